@@ -2,12 +2,18 @@ from flask import Flask
 from config.database import configure_db, db
 from config.jwt import configure_jwt
 from config.cors import configure_cors
+from config.fabric_config import configure_fabric
+from config.fraud_config import configure_fraud_model
+from config.scan_monitor_config import configure_scan_monitor
 from src.routes.user_routes import user_bp
 from src.routes.auth_routes import auth_bp
 from src.routes.blockchain_routes import blockchain_bp
 from src.routes.medication_request_routes import medication_request_bp
 from src.routes.inventory_routes import inventory_bp
 from src.routes.notification_routes import notification_bp
+from src.routes.verification_routes import verification_bp
+from src.routes.fraud_routes import fraud_bp
+from src.routes.analytics_routes import analytics_bp
 from flask_migrate import Migrate
 
 def create_app():
@@ -19,6 +25,9 @@ def create_app():
     migrate = Migrate(app, db)    
 
     configure_cors(app)
+    configure_fabric(app)
+    configure_scan_monitor(app)
+    configure_fraud_model(app)
 
     # Register blueprints
     app.register_blueprint(user_bp, url_prefix='/users')
@@ -27,6 +36,9 @@ def create_app():
     app.register_blueprint(medication_request_bp, url_prefix='/api')
     app.register_blueprint(inventory_bp, url_prefix='/api')
     app.register_blueprint(notification_bp, url_prefix='/api')
+    app.register_blueprint(verification_bp, url_prefix='/verify')
+    app.register_blueprint(fraud_bp, url_prefix='/fraud')
+    app.register_blueprint(analytics_bp, url_prefix='/analytics')
 
     return app
 
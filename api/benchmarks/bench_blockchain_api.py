@@ -0,0 +1,148 @@
+"""
+Load test the /blockchain endpoints end to end against the in-process fake
+Fabric network (FABRIC_BACKEND=fake), without the docker-compose stack.
+
+Each case drives the whole Flask app (routing, JWT auth, service, repository,
+client pool) from concurrent callers. The "hot" transfer case spreads the
+callers over a handful of batches to show MVCC conflicts under contention.
+
+Usage (from the api/ directory):
+    python -m benchmarks.bench_blockchain_api [--callers 32] [--requests 512]
+        [--endorse-latency 0.02] [--commit-latency 0.2] [--mvcc-rate 0]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _configure_environment(args):
+    # Must run before the app (and config.settings) is imported
+    os.environ["FABRIC_BACKEND"] = "fake"
+    os.environ["FABRIC_FAKE_ENDORSE_LATENCY"] = str(args.endorse_latency)
+    os.environ["FABRIC_FAKE_COMMIT_LATENCY"] = str(args.commit_latency)
+    os.environ["FABRIC_FAKE_MVCC_CONFLICT_RATE"] = str(args.mvcc_rate)
+    os.environ.setdefault("FABRIC_POOL_SIZE", "4")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ENVIRONMENT", "local")
+    if "DATABASE_URI_POSTGRES" not in os.environ:
+        database = os.path.join(tempfile.mkdtemp(prefix="bench-api-"), "bench.db")
+        os.environ["DATABASE_URI_POSTGRES"] = f"sqlite:///{database}"
+
+
+def _create_admin_token(app):
+    from flask_jwt_extended import create_access_token
+    from config.database import db
+    from src.models.user_model import User
+    from src.utils.constants import UserRole, UserStatus
+
+    with app.app_context():
+        db.create_all()
+        user = User(
+            name="Benchmark Admin",
+            email=f"bench-{time.time_ns()}@example.com",
+            phone="0",
+            hashed_password="-",
+            role=UserRole.ADMIN.value,
+            status=UserStatus.ACTIVE.value,
+        )
+        db.session.add(user)
+        db.session.commit()
+        return create_access_token(identity=str(user.id))
+
+
+def run_case(app, token, callers, requests, make_request):
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    statuses = Counter()
+
+    def call(i):
+        client = app.test_client()
+        method, url, body = make_request(i)
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as workers:
+        list(workers.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=512, help="requests per case")
+    parser.add_argument("--hot-batches", type=int, default=4, help="batches shared by the hot transfer case")
+    parser.add_argument("--endorse-latency", type=float, default=0.02, help="simulated endorsement seconds")
+    parser.add_argument("--commit-latency", type=float, default=0.2, help="simulated block cut seconds")
+    parser.add_argument("--mvcc-rate", type=float, default=0.0, help="injected MVCC conflict probability")
+    args = parser.parse_args()
+
+    _configure_environment(args)
+    from app import create_app
+    from config.fabric_config import get_fabric_client
+
+    app = create_app()
+    token = _create_admin_token(app)
+    n = args.requests
+
+    def create(i):
+        return "POST", "/blockchain/batches", {
+            "batch_id": f"BENCH-{i}",
+            "product_name": "Benchmark Drug",
+            "manufacture_date": "2026-01-01",
+            "expiry_date": "2028-01-01",
+            "total_quantity": 1000,
+            "unit_dosage": "10mg",
+            "unit_price": 1.5,
+            "owner_org_id": "manufacturer-bench",
+        }
+
+    def transfer(batch_id):
+        return "POST", "/blockchain/batches/transfer", {
+            "batch_id": batch_id,
+            "from_org_id": "manufacturer-bench",
+            "to_org_id": "distributor-bench",
+            "quantity": 1,
+        }
+
+    cases = [
+        ("create", create),
+        ("read", lambda i: ("GET", f"/blockchain/batches/BENCH-{i}", None)),
+        ("transfer (spread)", lambda i: transfer(f"BENCH-{i}")),
+        ("transfer (hot)", lambda i: transfer(f"BENCH-{i % args.hot_batches}")),
+    ]
+
+    print(
+        f"Fake network: endorse {args.endorse_latency * 1000:.0f} ms, block cut {args.commit_latency * 1000:.0f} ms, "
+        f"injected MVCC {args.mvcc_rate:.0%}; {args.callers} callers, {n} requests per case\n"
+    )
+    print(f"{'case':>18} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | statuses")
+    print("-" * 72)
+
+    for name, make_request in cases:
+        result = run_case(app, token, args.callers, n, make_request)
+        print(
+            f"{name:>18} | {result['throughput']:>8.1f} | {result['p50']:>8.1f} | "
+            f"{result['p99']:>8.1f} | {result['statuses']}"
+        )
+
+    print(f"\nLedger: {get_fabric_client()._members[0].client.ledger.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark BlockchainRepository.get_batch throughput with the legacy per-call
+event loop versus the per-process background event loop.
+
+The peer is simulated by an SDK stub whose chaincode_query sleeps for a fixed
+round-trip latency, so the numbers isolate the client-side concurrency model.
+
+Usage (from the api/ directory):
+    python -m benchmarks.bench_fabric_event_loop [--latency 0.02] [--calls 256]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.fabric.fabric_client import FabricClient, LOOP_MODE_BACKGROUND, LOOP_MODE_PER_CALL
+from src.fabric.peer_selector import PeerSelector
+from src.repositories.blockchain_repository import BlockchainRepository
+from src.utils.cache import LRUCache
+
+
+class SimulatedSdkClient:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def chaincode_query(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return json.dumps({"batchId": kwargs["args"][0], "status": "CREATED"})
+
+
+class SimulatedFabricClient(FabricClient):
+    def __init__(self, latency: float, loop_mode: str) -> None:
+        self.user_id = "benchUser"
+        self.channel_name = "mychannel"
+        self.chaincode_name = "medicinecc"
+        self.contract_name = "MedicineContract"
+        self.loop_mode = loop_mode
+        self.client = SimulatedSdkClient(latency)
+        self.query_selector = PeerSelector(["peer0.org1.example.com"])
+
+
+def _new_thread_loop():
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def run_case(loop_mode: str, callers: int, calls: int, latency: float) -> float:
+    # A one-entry cache, so every call with a new batch_id reaches the peer
+    repository = BlockchainRepository(
+        SimulatedFabricClient(latency, loop_mode), batch_cache=LRUCache("bench", max_size=1)
+    )
+
+    if loop_mode == LOOP_MODE_PER_CALL:
+        # Legacy behaviour: every ledger call owns the worker's loop until it
+        # completes, so concurrent callers queue up behind a single executor.
+        executor = ThreadPoolExecutor(max_workers=1, initializer=_new_thread_loop)
+        submit = lambda i: executor.submit(repository.get_batch, f"BATCH-{i}")
+        workers = ThreadPoolExecutor(max_workers=callers)
+        run = lambda i: submit(i).result()
+    else:
+        executor = None
+        workers = ThreadPoolExecutor(max_workers=callers)
+        run = lambda i: repository.get_batch(f"BATCH-{i}")
+
+    # Warm up threads and the loop before timing
+    list(workers.map(run, range(callers)))
+
+    started = time.perf_counter()
+    list(workers.map(run, range(calls)))
+    elapsed = time.perf_counter() - started
+
+    workers.shutdown()
+    if executor is not None:
+        executor.shutdown()
+
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated peer round-trip in seconds")
+    parser.add_argument("--calls", type=int, default=256, help="get_batch calls per case")
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    print(f"Simulated peer latency: {args.latency * 1000:.1f} ms, {args.calls} calls per case\n")
+    print(f"{'callers':>8} | {'per_call (req/s)':>17} | {'background (req/s)':>19} | {'speedup':>7}")
+    print("-" * 62)
+
+    for callers in args.callers:
+        before = run_case(LOOP_MODE_PER_CALL, callers, args.calls, args.latency)
+        after = run_case(LOOP_MODE_BACKGROUND, callers, args.calls, args.latency)
+        print(f"{callers:>8} | {before:>17.1f} | {after:>19.1f} | {after / before:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark FEFO allocation of medication requests: seeds a manufacturer with
+``--batches`` inventory batches spread over ``--products`` products and
+``--requests`` pending requests for them, then measures single approvals
+without a batch (FEFO split, reservation and approval per request) and
+the batch allocator working through the rest of the queue.
+
+Point DATABASE_URI_POSTGRES at a scratch PostgreSQL database; SQLite works
+for a quick run.
+
+Usage (from the api/ directory):
+    DATABASE_URI_POSTGRES=postgresql://.../scratch \\
+        python -m benchmarks.bench_fefo_allocation [--requests 100000]
+"""
+
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import insert, text
+
+
+def _configure_environment():
+    # Must run before the app (and config.settings) is imported
+    os.environ.setdefault("FABRIC_BACKEND", "fake")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ENVIRONMENT", "local")
+
+
+def seed(products: int, batches: int, requests: int, chunk: int = 50000):
+    from config.database import db
+    from src.models.inventory_model import Inventory
+    from src.models.medication_request_model import MedicationRequest
+    from src.models.organization_model import Organization
+    from src.models.user_model import User
+
+    rng = random.Random(7)
+    suffix = uuid.uuid4().hex[:8]
+    organization = Organization(
+        org_id=f"bench-{suffix}", name="FEFO Bench", org_type="manufacturer",
+        contact_email=f"bench-{suffix}@example.com", contact_phone="0", status="active"
+    )
+    consumer = User(
+        name="FEFO Bench", email=f"bench-{suffix}@example.com", phone="0", hashed_password="-",
+        role="consumer", status="active"
+    )
+    db.session.add_all([organization, consumer])
+    db.session.commit()
+
+    names = [f"BENCH-{suffix} Product {index}" for index in range(products)]
+    today = date.today()
+    db.session.execute(insert(Inventory), [
+        {
+            "id": uuid.uuid4(),
+            "organization_id": organization.id,
+            "batch_id": f"FEFO-{suffix}-{index}",
+            "product_name": names[index % products],
+            "available_quantity": rng.randrange(100, 5000),
+            "reserved_quantity": 0,
+            "unit_dosage": "500mg",
+            "manufacture_date": today - timedelta(days=365),
+            "expiry_date": today + timedelta(days=rng.randrange(1, 1000)),
+            "unit_price": 1,
+            "status": "available",
+        }
+        for index in range(batches)
+    ])
+    started = datetime(2026, 1, 1)
+    for start in range(0, requests, chunk):
+        db.session.execute(insert(MedicationRequest), [
+            {
+                "id": uuid.uuid4(),
+                "request_number": f"FEFO-{suffix}-{start + i}",
+                "consumer_id": consumer.id,
+                "product_name": rng.choice(names),
+                "requested_quantity": rng.randrange(1, 50),
+                "unit_dosage": "500mg",
+                "prescription_required": False,
+                "status": "pending",
+                "created_at": started + timedelta(milliseconds=start + i),
+            }
+            for i in range(min(chunk, requests - start))
+        ])
+        db.session.commit()
+    return organization, consumer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--batches", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--singles", type=int, default=200, help="requests approved one at a time first")
+    args = parser.parse_args()
+
+    _configure_environment()
+    from app import create_app
+    from config.database import db
+    from src.models.medication_request_model import MedicationRequest
+    from src.services.medication_request_service import MedicationRequestService
+    from src.utils.constants import UserRole
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        print(
+            f"Seeding {args.batches:,} batches of {args.products} products and "
+            f"{args.requests:,} pending requests ({db.engine.dialect.name})"
+        )
+        organization, consumer = seed(args.products, args.batches, args.requests)
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE"))
+
+        service = MedicationRequestService()
+        admin = SimpleNamespace(id=consumer.id, role=UserRole.ADMIN.value, organization_id=None)
+        service.auth_service.return_user_from_token = lambda: admin
+
+        pending = [request_id for (request_id,) in db.session.query(MedicationRequest.id).filter(
+            MedicationRequest.status == "pending", MedicationRequest.consumer_id == consumer.id
+        ).order_by(MedicationRequest.created_at).limit(args.singles).all()]
+        latencies = []
+        for request_id in pending:
+            started = time.perf_counter()
+            service.approve_request(request_id, {"assigned_manufacturer_id": organization.id})
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        if latencies:
+            print(
+                f"\nSingle FEFO approvals: {len(latencies)}  p50 {latencies[len(latencies) // 2]:.2f} ms  "
+                f"p95 {latencies[int(len(latencies) * 0.95)]:.2f} ms"
+            )
+
+        result = service.allocate_pending_requests({"assigned_manufacturer_id": organization.id})
+        print(
+            f"Batch allocation: {result['allocated']:,} approved, {result['skipped']:,} left pending "
+            f"in {result['elapsed_seconds']:.2f}s ({result['requests_per_second']:,} requests/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark fraud scoring of a POST /fraud/score batch: vectorized feature
+extraction and one model call for the whole batch, against scoring each
+record on its own. Also reports how long loading the artifact takes with
+and without memory mapping.
+
+Usage (from the api/ directory):
+    python -m benchmarks.bench_fraud_scoring [--records 10000] [--estimators 200]
+"""
+
+import argparse
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from src.analytics.fraud import FRAUD_FEATURES, transfer_features, transfer_frame
+from src.analytics.model_registry import ModelRegistry
+
+
+def synthetic_records(records: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    quantities = rng.lognormal(3, 0.3, records).astype(int) + 1
+    hours = rng.lognormal(2, 0.5, records)
+    return [
+        {
+            "tx_id": f"tx-{index}",
+            "batch_id": f"BATCH-{index}",
+            "quantity": int(quantity),
+            "total_quantity": 1000,
+            "transferred_at": f"2026-01-{1 + int(held // 24) + 1:02d}T{int(held % 24):02d}:00:00Z",
+            "previous_step_at": "2026-01-01T00:00:00Z",
+        }
+        for index, (quantity, held) in enumerate(zip(quantities, hours))
+    ]
+
+
+def _timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--estimators", type=int, default=200)
+    parser.add_argument("--row-sample", type=int, default=500, help="records scored one by one")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.records)
+    estimator = IsolationForest(n_estimators=args.estimators, contamination=0.01, random_state=0)
+    estimator.fit(transfer_features(transfer_frame(records)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory)
+        registry.publish(estimator, FRAUD_FEATURES, threshold=-estimator.offset_, version="bench")
+        _, mapped = _timed(lambda: registry.load("bench"))
+        _, copied = _timed(lambda: joblib.load(f"{directory}/bench.joblib"))
+        model = registry.load("bench")
+
+        batch, batch_seconds = _timed(lambda: model.score(transfer_features(transfer_frame(records))))
+        sample = records[:args.row_sample]
+        rows, row_seconds = _timed(
+            lambda: [model.score(transfer_features(transfer_frame([record])))[0] for record in sample]
+        )
+        assert np.allclose(rows, batch[:len(sample)])
+
+    per_batch = batch_seconds * 1e6 / args.records
+    per_row = row_seconds * 1e6 / len(sample)
+    print(f"{args.records} records, IsolationForest with {args.estimators} trees")
+    print(f"  load:       {mapped * 1000:.0f} ms mmap, {copied * 1000:.0f} ms in memory")
+    print(f"  vectorized: {args.records / batch_seconds:,.0f} records/s ({per_batch:.1f} us/record)")
+    print(f"  row by row: {len(sample) / row_seconds:,.0f} records/s ({per_row:.1f} us/record)")
+    print(f"  speedup:    {per_row / per_batch:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark the notification lookups before and after their indexes: seeds
+``--rows`` notifications spread over ``--users`` users, then shows the
+query plan and latency of each NotificationRepository.find_by_user query
+without the indexes and after building them CONCURRENTLY.
+
+Point DATABASE_URI_POSTGRES at a scratch PostgreSQL database: the tables
+are created if needed and the notification indexes are dropped and rebuilt.
+SQLite works too for a quick run at a smaller scale.
+
+Usage (from the api/ directory):
+    DATABASE_URI_POSTGRES=postgresql://.../scratch \\
+        python -m benchmarks.bench_notification_indexes [--rows 10000000] [--users 10000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+
+# (label, query): the SQL NotificationRepository.find_by_user emits, plus its first page
+QUERIES = [
+    ("all, newest first",
+     "SELECT * FROM notification WHERE user_id = :user_id ORDER BY created_at DESC"),
+    ("unread, newest first",
+     "SELECT * FROM notification WHERE user_id = :user_id AND is_read = false ORDER BY created_at DESC"),
+    ("first page of 50",
+     "SELECT * FROM notification WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 50"),
+]
+
+
+def _configure_environment():
+    # Must run before the app (and config.settings) is imported
+    os.environ.setdefault("FABRIC_BACKEND", "fake")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ENVIRONMENT", "local")
+
+
+def _postgres(engine) -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def seed(engine, rows: int, users: int, chunk: int = 1000000):
+    """
+    Inserts the users and notifications server-side, ``chunk`` rows per
+    statement, with 80% of the notifications already read.
+    """
+    # Plain strings: UUIDs are hex on SQLite and cast from text on PostgreSQL
+    user_ids = [str(user_id) if _postgres(engine) else user_id.hex for user_id in (uuid.uuid4() for _ in range(users))]
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO \"user\" (id, name, email, phone, hashed_password, role, status) "
+                "VALUES (:id, 'Bench', :email, '0', '-', 'consumer', 'active')"
+            ),
+            [{"id": user_id, "email": f"bench-{user_id}@example.com"} for user_id in user_ids],
+        )
+
+    if _postgres(engine):
+        insert = (
+            "INSERT INTO notification (id, user_id, title, message, notification_type, is_read, created_at) "
+            "SELECT gen_random_uuid(), u.id, 'Transfer received', 'Batch received', 'transfer_received', "
+            "random() < 0.8, now() - random() * interval '365 days' "
+            "FROM generate_series(1, :count) g JOIN bench_user u ON u.n = (g * 7919) % :users"
+        )
+    else:
+        insert = (
+            "WITH RECURSIVE g(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM g WHERE i < :count) "
+            "INSERT INTO notification (id, user_id, title, message, notification_type, is_read, created_at) "
+            "SELECT lower(hex(randomblob(16))), u.id, 'Transfer received', 'Batch received', 'transfer_received', "
+            "abs(random() % 10) < 8, datetime('now', '-' || abs(random() % 31536000) || ' seconds') "
+            "FROM g JOIN bench_user u ON u.n = (g.i * 7919) % :users"
+        )
+
+    done = 0
+    started = time.perf_counter()
+    while done < rows:
+        count = min(chunk, rows - done)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TEMPORARY TABLE IF NOT EXISTS bench_user AS "
+                                    "SELECT row_number() OVER () - 1 AS n, id FROM \"user\" WHERE name = 'Bench'"))
+            connection.execute(text(insert), {"count": count, "users": users})
+        done += count
+        print(f"  seeded {done:,} notifications ({time.perf_counter() - started:.0f}s)")
+    return user_ids
+
+
+def explain(connection, postgres: bool, query: str, user_id) -> str:
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if postgres else "EXPLAIN QUERY PLAN "
+    rows = connection.execute(text(prefix + query), {"user_id": user_id}).all()
+    return "\n".join(f"      {row[0] if postgres else row[-1]}" for row in rows)
+
+
+def measure(engine, user_ids, samples: int):
+    postgres = _postgres(engine)
+    rng = random.Random(11)
+    with engine.connect() as connection:
+        for label, query in QUERIES:
+            latencies = []
+            for _ in range(samples):
+                user_id = rng.choice(user_ids)
+                started = time.perf_counter()
+                connection.execute(text(query), {"user_id": user_id}).all()
+                latencies.append((time.perf_counter() - started) * 1000)
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"  {label:<22} p50 {statistics.median(latencies):8.2f} ms   p95 {p95:8.2f} ms")
+            print(explain(connection, postgres, query, user_ids[0]))
+
+
+def build_indexes(engine, table):
+    """
+    Builds the model's indexes the way the migration does: CONCURRENTLY,
+    outside a transaction, so the table stays writable meanwhile.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for index in table.indexes:
+            index.dialect_options["postgresql"]["concurrently"] = True
+            started = time.perf_counter()
+            index.create(connection)
+            print(f"  built {index.name} in {time.perf_counter() - started:.1f}s")
+            index.dialect_options["postgresql"]["concurrently"] = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--samples", type=int, default=200, help="lookups per query and phase")
+    args = parser.parse_args()
+
+    _configure_environment()
+    from app import create_app
+    from config.database import db
+    from src.models.notification_model import Notification
+
+    app = create_app()
+    with app.app_context():
+        engine = db.engine
+        db.create_all()
+        table = Notification.__table__
+        with engine.begin() as connection:
+            for index in table.indexes:
+                index.drop(connection, checkfirst=True)
+
+        print(f"Seeding {args.rows:,} notifications for {args.users:,} users ({engine.dialect.name})")
+        user_ids = seed(engine, args.rows, args.users)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE notification"))
+
+        print("\nWithout indexes:")
+        measure(engine, user_ids, args.samples)
+
+        print("\nBuilding indexes:")
+        build_indexes(engine, table)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE notification"))
+
+        print("\nWith indexes:")
+        measure(engine, user_ids, args.samples)
+
+
+if __name__ == "__main__":
+    main()
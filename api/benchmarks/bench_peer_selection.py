@@ -0,0 +1,103 @@
+"""
+Benchmark evaluate latency across several query peers when one of them is
+slow: pinned to a single peer, least-outstanding selection, and
+least-outstanding selection with hedged requests.
+
+Every simulated peer answers in ``--latency`` seconds with a small jitter,
+except ``peer0`` which takes ``--slow-factor`` times longer on a
+``--slow-ratio`` share of its queries (a GC pause, a busy CouchDB, ...).
+
+Usage (from the api/ directory):
+    python -m benchmarks.bench_peer_selection [--peers 3] [--calls 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from src.fabric.fabric_client import FabricClient, LOOP_MODE_BACKGROUND
+from src.fabric.peer_selector import PeerSelector
+
+
+class SimulatedSdkClient:
+    def __init__(self, latency: float, slow_factor: float, slow_ratio: float) -> None:
+        self.latency = latency
+        self.slow_factor = slow_factor
+        self.slow_ratio = slow_ratio
+        self.random = random.Random(7)
+
+    async def chaincode_query(self, **kwargs):
+        latency = self.latency * self.random.uniform(0.8, 1.2)
+        if kwargs["peers"][0] == "peer0" and self.random.random() < self.slow_ratio:
+            latency *= self.slow_factor
+        await asyncio.sleep(latency)
+        return json.dumps({"batchId": kwargs["args"][0]})
+
+
+class SimulatedFabricClient(FabricClient):
+    def __init__(self, sdk: SimulatedSdkClient, selector: PeerSelector) -> None:
+        self.user_id = "benchUser"
+        self.channel_name = "mychannel"
+        self.chaincode_name = "medicinecc"
+        self.contract_name = "MedicineContract"
+        self.loop_mode = LOOP_MODE_BACKGROUND
+        self.client = sdk
+        self.query_selector = selector
+
+
+async def run_case(client: SimulatedFabricClient, calls: int, concurrency: int) -> list:
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call(i):
+        async with slots:
+            started = time.perf_counter()
+            await client.evaluate_transaction("getBatch", [f"BATCH-{i}"])
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--peers", type=int, default=3)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.01, help="normal peer round-trip in seconds")
+    parser.add_argument("--slow-factor", type=float, default=20.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    peers = [f"peer{i}" for i in range(args.peers)]
+    cases = [
+        ("single peer", PeerSelector(peers[:1], hedge_percentile=0)),
+        ("least outstanding", PeerSelector(peers, hedge_percentile=0)),
+        ("least outstanding + hedge", PeerSelector(peers, hedge_percentile=0.95)),
+    ]
+
+    print(
+        f"{args.peers} peers, {args.latency * 1000:.0f} ms round-trip; peer0 is {args.slow_factor:.0f}x slower "
+        f"on {args.slow_ratio:.0%} of queries; {args.calls} calls at concurrency {args.concurrency}\n"
+    )
+    print(f"{'case':>26} | {'req/s':>8} | {'p50 ms':>7} | {'p99 ms':>7} | {'hedged':>6}")
+    print("-" * 66)
+
+    for name, selector in cases:
+        sdk = SimulatedSdkClient(args.latency, args.slow_factor, args.slow_ratio)
+        client = SimulatedFabricClient(sdk, selector)
+
+        started = time.perf_counter()
+        latencies = asyncio.run(run_case(client, args.calls, args.concurrency))
+        elapsed = time.perf_counter() - started
+
+        hedged = sum(p["hedged"] for p in selector.stats()["peers"].values())
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        print(f"{name:>26} | {args.calls / elapsed:>8.1f} | {p50:>7.1f} | {p99:>7.1f} | {hedged:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark inventory product search and autocomplete: seeds ``--rows``
+inventory rows named after a vocabulary of products and dosages, then
+measures the latency of ranked searches (exact, partial and misspelled
+terms, first page and the page after) and of prefix completions.
+
+Point DATABASE_URI_POSTGRES at a scratch PostgreSQL database with pg_trgm
+available; the search index is built like the migration builds it. SQLite
+(with the Python similarity stand-in) works for a quick run at a smaller
+scale.
+
+Usage (from the api/ directory):
+    DATABASE_URI_POSTGRES=postgresql://.../scratch \\
+        python -m benchmarks.bench_product_search [--rows 5000000]
+"""
+
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import date
+
+from sqlalchemy import insert, text
+
+PRODUCTS = [
+    "Amoxicillin", "Amlodipine", "Atorvastatin", "Azithromycin", "Ciprofloxacin", "Clopidogrel", "Doxycycline",
+    "Gabapentin", "Hydrochlorothiazide", "Ibuprofen", "Insulin Glargine", "Levothyroxine", "Lisinopril",
+    "Losartan", "Metformin", "Metoprolol", "Omeprazole", "Paracetamol", "Prednisone", "Salbutamol",
+    "Sertraline", "Simvastatin", "Tramadol", "Warfarin",
+]
+FORMS = ["Tablets", "Capsules", "Suspension", "Injection", "Syrup"]
+TERMS = ["Amoxicillin", "amox", "Metformin 500mg", "metfromin", "paracetmol", "Omeprazole Capsules", "statin"]
+PREFIXES = ["a", "am", "amo", "met", "500", "sus"]
+
+
+def _configure_environment():
+    # Must run before the app (and config.settings) is imported
+    os.environ.setdefault("FABRIC_BACKEND", "fake")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ENVIRONMENT", "local")
+
+
+def seed(rows: int, chunk: int = 50000):
+    from config.database import db
+    from src.models.inventory_model import Inventory
+    from src.models.organization_model import Organization
+
+    rng = random.Random(5)
+    organization = Organization.query.first()
+    organization_id = organization.id if organization else uuid.uuid4()
+    names = [f"{product} {dose}mg {form}" for product in PRODUCTS for dose in (5, 10, 50, 250, 500) for form in FORMS]
+    started = time.perf_counter()
+    for start in range(0, rows, chunk):
+        db.session.execute(insert(Inventory), [
+            {
+                "id": uuid.uuid4(),
+                "organization_id": organization_id,
+                "batch_id": f"BENCH-{start + i}",
+                "product_name": rng.choice(names),
+                "available_quantity": rng.randrange(0, 500),
+                "reserved_quantity": 0,
+                "unit_dosage": "1",
+                "manufacture_date": date(2026, 1, 1),
+                "expiry_date": date(2028, 1, 1),
+                "unit_price": 1,
+                "status": "available" if rng.random() < 0.8 else "out_of_stock",
+            }
+            for i in range(min(chunk, rows - start))
+        ])
+        db.session.commit()
+        print(f"  seeded {min(start + chunk, rows):,} rows ({time.perf_counter() - started:.0f}s)")
+
+
+def _percentiles(latencies):
+    latencies = sorted(latencies)
+    return latencies[len(latencies) // 2], latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000000)
+    parser.add_argument("--samples", type=int, default=100, help="runs per term")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    _configure_environment()
+    from app import create_app
+    from config.database import db
+    from src.repositories.inventory_repository import InventoryRepository
+    from src.services.inventory_service import get_product_index
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.create_all()
+
+        print(f"Seeding {args.rows:,} inventory rows ({db.engine.dialect.name})")
+        seed(args.rows)
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE inventory"))
+
+        repository = InventoryRepository()
+        print(f"\nSearch, {args.samples} runs per term (limit {args.limit}):")
+        for term in TERMS:
+            first, second = [], []
+            for _ in range(args.samples):
+                started = time.perf_counter()
+                rows, cursor = repository.search_available(term, 1, None, args.limit)
+                first.append((time.perf_counter() - started) * 1000)
+                if cursor:
+                    started = time.perf_counter()
+                    repository.search_available(term, 1, cursor, args.limit)
+                    second.append((time.perf_counter() - started) * 1000)
+            top = rows[0][0].product_name if rows else "-"
+            p50, p99 = _percentiles(first)
+            line = f"  {term!r:<24} page 1 p50 {p50:7.2f} ms  p99 {p99:7.2f} ms"
+            if second:
+                p50, p99 = _percentiles(second)
+                line += f"   page 2 p50 {p50:7.2f} ms  p99 {p99:7.2f} ms"
+            print(f"{line}   top: {top}")
+
+        started = time.perf_counter()
+        index = get_product_index()
+        print(f"\nAutocomplete index: {len(index)} products built in {(time.perf_counter() - started) * 1000:.0f} ms")
+        for prefix in PREFIXES:
+            latencies = []
+            for _ in range(args.samples):
+                started = time.perf_counter()
+                suggestions = index.complete(prefix, 10)
+                latencies.append((time.perf_counter() - started) * 1000)
+            p50, p99 = _percentiles(latencies)
+            print(f"  {prefix!r:<6} p50 {p50:6.3f} ms  p99 {p99:6.3f} ms   {len(suggestions)} suggestions")
+
+
+if __name__ == "__main__":
+    main()
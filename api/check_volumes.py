@@ -0,0 +1,65 @@
+"""
+Script to check volume conservation over every ledger batch history.
+Meant to run nightly; prints a summary of the violations found.
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from app import create_app
+from config.fabric_config import get_fabric_client
+from src.models.consistency_model import ConsistencyViolation
+from src.repositories.consistency_repository import ConsistencyRepository
+from src.services.volume_consistency_service import (
+    VolumeChecker, CONSISTENCY_WORKERS, CONSISTENCY_CHUNK_SIZE, CONSISTENCY_MAX_IN_FLIGHT
+)
+
+
+def main():
+    """Main function to run the volume consistency check."""
+    parser = argparse.ArgumentParser(description="Check volume conservation over ledger batch histories")
+    parser.add_argument("--workers", type=int, default=CONSISTENCY_WORKERS, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=CONSISTENCY_CHUNK_SIZE, help="batches per chunk")
+    parser.add_argument("--max-in-flight", type=int, default=CONSISTENCY_MAX_IN_FLIGHT, help="concurrent getBatchHistory queries per worker")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("LEDGER VOLUME CONSISTENCY CHECK")
+    print("="*60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            checker = VolumeChecker(
+                get_fabric_client(), workers=args.workers, chunk_size=args.chunk_size, max_in_flight=args.max_in_flight
+            )
+            run = ConsistencyRepository().create_run(checker.workers)
+
+            started = time.perf_counter()
+            run = checker.run(run)
+            elapsed = time.perf_counter() - started
+
+            if run.status != 'completed':
+                print(f"✗ Run {run.id} failed after {run.batches_checked} batches: {run.error}")
+                return 1
+
+            kinds = Counter(kind for (kind,) in ConsistencyViolation.query.with_entities(
+                ConsistencyViolation.kind).filter_by(run_id=run.id))
+            print(f"✓ Run {run.id}: {run.batches_checked} batches with {run.workers} workers in {elapsed:.1f}s "
+                  f"({run.batches_checked / elapsed:.0f}/s)")
+            if run.batches_failed:
+                print(f"✗ {run.batches_failed} batch histories could not be read")
+            print(f"✓ {run.violation_count} violations {dict(kinds)}")
+            return 0
+
+        except Exception as e:
+            print(f"\n✗ Error during volume consistency check: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
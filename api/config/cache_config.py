@@ -0,0 +1,39 @@
+import os
+import threading
+from src.utils.cache import LRUCache, RedisCache
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, default_max_size: int = 10000, default_ttl: float = 30):
+    """
+    Returns the process-wide cache called ``name``, creating it on first use.
+
+    CACHE_BACKEND selects ``memory`` (default) or ``redis`` (using REDIS_URL);
+    <NAME>_CACHE_MAX_SIZE and <NAME>_CACHE_TTL override the defaults.
+    """
+    with _caches_lock:
+        if name in _caches:
+            return _caches[name]
+
+        prefix = name.upper()
+        max_size = int(os.getenv(f"{prefix}_CACHE_MAX_SIZE", default_max_size))
+        ttl = float(os.getenv(f"{prefix}_CACHE_TTL", default_ttl))
+        backend = os.getenv("CACHE_BACKEND", "memory")
+
+        if backend == "redis":
+            redis_url = os.getenv("REDIS_URL")
+            if not redis_url:
+                raise RuntimeError("REDIS_URL is required when CACHE_BACKEND=redis.")
+            cache = RedisCache(name, redis_url, ttl=ttl)
+        else:
+            cache = LRUCache(name, max_size=max_size, ttl=ttl)
+
+        _caches[name] = cache
+        return cache
+
+
+def get_all_cache_stats() -> list:
+    with _caches_lock:
+        return [cache.stats() for cache in _caches.values()]
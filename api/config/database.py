@@ -1,6 +1,10 @@
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from config.settings import DATABASE_URI
+from src.utils.text_search import similarity
 
 db = SQLAlchemy()
 ma = Marshmallow()
@@ -11,3 +15,10 @@ def configure_db(app):
 
     db.init_app(app)
     ma.init_app(app)
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    # pg_trgm stand-in, so product search runs on SQLite (tests, local runs)
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
@@ -1,11 +1,43 @@
 import os
-from src.fabric.fabric_client import FabricClient
+import threading
+from src.fabric.fabric_client import FabricClient, LOOP_MODE_BACKGROUND, read_wallet_identity
+from src.fabric.client_pool import FabricClientPool
+from src.fabric.peer_selector import PeerSelector, discover_peers
+from src.fabric.event_listener import get_ledger_event_listener
 
+_client_pool = None
+_client_pool_lock = threading.Lock()
+_ledger_events_lock = threading.Lock()
+_ledger_indexer = None
+_outbox_dispatcher = None
+_anomaly_detector = None
 
-def get_fabric_client():
-    """
-    Initializes and returns a singleton FabricClient instance.
-    """
+
+def _build_fake_client_pool():
+    from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+
+    # One in-memory channel per process, shared by every pool member
+    ledger = FakeLedger(
+        channel_name=os.getenv("FABRIC_CHANNEL", "mychannel"),
+        chaincode_name=os.getenv("FABRIC_CHAINCODE", "medicinecc"),
+        endorse_latency=float(os.getenv("FABRIC_FAKE_ENDORSE_LATENCY", "0")),
+        commit_latency=float(os.getenv("FABRIC_FAKE_COMMIT_LATENCY", "0")),
+        mvcc_conflict_rate=float(os.getenv("FABRIC_FAKE_MVCC_CONFLICT_RATE", "0")),
+        max_block_size=int(os.getenv("FABRIC_FAKE_MAX_BLOCK_SIZE", "500")),
+    )
+    contract = os.getenv("FABRIC_CONTRACT", "MedicineContract")
+
+    return FabricClientPool(
+        lambda: FakeFabricClient(ledger, contract_name=contract),
+        size=int(os.getenv("FABRIC_POOL_SIZE", "1")),
+        idle_timeout=float(os.getenv("FABRIC_POOL_IDLE_TIMEOUT", "300")),
+        health_check_interval=float(os.getenv("FABRIC_HEALTH_CHECK_INTERVAL", "30")),
+    )
+
+
+def _build_client_pool():
+    if os.getenv("FABRIC_BACKEND", "sdk") == "fake":
+        return _build_fake_client_pool()
 
     ccp_path = os.getenv("FABRIC_CCP_PATH")
     wallet_path = os.getenv("FABRIC_WALLET_PATH")
@@ -14,16 +46,209 @@ def get_fabric_client():
     channel = os.getenv("FABRIC_CHANNEL")
     chaincode = os.getenv("FABRIC_CHAINCODE")
     contract = os.getenv("FABRIC_CONTRACT")
+    loop_mode = os.getenv("FABRIC_LOOP_MODE", LOOP_MODE_BACKGROUND)
 
     if not all([ccp_path, wallet_path, user_id, msp_id, channel, chaincode, contract]):
         raise RuntimeError("Fabric environment variables missing.")
 
-    return FabricClient(
-        ccp_path=ccp_path,
-        wallet_path=wallet_path,
-        user_id=user_id,
-        msp_id=msp_id,
-        channel_name=channel,
-        chaincode_name=chaincode,
-        contract_name=contract,
+    # Read the wallet once; every pooled client shares the same identity
+    identity = read_wallet_identity(wallet_path, user_id, msp_id)
+
+    # ...and the same peer selectors, so load balancing sees all in-flight requests
+    peer_roles = discover_peers(ccp_path, channel)
+    ejection = {
+        "eject_after": int(os.getenv("FABRIC_PEER_EJECT_AFTER", "5")),
+        "eject_seconds": float(os.getenv("FABRIC_PEER_EJECT_SECONDS", "30")),
+    }
+    query_selector = PeerSelector(
+        peer_roles["query"],
+        hedge_percentile=float(os.getenv("FABRIC_HEDGE_PERCENTILE", "0.95")),
+        hedge_min_delay=float(os.getenv("FABRIC_HEDGE_MIN_DELAY", "0.005")),
+        **ejection,
+    )
+    endorse_selector = PeerSelector(
+        [p for peers in peer_roles["endorsing"].values() for p in peers], hedge_percentile=0, **ejection
+    )
+
+    def factory():
+        return FabricClient(
+            ccp_path=ccp_path,
+            wallet_path=wallet_path,
+            user_id=user_id,
+            msp_id=msp_id,
+            channel_name=channel,
+            chaincode_name=chaincode,
+            contract_name=contract,
+            loop_mode=loop_mode,
+            identity=identity,
+            peer_roles=peer_roles,
+            query_selector=query_selector,
+            endorse_selector=endorse_selector,
+        )
+
+    return FabricClientPool(
+        factory,
+        size=int(os.getenv("FABRIC_POOL_SIZE", "1")),
+        idle_timeout=float(os.getenv("FABRIC_POOL_IDLE_TIMEOUT", "300")),
+        health_check_interval=float(os.getenv("FABRIC_HEALTH_CHECK_INTERVAL", "30")),
+        peer_selectors={"query": query_selector, "endorse": endorse_selector},
     )
+
+
+def get_fabric_client():
+    """
+    Initializes and returns the process-wide Fabric client pool.
+    FABRIC_BACKEND=fake swaps the network for an in-memory ledger.
+    """
+    global _client_pool
+
+    with _client_pool_lock:
+        if _client_pool is None:
+            _client_pool = _build_client_pool()
+        return _client_pool
+
+
+def start_ledger_events():
+    """
+    Starts following committed blocks and registers the API's subscribers.
+
+    The stream starts at the current chain height rather than at "newest",
+    so a transaction broadcast right after this returns is seen committing
+    however long the listener takes to connect.
+    """
+    from src.repositories.blockchain_repository import invalidate_batches_on_ledger_event
+    from src.fabric.transaction_tracker import get_transaction_tracker
+    from src.services.transfer_graph_service import update_transfer_graph_on_ledger_event
+    from src.services.verification_service import refresh_verification_on_ledger_event
+
+    listener = get_ledger_event_listener()
+    listener.subscribe(invalidate_batches_on_ledger_event)
+    listener.subscribe(get_transaction_tracker().on_ledger_event)
+    # After the batch cache invalidation, so refreshes read fresh state
+    listener.subscribe(refresh_verification_on_ledger_event)
+    listener.subscribe(update_transfer_graph_on_ledger_event)
+    with _ledger_events_lock:
+        if not listener.is_running():
+            client = get_fabric_client()
+            listener.start(client, start_block=client.height())
+    return listener
+
+
+def start_ledger_indexer(app, from_genesis=False):
+    """
+    Starts mirroring committed batch transactions into PostgreSQL.
+    """
+    global _ledger_indexer
+    from src.services.ledger_indexer_service import LedgerIndexer
+
+    if _ledger_indexer is None:
+        _ledger_indexer = LedgerIndexer(
+            app,
+            batch_size=int(os.getenv("LEDGER_INDEXER_BATCH_SIZE", "500")),
+            max_attempts=int(os.getenv("LEDGER_INDEXER_MAX_ATTEMPTS", "5")),
+        )
+        _ledger_indexer.start(get_fabric_client(), from_genesis=from_genesis)
+    return _ledger_indexer
+
+
+def start_anomaly_detector(app):
+    """
+    Starts scoring committed transfers and deliveries for anomalies.
+    """
+    global _anomaly_detector
+    from src.services.anomaly_detector_service import TransferAnomalyDetector
+
+    if _anomaly_detector is None:
+        _anomaly_detector = TransferAnomalyDetector(
+            app,
+            window=int(os.getenv("ANOMALY_WINDOW", "256")),
+            min_samples=int(os.getenv("ANOMALY_MIN_SAMPLES", "30")),
+            threshold=float(os.getenv("ANOMALY_THRESHOLD", "4.0")),
+            warmup_blocks=int(os.getenv("ANOMALY_WARMUP_BLOCKS", "10000")),
+            max_attempts=int(os.getenv("ANOMALY_MAX_ATTEMPTS", "5")),
+            max_queue=int(os.getenv("ANOMALY_MAX_QUEUE", "100000")),
+        )
+        _anomaly_detector.start(get_fabric_client())
+    return _anomaly_detector
+
+
+def build_outbox_dispatcher(app, **overrides):
+    from src.services.outbox_dispatcher_service import OutboxDispatcher
+
+    options = {
+        "workers": int(os.getenv("OUTBOX_WORKERS", "2")),
+        "batch_size": int(os.getenv("OUTBOX_BATCH_SIZE", "50")),
+        "max_in_flight": int(os.getenv("OUTBOX_MAX_IN_FLIGHT", "32")),
+        "max_attempts": int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10")),
+    }
+    options.update(overrides)
+    return OutboxDispatcher(app, get_fabric_client(), **options)
+
+
+def start_outbox_dispatcher(app):
+    """
+    Starts the workers that carry out outbox intents in this process.
+    """
+    global _outbox_dispatcher
+
+    if _outbox_dispatcher is None:
+        _outbox_dispatcher = build_outbox_dispatcher(app)
+        _outbox_dispatcher.start()
+    return _outbox_dispatcher
+
+
+def notify_outbox_dispatcher():
+    if _outbox_dispatcher is not None:
+        _outbox_dispatcher.notify()
+
+
+def configure_fabric(app):
+    """
+    Warms the Fabric client pool in the background when FABRIC_WARM_START is
+    enabled, so the first /blockchain request does not pay for profile
+    parsing, identity loading and channel setup. FABRIC_EVENTS_ENABLED also
+    starts the block event listener that keeps the API's caches coherent,
+    LEDGER_INDEXER_ENABLED the indexer behind the batch list endpoints,
+    OUTBOX_ENABLED the dispatcher that carries out recorded batch creations
+    and ANOMALY_DETECTOR_ENABLED the transfer anomaly detector.
+    """
+    warm = os.getenv("FABRIC_WARM_START", "false").lower() == "true"
+    events = os.getenv("FABRIC_EVENTS_ENABLED", "false").lower() == "true"
+    indexer = os.getenv("LEDGER_INDEXER_ENABLED", "false").lower() == "true"
+    outbox = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+    anomalies = os.getenv("ANOMALY_DETECTOR_ENABLED", "false").lower() == "true"
+    if not warm and not events and not indexer and not outbox and not anomalies:
+        return
+
+    def warm_start():
+        try:
+            pool = get_fabric_client()
+            if warm:
+                pool.warm_up()
+                pool.start_health_checks()
+            if events:
+                start_ledger_events()
+            if indexer:
+                start_ledger_indexer(app)
+            if outbox:
+                start_outbox_dispatcher(app)
+            if anomalies:
+                start_anomaly_detector(app)
+        except Exception as e:
+            print(f"Warning: Fabric warm start failed: {str(e)}")
+
+    threading.Thread(target=warm_start, name="fabric-warm-start", daemon=True).start()
+
+
+def _reset_after_fork():
+    global _client_pool, _client_pool_lock, _ledger_events_lock, _ledger_indexer, _outbox_dispatcher, _anomaly_detector
+    _client_pool = None
+    _ledger_indexer = None
+    _outbox_dispatcher = None
+    _anomaly_detector = None
+    _client_pool_lock = threading.Lock()
+    _ledger_events_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,47 @@
+import os
+import threading
+
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """
+    Returns the process-wide fraud model registry (FRAUD_MODEL_DIR).
+    """
+    global _model_registry
+    from src.analytics.model_registry import ModelRegistry
+
+    with _model_registry_lock:
+        if _model_registry is None:
+            _model_registry = ModelRegistry(
+                os.getenv("FRAUD_MODEL_DIR", "models/fraud"),
+                reload_interval=float(os.getenv("FRAUD_MODEL_RELOAD_INTERVAL", "10")),
+            )
+        return _model_registry
+
+
+def configure_fraud_model(app):
+    """
+    Loads the current fraud model at startup, so that with a preloaded app
+    (gunicorn --preload) workers inherit it from the master instead of each
+    loading their own.
+    """
+    registry = get_model_registry()
+    try:
+        registry.reload()
+    except Exception as e:
+        print(f"Warning: Could not load the fraud model: {str(e)}")
+
+
+def _reset_after_fork():
+    # The loaded model is kept: its arrays are file-backed and shared with
+    # the parent. Only the lock, which may have been held at fork, is renewed.
+    global _model_registry_lock
+    _model_registry_lock = threading.Lock()
+    if _model_registry is not None:
+        _model_registry._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
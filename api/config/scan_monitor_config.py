@@ -0,0 +1,62 @@
+import atexit
+import os
+import threading
+
+# Header the edge (CDN / load balancer) in front of the API sets to the
+# viewer's region, e.g. CloudFront-Viewer-Country or CF-IPCountry. Only
+# configure one the edge overwrites: public scans are located by it, and
+# without it by the connecting address's network, never by anything the
+# client sends.
+SCAN_MONITOR_REGION_HEADER = os.getenv("SCAN_MONITOR_REGION_HEADER", "")
+
+_scan_monitor = None
+_scan_monitor_lock = threading.Lock()
+
+
+def get_scan_monitor():
+    """
+    Returns the process-wide scan monitor, or None when SCAN_MONITOR_ENABLED
+    is off (verification then records nothing).
+    """
+    return _scan_monitor
+
+
+def configure_scan_monitor(app):
+    """
+    Starts the counterfeit scan monitor when SCAN_MONITOR_ENABLED is set;
+    pending counts are flushed on shutdown.
+    """
+    global _scan_monitor
+    from src.services.scan_monitor_service import ScanMonitor
+
+    if os.getenv("SCAN_MONITOR_ENABLED", "false").lower() != "true":
+        return
+
+    with _scan_monitor_lock:
+        if _scan_monitor is not None:
+            return
+        _scan_monitor = ScanMonitor(
+            app,
+            flush_interval=float(os.getenv("SCAN_MONITOR_FLUSH_INTERVAL", "30")),
+            volume_factor=float(os.getenv("SCAN_MONITOR_VOLUME_FACTOR", "1.0")),
+            max_locations=int(os.getenv("SCAN_MONITOR_MAX_LOCATIONS", "10")),
+            max_tracked=int(os.getenv("SCAN_MONITOR_MAX_TRACKED_BATCHES", "100000")),
+        )
+        try:
+            _scan_monitor.start()
+        except Exception as e:
+            print(f"Warning: Could not start the scan monitor: {str(e)}")
+            _scan_monitor = None
+            return
+        atexit.register(_scan_monitor.stop)
+
+
+def _reset_after_fork():
+    # The worker thread does not survive fork; children start their own
+    global _scan_monitor, _scan_monitor_lock
+    _scan_monitor = None
+    _scan_monitor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
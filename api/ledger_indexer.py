@@ -0,0 +1,46 @@
+"""
+Script to run the ledger indexer that mirrors batches into PostgreSQL.
+Use --replay to drop the mirror and rebuild it from the genesis block.
+"""
+
+import argparse
+import sys
+import time
+from app import create_app
+from config.fabric_config import get_fabric_client
+from src.services.ledger_indexer_service import LedgerIndexer
+
+
+def main():
+    """Main function to run the ledger indexer."""
+    parser = argparse.ArgumentParser(description="Mirror ledger batches into PostgreSQL")
+    parser.add_argument("--replay", action="store_true", help="rebuild the mirror from the genesis block")
+    parser.add_argument("--batch-size", type=int, default=500, help="events applied per transaction")
+    parser.add_argument("--max-attempts", type=int, default=5, help="attempts before a failing event is dead-lettered")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("LEDGER INDEXER")
+    print("="*60)
+
+    app = create_app()
+    indexer = LedgerIndexer(app, batch_size=args.batch_size, max_attempts=args.max_attempts)
+
+    try:
+        indexer.start(get_fabric_client(), from_genesis=args.replay)
+        print("✓ Following committed blocks (Ctrl+C to stop)")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        indexer.stop()
+        print("\n✓ Ledger indexer stopped")
+        return 0
+    except Exception as e:
+        print(f"\n✗ Error while indexing: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
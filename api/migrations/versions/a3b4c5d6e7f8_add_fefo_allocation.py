@@ -0,0 +1,94 @@
+"""store inventory dates as dates and add FEFO allocation lines
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+DATE_COLUMNS = ['manufacture_date', 'expiry_date']
+
+# Session-local cast that turns what is not a valid ISO date (including
+# well-formed but impossible ones such as 2024-13-45) into NULL instead of
+# aborting the migration
+SAFE_DATE_FUNCTION = """
+CREATE FUNCTION pg_temp.safe_iso_date(value text) RETURNS date AS $$
+BEGIN
+    IF value !~ '^\\d{4}-\\d{2}-\\d{2}' THEN
+        RETURN NULL;
+    END IF;
+    RETURN left(value, 10)::date;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE
+"""
+
+
+def upgrade():
+    # Values written so far are ISO dates (optionally with a time); anything
+    # else cannot be sorted by and becomes NULL
+    postgresql = op.get_context().dialect.name == 'postgresql'
+    if postgresql:
+        op.execute(SAFE_DATE_FUNCTION)
+    for column in DATE_COLUMNS:
+        op.alter_column(
+            'inventory', column,
+            existing_type=sa.String(length=50), type_=sa.Date(), existing_nullable=False, nullable=True,
+            postgresql_using=f"pg_temp.safe_iso_date({column})",
+        )
+    if postgresql:
+        op.execute("DROP FUNCTION pg_temp.safe_iso_date(text)")
+
+    # Create medication_request_allocation table
+    op.create_table('medication_request_allocation',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('request_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('inventory_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('line_number', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['request_id'], ['medication_request.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('request_id', 'line_number', name='uq_medication_request_allocation_request_id_line_number')
+    )
+
+    # Built CONCURRENTLY like the other lookup indexes (see e1f2a3b4c5d6)
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_inventory_product_name_unit_dosage_expiry_date', table_name='inventory',
+            if_exists=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_inventory_product_name_unit_dosage_expiry_date', 'inventory',
+            ['product_name', 'unit_dosage', 'expiry_date'], postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_inventory_product_name_unit_dosage_expiry_date', table_name='inventory',
+            if_exists=True, postgresql_concurrently=True,
+        )
+
+    op.drop_table('medication_request_allocation')
+
+    for column in DATE_COLUMNS:
+        op.alter_column(
+            'inventory', column,
+            existing_type=sa.Date(), type_=sa.String(length=50), existing_nullable=True,
+            postgresql_using=f"{column}::text",
+        )
@@ -0,0 +1,41 @@
+"""add scan sketch tables
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f6a7b8c9d0e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create scan_sketch table
+    op.create_table('scan_sketch',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    # Create batch_scan_stats table
+    op.create_table('batch_scan_stats',
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('location_registers', sa.LargeBinary(), nullable=True),
+        sa.Column('volume_flagged_at', sa.DateTime(), nullable=True),
+        sa.Column('locations_flagged_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('batch_id')
+    )
+
+
+def downgrade():
+    op.drop_table('batch_scan_stats')
+    op.drop_table('scan_sketch')
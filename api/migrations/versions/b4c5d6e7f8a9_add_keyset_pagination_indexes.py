@@ -0,0 +1,79 @@
+"""extend list lookup indexes with the primary key for keyset pagination
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4c5d6e7f8a9'
+down_revision = 'a3b4c5d6e7f8'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate, index it replaces). List
+# pages seek past the (created_at, id) of the previous page's last row, so the
+# id has to be in the index for a deep page to be a range scan like page one.
+INDEXES = [
+    # InventoryRepository.find_by_organization
+    ('ix_inventory_organization_id_created_at_id', 'inventory',
+     ['organization_id', sa.text('created_at DESC'), sa.text('id DESC')], None,
+     'ix_inventory_organization_id_created_at'),
+    # MedicationRequestRepository.find_by_consumer
+    ('ix_medication_request_consumer_id_created_at_id', 'medication_request',
+     ['consumer_id', sa.text('created_at DESC'), sa.text('id DESC')], None,
+     'ix_medication_request_consumer_id_created_at'),
+    # MedicationRequestRepository.find_pending_requests and find_pending_page
+    ('ix_medication_request_status_created_at_id', 'medication_request',
+     ['status', 'created_at', 'id'], None,
+     'ix_medication_request_status_created_at'),
+    # MedicationRequestRepository.find_by_manufacturer
+    ('ix_medication_request_assigned_manufacturer_id_created_at_id', 'medication_request',
+     ['assigned_manufacturer_id', sa.text('created_at DESC'), sa.text('id DESC')], None,
+     'ix_medication_request_assigned_manufacturer_id_created_at'),
+    # NotificationRepository.find_by_user
+    ('ix_notification_user_id_created_at_id', 'notification',
+     ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], None,
+     'ix_notification_user_id_created_at'),
+    # NotificationRepository.find_by_user(unread_only=True) and mark_all_as_read
+    ('ix_notification_user_id_unread_created_at_id', 'notification',
+     ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], sa.text('is_read = false'),
+     'ix_notification_user_id_unread_created_at'),
+    # OrganizationRepository.find_all
+    ('ix_organization_status_created_at_id', 'organization',
+     ['status', 'created_at', 'id'], None, None),
+    # UserRepository.get_all_users
+    ('ix_user_status_created_at_id', 'user',
+     ['status', 'created_at', 'id'], None, None),
+]
+
+
+def upgrade():
+    # Built CONCURRENTLY like the indexes they replace (see e1f2a3b4c5d6); the
+    # old index is only dropped once its successor is in place
+    with op.get_context().autocommit_block():
+        for name, table, columns, where, replaces in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, postgresql_where=where, sqlite_where=where,
+            )
+            if replaces:
+                op.drop_index(replaces, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where, replaces in reversed(INDEXES):
+            if replaces:
+                op.drop_index(replaces, table_name=table, if_exists=True, postgresql_concurrently=True)
+                op.create_index(
+                    replaces, table, columns[:2],
+                    postgresql_concurrently=True, postgresql_where=where, sqlite_where=where,
+                )
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""add transfer anomaly table
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create transfer_anomaly table
+    op.create_table('transfer_anomaly',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('tx_id', sa.String(length=64), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('function', sa.String(length=50), nullable=False),
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('org_id', sa.String(length=100), nullable=False),
+        sa.Column('counterparty_org_id', sa.String(length=100), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('features', sa.JSON(), nullable=False),
+        sa.Column('reasons', sa.JSON(), nullable=False),
+        sa.Column('detected_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tx_id')
+    )
+    op.create_index('ix_transfer_anomaly_detected_at_id', 'transfer_anomaly', ['detected_at', 'id'])
+    op.create_index('ix_transfer_anomaly_batch_id', 'transfer_anomaly', ['batch_id'])
+    op.create_index('ix_transfer_anomaly_org_id_detected_at', 'transfer_anomaly', ['org_id', 'detected_at'])
+
+
+def downgrade():
+    op.drop_index('ix_transfer_anomaly_org_id_detected_at', table_name='transfer_anomaly')
+    op.drop_index('ix_transfer_anomaly_batch_id', table_name='transfer_anomaly')
+    op.drop_index('ix_transfer_anomaly_detected_at_id', table_name='transfer_anomaly')
+    op.drop_table('transfer_anomaly')
@@ -0,0 +1,35 @@
+"""add ledger dead letter table
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b4c5d6e7f8a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create ledger_dead_letter table (events a ledger consumer skipped after
+    # running out of attempts)
+    op.create_table('ledger_dead_letter',
+        sa.Column('consumer', sa.String(length=100), nullable=False),
+        sa.Column('tx_id', sa.String(length=64), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('function', sa.String(length=100), nullable=True),
+        sa.Column('args', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('consumer', 'tx_id')
+    )
+
+
+def downgrade():
+    op.drop_table('ledger_dead_letter')
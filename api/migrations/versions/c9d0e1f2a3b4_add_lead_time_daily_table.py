@@ -0,0 +1,39 @@
+"""add lead time daily rollup table
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d0e1f2a3b4'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create lead_time_daily table
+    op.create_table('lead_time_daily',
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('scope', sa.String(length=10), nullable=False),
+        sa.Column('org_id', sa.String(length=100), nullable=False),
+        sa.Column('counterparty_org_id', sa.String(length=100), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('total_hours', sa.Float(), nullable=False),
+        sa.Column('histogram', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('source', 'scope', 'org_id', 'counterparty_org_id', 'day')
+    )
+    op.create_index('ix_lead_time_daily_source_scope_day', 'lead_time_daily', ['source', 'scope', 'day'])
+    op.create_index('ix_lead_time_daily_day', 'lead_time_daily', ['day'])
+
+
+def downgrade():
+    op.drop_index('ix_lead_time_daily_day', table_name='lead_time_daily')
+    op.drop_index('ix_lead_time_daily_source_scope_day', table_name='lead_time_daily')
+    op.drop_table('lead_time_daily')
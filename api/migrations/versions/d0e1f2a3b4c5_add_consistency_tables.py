@@ -0,0 +1,62 @@
+"""add volume consistency tables
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create consistency_run table
+    op.create_table('consistency_run',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('workers', sa.Integer(), nullable=False),
+        sa.Column('batches_checked', sa.Integer(), nullable=False),
+        sa.Column('batches_failed', sa.Integer(), nullable=False),
+        sa.Column('violation_count', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_by', UUID(as_uuid=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['started_by'], ['user.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Create consistency_violation table
+    op.create_table('consistency_violation',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('run_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('tx_id', sa.String(length=64), nullable=True),
+        sa.Column('tx_timestamp', sa.String(length=40), nullable=True),
+        sa.Column('org_id', sa.String(length=100), nullable=True),
+        sa.Column('counterparty_org_id', sa.String(length=100), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('expected', sa.Integer(), nullable=True),
+        sa.Column('actual', sa.Integer(), nullable=True),
+        sa.Column('detail', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['consistency_run.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_consistency_violation_run_id_batch_id_id', 'consistency_violation', ['run_id', 'batch_id', 'id'])
+    op.create_index('ix_consistency_violation_run_id_kind', 'consistency_violation', ['run_id', 'kind'])
+
+
+def downgrade():
+    op.drop_index('ix_consistency_violation_run_id_kind', table_name='consistency_violation')
+    op.drop_index('ix_consistency_violation_run_id_batch_id_id', table_name='consistency_violation')
+    op.drop_table('consistency_violation')
+    op.drop_table('consistency_run')
@@ -0,0 +1,87 @@
+"""add batch mirror tables
+
+Revision ID: d4e5f6a7b8c9
+Revises: b2c3d4e5f6g7
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e5f6a7b8c9'
+down_revision = 'b2c3d4e5f6g7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create batch table (off-chain mirror of the ledger world state)
+    op.create_table('batch',
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('product_name', sa.String(length=255), nullable=False),
+        sa.Column('manufacture_date', sa.Date(), nullable=True),
+        sa.Column('expiry_date', sa.Date(), nullable=True),
+        sa.Column('total_quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_dosage', sa.String(length=100), nullable=False),
+        sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('last_tx_id', sa.String(length=64), nullable=False),
+        sa.Column('last_block', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id')
+    )
+    op.create_index('ix_batch_product_name_batch_id', 'batch', ['product_name', 'batch_id'])
+    op.create_index('ix_batch_expiry_date_batch_id', 'batch', ['expiry_date', 'batch_id'])
+    op.create_index('ix_batch_status_batch_id', 'batch', ['status', 'batch_id'])
+
+    # Create batch_ownership table
+    op.create_table('batch_ownership',
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('org_id', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id', 'org_id'),
+        sa.ForeignKeyConstraint(['batch_id'], ['batch.batch_id'], ondelete='CASCADE')
+    )
+    op.create_index('ix_batch_ownership_org_id_batch_id', 'batch_ownership', ['org_id', 'batch_id'])
+
+    # Create batch_transfer table
+    op.create_table('batch_transfer',
+        sa.Column('tx_id', sa.String(length=64), nullable=False),
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('from_org_id', sa.String(length=100), nullable=False),
+        sa.Column('to_org_id', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('transferred_at', sa.DateTime(), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('transfer_metadata', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('tx_id'),
+        sa.ForeignKeyConstraint(['batch_id'], ['batch.batch_id'], ondelete='CASCADE')
+    )
+    op.create_index('ix_batch_transfer_batch_id_transferred_at', 'batch_transfer', ['batch_id', 'transferred_at'])
+    op.create_index('ix_batch_transfer_from_org_id_transferred_at', 'batch_transfer', ['from_org_id', 'transferred_at'])
+    op.create_index('ix_batch_transfer_to_org_id_transferred_at', 'batch_transfer', ['to_org_id', 'transferred_at'])
+
+    # Create ledger_checkpoint table
+    op.create_table('ledger_checkpoint',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('block_number', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('ledger_checkpoint')
+    op.drop_index('ix_batch_transfer_to_org_id_transferred_at', table_name='batch_transfer')
+    op.drop_index('ix_batch_transfer_from_org_id_transferred_at', table_name='batch_transfer')
+    op.drop_index('ix_batch_transfer_batch_id_transferred_at', table_name='batch_transfer')
+    op.drop_table('batch_transfer')
+    op.drop_index('ix_batch_ownership_org_id_batch_id', table_name='batch_ownership')
+    op.drop_table('batch_ownership')
+    op.drop_index('ix_batch_status_batch_id', table_name='batch')
+    op.drop_index('ix_batch_expiry_date_batch_id', table_name='batch')
+    op.drop_index('ix_batch_product_name_batch_id', table_name='batch')
+    op.drop_table('batch')
@@ -0,0 +1,58 @@
+"""add indexes for inventory, medication request and notification lookups
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f2a3b4c5d6'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate), one per repository query
+INDEXES = [
+    # InventoryRepository.find_by_organization
+    ('ix_inventory_organization_id_created_at', 'inventory',
+     ['organization_id', sa.text('created_at DESC')], None),
+    # MedicationRequestRepository.find_by_consumer
+    ('ix_medication_request_consumer_id_created_at', 'medication_request',
+     ['consumer_id', sa.text('created_at DESC')], None),
+    # MedicationRequestRepository.find_pending_requests
+    ('ix_medication_request_status_created_at', 'medication_request',
+     ['status', 'created_at'], None),
+    # MedicationRequestRepository.find_by_manufacturer
+    ('ix_medication_request_assigned_manufacturer_id_created_at', 'medication_request',
+     ['assigned_manufacturer_id', sa.text('created_at DESC')], None),
+    # NotificationRepository.find_by_user
+    ('ix_notification_user_id_created_at', 'notification',
+     ['user_id', sa.text('created_at DESC')], None),
+    # NotificationRepository.find_by_user(unread_only=True) and mark_all_as_read
+    ('ix_notification_user_id_unread_created_at', 'notification',
+     ['user_id', sa.text('created_at DESC')], sa.text('is_read = false')),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY does not lock out writes, but cannot run in a
+    # transaction. A build that fails leaves an INVALID index behind, so each
+    # one is dropped first in case this migration is being retried.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, postgresql_where=where, sqlite_where=where,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
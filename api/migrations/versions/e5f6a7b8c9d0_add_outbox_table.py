@@ -0,0 +1,46 @@
+"""add outbox table
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f6a7b8c9d0'
+down_revision = 'd4e5f6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create outbox table
+    op.create_table('outbox',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('operation', sa.String(length=50), nullable=False),
+        sa.Column('aggregate_id', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', UUID(as_uuid=True), nullable=True),
+        sa.Column('created_by', UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('operation', 'aggregate_id', name='uq_outbox_operation_aggregate_id'),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id'])
+    )
+    op.create_index('ix_outbox_status_next_attempt_at', 'outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_outbox_status_next_attempt_at', table_name='outbox')
+    op.drop_table('outbox')
@@ -0,0 +1,38 @@
+"""add inventory product search indexes
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e1f2a3b4c5d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    if postgresql:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Built CONCURRENTLY like the other lookup indexes (see e1f2a3b4c5d6)
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_inventory_product_name_trgm', table_name='inventory', if_exists=True, postgresql_concurrently=True)
+        op.create_index(
+            'ix_inventory_product_name_trgm', 'inventory', ['product_name'],
+            postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'}, postgresql_concurrently=True,
+        )
+        # Incremental refresh of the autocomplete index
+        op.drop_index('ix_inventory_updated_at', table_name='inventory', if_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_inventory_updated_at', 'inventory', ['updated_at'], postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_inventory_updated_at', table_name='inventory', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_inventory_product_name_trgm', table_name='inventory', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,64 @@
+"""add reconciliation tables
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create reconciliation_run table
+    op.create_table('reconciliation_run',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('batches_checked', sa.Integer(), nullable=False),
+        sa.Column('discrepancy_count', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_by', UUID(as_uuid=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['started_by'], ['user.id'])
+    )
+
+    # Create reconciliation_discrepancy table
+    op.create_table('reconciliation_discrepancy',
+        sa.Column('id', UUID(as_uuid=True), nullable=False),
+        sa.Column('run_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('org_id', sa.String(length=100), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('ledger_quantity', sa.Integer(), nullable=True),
+        sa.Column('inventory_quantity', sa.Integer(), nullable=True),
+        sa.Column('difference', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'batch_id', 'org_id', name='uq_reconciliation_discrepancy_run_batch_org'),
+        sa.ForeignKeyConstraint(['run_id'], ['reconciliation_run.id'], ondelete='CASCADE')
+    )
+    op.create_index('ix_reconciliation_discrepancy_run_id_kind', 'reconciliation_discrepancy', ['run_id', 'kind', 'batch_id', 'org_id'])
+
+    # The reconciliation walks inventory in batch_id order. inventory is live,
+    # so the index is built concurrently (outside a transaction, dropped
+    # first in case a failed build left an INVALID index behind)
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_inventory_batch_id', table_name='inventory', if_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_inventory_batch_id', 'inventory', ['batch_id'], postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_inventory_batch_id', table_name='inventory', if_exists=True, postgresql_concurrently=True)
+    op.drop_index('ix_reconciliation_discrepancy_run_id_kind', table_name='reconciliation_discrepancy')
+    op.drop_table('reconciliation_discrepancy')
+    op.drop_table('reconciliation_run')
@@ -0,0 +1,76 @@
+"""
+Script to drain the outbox after an outage.
+Runs a dispatcher with many workers until no due entries are left.
+Use --requeue-failed to give entries that exhausted their attempts another try.
+"""
+
+import argparse
+import sys
+import time
+from app import create_app
+from config.fabric_config import build_outbox_dispatcher
+from src.repositories.outbox_repository import OutboxRepository, READY_STATUSES
+
+
+def main():
+    """Main function to run the outbox replay."""
+    parser = argparse.ArgumentParser(description="Drain the transactional outbox")
+    parser.add_argument("--workers", type=int, default=8, help="dispatcher threads")
+    parser.add_argument("--batch-size", type=int, default=200, help="entries leased per worker round")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="chaincode submits in flight per worker")
+    parser.add_argument("--requeue-failed", action="store_true", help="retry entries that exhausted their attempts")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("OUTBOX REPLAY")
+    print("="*60)
+
+    app = create_app()
+    repository = OutboxRepository()
+
+    with app.app_context():
+        try:
+            if args.requeue_failed:
+                print(f"✓ Requeued {repository.requeue_failed()} failed entries")
+
+            before = repository.count_by_status()
+            backlog = sum(before.get(status, 0) for status in READY_STATUSES)
+            print(f"Backlog: {backlog} entries {before}")
+
+            dispatcher = build_outbox_dispatcher(
+                app,
+                workers=args.workers,
+                batch_size=args.batch_size,
+                max_in_flight=args.max_in_flight,
+                poll_interval=0.5,
+            )
+            started = time.perf_counter()
+            dispatcher.start()
+
+            # Entries waiting for a retry backoff keep the backlog non-empty;
+            # stop once a whole poll passes without any work being done
+            idle_rounds = 0
+            last_processed = 0
+            while idle_rounds < 3:
+                time.sleep(1)
+                idle_rounds = idle_rounds + 1 if dispatcher.processed == last_processed else 0
+                last_processed = dispatcher.processed
+                elapsed = time.perf_counter() - started
+                print(f"  {dispatcher.processed} processed ({dispatcher.processed / elapsed:.1f}/s)", end="\r")
+
+            dispatcher.stop()
+            elapsed = time.perf_counter() - started
+
+            after = repository.count_by_status()
+            print(f"\n✓ Processed {dispatcher.processed} entries in {elapsed:.1f}s: {after}")
+            return 0 if not after.get('failed') else 1
+
+        except Exception as e:
+            print(f"\n✗ Error during replay: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Script to reconcile inventory quantities with ledger ownerships.
+Runs in the foreground and prints a summary of the discrepancies found.
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from app import create_app
+from config.fabric_config import get_fabric_client
+from src.models.reconciliation_model import ReconciliationDiscrepancy
+from src.repositories.reconciliation_repository import ReconciliationRepository
+from src.services.reconciliation_service import Reconciler, RECONCILIATION_CHUNK_SIZE, RECONCILIATION_MAX_IN_FLIGHT
+
+
+def main():
+    """Main function to run the reconciliation."""
+    parser = argparse.ArgumentParser(description="Reconcile inventory with the ledger")
+    parser.add_argument("--chunk-size", type=int, default=RECONCILIATION_CHUNK_SIZE, help="batches per chunk")
+    parser.add_argument("--max-in-flight", type=int, default=RECONCILIATION_MAX_IN_FLIGHT, help="concurrent getBatch queries")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("LEDGER / INVENTORY RECONCILIATION")
+    print("="*60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            repository = ReconciliationRepository()
+            run = repository.create_run()
+            reconciler = Reconciler(get_fabric_client(), chunk_size=args.chunk_size, max_in_flight=args.max_in_flight)
+
+            started = time.perf_counter()
+            run = reconciler.run(run)
+            elapsed = time.perf_counter() - started
+
+            if run.status != 'completed':
+                print(f"✗ Run {run.id} failed after {run.batches_checked} batches: {run.error}")
+                return 1
+
+            kinds = Counter(kind for (kind,) in ReconciliationDiscrepancy.query.with_entities(
+                ReconciliationDiscrepancy.kind).filter_by(run_id=run.id))
+            print(f"✓ Run {run.id}: {run.batches_checked} batches in {elapsed:.1f}s "
+                  f"({run.batches_checked / elapsed:.0f}/s)")
+            print(f"✓ {run.discrepancy_count} discrepancies {dict(kinds)}")
+            return 0
+
+        except Exception as e:
+            print(f"\n✗ Error during reconciliation: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
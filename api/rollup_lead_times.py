@@ -0,0 +1,44 @@
+"""
+Script to refresh the daily lead-time rollups behind /analytics/lead-times.
+Meant to run from cron; each run only recomputes the most recent days.
+Use --full to rebuild every day from the whole history.
+"""
+
+import argparse
+import sys
+import time
+from app import create_app
+from src.services.lead_time_service import refresh_lead_time_rollups
+
+
+def main():
+    """Main function to run the rollup."""
+    parser = argparse.ArgumentParser(description="Refresh the lead-time rollups")
+    parser.add_argument("--full", action="store_true", help="recompute every day, not only the latest ones")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("LEAD-TIME ROLLUP")
+    print("="*60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            started = time.perf_counter()
+            result = refresh_lead_time_rollups(full=args.full)
+            elapsed = time.perf_counter() - started
+
+            print(f"✓ Rolled up {result['lead_times']} lead times since {result['since'] or 'the beginning'} "
+                  f"into {result['rollup_rows']} rows in {elapsed:.1f}s")
+            return 0
+
+        except Exception as e:
+            print(f"\n✗ Error during rollup: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,7 @@
 """
 Mock data for inventory table.
 """
+from datetime import date
 
 
 def get_inventory_data(organizations):
@@ -25,8 +26,8 @@ def get_inventory_data(organizations):
             'available_quantity': 10000,
             'reserved_quantity': 500,
             'unit_dosage': '500mg',
-            'manufacture_date': '2024-01-15',
-            'expiry_date': '2026-01-15',
+            'manufacture_date': date(2024, 1, 15),
+            'expiry_date': date(2026, 1, 15),
             'unit_price': 2.50,
             'status': 'available'
         },
@@ -37,8 +38,8 @@ def get_inventory_data(organizations):
             'available_quantity': 15000,
             'reserved_quantity': 200,
             'unit_dosage': '400mg',
-            'manufacture_date': '2024-02-20',
-            'expiry_date': '2026-02-20',
+            'manufacture_date': date(2024, 2, 20),
+            'expiry_date': date(2026, 2, 20),
             'unit_price': 1.75,
             'status': 'available'
         },
@@ -49,8 +50,8 @@ def get_inventory_data(organizations):
             'available_quantity': 8000,
             'reserved_quantity': 1000,
             'unit_dosage': '850mg',
-            'manufacture_date': '2024-03-10',
-            'expiry_date': '2026-03-10',
+            'manufacture_date': date(2024, 3, 10),
+            'expiry_date': date(2026, 3, 10),
             'unit_price': 3.20,
             'status': 'available'
         },
@@ -62,8 +63,8 @@ def get_inventory_data(organizations):
             'available_quantity': 12000,
             'reserved_quantity': 300,
             'unit_dosage': '20mg',
-            'manufacture_date': '2024-01-25',
-            'expiry_date': '2026-01-25',
+            'manufacture_date': date(2024, 1, 25),
+            'expiry_date': date(2026, 1, 25),
             'unit_price': 4.50,
             'status': 'available'
         },
@@ -74,8 +75,8 @@ def get_inventory_data(organizations):
             'available_quantity': 9000,
             'reserved_quantity': 600,
             'unit_dosage': '10mg',
-            'manufacture_date': '2024-02-15',
-            'expiry_date': '2026-02-15',
+            'manufacture_date': date(2024, 2, 15),
+            'expiry_date': date(2026, 2, 15),
             'unit_price': 2.80,
             'status': 'available'
         },
@@ -86,8 +87,8 @@ def get_inventory_data(organizations):
             'available_quantity': 500,
             'reserved_quantity': 100,
             'unit_dosage': '20mg',
-            'manufacture_date': '2024-03-05',
-            'expiry_date': '2026-03-05',
+            'manufacture_date': date(2024, 3, 5),
+            'expiry_date': date(2026, 3, 5),
             'unit_price': 3.75,
             'status': 'low_stock'
         },
@@ -98,8 +99,8 @@ def get_inventory_data(organizations):
             'available_quantity': 0,
             'reserved_quantity': 0,
             'unit_dosage': '50mcg',
-            'manufacture_date': '2024-04-01',
-            'expiry_date': '2026-04-01',
+            'manufacture_date': date(2024, 4, 1),
+            'expiry_date': date(2026, 4, 1),
             'unit_price': 5.20,
             'status': 'out_of_stock'
         }
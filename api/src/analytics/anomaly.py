@@ -0,0 +1,133 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Consistency constant: 1.4826 * MAD estimates the standard deviation of normal data
+_MAD_SCALE = 1.4826
+# Score reported when a feature that never varied suddenly does
+MAX_SCORE = 100.0
+
+
+class RingBuffer:
+    """
+    The last ``capacity`` feature vectors of one key, in a preallocated
+    float32 array. Median and MAD are cached and only recomputed every
+    ``refresh_every`` pushes, which keeps scoring cheap on busy keys.
+    """
+
+    __slots__ = ("values", "size", "position", "_min_scale", "_pushes", "_refresh_every", "_median", "_inverse_scale")
+
+    def __init__(self, capacity: int, features: int, min_scale: Optional[np.ndarray] = None,
+                 refresh_every: int = 8) -> None:
+        self.values = np.empty((capacity, features), dtype=np.float32)
+        self.size = 0
+        self.position = 0
+        self._min_scale = min_scale if min_scale is not None else np.full(features, 1e-6, dtype=np.float32)
+        self._pushes = 0
+        self._refresh_every = refresh_every
+        self._median: Optional[np.ndarray] = None
+        self._inverse_scale: Optional[np.ndarray] = None
+
+    def push(self, row: np.ndarray) -> None:
+        self.values[self.position] = row
+        self.position = (self.position + 1) % len(self.values)
+        self.size = min(self.size + 1, len(self.values))
+        self._pushes += 1
+        if self._pushes >= self._refresh_every:
+            self._median = None
+
+    def robust_stats(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the per-feature median and the inverse of the robust scale
+        (MAD based, falling back to the mean absolute deviation when more
+        than half the values are identical), floored at the feature's
+        ``min_scale`` so differences too small to matter never score high.
+        """
+        if self._median is None:
+            window = self.values[:self.size]
+            median = np.median(window, axis=0)
+            deviation = np.abs(window - median)
+            scale = _MAD_SCALE * np.median(deviation, axis=0)
+            flat = scale == 0
+            if flat.any():
+                scale[flat] = 1.2533 * deviation[:, flat].mean(axis=0)
+            self._median = median
+            self._inverse_scale = 1.0 / np.maximum(scale, self._min_scale)
+            self._pushes = 0
+        return self._median, self._inverse_scale
+
+
+class RobustZScoreDetector:
+    """
+    Incremental outlier scoring over rolling windows.
+
+    Each event is compared with the recent history of every key it belongs
+    to (e.g. its organization and its route): the score is the largest
+    absolute robust z-score of any feature in any window holding at least
+    ``min_samples`` events. The event is then added to those windows, so
+    the model adapts as distribution patterns drift. ``min_scale`` gives
+    each feature the smallest spread treated as meaningful.
+    """
+
+    def __init__(self, feature_names: Sequence[str], window: int = 256, min_samples: int = 30,
+                 threshold: float = 4.0, min_scale: Optional[Sequence[float]] = None) -> None:
+        self.feature_names = list(feature_names)
+        self.min_scale = np.asarray(min_scale if min_scale is not None else [1e-6] * len(feature_names), dtype=np.float32)
+        self.window = window
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self._buffers: Dict[Hashable, RingBuffer] = {}
+
+    def _buffer(self, key: Hashable) -> RingBuffer:
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = RingBuffer(self.window, len(self.feature_names), self.min_scale)
+        return buffer
+
+    def score(self, keys: Sequence[Hashable], features: Sequence[float]) -> Tuple[float, List[dict]]:
+        """
+        Scores one event without learning from it. Returns the score and the
+        feature/window pairs above the threshold.
+        """
+        row = np.asarray(features, dtype=np.float32)
+        best = 0.0
+        reasons = []
+
+        for key in keys:
+            buffer = self._buffers.get(key)
+            if buffer is None or buffer.size < self.min_samples:
+                continue
+
+            median, inverse_scale = buffer.robust_stats()
+            z = np.minimum(np.abs(row - median) * inverse_scale, MAX_SCORE)
+
+            top = float(z.max())
+            best = max(best, top)
+            if top <= self.threshold:
+                continue
+            for index in np.flatnonzero(z > self.threshold):
+                reasons.append({
+                    "window": key if isinstance(key, str) else "/".join(map(str, key)),
+                    "feature": self.feature_names[index],
+                    "value": round(float(row[index]), 4),
+                    "median": round(float(median[index]), 4),
+                    "z": round(float(z[index]), 2),
+                })
+        return best, reasons
+
+    def update(self, keys: Sequence[Hashable], features: Sequence[float]) -> None:
+        row = np.asarray(features, dtype=np.float32)
+        for key in keys:
+            self._buffer(key).push(row)
+
+    def observe(self, keys: Sequence[Hashable], features: Sequence[float]) -> Tuple[float, List[dict]]:
+        """
+        Scores the event, then learns from it.
+        """
+        result = self.score(keys, features)
+        self.update(keys, features)
+        return result
+
+    @property
+    def tracked_keys(self) -> int:
+        return len(self._buffers)
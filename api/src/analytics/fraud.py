@@ -0,0 +1,56 @@
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FRAUD_FEATURES = ("log_quantity", "batch_share", "log_hours_since_previous_step")
+TRANSFER_COLUMNS = ["quantity", "total_quantity", "transferred_at", "previous_step_at"]
+
+
+def transfer_frame(records: Iterable, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Builds a frame of transfer records (dicts, or tuples named by
+    ``columns``) with the columns the features need; missing fields become
+    NaN/NaT instead of failing the whole batch.
+    """
+    frame = pd.DataFrame.from_records(list(records), columns=columns)
+    frame = frame.reindex(columns=list(frame.columns) + [c for c in TRANSFER_COLUMNS if c not in frame.columns])
+    frame["quantity"] = pd.to_numeric(frame["quantity"], errors="coerce")
+    frame["total_quantity"] = pd.to_numeric(frame["total_quantity"], errors="coerce")
+    frame["transferred_at"] = pd.to_datetime(frame["transferred_at"], errors="coerce", utc=True, format="ISO8601")
+    frame["previous_step_at"] = pd.to_datetime(frame["previous_step_at"], errors="coerce", utc=True, format="ISO8601")
+    return frame
+
+
+def with_previous_steps(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fills ``previous_step_at`` for transfer histories: the previous transfer
+    of the same batch, or the batch's ``created_at`` for the first one.
+    """
+    frame = frame.sort_values(["batch_id", "transferred_at"], kind="stable")
+    previous = frame.groupby("batch_id", sort=False)["transferred_at"].shift(1)
+    created_at = pd.to_datetime(frame["created_at"], errors="coerce", utc=True)
+    frame["previous_step_at"] = previous.fillna(created_at)
+    return frame
+
+
+def transfer_features(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Computes the FRAUD_FEATURES matrix for every row at once: the quantity
+    moved (log scale), its share of the batch, and the hours since the
+    batch's previous custody step (log scale). Returns float64 of shape
+    ``(len(frame), len(FRAUD_FEATURES))``; rows with a missing quantity are
+    NaN and must be dropped by the caller.
+    """
+    quantity = frame["quantity"].to_numpy(dtype=np.float64, na_value=np.nan)
+    total = frame["total_quantity"].to_numpy(dtype=np.float64, na_value=np.nan)
+    held = (frame["transferred_at"] - frame["previous_step_at"]).dt.total_seconds().to_numpy(
+        dtype=np.float64, na_value=0.0
+    )
+
+    features = np.empty((len(frame), len(FRAUD_FEATURES)), dtype=np.float64)
+    features[:, 0] = np.log1p(np.maximum(quantity, 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        features[:, 1] = np.where(total > 0, quantity / total, 0.0)
+    features[:, 2] = np.log1p(np.maximum(held, 0) / 3600)
+    return features
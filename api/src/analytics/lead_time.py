@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.fraud import transfer_frame, with_previous_steps
+
+# Log-spaced bucket edges in hours, 6 minutes to a year: each bucket spans
+# ~13%, so quantiles read from merged histograms are within ~6%
+BUCKET_EDGES = np.geomspace(0.1, 24 * 365, 96)
+BUCKETS = len(BUCKET_EDGES) + 1
+KEYS = ["source", "scope", "org_id", "counterparty_org_id"]
+
+
+def transfer_lead_times(rows, columns) -> pd.DataFrame:
+    """
+    Lead time of every transfer: the hours between the batch's previous
+    custody step and the transfer, keyed per route and per sending
+    organization (how long it held the batch).
+    """
+    frame = with_previous_steps(transfer_frame(rows, columns=columns))
+    hours = (frame["transferred_at"] - frame["previous_step_at"]).dt.total_seconds() / 3600
+    frame = pd.DataFrame({
+        "org_id": frame["from_org_id"],
+        "counterparty_org_id": frame["to_org_id"],
+        "day": frame["transferred_at"].dt.date,
+        "hours": hours.clip(lower=0),
+    }).dropna(subset=["hours", "day"])
+
+    routes = frame.assign(source="transfer", scope="route")
+    organizations = frame.assign(source="transfer", scope="org", counterparty_org_id="")
+    return pd.concat([routes, organizations], ignore_index=True)
+
+
+def request_lead_times(rows, columns) -> pd.DataFrame:
+    """
+    Lead time of every delivered medication request: the hours from its
+    approval to its delivery, keyed per assigned manufacturer.
+    """
+    frame = pd.DataFrame.from_records(list(rows), columns=columns)
+    approved_at = pd.to_datetime(frame["approved_at"], utc=True)
+    delivered_at = pd.to_datetime(frame["delivered_at"], utc=True)
+    frame = pd.DataFrame({
+        "source": "request",
+        "scope": "org",
+        "org_id": frame["assigned_manufacturer_id"].astype(str),
+        "counterparty_org_id": "",
+        "day": delivered_at.dt.date,
+        "hours": ((delivered_at - approved_at).dt.total_seconds() / 3600).clip(lower=0),
+    })
+    return frame.dropna(subset=["hours", "day"])
+
+
+def daily_rollup(lead_times: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates lead times into one row per key and day with the count, the
+    summed hours and a BUCKETS-long histogram, all in one pass: every row is
+    mapped to ``group * BUCKETS + bucket`` and counted with ``np.bincount``.
+    """
+    if lead_times.empty:
+        return pd.DataFrame(columns=KEYS + ["day", "count", "total_hours", "histogram"])
+
+    grouped = lead_times.groupby(KEYS + ["day"], sort=False)
+    group = grouped.ngroup().to_numpy()
+    bucket = np.searchsorted(BUCKET_EDGES, lead_times["hours"].to_numpy(), side="right")
+    histograms = np.bincount(group * BUCKETS + bucket, minlength=grouped.ngroups * BUCKETS)
+
+    rollup = grouped["hours"].agg(count="size", total_hours="sum").reset_index()
+    rollup["histogram"] = list(histograms.reshape(grouped.ngroups, BUCKETS))
+    return rollup
+
+
+def histogram_quantiles(histograms: np.ndarray, quantiles) -> np.ndarray:
+    """
+    Reads quantiles off rows of histograms, interpolating geometrically
+    within the bucket that holds each one. Returns shape (rows, quantiles).
+    """
+    lower = np.concatenate([[BUCKET_EDGES[0] / 2], BUCKET_EDGES])
+    upper = np.concatenate([BUCKET_EDGES, [BUCKET_EDGES[-1] * 2]])
+
+    cumulative = np.cumsum(histograms, axis=1)
+    totals = cumulative[:, -1:]
+    result = np.empty((len(histograms), len(quantiles)))
+    for column, quantile in enumerate(quantiles):
+        rank = quantile * totals
+        bucket = np.minimum((cumulative < rank).sum(axis=1), BUCKETS - 1)
+        below = np.take_along_axis(cumulative, bucket[:, None], axis=1) - np.take_along_axis(
+            histograms, bucket[:, None], axis=1
+        )
+        inside = np.take_along_axis(histograms, bucket[:, None], axis=1)
+        fraction = np.clip((rank - below) / np.maximum(inside, 1), 0, 1)[:, 0]
+        result[:, column] = lower[bucket] * (upper[bucket] / lower[bucket]) ** fraction
+    result[totals[:, 0] == 0] = np.nan
+    return result
+
+
+def summarize(rollup: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merges daily rollup rows per key: count, mean, median and p95 hours,
+    and the trend as the count-weighted least-squares slope of the daily
+    mean (hours per day; positive means lead times are growing).
+    """
+    if rollup.empty:
+        return pd.DataFrame(columns=KEYS + ["count", "mean_hours", "median_hours", "p95_hours", "trend_hours_per_day"])
+
+    rollup = rollup.sort_values(KEYS + ["day"], kind="stable").reset_index(drop=True)
+    group = rollup.groupby(KEYS, sort=False).ngroup().to_numpy()
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+
+    histograms = np.add.reduceat(np.stack(rollup["histogram"].to_numpy()).astype(np.int64), starts, axis=0)
+    count = rollup["count"].to_numpy(dtype=np.float64)
+    total = rollup["total_hours"].to_numpy(dtype=np.float64)
+
+    # Weighted regression of each day's mean on its day number, per key
+    x = pd.to_datetime(rollup["day"]).to_numpy().astype("datetime64[D]").astype(np.float64)
+    y = total / np.maximum(count, 1)
+    weight_sum = np.add.reduceat(count, starts)
+    x_mean = np.add.reduceat(count * x, starts) / weight_sum
+    y_mean = np.add.reduceat(total, starts) / weight_sum
+    dx = x - x_mean[group]
+    covariance = np.add.reduceat(count * dx * (y - y_mean[group]), starts)
+    variance = np.add.reduceat(count * dx * dx, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trend = np.where(variance > 0, covariance / variance, 0.0)
+
+    quantiles = histogram_quantiles(histograms, (0.5, 0.95))
+    summary = rollup.loc[starts, KEYS].reset_index(drop=True)
+    summary["count"] = weight_sum.astype(np.int64)
+    summary["mean_hours"] = y_mean
+    summary["median_hours"] = quantiles[:, 0]
+    summary["p95_hours"] = quantiles[:, 1]
+    summary["trend_hours_per_day"] = trend
+    return summary
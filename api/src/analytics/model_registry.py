@@ -0,0 +1,152 @@
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import joblib
+import numpy as np
+
+CURRENT_FILE = "CURRENT"
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    One published model version. ``threshold`` is on the scale returned by
+    ``score``: higher scores are more suspicious.
+    """
+
+    version: str
+    estimator: object
+    features: Sequence[str]
+    threshold: float
+    metadata: dict = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.time)
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """
+        Scores a whole feature matrix in one call: the positive class
+        probability for classifiers, the negated ``score_samples`` for
+        outlier detectors such as IsolationForest.
+        """
+        if hasattr(self.estimator, "predict_proba"):
+            return self.estimator.predict_proba(features)[:, 1]
+        return -self.estimator.score_samples(features)
+
+
+class ModelRegistry:
+    """
+    Versioned joblib artifacts in one directory, loaded memory-mapped.
+
+    Each version is ``<directory>/<version>.joblib``; the ``CURRENT`` file
+    names the one to serve. Artifacts are loaded with ``mmap_mode="r"``, so
+    the estimator's numpy arrays stay in the page cache and every worker
+    process mapping the same file shares one copy. Structures sklearn copies
+    into its own buffers on load (the Cython trees of forest models) are
+    shared by loading in the master before forking instead, as they are
+    never written afterwards. ``current()`` checks ``CURRENT`` at most every
+    ``reload_interval`` seconds and swaps in a newly published version
+    without a restart; requests in flight keep the model they started with.
+    """
+
+    def __init__(self, directory: str, reload_interval: float = 10.0) -> None:
+        self.directory = directory
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._model: Optional[LoadedModel] = None
+        self._checked_at = 0.0
+        self._last_error: Optional[str] = None
+
+    def _path(self, version: str) -> str:
+        return os.path.join(self.directory, f"{version}.joblib")
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as current:
+                return current.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def load(self, version: str) -> LoadedModel:
+        bundle = joblib.load(self._path(version), mmap_mode="r")
+        return LoadedModel(
+            version=version,
+            estimator=bundle["estimator"],
+            features=tuple(bundle["features"]),
+            threshold=float(bundle["threshold"]),
+            metadata=bundle.get("metadata") or {},
+        )
+
+    def reload(self) -> Optional[LoadedModel]:
+        """
+        Loads the version named by ``CURRENT`` if it is not the one being
+        served. A broken artifact is reported and the previous model kept.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            version = self._current_version()
+            if version is None or (self._model is not None and self._model.version == version):
+                return self._model
+            try:
+                self._model = self.load(version)
+                self._last_error = None
+            except Exception as e:
+                self._last_error = f"Could not load model {version}: {str(e)}"
+                print(f"Warning: {self._last_error}")
+            return self._model
+
+    def current(self) -> Optional[LoadedModel]:
+        """
+        Returns the model to serve, or None if none was ever published.
+        """
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            return self.reload()
+        return self._model
+
+    def publish(self, estimator, features: Sequence[str], threshold: float, version: str,
+                metadata: Optional[dict] = None) -> str:
+        """
+        Writes a new version and points ``CURRENT`` at it. Artifacts are
+        stored uncompressed (memory mapping needs raw arrays) and both files
+        are replaced atomically, so readers never see a partial write.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        bundle = {
+            "estimator": estimator,
+            "features": list(features),
+            "threshold": float(threshold),
+            "metadata": metadata or {},
+        }
+        self._write_atomic(self._path(version), lambda path: joblib.dump(bundle, path, compress=0))
+
+        def write_current(path):
+            with open(path, "w") as current:
+                current.write(version)
+
+        self._write_atomic(os.path.join(self.directory, CURRENT_FILE), write_current)
+        return version
+
+    def _write_atomic(self, path: str, write) -> None:
+        handle, temporary = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        os.close(handle)
+        try:
+            write(temporary)
+            os.replace(temporary, path)
+        except Exception:
+            os.unlink(temporary)
+            raise
+
+    def stats(self) -> dict:
+        model = self._model
+        return {
+            "directory": self.directory,
+            "version": model.version if model else None,
+            "features": list(model.features) if model else None,
+            "threshold": model.threshold if model else None,
+            "metadata": model.metadata if model else None,
+            "loaded_at": model.loaded_at if model else None,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,76 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+KEYS = ["batch_id", "org_id"]
+DISCREPANCY_COLUMNS = KEYS + ["kind", "ledger_quantity", "inventory_quantity", "difference"]
+
+
+def ledger_frame(records: Iterable[tuple]) -> pd.DataFrame:
+    """
+    Builds the ledger side from ``(batch_id, org_id, quantity)`` ownerships.
+    """
+    frame = pd.DataFrame.from_records(list(records), columns=KEYS + ["ledger_quantity"])
+    return frame.astype({"ledger_quantity": "int64"})
+
+
+def inventory_frame(records: Iterable[tuple]) -> pd.DataFrame:
+    """
+    Builds the inventory side from ``(batch_id, org_id, available, reserved)``
+    rows; an organization holding a batch in several rows counts once.
+    """
+    frame = pd.DataFrame.from_records(list(records), columns=KEYS + ["available", "reserved"])
+    frame["inventory_quantity"] = frame["available"].astype("int64") + frame["reserved"].astype("int64")
+    return frame.groupby(KEYS, as_index=False, sort=False)["inventory_quantity"].sum()
+
+
+def diff_quantities(ledger: pd.DataFrame, inventory: pd.DataFrame, missing_batches=(), failed_batches=()) -> pd.DataFrame:
+    """
+    Outer-joins both sides on (batch_id, org_id) and returns the rows whose
+    quantities disagree, classified by ``kind``:
+
+    - ``missing_on_ledger``: inventory for a batch the ledger does not know
+    - ``ledger_error``: the batch could not be read from the ledger
+    - ``missing_in_inventory``: a ledger ownership with no inventory row
+    - ``not_owned_on_ledger``: inventory for an organization owning none of the batch
+    - ``quantity_mismatch``: both sides exist with different quantities
+
+    ``difference`` is inventory minus ledger, missing sides counting as 0.
+    """
+    merged = ledger.merge(inventory, on=KEYS, how="outer")
+
+    ledger_quantity = merged["ledger_quantity"].to_numpy(dtype="float64")
+    inventory_quantity = merged["inventory_quantity"].to_numpy(dtype="float64")
+    on_ledger = ~np.isnan(ledger_quantity)
+    in_inventory = ~np.isnan(inventory_quantity)
+
+    difference = np.nan_to_num(inventory_quantity) - np.nan_to_num(ledger_quantity)
+    missing = merged["batch_id"].isin(missing_batches).to_numpy()
+    failed = merged["batch_id"].isin(failed_batches).to_numpy()
+
+    kind = np.select(
+        [missing, failed, ~in_inventory, ~on_ledger],
+        ["missing_on_ledger", "ledger_error", "missing_in_inventory", "not_owned_on_ledger"],
+        default="quantity_mismatch",
+    )
+    mask = (difference != 0) | missing | failed
+
+    result = pd.DataFrame({
+        "batch_id": merged["batch_id"].to_numpy()[mask],
+        "org_id": merged["org_id"].to_numpy()[mask],
+        "kind": kind[mask],
+        "ledger_quantity": pd.array(np.where(on_ledger, ledger_quantity, np.nan)[mask], dtype="Int64"),
+        "inventory_quantity": pd.array(np.where(in_inventory, inventory_quantity, np.nan)[mask], dtype="Int64"),
+        "difference": difference[mask].astype("int64"),
+    })
+    return result[DISCREPANCY_COLUMNS]
+
+
+def to_records(frame: pd.DataFrame) -> list:
+    """
+    Converts a discrepancy frame to plain dicts (None for missing sides)
+    ready for a bulk insert.
+    """
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict("records")
@@ -0,0 +1,126 @@
+import hashlib
+import io
+import math
+
+import numpy as np
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(value: str) -> int:
+    """
+    Stable 64-bit hash (the same in every process, unlike ``hash``).
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _to_bytes(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _from_bytes(payload: bytes) -> np.ndarray:
+    return np.load(io.BytesIO(payload), allow_pickle=False)
+
+
+class CountMinSketch:
+    """
+    Approximate per-key counters in ``depth x width`` cells. Estimates never
+    undercount; with width ``e / epsilon`` and depth ``ln(1 / delta)`` they
+    overcount by more than ``epsilon * total`` with probability ``delta``.
+    """
+
+    def __init__(self, width: int = 2 ** 16, depth: int = 4, table: np.ndarray = None) -> None:
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    def _columns(self, key_hash: int) -> np.ndarray:
+        # Kirsch-Mitzenmacher double hashing: depth indexes from one 64-bit hash
+        low, high = key_hash & 0xFFFFFFFF, (key_hash >> 32) | 1
+        return (low + self._rows * high) % self.width
+
+    def add(self, key_hash: int, count: int = 1) -> int:
+        """
+        Counts ``key_hash`` and returns its new estimate.
+        """
+        columns = self._columns(key_hash)
+        self.table[self._rows, columns] += count
+        return int(self.table[self._rows, columns].min())
+
+    def add_many(self, key_hashes: np.ndarray) -> np.ndarray:
+        """
+        Counts every hash in ``key_hashes`` (uint64, repeats allowed) and
+        returns the estimate of each after all of them were added.
+        """
+        low = key_hashes & np.uint64(0xFFFFFFFF)
+        high = (key_hashes >> np.uint64(32)) | np.uint64(1)
+        columns = (low[None, :] + self._rows.astype(np.uint64)[:, None] * high[None, :]) % np.uint64(self.width)
+        rows = np.broadcast_to(self._rows[:, None], columns.shape)
+        np.add.at(self.table, (rows, columns.astype(np.int64)), 1)
+        return self.table[rows, columns.astype(np.int64)].min(axis=0)
+
+    def estimate(self, key_hash: int) -> int:
+        return int(self.table[self._rows, self._columns(key_hash)].min())
+
+    def merge(self, other: "CountMinSketch") -> None:
+        self.table += other.table
+
+    def clear(self) -> None:
+        self.table[:] = 0
+
+    def to_bytes(self) -> bytes:
+        return _to_bytes(self.table)
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "CountMinSketch":
+        table = _from_bytes(payload)
+        return cls(width=table.shape[1], depth=table.shape[0], table=table)
+
+
+class HyperLogLog:
+    """
+    Distinct-count estimate in ``2 ** precision`` one-byte registers
+    (standard error about ``1.04 / sqrt(2 ** precision)``). Merging is a
+    register-wise max, so it can be repeated safely.
+    """
+
+    def __init__(self, precision: int = 8, registers: np.ndarray = None) -> None:
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, key_hash: int) -> bool:
+        """
+        Adds ``key_hash``; returns whether a register changed.
+        """
+        index = key_hash >> (64 - self.precision)
+        remaining = (key_hash << self.precision) & _MASK64
+        rank = min(64 - remaining.bit_length() + 1, 64 - self.precision + 1)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is far more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def to_bytes(self) -> bytes:
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "HyperLogLog":
+        registers = np.frombuffer(payload, dtype=np.uint8).copy()
+        return cls(precision=int(registers.size).bit_length() - 1, registers=registers)
@@ -0,0 +1,215 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+# Dijkstra ignores zero-weight edges, so instant hand-offs still cost a little
+MIN_LEAD_TIME_HOURS = 1e-3
+WEIGHTS = ("hops", "lead_time")
+
+
+class TransferGraph:
+    """
+    Directed organization-to-organization transfer graph.
+
+    Edges live in parallel numpy arrays (source, target, transfers, volume,
+    summed lead time in hours), indexed by a dict from (source, target) to
+    position, so recording a transfer on a known edge is an O(1) in-place
+    update. The CSR adjacency in both directions (edge positions ordered by
+    source, resp. target) is only rebuilt when an edge or an organization
+    is added; queries gather the weight they need through it and run
+    scipy's csgraph routines on the result.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._lock = threading.RLock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._edges: Dict[Tuple[int, int], int] = {}
+
+        self._source = np.empty(capacity, dtype=np.int32)
+        self._target = np.empty(capacity, dtype=np.int32)
+        self._transfers = np.zeros(capacity, dtype=np.int64)
+        self._volume = np.zeros(capacity, dtype=np.int64)
+        self._lead_hours = np.zeros(capacity, dtype=np.float64)
+        self._size = 0
+
+        self._forward: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._backward: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # --------------------------------------------------------
+    # Updates
+    # --------------------------------------------------------
+    def _node(self, org_id: str) -> int:
+        node = self._ids.get(org_id)
+        if node is None:
+            node = self._ids[org_id] = len(self._names)
+            self._names.append(org_id)
+            self._forward = self._backward = None
+        return node
+
+    def _edge(self, source: int, target: int) -> int:
+        edge = self._edges.get((source, target))
+        if edge is not None:
+            return edge
+
+        if self._size == len(self._source):
+            capacity = 2 * len(self._source)
+            for name in ("_source", "_target", "_transfers", "_volume", "_lead_hours"):
+                grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                grown[:self._size] = getattr(self, name)[:self._size]
+                setattr(self, name, grown)
+
+        edge = self._edges[(source, target)] = self._size
+        self._source[edge], self._target[edge] = source, target
+        self._size += 1
+        self._forward = self._backward = None
+        return edge
+
+    def add_transfer(self, from_org_id: str, to_org_id: str, quantity: int, lead_hours: float,
+                     transfers: int = 1) -> None:
+        """
+        Records ``transfers`` transfers of ``quantity`` units in total whose
+        lead times (hours since the batch's previous custody step) sum to
+        ``lead_hours``.
+        """
+        with self._lock:
+            edge = self._edge(self._node(from_org_id), self._node(to_org_id))
+            self._transfers[edge] += transfers
+            self._volume[edge] += quantity
+            self._lead_hours[edge] += lead_hours
+
+    def add_edges(self, from_org_ids, to_org_ids, transfers, volume, lead_hours) -> None:
+        """
+        Records pre-aggregated edges given column-wise (e.g. a group-by over
+        the transfer history): only new (source, target) pairs cost a dict
+        insertion, the weights are accumulated with numpy.
+        """
+        with self._lock:
+            edges = np.fromiter(
+                (self._edge(self._node(a), self._node(b)) for a, b in zip(from_org_ids, to_org_ids)),
+                dtype=np.int64,
+            )
+            np.add.at(self._transfers, edges, np.asarray(transfers, dtype=np.int64))
+            np.add.at(self._volume, edges, np.asarray(volume, dtype=np.int64))
+            np.add.at(self._lead_hours, edges, np.asarray(lead_hours, dtype=np.float64))
+
+    # --------------------------------------------------------
+    # Adjacency
+    # --------------------------------------------------------
+    def _csr(self, by: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(by, kind="stable").astype(np.int32)
+        indptr = np.zeros(len(self._names) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(by, minlength=len(self._names)), out=indptr[1:])
+        return indptr, order
+
+    def _adjacency(self, weight: str, reverse: bool = False) -> csr_matrix:
+        size = self._size
+        if self._forward is None:
+            self._forward = self._csr(self._source[:size])
+            self._backward = self._csr(self._target[:size])
+        indptr, order = self._backward if reverse else self._forward
+        neighbours = (self._source if reverse else self._target)[order]
+
+        if weight == "lead_time":
+            data = np.maximum(self._lead_hours[order] / self._transfers[order], MIN_LEAD_TIME_HOURS)
+        else:
+            data = np.ones(len(order), dtype=np.float64)
+        nodes = len(self._names)
+        return csr_matrix((data, neighbours, indptr), shape=(nodes, nodes))
+
+    def _edge_summary(self, edge: int) -> dict:
+        transfers = int(self._transfers[edge])
+        return {
+            "from_org_id": self._names[self._source[edge]],
+            "to_org_id": self._names[self._target[edge]],
+            "transfers": transfers,
+            "volume": int(self._volume[edge]),
+            "avg_lead_time_hours": round(float(self._lead_hours[edge]) / transfers, 3) if transfers else None,
+        }
+
+    # --------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------
+    def shortest_path(self, from_org_id: str, to_org_id: str, weight: str = "hops") -> Optional[dict]:
+        """
+        Returns the cheapest route between two organizations, by number of
+        hand-offs or by summed average lead time, or None if there is none.
+        """
+        with self._lock:
+            source, target = self._ids.get(from_org_id), self._ids.get(to_org_id)
+            if source is None or target is None:
+                return None
+            distances, predecessors = dijkstra(
+                self._adjacency(weight), indices=source, return_predecessors=True, unweighted=weight == "hops"
+            )
+            if np.isinf(distances[target]):
+                return None
+
+            nodes = [target]
+            while nodes[-1] != source:
+                nodes.append(predecessors[nodes[-1]])
+            nodes.reverse()
+            edges = [self._edge_summary(self._edges[pair]) for pair in zip(nodes, nodes[1:])]
+            return {
+                "path": [self._names[node] for node in nodes],
+                "hops": len(edges),
+                "lead_time_hours": round(sum(edge["avg_lead_time_hours"] for edge in edges), 3),
+                "edges": edges,
+            }
+
+    def reachable(self, org_id: str, downstream: bool = True, max_hops: Optional[int] = None) -> Optional[List[dict]]:
+        """
+        Lists the organizations product can flow to from ``org_id``
+        (``downstream``) or can have come from, with the fewest hand-offs
+        between them, nearest first. None for an unknown organization.
+        """
+        with self._lock:
+            node = self._ids.get(org_id)
+            if node is None:
+                return None
+            hops = dijkstra(
+                self._adjacency("hops", reverse=not downstream),
+                indices=node,
+                unweighted=True,
+                limit=np.inf if max_hops is None else max_hops,
+            )
+            found = np.flatnonzero(np.isfinite(hops))
+            found = found[found != node]
+            found = found[np.argsort(hops[found], kind="stable")]
+            return [{"org_id": self._names[other], "hops": int(hops[other])} for other in found]
+
+    def top_flows(self, limit: int = 10, org_id: Optional[str] = None, direction: str = "both") -> List[dict]:
+        """
+        Returns the ``limit`` edges that moved the most units, optionally
+        only those leaving (``out``), entering (``in``) or touching an
+        organization.
+        """
+        with self._lock:
+            size = self._size
+            candidates = np.arange(size)
+            if org_id is not None:
+                node = self._ids.get(org_id)
+                if node is None:
+                    return []
+                outgoing, incoming = self._source[:size] == node, self._target[:size] == node
+                mask = outgoing if direction == "out" else incoming if direction == "in" else outgoing | incoming
+                candidates = candidates[mask]
+
+            volume = self._volume[candidates]
+            if len(candidates) > limit:
+                top = np.argpartition(-volume, limit - 1)[:limit]
+                candidates, volume = candidates[top], volume[top]
+            ranked = candidates[np.argsort(-volume, kind="stable")]
+            return [self._edge_summary(edge) for edge in ranked]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "organizations": len(self._names),
+                "edges": self._size,
+                "transfers": int(self._transfers[:self._size].sum()),
+                "volume": int(self._volume[:self._size].sum()),
+            }
@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional
+
+# Violation kinds, from most to least specific
+TOTAL_CHANGED = "total_changed"
+TRANSFER_EXCEEDS_BALANCE = "transfer_exceeds_balance"
+UNEXPLAINED_CHANGE = "unexplained_change"
+NEGATIVE_OWNERSHIP = "negative_ownership"
+CONSERVATION = "conservation"
+
+
+def _ownerships(value: dict) -> Dict[str, int]:
+    balances: Dict[str, int] = {}
+    for ownership in value.get("ownerships") or []:
+        balances[ownership["orgId"]] = balances.get(ownership["orgId"], 0) + int(ownership["quantity"])
+    return balances
+
+
+class BatchBalance:
+    """
+    Running conservation balance of one batch, fed its history oldest
+    first. Each version's ownerships must follow from the previous ones and
+    the transaction that wrote it: transfers appended since move quantity
+    from their sender (who must hold it) to their receiver, and a version
+    without a new transfer may only lower one organization's share (a
+    delivery). Throughout, ownerships plus delivered units must add up to
+    the batch's ``totalQuantity``.
+
+    Balances continue from what the ledger recorded, so one bad write is
+    reported once instead of cascading into every later version.
+    """
+
+    def __init__(self, batch_id: str) -> None:
+        self.batch_id = batch_id
+        self.total: Optional[int] = None
+        self.balances: Dict[str, int] = {}
+        self.delivered = 0
+        self.transfers_seen = 0
+        self.violations: List[dict] = []
+        self._unbalanced = False
+
+    def _violation(self, kind: str, entry: dict, detail: str, org_id=None, counterparty_org_id=None,
+                   quantity=None, expected=None, actual=None) -> None:
+        self.violations.append({
+            "batch_id": self.batch_id,
+            "kind": kind,
+            "tx_id": entry.get("txId"),
+            "tx_timestamp": entry.get("timestamp"),
+            "org_id": org_id,
+            "counterparty_org_id": counterparty_org_id,
+            "quantity": quantity,
+            "expected": expected,
+            "actual": actual,
+            "detail": detail,
+        })
+
+    def apply(self, entry: dict) -> None:
+        value = entry.get("value")
+        if entry.get("isDelete") or not isinstance(value, dict):
+            return
+
+        total = int(value.get("totalQuantity") or 0)
+        transfers = value.get("transfers") or []
+        recorded = _ownerships(value)
+
+        if self.total is None:
+            # Creation: everything starts with the first owners
+            self.total = total
+            self.balances = recorded
+            self.transfers_seen = len(transfers)
+            self._check_totals(entry, recorded)
+            return
+
+        if total != self.total:
+            self._violation(
+                TOTAL_CHANGED, entry, f"totalQuantity changed from {self.total} to {total}",
+                expected=self.total, actual=total,
+            )
+
+        expected = dict(self.balances)
+        appended = transfers[self.transfers_seen:]
+        self.transfers_seen = len(transfers)
+        for transfer in appended:
+            quantity = int(transfer.get("quantity") or 0)
+            sender, receiver = transfer.get("fromOrgId"), transfer.get("toOrgId")
+            held = expected.get(sender, 0)
+            if quantity > held:
+                self._violation(
+                    TRANSFER_EXCEEDS_BALANCE, entry,
+                    f"{sender} transferred {quantity} to {receiver} while holding {held}",
+                    org_id=sender, counterparty_org_id=receiver, quantity=quantity, expected=held, actual=quantity,
+                )
+            expected[sender] = held - quantity
+            expected[receiver] = expected.get(receiver, 0) + quantity
+
+        changed = {
+            org_id: (expected.get(org_id, 0), recorded.get(org_id, 0))
+            for org_id in set(expected) | set(recorded)
+            if expected.get(org_id, 0) != recorded.get(org_id, 0)
+        }
+        decreases = {org_id: before - after for org_id, (before, after) in changed.items() if after < before}
+        if not appended and len(changed) == 1 and decreases:
+            # markBatchDelivered: one holder's share leaves the supply chain
+            self.delivered += sum(decreases.values())
+        else:
+            for org_id, (before, after) in sorted(changed.items()):
+                self._violation(
+                    UNEXPLAINED_CHANGE, entry,
+                    f"{org_id} holds {after}, {before} expected after this transaction",
+                    org_id=org_id, expected=before, actual=after,
+                )
+
+        self.balances = recorded
+        self._check_totals(entry, recorded)
+
+    def _check_totals(self, entry: dict, recorded: Dict[str, int]) -> None:
+        for org_id, quantity in sorted(recorded.items()):
+            if quantity < 0:
+                self._violation(
+                    NEGATIVE_OWNERSHIP, entry, f"{org_id} holds {quantity}",
+                    org_id=org_id, expected=0, actual=quantity,
+                )
+
+        accounted = sum(recorded.values()) + self.delivered
+        if accounted != self.total:
+            if not self._unbalanced:
+                self._violation(
+                    CONSERVATION, entry,
+                    f"ownerships ({sum(recorded.values())}) plus delivered ({self.delivered}) "
+                    f"add up to {accounted}, not {self.total}",
+                    expected=self.total, actual=accounted,
+                )
+            self._unbalanced = True
+        else:
+            self._unbalanced = False
+
+
+def check_history(batch_id: str, history: List[dict]) -> List[dict]:
+    """
+    Checks a batch history as returned by getBatchHistory (newest first)
+    and returns its violations in ledger order.
+    """
+    balance = BatchBalance(batch_id)
+    for entry in reversed(history):
+        balance.apply(entry)
+    return balance.violations
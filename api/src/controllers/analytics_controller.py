@@ -0,0 +1,32 @@
+from werkzeug.exceptions import BadRequest
+from src.services.lead_time_service import LeadTimeService
+from src.utils.api_response import ApiResponse
+
+
+class AnalyticsController:
+    def __init__(self):
+        self.lead_time_service = LeadTimeService()
+
+    def get_lead_times(self, args):
+        try:
+            result = self.lead_time_service.get_lead_times(args)
+
+            return ApiResponse.response(True, "Lead times loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading lead times", None, 500)
+
+    def refresh_lead_time_rollups(self, args):
+        try:
+            result = self.lead_time_service.refresh_rollups(args)
+
+            return ApiResponse.response(True, "Lead-time rollups refreshed", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error refreshing lead-time rollups", None, 500)
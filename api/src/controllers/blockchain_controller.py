@@ -1,9 +1,36 @@
+import json
+import os
+
 from marshmallow.exceptions import ValidationError
-from werkzeug.exceptions import NotFound, BadRequest
+from werkzeug.exceptions import NotFound, BadRequest, Conflict
 
 from src.models.blockchain_model import CreateBatchDTO, TransferBatchDTO
+from src.services.anomaly_service import AnomalyService
+from src.services.ledger_mirror_service import LedgerMirrorService
+from src.services.reconciliation_service import ReconciliationService
+from src.services.volume_consistency_service import VolumeConsistencyService
+from src.services.transfer_graph_service import TransferGraphService
 from src.utils.api_response import ApiResponse
 
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+
+def _parse_bulk_body(body: str, mimetype: str):
+    """
+    Accepts a JSON array (optionally wrapped as {"batches": [...]}) or an
+    NDJSON stream with one batch object per line.
+    """
+    try:
+        if mimetype == "application/x-ndjson":
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+
+        items = json.loads(body) if body else None
+        if isinstance(items, dict):
+            items = items.get("batches")
+        return items
+    except ValueError:
+        raise BadRequest("Malformed JSON payload")
+
 
 class BlockchainController:
     """
@@ -15,6 +42,13 @@ class BlockchainController:
         # Lazy-loaded attributes
         self.fabric_client = None
         self.blockchain_service = None
+        # Served from the PostgreSQL mirror, so it never needs Fabric
+        self.mirror_service = LedgerMirrorService()
+        self.anomaly_service = AnomalyService()
+        self.graph_service = TransferGraphService()
+        # Fetches the Fabric client itself when a run starts
+        self.reconciliation_service = ReconciliationService()
+        self.volume_consistency_service = VolumeConsistencyService()
 
     # ---------------------------------------------------------
     # Lazy initialization utilities
@@ -23,6 +57,7 @@ class BlockchainController:
         """
         Initialize FabricClient and BlockchainService only when needed.
         This avoids loading Fabric connection profiles during import time.
+        The client is the process-wide pool, shared by every controller.
         """
         if self.fabric_client is None or self.blockchain_service is None:
             # Import here to avoid circular imports + early initialization
@@ -36,13 +71,15 @@ class BlockchainController:
     # Controller Methods
     # ---------------------------------------------------------
 
-    def create_batch(self, data):
+    def create_batch(self, data, wait_for_commit=True):
         try:
             self._ensure_client_and_service()
 
             dto = CreateBatchDTO().load(data)
-            result = self.blockchain_service.create_batch(dto)
+            result = self.blockchain_service.create_batch(dto, wait_for_commit)
 
+            if not wait_for_commit or self.blockchain_service.outbox_enabled:
+                return ApiResponse.response(True, "Batch creation accepted", result, 202)
             return ApiResponse.response(True, "Batch created", result, 201)
 
         except ValidationError as e:
@@ -51,16 +88,78 @@ class BlockchainController:
         except BadRequest as e:
             return ApiResponse.response(False, e.description, None, 400)
 
+        except Conflict as e:
+            return ApiResponse.response(False, e.description, None, 409)
+
         except Exception:
             return ApiResponse.response(False, "Error creating batch", None, 500)
 
-    def transfer_batch(self, data):
+    def create_batches(self, body: str, mimetype: str):
+        try:
+            self._ensure_client_and_service()
+
+            items = _parse_bulk_body(body, mimetype)
+            if not isinstance(items, list) or not items:
+                raise BadRequest("Expected a non-empty list of batches")
+            if len(items) > BULK_MAX_ITEMS:
+                raise BadRequest(f"A bulk request accepts at most {BULK_MAX_ITEMS} batches")
+
+            # Validate everything in one pass; only valid, unique items are submitted
+            schema = CreateBatchDTO()
+            results = [None] * len(items)
+            valid = []
+            seen = set()
+
+            for index, item in enumerate(items):
+                batch_id = item.get("batch_id") if isinstance(item, dict) else None
+                try:
+                    dto = schema.load(item)
+                except ValidationError as e:
+                    results[index] = {"index": index, "batch_id": batch_id, "success": False, "error": e.messages}
+                    continue
+
+                if dto["batch_id"] in seen:
+                    results[index] = {"index": index, "batch_id": batch_id, "success": False, "error": "Duplicate batch_id in request"}
+                    continue
+
+                seen.add(dto["batch_id"])
+                valid.append((index, dto))
+
+            if valid:
+                outcomes = self.blockchain_service.create_batches([dto for _, dto in valid])
+                for (index, dto), (success, value) in zip(valid, outcomes):
+                    results[index] = {
+                        "index": index,
+                        "batch_id": dto["batch_id"],
+                        "success": success,
+                        "data" if success else "error": value,
+                    }
+
+            created = sum(1 for r in results if r["success"])
+            if self.blockchain_service.outbox_enabled:
+                status_code = 202 if created == len(items) else 207
+                message = f"{created} of {len(items)} batches accepted"
+            else:
+                status_code = 201 if created == len(items) else 207
+                message = f"{created} of {len(items)} batches created"
+
+            return ApiResponse.response(created == len(items), message, results, status_code)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error creating batches", None, 500)
+
+    def transfer_batch(self, data, wait_for_commit=True):
         try:
             self._ensure_client_and_service()
 
             dto = TransferBatchDTO().load(data)
-            result = self.blockchain_service.transfer_batch(dto)
+            result = self.blockchain_service.transfer_batch(dto, wait_for_commit)
 
+            if not wait_for_commit:
+                return ApiResponse.response(True, "Batch transfer accepted", result, 202)
             return ApiResponse.response(True, "Batch transferred", result, 200)
 
         except ValidationError as e:
@@ -69,28 +168,67 @@ class BlockchainController:
         except BadRequest as e:
             return ApiResponse.response(False, e.description, None, 400)
 
+        except Conflict as e:
+            return ApiResponse.response(False, e.description, None, 409)
+
         except Exception:
             return ApiResponse.response(False, "Error transferring batch", None, 500)
 
-    def mark_batch_delivered(self, data):
+    def mark_batch_delivered(self, data, wait_for_commit=True):
         try:
             self._ensure_client_and_service()
 
             if "batch_id" not in data or "delivered_to_org_id" not in data:
                 raise BadRequest("batch_id and delivered_to_org_id are required")
 
-            result = self.blockchain_service.mark_batch_delivered(
-                data["batch_id"], data["delivered_to_org_id"]
-            )
+            result = self.blockchain_service.mark_batch_delivered(data, wait_for_commit)
 
+            if not wait_for_commit:
+                return ApiResponse.response(True, "Batch delivery accepted", result, 202)
             return ApiResponse.response(True, "Batch delivered", result, 200)
 
         except BadRequest as e:
             return ApiResponse.response(False, e.description, None, 400)
 
+        except Conflict as e:
+            return ApiResponse.response(False, e.description, None, 409)
+
         except Exception:
             return ApiResponse.response(False, "Error marking batch delivered", None, 500)
 
+    def verify_batches(self, data):
+        try:
+            self._ensure_client_and_service()
+
+            batch_ids = data.get("batch_ids") if isinstance(data, dict) else data
+            if not isinstance(batch_ids, list) or not batch_ids:
+                raise BadRequest("Expected a non-empty list of batch_ids")
+            if len(batch_ids) > BULK_MAX_ITEMS:
+                raise BadRequest(f"A bulk request accepts at most {BULK_MAX_ITEMS} batch ids")
+            if not all(isinstance(batch_id, str) and batch_id for batch_id in batch_ids):
+                raise BadRequest("batch_ids must be non-empty strings")
+
+            results = self.blockchain_service.verify_batches(batch_ids)
+
+            authentic = sum(1 for r in results if r["authentic"])
+            summary = {
+                "scanned": len(batch_ids),
+                "unique": len(results),
+                "authentic": authentic,
+                "not_found": sum(1 for r in results if r["authentic"] is False),
+                "unavailable": sum(1 for r in results if r["authentic"] is None),
+            }
+
+            return ApiResponse.response(
+                True, f"{authentic} of {len(results)} batches verified", {"summary": summary, "results": results}, 200
+            )
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error verifying batches", None, 500)
+
     def get_batch(self, batch_id: str):
         try:
             self._ensure_client_and_service()
@@ -108,11 +246,11 @@ class BlockchainController:
         except Exception:
             return ApiResponse.response(False, "Error loading batch", None, 500)
 
-    def get_batch_history(self, batch_id: str):
+    def get_batch_history(self, batch_id: str, since: str = None):
         try:
             self._ensure_client_and_service()
 
-            result = self.blockchain_service.get_batch_history(batch_id)
+            result = self.blockchain_service.get_batch_history(batch_id, since)
 
             return ApiResponse.response(True, "Batch history loaded", result, 200)
 
@@ -124,3 +262,341 @@ class BlockchainController:
 
         except Exception:
             return ApiResponse.response(False, "Error loading history", None, 500)
+
+    def get_cache_stats(self):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_cache_stats()
+
+            return ApiResponse.response(True, "Cache statistics loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading cache statistics", None, 500)
+
+    def get_network_stats(self):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_network_stats()
+
+            return ApiResponse.response(True, "Network statistics loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading network statistics", None, 500)
+
+    def get_write_stats(self):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_write_stats()
+
+            return ApiResponse.response(True, "Write statistics loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading write statistics", None, 500)
+
+    def get_scan_stats(self):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_scan_stats()
+
+            return ApiResponse.response(True, "Scan statistics loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading scan statistics", None, 500)
+
+    def get_outbox_entry(self, entry_id: str):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_outbox_entry(entry_id)
+
+            return ApiResponse.response(True, "Outbox entry loaded", result, 200)
+
+        except NotFound:
+            return ApiResponse.response(False, "Outbox entry not found", None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading outbox entry", None, 500)
+
+    def get_outbox_stats(self):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_outbox_stats()
+
+            return ApiResponse.response(True, "Outbox statistics loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading outbox statistics", None, 500)
+
+    def get_transaction_status(self, tx_id: str):
+        try:
+            self._ensure_client_and_service()
+
+            result = self.blockchain_service.get_transaction_status(tx_id)
+
+            return ApiResponse.response(True, "Transaction status loaded", result, 200)
+
+        except NotFound:
+            return ApiResponse.response(False, "Transaction not found", None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading transaction status", None, 500)
+
+    def get_transaction_statuses(self, data):
+        try:
+            self._ensure_client_and_service()
+
+            tx_ids = (data or {}).get("tx_ids")
+            result = self.blockchain_service.get_transaction_statuses(tx_ids)
+
+            return ApiResponse.response(True, "Transaction statuses loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading transaction statuses", None, 500)
+
+    def list_batches(self, args):
+        try:
+            result, next_cursor = self.mirror_service.list_batches(args)
+
+            return ApiResponse.response(True, "Batches loaded", result, 200, next_cursor=next_cursor)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading batches", None, 500)
+
+    def list_transfers(self, args):
+        try:
+            result, next_cursor = self.mirror_service.list_transfers(args)
+
+            return ApiResponse.response(True, "Transfers loaded", result, 200, next_cursor=next_cursor)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading transfers", None, 500)
+
+    def list_anomalies(self, args):
+        try:
+            result, next_cursor = self.anomaly_service.list_anomalies(args)
+
+            return ApiResponse.response(True, "Anomalies loaded", result, 200, next_cursor=next_cursor)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading anomalies", None, 500)
+
+    def get_batch_route(self, batch_id: str):
+        try:
+            result = self.graph_service.get_batch_route(batch_id)
+
+            return ApiResponse.response(True, "Batch route loaded", result, 200)
+
+        except NotFound as e:
+            return ApiResponse.response(False, e.description, None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading batch route", None, 500)
+
+    def find_graph_path(self, args):
+        try:
+            result = self.graph_service.find_path(args)
+
+            return ApiResponse.response(True, "Transfer route found", result, 200)
+
+        except NotFound as e:
+            return ApiResponse.response(False, e.description, None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error finding transfer route", None, 500)
+
+    def find_graph_reachable(self, org_id: str, args):
+        try:
+            result = self.graph_service.find_reachable(org_id, args)
+
+            return ApiResponse.response(True, "Reachable organizations loaded", result, 200)
+
+        except NotFound as e:
+            return ApiResponse.response(False, e.description, None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading reachable organizations", None, 500)
+
+    def find_graph_flows(self, args):
+        try:
+            result = self.graph_service.find_top_flows(args)
+
+            return ApiResponse.response(True, "Top flows loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading top flows", None, 500)
+
+    def get_graph_stats(self):
+        try:
+            result = self.graph_service.get_graph_stats()
+
+            return ApiResponse.response(True, "Transfer graph statistics loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading transfer graph statistics", None, 500)
+
+    def start_reconciliation(self):
+        try:
+            result = self.reconciliation_service.start_reconciliation()
+
+            return ApiResponse.response(True, "Reconciliation started", result, 202)
+
+        except Conflict as e:
+            return ApiResponse.response(False, e.description, None, 409)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error starting reconciliation", None, 500)
+
+    def list_reconciliations(self):
+        try:
+            result = self.reconciliation_service.list_runs()
+
+            return ApiResponse.response(True, "Reconciliation runs loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading reconciliation runs", None, 500)
+
+    def get_reconciliation(self, run_id: str):
+        try:
+            result = self.reconciliation_service.get_run(run_id)
+
+            return ApiResponse.response(True, "Reconciliation run loaded", result, 200)
+
+        except NotFound:
+            return ApiResponse.response(False, "Reconciliation run not found", None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading reconciliation run", None, 500)
+
+    def list_discrepancies(self, run_id: str, args):
+        try:
+            result, next_cursor = self.reconciliation_service.list_discrepancies(run_id, args)
+
+            return ApiResponse.response(True, "Discrepancies loaded", result, 200, next_cursor=next_cursor)
+
+        except NotFound:
+            return ApiResponse.response(False, "Reconciliation run not found", None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading discrepancies", None, 500)
+
+    def start_consistency_check(self):
+        try:
+            result = self.volume_consistency_service.start_check()
+
+            return ApiResponse.response(True, "Consistency check started", result, 202)
+
+        except Conflict as e:
+            return ApiResponse.response(False, e.description, None, 409)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error starting consistency check", None, 500)
+
+    def list_consistency_runs(self):
+        try:
+            result = self.volume_consistency_service.list_runs()
+
+            return ApiResponse.response(True, "Consistency runs loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading consistency runs", None, 500)
+
+    def get_consistency_run(self, run_id: str):
+        try:
+            result = self.volume_consistency_service.get_run(run_id)
+
+            return ApiResponse.response(True, "Consistency run loaded", result, 200)
+
+        except NotFound:
+            return ApiResponse.response(False, "Consistency run not found", None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading consistency run", None, 500)
+
+    def list_consistency_violations(self, run_id: str, args):
+        try:
+            result, next_cursor = self.volume_consistency_service.list_violations(run_id, args)
+
+            return ApiResponse.response(True, "Violations loaded", result, 200, next_cursor=next_cursor)
+
+        except NotFound:
+            return ApiResponse.response(False, "Consistency run not found", None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading violations", None, 500)
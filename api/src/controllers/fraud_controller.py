@@ -0,0 +1,36 @@
+from werkzeug.exceptions import BadRequest, NotFound
+from src.services.fraud_service import FraudService
+from src.utils.api_response import ApiResponse
+
+
+class FraudController:
+    def __init__(self):
+        self.fraud_service = FraudService()
+
+    def score_transfers(self, data):
+        try:
+            records = data.get("transfers") if isinstance(data, dict) else data
+            result = self.fraud_service.score_transfers(records)
+
+            return ApiResponse.response(True, "Transfers scored", result, 200)
+
+        except NotFound as e:
+            return ApiResponse.response(False, e.description, None, 404)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error scoring transfers", None, 500)
+
+    def get_model(self):
+        try:
+            result = self.fraud_service.get_model()
+
+            return ApiResponse.response(True, "Fraud model loaded", result, 200)
+
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
+        except Exception:
+            return ApiResponse.response(False, "Error loading fraud model", None, 500)
@@ -4,7 +4,8 @@ from src.models.inventory_model import (
     inventory_output,
     inventories_output,
     inventory_input_create,
-    inventory_input_update
+    inventory_input_update,
+    inventory_reservation_input
 )
 from src.utils.api_response import ApiResponse
 from marshmallow import ValidationError
@@ -25,24 +26,38 @@ class InventoryController:
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
 
-    def get_my_inventory(self):
+    def get_my_inventory(self, args):
         try:
-            inventory = self.service.get_my_inventory()
-            return ApiResponse.response(True, 'Inventory retrieved successfully', inventories_output.dump(inventory), 200)
+            inventory, next_cursor = self.service.get_my_inventory(args)
+            return ApiResponse.response(
+                True, 'Inventory retrieved successfully', inventories_output.dump(inventory), 200, next_cursor=next_cursor
+            )
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
 
-    def get_inventory_by_organization(self, organization_id):
+    def get_inventory_by_organization(self, organization_id, args):
         try:
-            inventory = self.service.get_inventory_by_organization(organization_id)
-            return ApiResponse.response(True, 'Inventory retrieved successfully', inventories_output.dump(inventory), 200)
+            inventory, next_cursor = self.service.get_inventory_by_organization(organization_id, args)
+            return ApiResponse.response(
+                True, 'Inventory retrieved successfully', inventories_output.dump(inventory), 200, next_cursor=next_cursor
+            )
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
 
-    def search_available_inventory(self, product_name, min_quantity=1):
+    def search_available_inventory(self, args):
         try:
-            inventory = self.service.search_available_inventory(product_name, int(min_quantity))
-            return ApiResponse.response(True, 'Inventory search completed', inventories_output.dump(inventory), 200)
+            rows, next_cursor = self.service.search_available_inventory(args)
+            results = [
+                {**inventory_output.dump(inventory), 'score': round(float(score), 4)} for inventory, score in rows
+            ]
+            return ApiResponse.response(True, 'Inventory search completed', results, 200, next_cursor=next_cursor)
+        except Exception as e:
+            return ApiResponse.response(False, str(e), None, 400)
+
+    def autocomplete_products(self, args):
+        try:
+            suggestions = self.service.autocomplete_products(args)
+            return ApiResponse.response(True, 'Product suggestions loaded', suggestions, 200)
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
 
@@ -53,3 +68,13 @@ class InventoryController:
             return ApiResponse.response(True, 'Inventory updated successfully', inventory_output.dump(inventory), 200)
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
+
+    def reserve_inventory(self, data):
+        try:
+            validated_data = inventory_reservation_input.load(data)
+            inventory = self.service.reserve_inventory(validated_data)
+            return ApiResponse.response(True, 'Inventory reserved successfully', inventories_output.dump(inventory), 200)
+        except ValidationError as e:
+            return ApiResponse.response(False, str(e.messages), None, 400)
+        except Exception as e:
+            return ApiResponse.response(False, str(e), None, 400)
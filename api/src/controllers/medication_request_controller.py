@@ -5,6 +5,7 @@ from src.models.medication_request_model import (
     medication_requests_output,
     medication_request_input_create,
     medication_request_input_approve,
+    medication_request_input_allocate,
     medication_request_input_reject
 )
 from src.utils.api_response import ApiResponse
@@ -25,10 +26,13 @@ class MedicationRequestController:
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
     
-    def get_my_requests(self):
+    def get_my_requests(self, args):
         try:
-            requests = self.service.get_my_requests()
-            return ApiResponse.response(True, "Medication requests retrieved successfully", medication_requests_output.dump(requests), 200)
+            requests, next_cursor = self.service.get_my_requests(args)
+            return ApiResponse.response(
+                True, "Medication requests retrieved successfully", medication_requests_output.dump(requests), 200,
+                next_cursor=next_cursor
+            )
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
 
@@ -49,6 +53,16 @@ class MedicationRequestController:
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
     
+    def allocate_pending_requests(self, data):
+        try:
+            validated_data = medication_request_input_allocate.load(data)
+            result = self.service.allocate_pending_requests(validated_data)
+            return ApiResponse.response(True, "Pending requests allocated successfully", result, 200)
+        except ValidationError as e:
+            return ApiResponse.response(False, str(e.messages), None, 400)
+        except Exception as e:
+            return ApiResponse.response(False, str(e), None, 400)
+    
     def reject_request(self, request_id, data):
         try:
             validated_data = medication_request_input_reject.load(data)
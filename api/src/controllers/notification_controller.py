@@ -8,10 +8,13 @@ class NotificationController:
     def __init__(self):
         self.service = NotificationService()
 
-    def get_my_notifications(self, unread_only=False):
+    def get_my_notifications(self, args):
         try:
-            notifications = self.service.get_my_notifications(unread_only)
-            return ApiResponse.response(True, "Notifications retrieved successfully", notifications_output.dump(notifications), 200)
+            notifications, next_cursor = self.service.get_my_notifications(args)
+            return ApiResponse.response(
+                True, "Notifications retrieved successfully", notifications_output.dump(notifications), 200,
+                next_cursor=next_cursor
+            )
         except Exception as e:
             return ApiResponse.response(False, str(e), None, 400)
 
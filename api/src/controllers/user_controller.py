@@ -1,5 +1,5 @@
 from src.services.user_service import UserService
-from werkzeug.exceptions import NotFound
+from werkzeug.exceptions import BadRequest, NotFound
 from marshmallow.exceptions import ValidationError
 from src.utils.api_response import ApiResponse
 from jwt.exceptions import PyJWTError
@@ -8,15 +8,18 @@ class UserController:
     def __init__(self):
         self.user_service = UserService()
 
-    def get_all_users(self, source=None):
+    def get_all_users(self, args):
         try:
-            users = self.user_service.get_all_users(source)
+            users, next_cursor = self.user_service.get_all_users(args)
             
-            return ApiResponse.response(True, 'Users Found', users, 200)
+            return ApiResponse.response(True, 'Users Found', users, 200, next_cursor=next_cursor)
         
         except PyJWTError:
             raise
 
+        except BadRequest as e:
+            return ApiResponse.response(False, e.description, None, 400)
+
         except Exception:
             return ApiResponse.response(False, 'An error occurred while getting all users', None, 500)
 
@@ -0,0 +1,76 @@
+from flask import make_response, request
+
+from config.scan_monitor_config import SCAN_MONITOR_REGION_HEADER, get_scan_monitor
+from src.services.scan_monitor_service import coarse_scan_location
+from src.services.verification_service import (
+    VerificationService, VERIFY_MAX_AGE, VERIFY_SHARED_MAX_AGE, VERIFY_NOT_FOUND_MAX_AGE
+)
+from src.utils.api_response import ApiResponse
+
+
+class VerificationController:
+    """
+    Public (unauthenticated) provenance verification. Responses carry
+    strong ETags and Cache-Control headers so browsers and CDNs can absorb
+    repeated scans of the same package.
+    """
+
+    def __init__(self):
+        # Lazy-loaded, like the blockchain controller
+        self.verification_service = None
+
+    def _ensure_service(self):
+        if self.verification_service is None:
+            from config.fabric_config import get_fabric_client
+
+            self.verification_service = VerificationService(get_fabric_client())
+
+    @staticmethod
+    def _cacheable(response, max_age, shared_max_age):
+        # stale-if-error lets caches keep answering scans while the peers are unreachable
+        response.headers["Cache-Control"] = (
+            f"public, max-age={max_age}, s-maxage={shared_max_age}, stale-if-error=86400"
+        )
+        return response
+
+    def verify_batch(self, batch_id: str):
+        try:
+            self._ensure_service()
+
+            snapshot = self.verification_service.get_snapshot(batch_id)
+
+            if not snapshot["found"]:
+                response = make_response(ApiResponse.response(False, "Batch not found", None, 404))
+                return self._cacheable(response, VERIFY_NOT_FOUND_MAX_AGE, VERIFY_NOT_FOUND_MAX_AGE)
+
+            scan_monitor = get_scan_monitor()
+            if scan_monitor is not None:
+                # Only scans that reach the API are counted (not CDN hits)
+                region = request.headers.get(SCAN_MONITOR_REGION_HEADER) if SCAN_MONITOR_REGION_HEADER else None
+                location = coarse_scan_location(request.remote_addr, region)
+                scan_monitor.record(batch_id, location, snapshot["data"]["summary"]["total_quantity"])
+
+            response = make_response(ApiResponse.response(True, "Batch verified", snapshot["data"], 200))
+            response.set_etag(snapshot["etag"])
+            self._cacheable(response, VERIFY_MAX_AGE, VERIFY_SHARED_MAX_AGE)
+            # Answers If-None-Match with a bodyless 304
+            return response.make_conditional(request)
+
+        except Exception:
+            response = make_response(ApiResponse.response(False, "Error verifying batch", None, 500))
+            response.cache_control.no_store = True
+            return response
+
+    def get_public_key(self):
+        try:
+            self._ensure_service()
+
+            result = self.verification_service.get_public_key()
+
+            response = make_response(ApiResponse.response(True, "Verification key loaded", result, 200))
+            return self._cacheable(response, 3600, 3600)
+
+        except Exception:
+            response = make_response(ApiResponse.response(False, "Error loading verification key", None, 500))
+            response.cache_control.no_store = True
+            return response
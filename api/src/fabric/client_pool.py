@@ -0,0 +1,183 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from src.fabric.event_loop import get_event_loop_thread
+
+
+class _PoolMember:
+    def __init__(self, client) -> None:
+        self.client = client
+        self.last_used = time.monotonic()
+        self.healthy = True
+        self.failures = 0
+        self.rebuilds = 0
+
+
+class FabricClientPool:
+    """
+    Fixed-size pool of warm FabricClient instances.
+
+    Every member owns its own SDK client and therefore its own gRPC channels
+    to the peers and orderer. Members are handed out round-robin, validated
+    with a ping before reuse once they have been idle for ``idle_timeout``
+    seconds, and checked in the background every ``health_check_interval``
+    seconds; a member that fails its check is rebuilt off the request path.
+
+    The pool exposes the same ``evaluate``/``submit`` interface as
+    FabricClient so repositories can use either transparently.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        size: int = 1,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+        peer_selectors: Optional[dict] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Fabric client pool size must be at least 1")
+
+        self._factory = factory
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.peer_selectors = peer_selectors or {}
+
+        self._members: List[_PoolMember] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._health_future: Optional[Future] = None
+
+    # --------------------------------------------------------
+    # Member management
+    # --------------------------------------------------------
+    def _ensure_members(self) -> None:
+        if len(self._members) == self.size:
+            return
+        with self._lock:
+            while len(self._members) < self.size:
+                self._members.append(_PoolMember(self._factory()))
+
+    def _acquire(self):
+        self._ensure_members()
+
+        with self._lock:
+            candidates = [m for m in self._members if m.healthy] or self._members
+            member = candidates[self._next % len(candidates)]
+            self._next += 1
+
+        if time.monotonic() - member.last_used > self.idle_timeout:
+            self._validate(member)
+
+        member.last_used = time.monotonic()
+        return member.client
+
+    def _validate(self, member: _PoolMember) -> None:
+        try:
+            member.client.ping_async().result(self.health_check_timeout)
+            member.healthy = True
+        except Exception:
+            member.failures += 1
+            self._rebuild(member)
+
+    def _rebuild(self, member: _PoolMember) -> None:
+        try:
+            member.client = self._factory()
+            member.healthy = True
+            member.rebuilds += 1
+        except Exception as e:
+            member.healthy = False
+            print(f"Warning: Could not rebuild Fabric client: {str(e)}")
+
+    def warm_up(self) -> None:
+        """
+        Builds every member and opens its channels with a first ping.
+        """
+        self._ensure_members()
+        for member in self._members:
+            self._validate(member)
+            member.last_used = time.monotonic()
+
+    # --------------------------------------------------------
+    # Background health checks
+    # --------------------------------------------------------
+    def start_health_checks(self) -> None:
+        if self._health_future is not None and not self._health_future.done():
+            return
+        self._health_future = get_event_loop_thread().submit(self._health_loop())
+
+    async def _health_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for member in list(self._members):
+                try:
+                    await asyncio.wait_for(
+                        member.client.ping_transaction(), self.health_check_timeout
+                    )
+                    member.healthy = True
+                except Exception:
+                    member.healthy = False
+                    member.failures += 1
+                    # Building a client parses the profile and blocks; keep it off the loop
+                    await loop.run_in_executor(None, self._rebuild, member)
+
+    def close(self) -> None:
+        if self._health_future is not None:
+            self._health_future.cancel()
+            self._health_future = None
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle_timeout": self.idle_timeout,
+            "health_check_interval": self.health_check_interval,
+            "members": [
+                {
+                    "healthy": m.healthy,
+                    "idle_seconds": round(time.monotonic() - m.last_used, 3),
+                    "failures": m.failures,
+                    "rebuilds": m.rebuilds,
+                }
+                for m in self._members
+            ],
+            "peers": {name: selector.stats() for name, selector in self.peer_selectors.items()},
+        }
+
+    # --------------------------------------------------------
+    # FabricClient interface
+    # --------------------------------------------------------
+    def evaluate(self, function: str, args: list[str]):
+        return self._acquire().evaluate(function, args)
+
+    def submit(self, function: str, args: list[str]):
+        return self._acquire().submit(function, args)
+
+    def broadcast(self, function: str, args: list[str]):
+        return self._acquire().broadcast(function, args)
+
+    def height(self) -> int:
+        return self._acquire().height()
+
+    def evaluate_async(self, function: str, args: list[str]) -> Future:
+        return self._acquire().evaluate_async(function, args)
+
+    def submit_async(self, function: str, args: list[str]) -> Future:
+        return self._acquire().submit_async(function, args)
+
+    def broadcast_async(self, function: str, args: list[str]) -> Future:
+        return self._acquire().broadcast_async(function, args)
+
+    @property
+    def chaincode_name(self):
+        self._ensure_members()
+        return self._members[0].client.chaincode_name
+
+    async def listen_blocks(self, on_block, start_block=None):
+        await self._acquire().listen_blocks(on_block, start_block=start_block)
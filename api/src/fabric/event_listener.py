@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from src.fabric.event_loop import get_event_loop_thread
+
+TX_VALIDATION_VALID = 0
+TX_VALIDATION_MVCC_READ_CONFLICT = 11
+
+# Names of Fabric's TxValidationCode values
+TX_VALIDATION_CODES = {
+    0: "VALID",
+    1: "NIL_ENVELOPE",
+    2: "BAD_PAYLOAD",
+    3: "BAD_COMMON_HEADER",
+    4: "BAD_CREATOR_SIGNATURE",
+    5: "INVALID_ENDORSER_TRANSACTION",
+    6: "INVALID_CONFIG_TRANSACTION",
+    7: "UNSUPPORTED_TX_PAYLOAD",
+    8: "BAD_PROPOSAL_TXID",
+    9: "DUPLICATE_TXID",
+    10: "ENDORSEMENT_POLICY_FAILURE",
+    11: "MVCC_READ_CONFLICT",
+    12: "PHANTOM_READ_CONFLICT",
+    13: "UNKNOWN_TX_TYPE",
+    14: "TARGET_CHAIN_NOT_FOUND",
+    15: "MARSHAL_TX_ERROR",
+    16: "NIL_TXACTION",
+    17: "EXPIRED_CHAINCODE",
+    18: "CHAINCODE_VERSION_CONFLICT",
+    19: "BAD_HEADER_EXTENSION",
+    20: "BAD_CHANNEL_HEADER",
+    21: "BAD_RESPONSE_PAYLOAD",
+    22: "BAD_RWSET",
+    23: "ILLEGAL_WRITESET",
+    24: "INVALID_WRITESET",
+    25: "INVALID_CHAINCODE",
+    254: "NOT_VALIDATED",
+    255: "INVALID_OTHER_REASON",
+}
+
+# Index of the transaction validation flags in block metadata
+_TRANSACTIONS_FILTER = 2
+
+
+class LedgerEvent:
+    """
+    One transaction of a committed block, reduced to what the API reacts to.
+    """
+
+    def __init__(
+        self,
+        block_number: int,
+        tx_id: str,
+        validation_code: int,
+        function: Optional[str],
+        args: List[str],
+        keys: List[str],
+        timestamp: Optional[str] = None,
+        values: Optional[dict] = None,
+    ) -> None:
+        self.block_number = block_number
+        self.tx_id = tx_id
+        self.validation_code = validation_code
+        self.function = function
+        self.args = args
+        self.keys = keys
+        self.timestamp = timestamp
+        # Parsed JSON value written for each key (None for deletes)
+        self.values = values or {}
+
+    @property
+    def valid(self) -> bool:
+        return self.validation_code == TX_VALIDATION_VALID
+
+    @property
+    def validation_name(self) -> str:
+        return TX_VALIDATION_CODES.get(self.validation_code, str(self.validation_code))
+
+    def __repr__(self):
+        return f"<LedgerEvent {self.tx_id} {self.function} block={self.block_number}>"
+
+
+def _decode(value) -> str:
+    return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+def _write_value(write: dict):
+    if write.get("is_delete"):
+        return None
+    try:
+        return json.loads(_decode(write.get("value", b"")))
+    except ValueError:
+        return None
+
+
+def _timestamp(channel_header: dict) -> Optional[str]:
+    timestamp = channel_header.get("timestamp")
+    if isinstance(timestamp, dict) and "seconds" in timestamp:
+        return datetime.fromtimestamp(int(timestamp["seconds"]), timezone.utc).isoformat()
+    return str(timestamp) if timestamp else None
+
+
+def parse_block(block: dict, chaincode_name: Optional[str] = None) -> List[LedgerEvent]:
+    """
+    Extracts the endorser transactions of a decoded block.
+
+    Each event carries the invoked chaincode function (without the contract
+    prefix), its string arguments, the state keys it wrote and their new
+    values.
+    """
+    number = int(block["header"]["number"])
+    metadata = block.get("metadata", {}).get("metadata", [])
+    flags = metadata[_TRANSACTIONS_FILTER] if len(metadata) > _TRANSACTIONS_FILTER else []
+
+    events = []
+    for index, envelope in enumerate(block.get("data", {}).get("data", [])):
+        payload = envelope.get("payload", {})
+        channel_header = payload.get("header", {}).get("channel_header", {})
+        actions = payload.get("data", {}).get("actions") or []
+        if not actions:
+            continue
+
+        action_payload = actions[0].get("payload", {})
+        spec = action_payload.get("chaincode_proposal_payload", {}).get("input", {}).get("chaincode_spec", {})
+        if chaincode_name and spec.get("chaincode_id", {}).get("name") not in (None, chaincode_name):
+            continue
+
+        raw_args = [_decode(a) for a in spec.get("input", {}).get("args", [])]
+        function = raw_args[0].split(":")[-1] if raw_args else None
+
+        results = (
+            action_payload.get("action", {})
+            .get("proposal_response_payload", {})
+            .get("extension", {})
+            .get("results", {})
+        )
+        keys = []
+        values = {}
+        for ns_rwset in results.get("ns_rwset", []):
+            if chaincode_name and ns_rwset.get("namespace") != chaincode_name:
+                continue
+            for write in ns_rwset.get("rwset", {}).get("writes", []):
+                keys.append(write["key"])
+                values[write["key"]] = _write_value(write)
+
+        events.append(
+            LedgerEvent(
+                block_number=number,
+                tx_id=channel_header.get("tx_id"),
+                validation_code=int(flags[index]) if index < len(flags) else TX_VALIDATION_VALID,
+                function=function,
+                args=raw_args[1:],
+                keys=keys,
+                timestamp=_timestamp(channel_header),
+                values=values,
+            )
+        )
+
+    return events
+
+
+class LedgerEventListener:
+    """
+    Follows committed blocks on the channel and fans their transactions out
+    to subscribers.
+
+    Subscribers run on the Fabric event loop thread, so they must be quick
+    (cache invalidation, status updates); anything that touches the database
+    should hand the event to its own worker. The listener reconnects after
+    failures and resumes from the block after the last one it delivered.
+    """
+
+    def __init__(self, reconnect_delay: float = 5.0) -> None:
+        self.reconnect_delay = reconnect_delay
+        self.last_block: Optional[int] = None
+        self._subscribers: List[Callable[[LedgerEvent], None]] = []
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+        self._chaincode_name: Optional[str] = None
+
+    def subscribe(self, callback: Callable[[LedgerEvent], None]) -> None:
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[LedgerEvent], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: LedgerEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Warning: Ledger event subscriber failed: {str(e)}")
+
+    def _on_block(self, block: dict) -> None:
+        for event in parse_block(block, self._chaincode_name):
+            self.publish(event)
+        self.last_block = int(block["header"]["number"])
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def start(self, fabric_client, start_block: Optional[int] = None) -> None:
+        if self.is_running():
+            return
+        self._chaincode_name = getattr(fabric_client, "chaincode_name", None)
+        self._future = get_event_loop_thread().submit(self._run(fabric_client, start_block))
+
+    async def _run(self, fabric_client, start_block: Optional[int]) -> None:
+        while True:
+            resume_from = self.last_block + 1 if self.last_block is not None else start_block
+            try:
+                await fabric_client.listen_blocks(self._on_block, start_block=resume_from)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Ledger event stream interrupted: {str(e)}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def stop(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+
+_listener: Optional[LedgerEventListener] = None
+_listener_lock = threading.Lock()
+
+
+def get_ledger_event_listener() -> LedgerEventListener:
+    """
+    Returns the per-process ledger event listener.
+    """
+    global _listener
+
+    with _listener_lock:
+        if _listener is None:
+            _listener = LedgerEventListener()
+        return _listener
+
+
+def _reset_after_fork() -> None:
+    global _listener, _listener_lock
+    _listener = None
+    _listener_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,118 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+class EventLoopThread:
+    """
+    Long-lived asyncio event loop running on a dedicated daemon thread.
+
+    Coroutines are scheduled from any thread with ``submit`` and come back as
+    thread-safe ``concurrent.futures.Future`` objects, so Flask handlers can
+    block on their own result while other requests' peer round-trips overlap.
+    """
+
+    def __init__(self, name: str = "fabric-event-loop") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running():
+                return
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._started.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            if not self.is_running():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+            self._loop = None
+
+    # --------------------------------------------------------
+    # Scheduling
+    # --------------------------------------------------------
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Schedule a coroutine on the loop and return a concurrent future.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Schedule a coroutine and block the calling thread until it finishes.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("EventLoopThread.run() called from its own loop thread")
+        return self.submit(coro).result(timeout)
+
+
+# ------------------------------------------------------------
+# Per-process instance
+# ------------------------------------------------------------
+_loop_thread: Optional[EventLoopThread] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """
+    Returns the event loop thread owned by the current process.
+    """
+    global _loop_thread
+
+    with _loop_lock:
+        if _loop_thread is None:
+            _loop_thread = EventLoopThread()
+        return _loop_thread
+
+
+def _reset_after_fork() -> None:
+    # Threads do not survive fork(); gunicorn workers forked from a preloaded
+    # master must start their own loop instead of inheriting a dead one.
+    global _loop_thread, _loop_lock
+    _loop_thread = None
+    _loop_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
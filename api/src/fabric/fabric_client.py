@@ -1,12 +1,85 @@
 import json
 import asyncio
+from concurrent.futures import Future
 from pathlib import Path
-from hfc.fabric import Client
+from typing import Optional
+
+from src.fabric.event_loop import get_event_loop_thread
+from src.fabric.peer_selector import PeerSelector, discover_peers
+
+LOOP_MODE_BACKGROUND = "background"
+LOOP_MODE_PER_CALL = "per_call"
+
+
+def read_wallet_identity(wallet_path: str, user_id: str, msp_id: str) -> dict:
+    """
+    Reads the certificate and private key of ``user_id`` from the wallet.
+    """
+    cert_path = Path(wallet_path) / f"{user_id}.crt"
+    key_path = Path(wallet_path) / f"{user_id}.key"
+
+    if not cert_path.exists() or not key_path.exists():
+        raise FileNotFoundError(
+            f"Identity files not found in wallet: {cert_path}, {key_path}"
+        )
+
+    with open(cert_path, "r") as f:
+        cert = f.read()
+
+    with open(key_path, "r") as f:
+        key = f.read()
+
+    return {
+        "cert": cert,
+        "private_key": key,
+        "mspid": msp_id,
+    }
+
+
+def profile_organization(ccp_path: str, msp_id: str) -> Optional[str]:
+    """
+    Name of the connection profile organization whose MSP is ``msp_id``,
+    falling back to the profile's client organization.
+    """
+    import yaml
+
+    with open(ccp_path, "r") as f:
+        profile = yaml.safe_load(f) or {}
+
+    for name, spec in (profile.get("organizations") or {}).items():
+        if (spec or {}).get("mspid") == msp_id:
+            return name
+    return (profile.get("client") or {}).get("organization")
+
+
+async def _first_result(attempts: list):
+    """
+    Returns the first successful result among ``attempts`` and cancels the
+    rest; raises the last error if every attempt fails.
+    """
+    pending = set(attempts)
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 class FabricClient:
     """
     Fabric client wrapper used by blockchain_repository.py.
+
+    In ``background`` loop mode (the default) every SDK coroutine runs on one
+    long-lived event loop owned by a dedicated thread per process, and the
+    sync wrappers block on a thread-safe future. ``per_call`` keeps the legacy
+    ``run_until_complete`` behaviour on the caller's thread.
     """
 
     def __init__(
@@ -18,7 +91,14 @@ class FabricClient:
         channel_name: str,
         chaincode_name: str,
         contract_name: str,
+        loop_mode: str = LOOP_MODE_BACKGROUND,
+        identity: Optional[dict] = None,
+        peer_roles: Optional[dict] = None,
+        query_selector: Optional[PeerSelector] = None,
+        endorse_selector: Optional[PeerSelector] = None,
     ) -> None:
+        # Imported here so the SDK is only required once a client is built
+        from hfc.fabric import Client
 
         self.ccp_path = Path(ccp_path)
         self.wallet_path = Path(wallet_path)
@@ -28,54 +108,104 @@ class FabricClient:
         self.chaincode_name = chaincode_name
         self.contract_name = contract_name
 
+        if loop_mode not in (LOOP_MODE_BACKGROUND, LOOP_MODE_PER_CALL):
+            raise ValueError(f"Unknown Fabric loop mode: {loop_mode}")
+        self.loop_mode = loop_mode
+
         # Load connection profile
         self.client = Client(net_profile=str(self.ccp_path))
 
-        # Load user identity from wallet
-        self._load_identity()
+        # Load user identity from wallet (unless already loaded by the caller)
+        self._load_identity(identity)
+        self.org_name = profile_organization(str(self.ccp_path), self.msp_id)
+        self._requestor = None
 
         # Get channel instance
         self.channel = self.client.get_channel(self.channel_name)
 
+        # Peers and their roles; selectors are shared by every pooled client
+        # so load balancing and stats are process-wide
+        self.peer_roles = peer_roles or discover_peers(str(self.ccp_path), self.channel_name)
+        self.query_selector = query_selector or PeerSelector(self.peer_roles["query"])
+        self.endorse_selector = endorse_selector or PeerSelector(
+            [p for peers in self.peer_roles["endorsing"].values() for p in peers], hedge_percentile=0
+        )
+
     # --------------------------------------------------------
     # Load identity (certificate + private key)
     # --------------------------------------------------------
-    def _load_identity(self):
-        cert_path = self.wallet_path / f"{self.user_id}.crt"
-        key_path = self.wallet_path / f"{self.user_id}.key"
+    def _load_identity(self, identity: Optional[dict] = None):
+        if identity is None:
+            identity = read_wallet_identity(self.wallet_path, self.user_id, self.msp_id)
 
-        if not cert_path.exists() or not key_path.exists():
-            raise FileNotFoundError(
-                f"Identity files not found in wallet: {cert_path}, {key_path}"
-            )
+        # Register identity inside SDK
+        self.client._users[self.user_id] = identity
 
-        with open(cert_path, "r") as f:
-            cert = f.read()
+    def _user(self):
+        """
+        The SDK User that signs as ``user_id``: the one the connection
+        profile defines for our organization, or else one built from the
+        wallet's certificate and key.
+        """
+        if self._requestor is None:
+            user = self.client.get_user(self.org_name, self.user_id)
+            if user is None:
+                from hfc.fabric.user import create_user
 
-        with open(key_path, "r") as f:
-            key = f.read()
-
-        # Register identity inside SDK
-        self.client._users[self.user_id] = {
-            "cert": cert,
-            "private_key": key,
-            "mspid": self.msp_id,
-        }
+                user = create_user(
+                    name=self.user_id,
+                    org=self.org_name,
+                    state_store=self.client.state_store,
+                    msp_id=self.msp_id,
+                    key_path=str(self.wallet_path / f"{self.user_id}.key"),
+                    cert_path=str(self.wallet_path / f"{self.user_id}.crt"),
+                )
+            self._requestor = user
+        return self._requestor
 
     # --------------------------------------------------------
     # Evaluate transaction (read)
     # --------------------------------------------------------
+    async def _query_peer(self, peer: str, function_name: str, args: list[str], hedged: bool = False):
+        started = self.query_selector.begin(peer, hedged)
+        try:
+            response = await self.client.chaincode_query(
+                requestor=self._user(),
+                channel_name=self.channel_name,
+                peers=[peer],
+                chaincode_name=self.chaincode_name,
+                fcn=function_name,
+                args=args,
+            )
+        except asyncio.CancelledError:
+            self.query_selector.end(peer, started, cancelled=True)
+            raise
+        except Exception:
+            self.query_selector.end(peer, started, error=True)
+            raise
+        self.query_selector.end(peer, started)
+        return response
+
     async def evaluate_transaction(self, fcn: str, args: list[str]):
+        """
+        Queries the least loaded peer. If it has not answered once the
+        selector's hedge delay (a recent latency percentile) has passed, the
+        same query goes to a second peer and the first answer wins.
+        """
         # Use contract_name:function format if contract_name is provided
         function_name = f"{self.contract_name}:{fcn}" if self.contract_name else fcn
-        
-        response = await self.client.chaincode_query(
-            requestor=self.user_id,
-            channel_name=self.channel_name,
-            chaincode_name=self.chaincode_name,
-            fcn=function_name,
-            args=args,
-        )
+
+        primary = self.query_selector.pick()
+        attempts = [asyncio.ensure_future(self._query_peer(primary, function_name, args))]
+
+        delay = self.query_selector.hedge_delay()
+        if delay is not None:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            backup = self.query_selector.pick(exclude={primary}) if not done else None
+            if backup is not None:
+                attempts.append(asyncio.ensure_future(self._query_peer(backup, function_name, args, hedged=True)))
+
+        response = await _first_result(attempts)
 
         try:
             return json.loads(response)
@@ -89,30 +219,160 @@ class FabricClient:
         # Use contract_name:function format if contract_name is provided
         function_name = f"{self.contract_name}:{fcn}" if self.contract_name else fcn
         
-        response = await self.client.chaincode_invoke(
-            requestor=self.user_id,
-            peers=["peer0.org1.example.com"],
-            channel_name=self.channel_name,
-            chaincode_name=self.chaincode_name,
+        # One endorser per organization, the least loaded of each
+        peers = self.endorse_selector.pick_per_group(self.peer_roles["endorsing"])
+        started = [self.endorse_selector.begin(peer) for peer in peers]
+        error = False
+        try:
+            response = await self.client.chaincode_invoke(
+                requestor=self._user(),
+                peers=peers,
+                channel_name=self.channel_name,
+                chaincode_name=self.chaincode_name,
+                fcn=function_name,
+                args=args,
+                wait_for_event=True,
+            )
+        except BaseException:
+            error = True
+            raise
+        finally:
+            for peer, began in zip(peers, started):
+                self.endorse_selector.end(peer, began, error=error)
+
+        try:
+            return json.loads(response)
+        except Exception:
+            return response
+
+    # --------------------------------------------------------
+    # Broadcast transaction (write, returns once ordered - not committed)
+    # --------------------------------------------------------
+    async def broadcast_transaction(self, fcn: str, args: list[str]):
+        """
+        Endorses the transaction and hands it to the orderer without waiting
+        for the commit event. Returns the tx id and the endorsed chaincode
+        result; commit status arrives later through block events.
+        """
+        from hfc.fabric.transaction.tx_context import create_tx_context
+        from hfc.fabric.transaction.tx_proposal_request import (
+            CC_INVOKE,
+            CC_TYPE_NODE,
+            TXProposalRequest,
+            create_tx_prop_req,
+        )
+        from hfc.util.utils import build_tx_req, send_transaction
+
+        function_name = f"{self.contract_name}:{fcn}" if self.contract_name else fcn
+        requestor = self._user()
+        endorsers = self.endorse_selector.pick_per_group(self.peer_roles["endorsing"])
+        peers = [self.client.get_peer(name) for name in endorsers]
+
+        proposal_request = create_tx_prop_req(
+            prop_type=CC_INVOKE,
+            cc_name=self.chaincode_name,
+            cc_type=CC_TYPE_NODE,
             fcn=function_name,
             args=args,
-            wait_for_event=True,
         )
+        tx_context = create_tx_context(requestor, requestor.cryptoSuite, proposal_request)
 
+        started = [self.endorse_selector.begin(peer) for peer in endorsers]
+        error = False
         try:
-            return json.loads(response)
+            responses, proposal, header = self.channel.send_tx_proposal(tx_context, peers)
+            endorsements = await asyncio.gather(*responses)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            for peer, began in zip(endorsers, started):
+                self.endorse_selector.end(peer, began, error=error)
+
+        failed = [r for r in endorsements if r.response.status != 200]
+        if failed:
+            raise RuntimeError(failed[0].response.message)
+
+        transaction_request = build_tx_req((endorsements, proposal, header))
+        order_context = create_tx_context(requestor, requestor.cryptoSuite, TXProposalRequest())
+        async for reply in send_transaction(self.client.orderers, transaction_request, order_context):
+            if reply.status != 200:
+                raise RuntimeError(f"Orderer rejected transaction {tx_context.tx_id}: {reply.info}")
+            break
+
+        payload = endorsements[0].response.payload.decode("utf-8")
+        try:
+            result = json.loads(payload)
         except Exception:
-            return response
+            result = payload
+
+        return {"tx_id": tx_context.tx_id, "result": result}
+
+    # --------------------------------------------------------
+    # Health check (channel info query against the peers)
+    # --------------------------------------------------------
+    async def ping_transaction(self):
+        return await self.client.query_info(
+            requestor=self._user(),
+            channel_name=self.channel_name,
+            peers=list(self.client.peers.keys()),
+        )
+
+    async def query_height(self) -> int:
+        """
+        Number of blocks on the channel, i.e. the number of the next block.
+        """
+        info = await self.ping_transaction()
+        return int(info.height)
+
+    # --------------------------------------------------------
+    # Block events (runs until the stream closes or is cancelled)
+    # --------------------------------------------------------
+    async def listen_blocks(self, on_block, start_block=None):
+        peer = self.client.get_peer(self.peer_roles["events"][0])
+        event_hub = self.channel.newChannelEventHub(peer, self._user())
+        event_hub.registerBlockEvent(onEvent=on_block)
+
+        stream = event_hub.connect(
+            start=start_block if start_block is not None else "newest",
+            filtered=False,
+        )
+        try:
+            await stream
+        finally:
+            event_hub.disconnect()
+
+    # --------------------------------------------------------
+    # Public async wrappers (thread-safe futures)
+    # --------------------------------------------------------
+    def evaluate_async(self, function: str, args: list[str]) -> Future:
+        return get_event_loop_thread().submit(self.evaluate_transaction(function, args))
+
+    def submit_async(self, function: str, args: list[str]) -> Future:
+        return get_event_loop_thread().submit(self.submit_transaction(function, args))
+
+    def broadcast_async(self, function: str, args: list[str]) -> Future:
+        return get_event_loop_thread().submit(self.broadcast_transaction(function, args))
+
+    def ping_async(self) -> Future:
+        return get_event_loop_thread().submit(self.ping_transaction())
 
     # --------------------------------------------------------
     # Public sync wrappers
     # --------------------------------------------------------
+    def _run(self, coro):
+        if self.loop_mode == LOOP_MODE_PER_CALL:
+            return asyncio.get_event_loop().run_until_complete(coro)
+        return get_event_loop_thread().run(coro)
+
     def evaluate(self, function: str, args: list[str]):
-        return asyncio.get_event_loop().run_until_complete(
-            self.evaluate_transaction(function, args)
-        )
+        return self._run(self.evaluate_transaction(function, args))
 
     def submit(self, function: str, args: list[str]):
-        return asyncio.get_event_loop().run_until_complete(
-            self.submit_transaction(function, args)
-        )
+        return self._run(self.submit_transaction(function, args))
+
+    def broadcast(self, function: str, args: list[str]):
+        return self._run(self.broadcast_transaction(function, args))
+
+    def height(self) -> int:
+        return self._run(self.query_height())
@@ -0,0 +1,596 @@
+import asyncio
+import inspect
+import json
+import random
+import re
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.fabric.event_listener import (
+    TX_VALIDATION_CODES,
+    TX_VALIDATION_MVCC_READ_CONFLICT,
+    TX_VALIDATION_VALID,
+)
+from src.fabric.event_loop import get_event_loop_thread
+
+
+class ChaincodeError(RuntimeError):
+    """
+    Raised when the simulated chaincode rejects a proposal.
+    """
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(moment: datetime) -> str:
+    # Same format as JavaScript's Date.toISOString()
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _parse_int(value) -> Optional[int]:
+    # parseInt(value, 10): leading digits only, NaN otherwise
+    match = re.match(r"\s*([+-]?\d+)", str(value))
+    return int(match.group(1)) if match else None
+
+
+def _parse_float(value) -> Optional[float]:
+    match = re.match(r"\s*([+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?)", str(value))
+    if not match:
+        return None
+    number = float(match.group(1))
+    return int(number) if number.is_integer() else number
+
+
+def _loads(payload: str):
+    try:
+        return json.loads(payload)
+    except Exception:
+        return payload
+
+
+class _Stub:
+    """
+    Minimal chaincode stub: serves reads from the committed state and records
+    the read set (key -> version) and write set of one simulation.
+    """
+
+    def __init__(self, ledger: "FakeLedger", timestamp: datetime) -> None:
+        self.ledger = ledger
+        self.timestamp = timestamp
+        self.reads: Dict[str, Optional[tuple]] = {}
+        self.writes: Dict[str, str] = {}
+
+    def get_state(self, key: str) -> Optional[str]:
+        if key in self.writes:
+            return self.writes[key]
+        value, version = self.ledger.state.get(key, (None, None))
+        self.reads.setdefault(key, version)
+        return value
+
+    def put_state(self, key: str, value: str) -> None:
+        self.writes[key] = value
+
+    def get_history_for_key(self, key: str) -> List[dict]:
+        return list(self.ledger.history.get(key, []))
+
+
+class MedicineContractSimulator:
+    """
+    Python port of chaincode/medicine/contracts/medicine-contract.js.
+
+    Keep the two in sync: the fake network is only useful for load tests as
+    long as it accepts and rejects exactly what the real chaincode does.
+    """
+
+    _SUPPLY_CHAIN_ROLES = {"manufacturer": 1, "distributor": 2, "pharmacy": 3, "consumer": 4}
+
+    def invoke(self, stub: _Stub, function: str, args: List[str]) -> str:
+        method = getattr(self, function, None) if not function.startswith("_") else None
+        if method is None:
+            raise ChaincodeError(f"You've asked to invoke a function that does not exist: {function}")
+        try:
+            inspect.signature(method).bind(stub, *args)
+        except TypeError:
+            raise ChaincodeError(f"Expected a different number of arguments for {function}")
+        return method(stub, *args)
+
+    # ---------- Utility methods ----------
+
+    @staticmethod
+    def _read_batch(stub: _Stub, batch_id: str) -> dict:
+        value = stub.get_state(batch_id)
+        if not value:
+            raise ChaincodeError(f"Batch {batch_id} does not exist")
+        return json.loads(value)
+
+    @staticmethod
+    def _write_batch(stub: _Stub, batch: dict) -> None:
+        stub.put_state(batch["batchId"], json.dumps(batch, separators=(",", ":")))
+
+    # ---------- Smart contract business methods ----------
+
+    def createBatch(self, stub, batchId, productName, manufactureDate, expiryDate,
+                    totalQuantity, unitDosage, unitPrice, ownerOrgId):
+        if stub.get_state(batchId):
+            raise ChaincodeError(f"Batch {batchId} already exists")
+
+        total_quantity = _parse_int(totalQuantity)
+        if total_quantity is None or total_quantity <= 0:
+            raise ChaincodeError("totalQuantity must be a positive integer")
+
+        unit_price = _parse_float(unitPrice)
+        if unit_price is None or unit_price <= 0:
+            raise ChaincodeError("unitPrice must be a positive number")
+
+        now = _iso(stub.timestamp)
+        batch = {
+            "batchId": batchId,
+            "productName": productName,
+            "manufactureDate": manufactureDate,
+            "expiryDate": expiryDate,
+            "totalQuantity": total_quantity,
+            "unitDosage": unitDosage,
+            "unitPrice": unit_price,
+            "status": "CREATED",
+            "ownerships": [{"orgId": ownerOrgId, "quantity": total_quantity}],
+            "lastTransfer": None,
+            "transfers": [],
+            "createdAt": now,
+            "updatedAt": now,
+        }
+
+        self._write_batch(stub, batch)
+        return json.dumps(batch)
+
+    def getBatch(self, stub, batchId):
+        return json.dumps(self._read_batch(stub, batchId))
+
+    def transferBatch(self, stub, batchId, fromOrgId, toOrgId, quantityStr, transferMetadataJson=None):
+        batch = self._read_batch(stub, batchId)
+
+        quantity = _parse_int(quantityStr)
+        if quantity is None or quantity <= 0:
+            raise ChaincodeError("Quantity must be a positive integer")
+
+        from_ownership = next((o for o in batch["ownerships"] if o["orgId"] == fromOrgId), None)
+        if from_ownership is None:
+            raise ChaincodeError(f"Organization {fromOrgId} does not own any of batch {batchId}")
+
+        if from_ownership["quantity"] < quantity:
+            raise ChaincodeError(
+                f"Insufficient quantity. {fromOrgId} owns {from_ownership['quantity']}, trying to transfer {quantity}"
+            )
+
+        self._validate_supply_chain_order(fromOrgId, toOrgId)
+
+        if batch.get("unitPrice") is None:
+            raise ChaincodeError("Unit price is not set - batch integrity compromised")
+
+        now = _iso(stub.timestamp)
+        metadata = {}
+        if transferMetadataJson:
+            try:
+                metadata = json.loads(transferMetadataJson)
+            except ValueError:
+                raise ChaincodeError("transferMetadataJson is not valid JSON")
+
+        transfer_record = {
+            "fromOrgId": fromOrgId,
+            "toOrgId": toOrgId,
+            "quantity": quantity,
+            "timestamp": now,
+            "metadata": metadata,
+        }
+
+        from_ownership["quantity"] -= quantity
+        if from_ownership["quantity"] == 0:
+            batch["ownerships"] = [o for o in batch["ownerships"] if o["orgId"] != fromOrgId]
+
+        to_ownership = next((o for o in batch["ownerships"] if o["orgId"] == toOrgId), None)
+        if to_ownership is not None:
+            to_ownership["quantity"] += quantity
+        else:
+            batch["ownerships"].append({"orgId": toOrgId, "quantity": quantity})
+
+        batch["status"] = "IN_TRANSIT"
+        batch["lastTransfer"] = transfer_record
+        batch["updatedAt"] = now
+
+        if not isinstance(batch.get("transfers"), list):
+            batch["transfers"] = []
+        batch["transfers"].append(transfer_record)
+
+        self._write_batch(stub, batch)
+        return json.dumps(batch)
+
+    def _validate_supply_chain_order(self, from_org_id: str, to_org_id: str) -> None:
+        def role(org_id):
+            lower = org_id.lower()
+            if "manufacturer" in lower:
+                return self._SUPPLY_CHAIN_ROLES["manufacturer"]
+            if "distributor" in lower:
+                return self._SUPPLY_CHAIN_ROLES["distributor"]
+            if "pharmacy" in lower or "pharmacist" in lower:
+                return self._SUPPLY_CHAIN_ROLES["pharmacy"]
+            if "consumer" in lower:
+                return self._SUPPLY_CHAIN_ROLES["consumer"]
+            return 0
+
+        from_role = role(from_org_id)
+        to_role = role(to_org_id)
+
+        if from_role == 0 or to_role == 0:
+            return
+
+        if to_role < from_role:
+            raise ChaincodeError(
+                f"Invalid supply chain order: cannot transfer from {from_org_id} (level {from_role}) "
+                f"to {to_org_id} (level {to_role}). "
+                "Transfers must go forward in the chain: manufacturer -> distributor -> pharmacy -> consumer"
+            )
+
+        if to_role - from_role > 1 and not (from_role == 1 and to_role == 3):
+            raise ChaincodeError(
+                f"Invalid supply chain order: cannot skip intermediate steps from {from_org_id} to {to_org_id}"
+            )
+
+    def markBatchDelivered(self, stub, batchId, deliveredToOrgId, quantityStr):
+        batch = self._read_batch(stub, batchId)
+
+        quantity = _parse_int(quantityStr)
+        if quantity is None or quantity <= 0:
+            raise ChaincodeError("Quantity must be a positive integer")
+
+        ownership = next((o for o in batch["ownerships"] if o["orgId"] == deliveredToOrgId), None)
+        if ownership is None:
+            raise ChaincodeError(
+                f"Cannot mark delivered: {deliveredToOrgId} does not own any of batch {batchId}"
+            )
+
+        if ownership["quantity"] < quantity:
+            raise ChaincodeError(
+                f"Cannot mark delivered: {deliveredToOrgId} owns {ownership['quantity']}, trying to deliver {quantity}"
+            )
+
+        ownership["quantity"] -= quantity
+        if ownership["quantity"] == 0:
+            batch["ownerships"] = [o for o in batch["ownerships"] if o["orgId"] != deliveredToOrgId]
+
+        if not batch["ownerships"]:
+            batch["status"] = "DELIVERED"
+
+        batch["updatedAt"] = _iso(stub.timestamp)
+
+        self._write_batch(stub, batch)
+        return json.dumps(batch)
+
+    def getBatchHistory(self, stub, batchId):
+        return json.dumps(self._read_history(stub, batchId, None))
+
+    def getBatchHistorySince(self, stub, batchId, sinceTxId):
+        if not sinceTxId:
+            raise ChaincodeError("sinceTxId is required")
+        return json.dumps(self._read_history(stub, batchId, sinceTxId))
+
+    def _read_history(self, stub, batch_id, since_tx_id):
+        if not stub.get_state(batch_id):
+            raise ChaincodeError(f"Batch {batch_id} does not exist")
+
+        history = []
+        for entry in stub.get_history_for_key(batch_id):
+            if since_tx_id and entry["txId"] == since_tx_id:
+                return history
+            history.append({**entry, "value": _loads(entry["value"])})
+
+        if since_tx_id:
+            raise ChaincodeError(f"Transaction {since_tx_id} is not part of the history of batch {batch_id}")
+        return history
+
+
+class FakeLedger:
+    """
+    In-memory stand-in for the channel: endorsing peers, orderer and
+    committing peer in one object.
+
+    Proposals are simulated against the committed state after
+    ``endorse_latency`` seconds and record a versioned read set. The orderer
+    cuts a block every ``commit_latency`` seconds (or at ``max_block_size``
+    transactions) and validates it like a peer: a transaction whose reads no
+    longer match the committed versions is invalidated with
+    MVCC_READ_CONFLICT, and ``mvcc_conflict_rate`` injects extra conflicts.
+    Committed blocks are decoded the same way the SDK delivers them, so the
+    ledger event listener works unchanged.
+
+    All state is touched from the Fabric event loop thread only.
+    """
+
+    def __init__(
+        self,
+        channel_name: str = "mychannel",
+        chaincode_name: str = "medicinecc",
+        endorse_latency: float = 0.0,
+        commit_latency: float = 0.0,
+        mvcc_conflict_rate: float = 0.0,
+        max_block_size: int = 500,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.channel_name = channel_name
+        self.chaincode_name = chaincode_name
+        self.endorse_latency = endorse_latency
+        self.commit_latency = commit_latency
+        self.mvcc_conflict_rate = mvcc_conflict_rate
+        self.max_block_size = max_block_size
+        self.contract = MedicineContractSimulator()
+
+        self.state: Dict[str, tuple] = {}  # key -> (value, (block, tx index))
+        self.history: Dict[str, List[dict]] = {}  # key -> entries, newest first
+        self.blocks: List[dict] = [self._genesis_block()]
+
+        self._random = random.Random(seed)
+        self._pending: List[tuple] = []
+        self._cut_handle = None
+        self._followers: List[asyncio.Event] = []
+
+        self.counters = {
+            "endorsed": 0,
+            "endorsement_failures": 0,
+            "committed": 0,
+            "mvcc_conflicts": 0,
+            "injected_conflicts": 0,
+        }
+
+    @property
+    def height(self) -> int:
+        return len(self.blocks)
+
+    def _genesis_block(self) -> dict:
+        # Block 0 holds the channel configuration, no endorser transactions
+        return {
+            "header": {"number": 0},
+            "data": {"data": [{"payload": {"header": {"channel_header": {"type": 1}}, "data": {}}}]},
+            "metadata": {"metadata": [[], [], []]},
+        }
+
+    # --------------------------------------------------------
+    # Endorsement
+    # --------------------------------------------------------
+    def simulate(self, function: str, args: List[str]) -> dict:
+        stub = _Stub(self, _now())
+        try:
+            result = self.contract.invoke(stub, function, [str(a) for a in args])
+        except ChaincodeError:
+            self.counters["endorsement_failures"] += 1
+            raise
+
+        self.counters["endorsed"] += 1
+        return {
+            "tx_id": uuid.uuid4().hex + uuid.uuid4().hex,
+            "function": function,
+            "args": [str(a) for a in args],
+            "timestamp": stub.timestamp,
+            "reads": stub.reads,
+            "writes": stub.writes,
+            "result": result,
+        }
+
+    async def endorse(self, function: str, args: List[str]) -> dict:
+        if self.endorse_latency:
+            await asyncio.sleep(self.endorse_latency)
+        return self.simulate(function, args)
+
+    # --------------------------------------------------------
+    # Ordering and commit
+    # --------------------------------------------------------
+    def order(self, transaction: dict) -> "asyncio.Future":
+        """
+        Queues an endorsed transaction for the next block; the returned
+        future resolves with its validation code once committed.
+        """
+        loop = asyncio.get_running_loop()
+        committed = loop.create_future()
+        self._pending.append((transaction, committed))
+
+        if len(self._pending) >= self.max_block_size:
+            self._cut_block()
+        elif self._cut_handle is None:
+            self._cut_handle = loop.call_later(self.commit_latency, self._cut_block)
+        return committed
+
+    def _cut_block(self) -> None:
+        if self._cut_handle is not None:
+            self._cut_handle.cancel()
+            self._cut_handle = None
+
+        pending, self._pending = self._pending[:self.max_block_size], self._pending[self.max_block_size:]
+        if not pending:
+            return
+        if self._pending:
+            self._cut_handle = asyncio.get_running_loop().call_later(self.commit_latency, self._cut_block)
+
+        number = len(self.blocks)
+        codes = []
+        for index, (tx, _) in enumerate(pending):
+            code = self._validate(tx)
+            codes.append(code)
+            if code == TX_VALIDATION_VALID:
+                self._apply(tx, (number, index))
+
+        block = self._build_block(number, [tx for tx, _ in pending], codes)
+        self.blocks.append(block)
+
+        for (_, committed), code in zip(pending, codes):
+            if not committed.done():
+                committed.set_result(code)
+        for follower in self._followers:
+            follower.set()
+
+    def _validate(self, tx: dict) -> int:
+        for key, version in tx["reads"].items():
+            current = self.state.get(key, (None, None))[1]
+            if current != version:
+                self.counters["mvcc_conflicts"] += 1
+                return TX_VALIDATION_MVCC_READ_CONFLICT
+
+        if tx["writes"] and self.mvcc_conflict_rate and self._random.random() < self.mvcc_conflict_rate:
+            self.counters["mvcc_conflicts"] += 1
+            self.counters["injected_conflicts"] += 1
+            return TX_VALIDATION_MVCC_READ_CONFLICT
+
+        self.counters["committed"] += 1
+        return TX_VALIDATION_VALID
+
+    def _apply(self, tx: dict, version: tuple) -> None:
+        for key, value in tx["writes"].items():
+            self.state[key] = (value, version)
+            self.history.setdefault(key, []).insert(0, {
+                "txId": tx["tx_id"],
+                "timestamp": _iso(tx["timestamp"].replace(microsecond=0)),
+                "value": value,
+                "isDelete": False,
+            })
+
+    def _build_block(self, number: int, transactions: List[dict], codes: List[int]) -> dict:
+        envelopes = []
+        for tx in transactions:
+            envelopes.append({
+                "payload": {
+                    "header": {
+                        "channel_header": {
+                            "type": 3,
+                            "channel_id": self.channel_name,
+                            "tx_id": tx["tx_id"],
+                            "timestamp": {"seconds": int(tx["timestamp"].timestamp())},
+                        }
+                    },
+                    "data": {
+                        "actions": [{
+                            "payload": {
+                                "chaincode_proposal_payload": {"input": {"chaincode_spec": {
+                                    "chaincode_id": {"name": self.chaincode_name},
+                                    "input": {"args": [tx["function"].encode("utf-8")]
+                                              + [a.encode("utf-8") for a in tx["args"]]},
+                                }}},
+                                "action": {"proposal_response_payload": {"extension": {"results": {
+                                    "ns_rwset": [{
+                                        "namespace": self.chaincode_name,
+                                        "rwset": {
+                                            "reads": [{"key": k} for k in tx["reads"]],
+                                            "writes": [
+                                                {"key": k, "is_delete": False, "value": v.encode("utf-8")}
+                                                for k, v in tx["writes"].items()
+                                            ],
+                                        },
+                                    }],
+                                }}}},
+                            }
+                        }]
+                    },
+                }
+            })
+
+        return {
+            "header": {"number": number},
+            "data": {"data": envelopes},
+            "metadata": {"metadata": [[], [], codes]},
+        }
+
+    async def follow(self, on_block, start_block: Optional[int] = None) -> None:
+        """
+        Delivers committed blocks from ``start_block`` (default: only new
+        ones) until cancelled, like a channel event hub.
+        """
+        wake = asyncio.Event()
+        self._followers.append(wake)
+        next_block = self.height if start_block is None else start_block
+        try:
+            while True:
+                wake.clear()
+                while next_block < self.height:
+                    on_block(self.blocks[next_block])
+                    next_block += 1
+                await wake.wait()
+        finally:
+            self._followers.remove(wake)
+
+    def stats(self) -> dict:
+        return {"height": self.height, "keys": len(self.state), **self.counters}
+
+
+class FakeFabricClient:
+    """
+    Drop-in replacement for FabricClient backed by a FakeLedger, selected
+    with FABRIC_BACKEND=fake. Pool members share one ledger, so the whole
+    process sees a single channel.
+
+    Coroutines always run on the background event loop; ``loop_mode`` does
+    not apply.
+    """
+
+    def __init__(self, ledger: FakeLedger, contract_name: str = "MedicineContract") -> None:
+        self.ledger = ledger
+        self.channel_name = ledger.channel_name
+        self.chaincode_name = ledger.chaincode_name
+        self.contract_name = contract_name
+
+    async def evaluate_transaction(self, fcn: str, args: list[str]):
+        if self.ledger.endorse_latency:
+            await asyncio.sleep(self.ledger.endorse_latency)
+        stub = _Stub(self.ledger, _now())
+        return _loads(self.ledger.contract.invoke(stub, fcn, [str(a) for a in args]))
+
+    async def submit_transaction(self, fcn: str, args: list[str]):
+        tx = await self.ledger.endorse(fcn, args)
+        code = await self.ledger.order(tx)
+        if code != TX_VALIDATION_VALID:
+            raise RuntimeError(
+                f"Transaction {tx['tx_id']} failed to commit: {TX_VALIDATION_CODES.get(code, code)}"
+            )
+        return _loads(tx["result"])
+
+    async def broadcast_transaction(self, fcn: str, args: list[str]):
+        tx = await self.ledger.endorse(fcn, args)
+        self.ledger.order(tx)
+        return {"tx_id": tx["tx_id"], "result": _loads(tx["result"])}
+
+    async def ping_transaction(self):
+        return {"height": self.ledger.height}
+
+    async def query_height(self) -> int:
+        return self.ledger.height
+
+    async def listen_blocks(self, on_block, start_block=None):
+        await self.ledger.follow(on_block, start_block=start_block)
+
+    # --------------------------------------------------------
+    # Public async wrappers (thread-safe futures)
+    # --------------------------------------------------------
+    def evaluate_async(self, function: str, args: list[str]) -> Future:
+        return get_event_loop_thread().submit(self.evaluate_transaction(function, args))
+
+    def submit_async(self, function: str, args: list[str]) -> Future:
+        return get_event_loop_thread().submit(self.submit_transaction(function, args))
+
+    def broadcast_async(self, function: str, args: list[str]) -> Future:
+        return get_event_loop_thread().submit(self.broadcast_transaction(function, args))
+
+    def ping_async(self) -> Future:
+        return get_event_loop_thread().submit(self.ping_transaction())
+
+    # --------------------------------------------------------
+    # Public sync wrappers
+    # --------------------------------------------------------
+    def evaluate(self, function: str, args: list[str]):
+        return get_event_loop_thread().run(self.evaluate_transaction(function, args))
+
+    def submit(self, function: str, args: list[str]):
+        return get_event_loop_thread().run(self.submit_transaction(function, args))
+
+    def broadcast(self, function: str, args: list[str]):
+        return get_event_loop_thread().run(self.broadcast_transaction(function, args))
+
+    def height(self) -> int:
+        return get_event_loop_thread().run(self.query_height())
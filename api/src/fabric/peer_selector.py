@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+def discover_peers(ccp_path: str, channel_name: str) -> dict:
+    """
+    Reads the peers of ``channel_name`` and their roles from the connection
+    profile.
+
+    Returns ``{"endorsing": {org: [peer, ...]}, "query": [...], "events": [...]}``.
+    Peers the profile does not list under the channel default to every role,
+    like the SDK does.
+    """
+    # PyYAML ships with the Fabric SDK; only needed once a client is built
+    import yaml
+
+    with open(ccp_path, "r") as f:
+        profile = yaml.safe_load(f) or {}
+
+    channel_peers = ((profile.get("channels") or {}).get(channel_name) or {}).get("peers")
+    if not channel_peers:
+        channel_peers = {name: {} for name in profile.get("peers") or {}}
+
+    org_of = {}
+    for org, spec in (profile.get("organizations") or {}).items():
+        for peer in (spec or {}).get("peers") or []:
+            org_of[peer] = org
+
+    roles = {"endorsing": {}, "query": [], "events": []}
+    for peer, options in channel_peers.items():
+        options = options or {}
+        if options.get("endorsingPeer", True):
+            roles["endorsing"].setdefault(org_of.get(peer, peer), []).append(peer)
+        if options.get("chaincodeQuery", True):
+            roles["query"].append(peer)
+        if options.get("eventSource", True):
+            roles["events"].append(peer)
+
+    if not roles["query"]:
+        raise RuntimeError(f"No chaincode query peers for channel {channel_name} in {ccp_path}")
+    return roles
+
+
+class PeerStats:
+    def __init__(self, window: int) -> None:
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.hedged = 0
+        self.consecutive_errors = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.latency_ewma = 0.0
+        self.latencies = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "hedged": self.hedged,
+            "ejected": self.ejected_until > time.monotonic(),
+            "ejections": self.ejections,
+            "latency_ms": {
+                "p50": _percentile(latencies, 0.5) * 1000 if latencies else None,
+                "p95": _percentile(latencies, 0.95) * 1000 if latencies else None,
+                "p99": _percentile(latencies, 0.99) * 1000 if latencies else None,
+            },
+        }
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+class PeerSelector:
+    """
+    Spreads requests over a set of peers and keeps per-peer statistics.
+
+    ``pick`` returns the peer with the fewest requests in flight, breaking
+    ties by a moving average of its latency and then round-robin, so a slow
+    peer naturally receives less traffic. ``hedge_delay`` is the latency
+    percentile across all peers after which a read should be duplicated to
+    a second peer; it is None until ``min_samples`` latencies were seen or
+    when hedging is disabled (``hedge_percentile`` of 0).
+
+    A peer that fails ``eject_after`` requests in a row (fast failures
+    would otherwise make it look like the least loaded peer) is ejected
+    for ``eject_seconds``: it is not picked until then, unless every
+    candidate is ejected.
+    """
+
+    def __init__(
+        self,
+        peers: Iterable[str],
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.005,
+        window: int = 256,
+        min_samples: int = 20,
+        eject_after: int = 5,
+        eject_seconds: float = 30.0,
+    ) -> None:
+        self.peers = list(peers)
+        if not self.peers:
+            raise ValueError("PeerSelector needs at least one peer")
+
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.min_samples = min_samples
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._stats: Dict[str, PeerStats] = {p: PeerStats(window) for p in self.peers}
+        self._recent = deque(maxlen=window)
+        self._hedge_delay: Optional[float] = None
+        self._since_refresh = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def pick(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        with self._lock:
+            candidates = [p for p in self.peers if p not in exclude]
+            if not candidates:
+                return None
+            now = time.monotonic()
+            candidates = [p for p in candidates if self._stats[p].ejected_until <= now] or candidates
+            offset = self._next % len(candidates)
+            self._next += 1
+            rotated = candidates[offset:] + candidates[:offset]
+            return min(rotated, key=lambda p: (self._stats[p].outstanding, self._stats[p].latency_ewma))
+
+    def pick_per_group(self, groups: Dict[str, List[str]]) -> List[str]:
+        """
+        Picks the least loaded peer of every group (e.g. one per organization).
+        """
+        return [self.pick(exclude=set(self.peers) - set(members)) for members in groups.values()]
+
+    # --------------------------------------------------------
+    # Request accounting
+    # --------------------------------------------------------
+    def begin(self, peer: str, hedged: bool = False) -> float:
+        with self._lock:
+            stats = self._stats[peer]
+            stats.outstanding += 1
+            stats.requests += 1
+            if hedged:
+                stats.hedged += 1
+        return time.monotonic()
+
+    def end(self, peer: str, started: float, error: bool = False, cancelled: bool = False) -> None:
+        elapsed = time.monotonic() - started
+        with self._lock:
+            stats = self._stats[peer]
+            stats.outstanding -= 1
+            if error:
+                stats.errors += 1
+                stats.consecutive_errors += 1
+                if self.eject_after and stats.consecutive_errors >= self.eject_after:
+                    stats.ejected_until = time.monotonic() + self.eject_seconds
+                    stats.ejections += 1
+                    stats.consecutive_errors = 0
+            if error or cancelled:
+                return
+            stats.consecutive_errors = 0
+            stats.latencies.append(elapsed)
+            stats.latency_ewma = elapsed if stats.latency_ewma == 0.0 else 0.8 * stats.latency_ewma + 0.2 * elapsed
+            self._recent.append(elapsed)
+            self._since_refresh += 1
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge_percentile or len(self.peers) < 2:
+            return None
+        with self._lock:
+            if len(self._recent) < self.min_samples:
+                return None
+            # Sorting the window on every read would dominate fast queries
+            if self._hedge_delay is None or self._since_refresh >= 16:
+                self._hedge_delay = max(
+                    self.hedge_min_delay, _percentile(sorted(self._recent), self.hedge_percentile)
+                )
+                self._since_refresh = 0
+            return self._hedge_delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hedge_percentile": self.hedge_percentile,
+                "hedge_delay_ms": self._hedge_delay * 1000 if self._hedge_delay is not None else None,
+                "peers": {peer: stats.snapshot() for peer, stats in self._stats.items()},
+            }
@@ -0,0 +1,132 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from config.cache_config import get_cache
+from src.repositories.blockchain_repository import BATCH_WRITE_FUNCTIONS
+
+TX_STATUS_PENDING = "PENDING"
+TX_STATUS_VALID = "VALID"
+TX_STATUS_INVALID = "INVALID"
+
+
+class TransactionTracker:
+    """
+    Commit status of ledger transactions, keyed by tx id.
+
+    Transactions submitted without waiting for commit are recorded as
+    PENDING; the ledger event listener then stores the outcome of every
+    committed batch transaction, so with a shared (Redis) cache any worker
+    can answer for any tx id.
+
+    ``on_valid`` callbacks are kept in the submitting process only and run
+    once, when its own listener sees the transaction commit as VALID. They
+    touch the database, so they run on a small worker pool rather than on
+    the Fabric event loop that delivers the commit.
+    """
+
+    def __init__(self, cache=None) -> None:
+        self.cache = cache if cache is not None else get_cache(
+            "tx_status", default_max_size=100000, default_ttl=86400
+        )
+        self._on_valid: Dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+        self._callbacks: Optional[ThreadPoolExecutor] = None
+
+    def track(self, tx_id: str, function: str, batch_id: Optional[str],
+              on_valid: Optional[Callable[[], None]] = None) -> dict:
+        with self._lock:
+            record = self._track(tx_id, function, batch_id)
+            if on_valid is not None and record["status"] == TX_STATUS_PENDING:
+                self._on_valid[tx_id] = on_valid
+                on_valid = None
+
+        if on_valid is not None and record["status"] == TX_STATUS_VALID:
+            on_valid()
+        return record
+
+    def _track(self, tx_id: str, function: str, batch_id: Optional[str]) -> dict:
+        existing = self.cache.get(tx_id)
+        if existing is not None and existing["status"] != TX_STATUS_PENDING:
+            # The commit event won the race against the submitting request
+            return existing
+
+        record = {
+            "tx_id": tx_id,
+            "function": function,
+            "batch_id": batch_id,
+            "status": TX_STATUS_PENDING,
+            "validation_code": None,
+            "block_number": None,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "committed_at": None,
+        }
+        self.cache.set(tx_id, record)
+        return record
+
+    def get(self, tx_id: str) -> Optional[dict]:
+        return self.cache.get(tx_id)
+
+    def get_many(self, tx_ids: List[str]) -> Dict[str, Optional[dict]]:
+        return {tx_id: self.cache.get(tx_id) for tx_id in tx_ids}
+
+    def on_ledger_event(self, event) -> None:
+        if not event.tx_id or event.function not in BATCH_WRITE_FUNCTIONS:
+            return
+
+        with self._lock:
+            record = self.cache.get(event.tx_id) or {
+                "tx_id": event.tx_id,
+                "function": event.function,
+                "batch_id": event.args[0] if event.args else None,
+                "submitted_at": None,
+            }
+            record.update({
+                "status": TX_STATUS_VALID if event.valid else TX_STATUS_INVALID,
+                "validation_code": event.validation_name,
+                "block_number": event.block_number,
+                "committed_at": event.timestamp,
+            })
+            self.cache.set(event.tx_id, record)
+            on_valid = self._on_valid.pop(event.tx_id, None)
+
+        if on_valid is not None and event.valid:
+            self._run_callback(on_valid)
+
+    def _run_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if self._callbacks is None:
+                self._callbacks = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tx-on-valid")
+        self._callbacks.submit(_call, callback)
+
+
+def _call(callback: Callable[[], None]) -> None:
+    try:
+        callback()
+    except Exception as e:
+        print(f"Warning: Commit callback failed: {str(e)}")
+
+
+_tracker: Optional[TransactionTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_transaction_tracker() -> TransactionTracker:
+    global _tracker
+
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = TransactionTracker()
+        return _tracker
+
+
+def _reset_after_fork() -> None:
+    global _tracker, _tracker_lock
+    _tracker = None
+    _tracker_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,159 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Validation codes that mean "another transaction changed what this one read"
+CONFLICT_CODES = ("MVCC_READ_CONFLICT", "PHANTOM_READ_CONFLICT")
+
+
+class WriteConflictError(RuntimeError):
+    """
+    Raised when a write still conflicts after every retry.
+    """
+
+
+def is_conflict(error: Exception) -> bool:
+    message = str(error)
+    return any(code in message for code in CONFLICT_CODES)
+
+
+class _KeyTurn:
+    """
+    FIFO turn-taking for one key: callers draw a ticket and wait until it
+    is served, so same-key writes run one at a time in arrival order.
+    """
+
+    __slots__ = ("condition", "next_ticket", "serving")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.condition = threading.Condition(lock)
+        self.next_ticket = 0
+        self.serving = 0
+
+
+class WriteScheduler:
+    """
+    Serializes ledger writes per key and retries MVCC conflicts.
+
+    Writes to the same key (a batch_id) queue up and are submitted one after
+    the other, each waiting for the previous one to commit, so they never
+    endorse against state that is about to change. Writes to different keys
+    proceed in parallel. Conflicts that still happen (other API processes,
+    other clients of the channel) are retried up to ``max_retries`` times
+    with full-jitter exponential backoff before WriteConflictError is raised.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.05, max_delay: float = 1.0) -> None:
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._turns: Dict[str, _KeyTurn] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._random = random.Random()
+
+    # --------------------------------------------------------
+    # Per-key ordering
+    # --------------------------------------------------------
+    def _enter(self, key: str) -> None:
+        with self._lock:
+            turn = self._turns.get(key)
+            if turn is None:
+                turn = self._turns[key] = _KeyTurn(self._lock)
+            ticket = turn.next_ticket
+            turn.next_ticket += 1
+            while turn.serving != ticket:
+                turn.condition.wait()
+
+    def _leave(self, key: str) -> None:
+        with self._lock:
+            turn = self._turns[key]
+            turn.serving += 1
+            if turn.serving == turn.next_ticket:
+                del self._turns[key]
+            else:
+                turn.condition.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _count(self, function: str, name: str, value: float = 1) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(function, {
+                "submitted": 0, "conflicts": 0, "retries": 0, "exhausted": 0, "queue_wait_seconds": 0.0,
+            })
+            stats[name] += value
+
+    # --------------------------------------------------------
+    # Submission
+    # --------------------------------------------------------
+    def run(self, function: str, key: str, submit: Callable[[], object], retry: bool = True):
+        """
+        Runs ``submit`` once it is the oldest pending write for ``key``,
+        retrying it on MVCC conflicts when ``retry`` is set.
+        """
+        queued_at = time.monotonic()
+        self._enter(key)
+        try:
+            self._count(function, "submitted")
+            self._count(function, "queue_wait_seconds", time.monotonic() - queued_at)
+
+            attempt = 0
+            while True:
+                try:
+                    return submit()
+                except Exception as e:
+                    if not is_conflict(e):
+                        raise
+                    self._count(function, "conflicts")
+                    if not retry or attempt >= self.max_retries:
+                        self._count(function, "exhausted")
+                        raise WriteConflictError(
+                            f"{function} on {key} kept conflicting with concurrent writes"
+                        ) from e
+                    attempt += 1
+                    self._count(function, "retries")
+                    time.sleep(self._backoff(attempt))
+        finally:
+            self._leave(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_retries": self.max_retries,
+                "queued_keys": len(self._turns),
+                "functions": {name: dict(stats) for name, stats in self._stats.items()},
+            }
+
+
+_scheduler: Optional[WriteScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_write_scheduler() -> WriteScheduler:
+    """
+    Returns the per-process write scheduler.
+    """
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WriteScheduler(
+                max_retries=int(os.getenv("FABRIC_WRITE_MAX_RETRIES", "3")),
+                base_delay=float(os.getenv("FABRIC_WRITE_RETRY_BASE_DELAY", "0.05")),
+                max_delay=float(os.getenv("FABRIC_WRITE_RETRY_MAX_DELAY", "1.0")),
+            )
+        return _scheduler
+
+
+def _reset_after_fork() -> None:
+    global _scheduler, _scheduler_lock
+    _scheduler = None
+    _scheduler_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
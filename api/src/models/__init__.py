@@ -4,3 +4,10 @@ import src.models.inventory_model
 import src.models.medication_request_model
 import src.models.notification_model
 import src.models.blockchain_model
+import src.models.batch_mirror_model
+import src.models.outbox_model
+import src.models.reconciliation_model
+import src.models.scan_model
+import src.models.anomaly_model
+import src.models.lead_time_model
+import src.models.consistency_model
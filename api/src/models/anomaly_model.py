@@ -0,0 +1,48 @@
+import uuid
+from config.database import db, ma
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class TransferAnomaly(db.Model):
+    """A transfer or delivery event the anomaly detector flagged."""
+    __tablename__ = 'transfer_anomaly'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tx_id = db.Column(db.String(64), nullable=False, unique=True)
+    block_number = db.Column(db.BigInteger, nullable=False)
+    function = db.Column(db.String(50), nullable=False)  # transferBatch, markBatchDelivered
+    batch_id = db.Column(db.String(100), nullable=False)
+    org_id = db.Column(db.String(100), nullable=False)  # sender, or the delivering organization
+    counterparty_org_id = db.Column(db.String(100), nullable=True)  # receiver of a transfer
+    quantity = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    features = db.Column(db.JSON, nullable=False)
+    reasons = db.Column(db.JSON, nullable=False)
+    detected_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    __table_args__ = (
+        db.Index('ix_transfer_anomaly_detected_at_id', 'detected_at', 'id'),
+        db.Index('ix_transfer_anomaly_batch_id', 'batch_id'),
+        db.Index('ix_transfer_anomaly_org_id_detected_at', 'org_id', 'detected_at'),
+    )
+
+    def __repr__(self):
+        return f"<TransferAnomaly {self.function} {self.batch_id} - {self.score:.1f}>"
+
+
+class TransferAnomalyOutput(ma.Schema):
+    id = ma.UUID()
+    tx_id = ma.String()
+    block_number = ma.Integer()
+    function = ma.String()
+    batch_id = ma.String()
+    org_id = ma.String()
+    counterparty_org_id = ma.String()
+    quantity = ma.Integer()
+    score = ma.Float()
+    features = ma.Raw()
+    reasons = ma.Raw()
+    detected_at = ma.DateTime()
+
+
+transfer_anomalies_output = TransferAnomalyOutput(many=True)
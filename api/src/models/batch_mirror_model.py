@@ -0,0 +1,127 @@
+from config.database import db, ma
+from datetime import datetime, timezone
+
+
+class LedgerBatch(db.Model):
+    """Off-chain copy of a ledger batch, maintained by the ledger indexer."""
+    __tablename__ = 'batch'
+    batch_id = db.Column(db.String(100), primary_key=True)
+    product_name = db.Column(db.String(255), nullable=False)
+    manufacture_date = db.Column(db.Date, nullable=True)
+    expiry_date = db.Column(db.Date, nullable=True)
+    total_quantity = db.Column(db.Integer, nullable=False)
+    unit_dosage = db.Column(db.String(100), nullable=False)
+    unit_price = db.Column(db.Numeric(10, 2), nullable=True)
+    status = db.Column(db.String(20), nullable=False)  # CREATED, IN_TRANSIT, DELIVERED
+    created_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    last_tx_id = db.Column(db.String(64), nullable=False)
+    last_block = db.Column(db.BigInteger, nullable=False)
+
+    # Relationship
+    ownerships = db.relationship('BatchOwnership', backref='batch', lazy='selectin', cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_batch_product_name_batch_id', 'product_name', 'batch_id'),
+        db.Index('ix_batch_expiry_date_batch_id', 'expiry_date', 'batch_id'),
+        db.Index('ix_batch_status_batch_id', 'status', 'batch_id'),
+    )
+
+    def __repr__(self):
+        return f"<LedgerBatch {self.batch_id} - {self.status}>"
+
+
+class BatchOwnership(db.Model):
+    __tablename__ = 'batch_ownership'
+    batch_id = db.Column(db.String(100), db.ForeignKey('batch.batch_id', ondelete='CASCADE'), primary_key=True)
+    org_id = db.Column(db.String(100), primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_batch_ownership_org_id_batch_id', 'org_id', 'batch_id'),
+    )
+
+    def __repr__(self):
+        return f"<BatchOwnership {self.batch_id} - {self.org_id}: {self.quantity}>"
+
+
+class BatchTransfer(db.Model):
+    __tablename__ = 'batch_transfer'
+    tx_id = db.Column(db.String(64), primary_key=True)
+    batch_id = db.Column(db.String(100), db.ForeignKey('batch.batch_id', ondelete='CASCADE'), nullable=False)
+    from_org_id = db.Column(db.String(100), nullable=False)
+    to_org_id = db.Column(db.String(100), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    transferred_at = db.Column(db.DateTime, nullable=False)
+    block_number = db.Column(db.BigInteger, nullable=False)
+    transfer_metadata = db.Column(db.JSON, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_batch_transfer_batch_id_transferred_at', 'batch_id', 'transferred_at'),
+        db.Index('ix_batch_transfer_from_org_id_transferred_at', 'from_org_id', 'transferred_at'),
+        db.Index('ix_batch_transfer_to_org_id_transferred_at', 'to_org_id', 'transferred_at'),
+    )
+
+    def __repr__(self):
+        return f"<BatchTransfer {self.batch_id} {self.from_org_id} -> {self.to_org_id}>"
+
+
+class LedgerCheckpoint(db.Model):
+    __tablename__ = 'ledger_checkpoint'
+    name = db.Column(db.String(100), primary_key=True)
+    block_number = db.Column(db.BigInteger, nullable=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<LedgerCheckpoint {self.name} @ {self.block_number}>"
+
+
+class LedgerDeadLetter(db.Model):
+    """A committed transaction a ledger consumer gave up on applying."""
+    __tablename__ = 'ledger_dead_letter'
+    consumer = db.Column(db.String(100), primary_key=True)  # checkpoint name of the consumer
+    tx_id = db.Column(db.String(64), primary_key=True)
+    block_number = db.Column(db.BigInteger, nullable=False)
+    function = db.Column(db.String(100), nullable=True)
+    args = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<LedgerDeadLetter {self.consumer} {self.tx_id} @ {self.block_number}>"
+
+
+class BatchOwnershipOutput(ma.Schema):
+    org_id = ma.String()
+    quantity = ma.Integer()
+
+
+class LedgerBatchOutput(ma.Schema):
+    batch_id = ma.String()
+    product_name = ma.String()
+    manufacture_date = ma.Date()
+    expiry_date = ma.Date()
+    total_quantity = ma.Integer()
+    unit_dosage = ma.String()
+    unit_price = ma.Decimal(as_string=True)
+    status = ma.String()
+    ownerships = ma.List(ma.Nested(BatchOwnershipOutput))
+    created_at = ma.DateTime()
+    updated_at = ma.DateTime()
+    last_tx_id = ma.String()
+    last_block = ma.Integer()
+
+
+class BatchTransferOutput(ma.Schema):
+    tx_id = ma.String()
+    batch_id = ma.String()
+    from_org_id = ma.String()
+    to_org_id = ma.String()
+    quantity = ma.Integer()
+    transferred_at = ma.DateTime()
+    block_number = ma.Integer()
+    transfer_metadata = ma.Dict(data_key='metadata')
+
+
+ledger_batches_output = LedgerBatchOutput(many=True)
+batch_transfers_output = BatchTransferOutput(many=True)
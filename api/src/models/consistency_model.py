@@ -0,0 +1,82 @@
+import uuid
+from config.database import db, ma
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class ConsistencyRun(db.Model):
+    """One pass of the volume consistency checker over every ledger batch history."""
+    __tablename__ = 'consistency_run'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed
+    workers = db.Column(db.Integer, nullable=False, default=1)
+    batches_checked = db.Column(db.Integer, nullable=False, default=0)
+    batches_failed = db.Column(db.Integer, nullable=False, default=0)
+    violation_count = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    started_by = db.Column(UUID(as_uuid=True), db.ForeignKey('user.id'), nullable=True)
+    started_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ConsistencyRun {self.id} - {self.status}>"
+
+
+class ConsistencyViolation(db.Model):
+    """
+    A ledger write that breaks volume conservation, with the offending
+    transaction and the quantities expected from the batch's running balance.
+    """
+    __tablename__ = 'consistency_violation'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_id = db.Column(UUID(as_uuid=True), db.ForeignKey('consistency_run.id', ondelete='CASCADE'), nullable=False)
+    batch_id = db.Column(db.String(100), nullable=False)
+    kind = db.Column(db.String(30), nullable=False)  # total_changed, transfer_exceeds_balance, unexplained_change, negative_ownership, conservation
+    tx_id = db.Column(db.String(64), nullable=True)
+    tx_timestamp = db.Column(db.String(40), nullable=True)
+    org_id = db.Column(db.String(100), nullable=True)
+    counterparty_org_id = db.Column(db.String(100), nullable=True)
+    quantity = db.Column(db.Integer, nullable=True)
+    expected = db.Column(db.Integer, nullable=True)
+    actual = db.Column(db.Integer, nullable=True)
+    detail = db.Column(db.Text, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_consistency_violation_run_id_batch_id_id', 'run_id', 'batch_id', 'id'),
+        db.Index('ix_consistency_violation_run_id_kind', 'run_id', 'kind'),
+    )
+
+    def __repr__(self):
+        return f"<ConsistencyViolation {self.batch_id} - {self.kind}>"
+
+
+class ConsistencyRunOutput(ma.Schema):
+    id = ma.UUID()
+    status = ma.String()
+    workers = ma.Integer()
+    batches_checked = ma.Integer()
+    batches_failed = ma.Integer()
+    violation_count = ma.Integer()
+    error = ma.String()
+    started_by = ma.UUID()
+    started_at = ma.DateTime()
+    finished_at = ma.DateTime()
+
+
+class ConsistencyViolationOutput(ma.Schema):
+    id = ma.UUID()
+    batch_id = ma.String()
+    kind = ma.String()
+    tx_id = ma.String()
+    tx_timestamp = ma.String()
+    org_id = ma.String()
+    counterparty_org_id = ma.String()
+    quantity = ma.Integer()
+    expected = ma.Integer()
+    actual = ma.Integer()
+    detail = ma.String()
+
+
+consistency_run_output = ConsistencyRunOutput()
+consistency_runs_output = ConsistencyRunOutput(many=True)
+consistency_violations_output = ConsistencyViolationOutput(many=True)
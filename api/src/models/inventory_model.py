@@ -14,8 +14,9 @@ class Inventory(db.Model):
     available_quantity = db.Column(db.Integer, nullable=False, default=0)
     reserved_quantity = db.Column(db.Integer, nullable=False, default=0)
     unit_dosage = db.Column(db.String(100), nullable=False)
-    manufacture_date = db.Column(db.String(50), nullable=False)
-    expiry_date = db.Column(db.String(50), nullable=False)
+    # NULL where a legacy free-form value was not a date
+    manufacture_date = db.Column(db.Date, nullable=True)
+    expiry_date = db.Column(db.Date, nullable=True)
     unit_price = db.Column(db.Numeric(10, 2), nullable=False)
     status = db.Column(db.String(20), nullable=False, default='available')  # available, low_stock, out_of_stock
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
@@ -23,6 +24,19 @@ class Inventory(db.Model):
     
     # Relationship
     organization = db.relationship('Organization', backref='inventory_items')
+
+    __table_args__ = (
+        db.Index('ix_inventory_batch_id', 'batch_id'),
+        db.Index('ix_inventory_organization_id_created_at_id', organization_id, created_at.desc(), id.desc()),
+        # Product search (substring and similarity); a plain index outside PostgreSQL
+        db.Index(
+            'ix_inventory_product_name_trgm', 'product_name',
+            postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'},
+        ),
+        db.Index('ix_inventory_updated_at', 'updated_at'),
+        # FEFO allocation: a product's batches, soonest expiring first
+        db.Index('ix_inventory_product_name_unit_dosage_expiry_date', 'product_name', 'unit_dosage', 'expiry_date'),
+    )
     
     def __repr__(self):
         return f"<Inventory {self.product_name} - {self.batch_id}>"
@@ -41,8 +55,8 @@ class InventoryOutput(ma.Schema):
     reserved_quantity = ma.Integer()
     total_quantity = ma.Integer()
     unit_dosage = ma.String()
-    manufacture_date = ma.String()
-    expiry_date = ma.String()
+    manufacture_date = ma.Date()
+    expiry_date = ma.Date()
     unit_price = ma.Decimal(as_string=True)
     status = ma.String()
     created_at = ma.DateTime()
@@ -55,8 +69,8 @@ class InventoryInputCreate(ma.Schema):
     product_name = ma.String(required=True, validate=validate.Length(min=3, max=255))
     available_quantity = ma.Integer(required=True, validate=validate.Range(min=0))
     unit_dosage = ma.String(required=True, validate=validate.Length(min=1, max=100))
-    manufacture_date = ma.String(required=True)
-    expiry_date = ma.String(required=True)
+    manufacture_date = ma.Date(required=True)
+    expiry_date = ma.Date(required=True)
     unit_price = ma.Decimal(required=True, as_string=True)
 
 
@@ -66,7 +80,18 @@ class InventoryInputUpdate(ma.Schema):
     status = ma.String(validate=validate.OneOf(['available', 'low_stock', 'out_of_stock']))
 
 
+class ReservationLineInput(ma.Schema):
+    batch_id = ma.String(required=True, validate=validate.Length(min=1, max=100))
+    quantity = ma.Integer(required=True, validate=validate.Range(min=1))
+
+
+class InventoryReservationInput(ma.Schema):
+    organization_id = ma.UUID()
+    lines = ma.List(ma.Nested(ReservationLineInput), required=True, validate=validate.Length(min=1, max=100))
+
+
 inventory_output = InventoryOutput()
 inventories_output = InventoryOutput(many=True)
 inventory_input_create = InventoryInputCreate()
 inventory_input_update = InventoryInputUpdate()
+inventory_reservation_input = InventoryReservationInput()
@@ -0,0 +1,26 @@
+from config.database import db
+
+
+class LeadTimeDaily(db.Model):
+    """
+    Lead times of one day for one route or organization: the count, the
+    summed hours and a histogram over the lead-time buckets (int32 counts),
+    which add up across days for the dashboard's medians and p95s.
+    """
+    __tablename__ = 'lead_time_daily'
+    source = db.Column(db.String(20), primary_key=True)  # transfer, request
+    scope = db.Column(db.String(10), primary_key=True)  # route, org
+    org_id = db.Column(db.String(100), primary_key=True)
+    counterparty_org_id = db.Column(db.String(100), primary_key=True, default='')  # route target; '' for org scope
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    total_hours = db.Column(db.Float, nullable=False)
+    histogram = db.Column(db.LargeBinary, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_lead_time_daily_source_scope_day', 'source', 'scope', 'day'),
+        db.Index('ix_lead_time_daily_day', 'day'),
+    )
+
+    def __repr__(self):
+        return f"<LeadTimeDaily {self.source}/{self.scope} {self.org_id} {self.day}>"
@@ -36,11 +36,49 @@ class MedicationRequest(db.Model):
     consumer = db.relationship('User', foreign_keys=[consumer_id], backref='medication_requests')
     approver = db.relationship('User', foreign_keys=[approved_by])
     assigned_manufacturer = db.relationship('Organization', backref='assigned_requests')
+    allocations = db.relationship(
+        'MedicationRequestAllocation', backref='medication_request', lazy='selectin',
+        order_by='MedicationRequestAllocation.line_number'
+    )
+
+    __table_args__ = (
+        db.Index('ix_medication_request_consumer_id_created_at_id', consumer_id, created_at.desc(), id.desc()),
+        db.Index('ix_medication_request_status_created_at_id', status, created_at, id),
+        db.Index(
+            'ix_medication_request_assigned_manufacturer_id_created_at_id',
+            assigned_manufacturer_id, created_at.desc(), id.desc()
+        ),
+    )
     
     def __repr__(self):
         return f"<MedicationRequest {self.request_number} - {self.status}>"
 
 
+class MedicationRequestAllocation(db.Model):
+    """One batch an approved request draws from; FEFO splits a request across several."""
+    __tablename__ = 'medication_request_allocation'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    request_id = db.Column(UUID(as_uuid=True), db.ForeignKey('medication_request.id', ondelete='CASCADE'), nullable=False)
+    inventory_id = db.Column(UUID(as_uuid=True), db.ForeignKey('inventory.id'), nullable=False)
+    batch_id = db.Column(db.String(100), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    # 0 is the soonest-expiring batch
+    line_number = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    inventory = db.relationship('Inventory')
+
+    __table_args__ = (
+        db.UniqueConstraint('request_id', 'line_number', name='uq_medication_request_allocation_request_id_line_number'),
+    )
+
+
+class MedicationRequestAllocationOutput(ma.Schema):
+    inventory_id = ma.UUID()
+    batch_id = ma.String()
+    quantity = ma.Integer()
+
+
 class MedicationRequestOutput(ma.Schema):
     id = ma.UUID()
     request_number = ma.String()
@@ -52,6 +90,7 @@ class MedicationRequestOutput(ma.Schema):
     prescription_document = ma.String()
     assigned_manufacturer_id = ma.UUID()
     batch_id = ma.String()
+    allocations = ma.List(ma.Nested(MedicationRequestAllocationOutput))
     status = ma.String()
     rejection_reason = ma.String()
     approved_at = ma.DateTime()
@@ -70,8 +109,15 @@ class MedicationRequestInputCreate(ma.Schema):
 
 
 class MedicationRequestInputApprove(ma.Schema):
-    batch_id = ma.String(required=True, validate=validate.Length(min=1, max=100))
+    # Without a batch, the quantity is allocated first-expiry-first-out
+    # from the assigned manufacturer's stock
+    batch_id = ma.String(validate=validate.Length(min=1, max=100))
+    assigned_manufacturer_id = ma.UUID(required=True)
+
+
+class MedicationRequestInputAllocate(ma.Schema):
     assigned_manufacturer_id = ma.UUID(required=True)
+    limit = ma.Integer(validate=validate.Range(min=1))
 
 
 class MedicationRequestInputReject(ma.Schema):
@@ -82,4 +128,5 @@ medication_request_output = MedicationRequestOutput()
 medication_requests_output = MedicationRequestOutput(many=True)
 medication_request_input_create = MedicationRequestInputCreate()
 medication_request_input_approve = MedicationRequestInputApprove()
+medication_request_input_allocate = MedicationRequestInputAllocate()
 medication_request_input_reject = MedicationRequestInputReject()
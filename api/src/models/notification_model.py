@@ -20,6 +20,15 @@ class Notification(db.Model):
     
     # Relationship
     user = db.relationship('User', backref='notifications')
+
+    __table_args__ = (
+        db.Index('ix_notification_user_id_created_at_id', user_id, created_at.desc(), id.desc()),
+        # Unread notifications are a small, hot slice: a partial index keeps it compact
+        db.Index(
+            'ix_notification_user_id_unread_created_at_id', user_id, created_at.desc(), id.desc(),
+            postgresql_where=is_read.is_(False), sqlite_where=is_read.is_(False),
+        ),
+    )
     
     def __repr__(self):
         return f"<Notification {self.title} for User {self.user_id}>"
@@ -20,6 +20,10 @@ class Organization(db.Model):
     
     # Relationship
     users = db.relationship('User', back_populates='organization', lazy=True)
+
+    __table_args__ = (
+        db.Index('ix_organization_status_created_at_id', status, created_at, id),
+    )
     
     def __repr__(self):
         return f"<Organization {self.name} ({self.org_id})>"
@@ -0,0 +1,50 @@
+import uuid
+from config.database import db, ma
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class OutboxEntry(db.Model):
+    """
+    A recorded intent to write to the ledger (and its off-chain side
+    effects), carried out by the outbox dispatcher.
+    """
+    __tablename__ = 'outbox'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    operation = db.Column(db.String(50), nullable=False)  # createBatch
+    aggregate_id = db.Column(db.String(100), nullable=False)  # batch_id
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, ledger_committed, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    locked_at = db.Column(db.DateTime, nullable=True)
+    locked_by = db.Column(UUID(as_uuid=True), nullable=True)  # lease token of the claiming worker
+    created_by = db.Column(UUID(as_uuid=True), db.ForeignKey('user.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint('operation', 'aggregate_id', name='uq_outbox_operation_aggregate_id'),
+        db.Index('ix_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEntry {self.operation} {self.aggregate_id} - {self.status}>"
+
+
+class OutboxEntryOutput(ma.Schema):
+    id = ma.UUID()
+    operation = ma.String()
+    aggregate_id = ma.String()
+    status = ma.String()
+    attempts = ma.Integer()
+    last_error = ma.String()
+    result = ma.Raw()
+    next_attempt_at = ma.DateTime()
+    created_at = ma.DateTime()
+    updated_at = ma.DateTime()
+
+
+outbox_entry_output = OutboxEntryOutput()
@@ -0,0 +1,69 @@
+import uuid
+from config.database import db, ma
+from datetime import datetime, timezone
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class ReconciliationRun(db.Model):
+    """One pass comparing ledger ownerships with inventory quantities."""
+    __tablename__ = 'reconciliation_run'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed
+    batches_checked = db.Column(db.Integer, nullable=False, default=0)
+    discrepancy_count = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    started_by = db.Column(UUID(as_uuid=True), db.ForeignKey('user.id'), nullable=True)
+    started_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ReconciliationRun {self.id} - {self.status}>"
+
+
+class ReconciliationDiscrepancy(db.Model):
+    """
+    A (batch, organization) pair whose inventory quantity (available plus
+    reserved) differs from the quantity the ledger says it owns.
+    """
+    __tablename__ = 'reconciliation_discrepancy'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_id = db.Column(UUID(as_uuid=True), db.ForeignKey('reconciliation_run.id', ondelete='CASCADE'), nullable=False)
+    batch_id = db.Column(db.String(100), nullable=False)
+    org_id = db.Column(db.String(100), nullable=False)
+    kind = db.Column(db.String(30), nullable=False)  # quantity_mismatch, missing_in_inventory, not_owned_on_ledger, missing_on_ledger, ledger_error
+    ledger_quantity = db.Column(db.Integer, nullable=True)
+    inventory_quantity = db.Column(db.Integer, nullable=True)
+    difference = db.Column(db.Integer, nullable=False, default=0)  # inventory - ledger
+
+    __table_args__ = (
+        db.UniqueConstraint('run_id', 'batch_id', 'org_id', name='uq_reconciliation_discrepancy_run_batch_org'),
+        db.Index('ix_reconciliation_discrepancy_run_id_kind', 'run_id', 'kind', 'batch_id', 'org_id'),
+    )
+
+    def __repr__(self):
+        return f"<ReconciliationDiscrepancy {self.batch_id}/{self.org_id} - {self.kind}>"
+
+
+class ReconciliationRunOutput(ma.Schema):
+    id = ma.UUID()
+    status = ma.String()
+    batches_checked = ma.Integer()
+    discrepancy_count = ma.Integer()
+    error = ma.String()
+    started_by = ma.UUID()
+    started_at = ma.DateTime()
+    finished_at = ma.DateTime()
+
+
+class ReconciliationDiscrepancyOutput(ma.Schema):
+    batch_id = ma.String()
+    org_id = ma.String()
+    kind = ma.String()
+    ledger_quantity = ma.Integer()
+    inventory_quantity = ma.Integer()
+    difference = ma.Integer()
+
+
+reconciliation_run_output = ReconciliationRunOutput()
+reconciliation_runs_output = ReconciliationRunOutput(many=True)
+reconciliation_discrepancies_output = ReconciliationDiscrepancyOutput(many=True)
@@ -0,0 +1,26 @@
+from config.database import db
+from datetime import datetime, timezone
+
+
+class ScanSketch(db.Model):
+    """A serialized sketch shared by every API process (summed on flush)."""
+    __tablename__ = 'scan_sketch'
+    name = db.Column(db.String(50), primary_key=True)
+    payload = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<ScanSketch {self.name}>"
+
+
+class BatchScanStats(db.Model):
+    """Per-batch scan state: distinct-location registers and raised alerts."""
+    __tablename__ = 'batch_scan_stats'
+    batch_id = db.Column(db.String(100), primary_key=True)
+    location_registers = db.Column(db.LargeBinary, nullable=True)  # HyperLogLog registers
+    volume_flagged_at = db.Column(db.DateTime, nullable=True)
+    locations_flagged_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<BatchScanStats {self.batch_id}>"
@@ -21,6 +21,10 @@ class User(db.Model):
     
     # Relationship
     organization = db.relationship('Organization', back_populates='users')
+
+    __table_args__ = (
+        db.Index('ix_user_status_created_at_id', status, created_at, id),
+    )
     
     def __repr__(self):
         return f"<User {self.name}>"
@@ -0,0 +1,32 @@
+from config.database import db
+from src.models.anomaly_model import TransferAnomaly
+from src.utils.pagination import keyset_paginate
+from typing import List
+
+
+class AnomalyRepository:
+    def add_new(self, anomalies: List[dict]) -> List[TransferAnomaly]:
+        """
+        Adds the anomalies not recorded yet (a replayed block scores its
+        events again) and returns them. The caller commits.
+        """
+        tx_ids = [a['tx_id'] for a in anomalies]
+        existing = {
+            tx_id for (tx_id,) in
+            db.session.query(TransferAnomaly.tx_id).filter(TransferAnomaly.tx_id.in_(tx_ids))
+        }
+        added = [TransferAnomaly(**a) for a in anomalies if a['tx_id'] not in existing]
+        db.session.add_all(added)
+        return added
+
+    def find(self, filters: dict, cursor, limit: int):
+        query = TransferAnomaly.query
+        if filters.get('batch_id'):
+            query = query.filter(TransferAnomaly.batch_id == filters['batch_id'])
+        if filters.get('org_id'):
+            query = query.filter(TransferAnomaly.org_id == filters['org_id'])
+        if filters.get('min_score') is not None:
+            query = query.filter(TransferAnomaly.score >= filters['min_score'])
+        return keyset_paginate(
+            query, [TransferAnomaly.detected_at, TransferAnomaly.id], cursor, limit, descending=True
+        )
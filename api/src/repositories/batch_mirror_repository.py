@@ -0,0 +1,198 @@
+from config.database import db
+from src.models.batch_mirror_model import LedgerBatch, BatchOwnership, BatchTransfer, LedgerCheckpoint, LedgerDeadLetter
+from src.utils.pagination import keyset_paginate
+from datetime import date, datetime
+from typing import Iterator, Optional, List, Tuple
+
+LEDGER_INDEXER_CHECKPOINT = 'ledger_indexer'
+
+
+def _parse_date(value) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # Stored naive in UTC, like the rest of the schema
+    return parsed.replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+class BatchMirrorRepository:
+    # --------------------------------------------------------
+    # Writes (ledger indexer)
+    # --------------------------------------------------------
+    def apply_event(self, event) -> None:
+        """
+        Upserts the batch state written by one committed transaction.
+
+        Events older than the stored row are ignored and transfers are keyed
+        by tx_id, so replaying a block is a no-op. The caller commits.
+        """
+        for key, value in event.values.items():
+            if not isinstance(value, dict) or 'batchId' not in value:
+                continue
+
+            batch = db.session.get(LedgerBatch, key)
+            if batch is not None and batch.last_block > event.block_number:
+                continue
+            if batch is None:
+                batch = LedgerBatch(batch_id=key)
+                db.session.add(batch)
+
+            batch.product_name = value.get('productName', '')
+            batch.manufacture_date = _parse_date(value.get('manufactureDate'))
+            batch.expiry_date = _parse_date(value.get('expiryDate'))
+            batch.total_quantity = int(value.get('totalQuantity') or 0)
+            batch.unit_dosage = value.get('unitDosage', '')
+            batch.unit_price = value.get('unitPrice')
+            batch.status = value.get('status', '')
+            batch.created_at = _parse_datetime(value.get('createdAt'))
+            batch.updated_at = _parse_datetime(value.get('updatedAt'))
+            batch.last_tx_id = event.tx_id
+            batch.last_block = event.block_number
+
+            owners = {o['orgId']: int(o['quantity']) for o in value.get('ownerships') or []}
+            batch.ownerships = [
+                o for o in batch.ownerships if o.org_id in owners
+            ]
+            for ownership in batch.ownerships:
+                ownership.quantity = owners.pop(ownership.org_id)
+            for org_id, quantity in owners.items():
+                batch.ownerships.append(BatchOwnership(org_id=org_id, quantity=quantity))
+
+            transfer = value.get('lastTransfer')
+            if event.function == 'transferBatch' and transfer and db.session.get(BatchTransfer, event.tx_id) is None:
+                db.session.add(BatchTransfer(
+                    tx_id=event.tx_id,
+                    batch_id=key,
+                    from_org_id=transfer['fromOrgId'],
+                    to_org_id=transfer['toOrgId'],
+                    quantity=int(transfer['quantity']),
+                    transferred_at=_parse_datetime(transfer.get('timestamp')) or batch.updated_at,
+                    block_number=event.block_number,
+                    transfer_metadata=transfer.get('metadata') or {}
+                ))
+
+    def get_checkpoint(self, name: str = LEDGER_INDEXER_CHECKPOINT) -> Optional[int]:
+        checkpoint = db.session.get(LedgerCheckpoint, name)
+        return checkpoint.block_number if checkpoint else None
+
+    def set_checkpoint(self, block_number: int, name: str = LEDGER_INDEXER_CHECKPOINT) -> None:
+        checkpoint = db.session.get(LedgerCheckpoint, name)
+        if checkpoint is None:
+            db.session.add(LedgerCheckpoint(name=name, block_number=block_number))
+        elif block_number > checkpoint.block_number:
+            checkpoint.block_number = block_number
+
+    def record_dead_letter(self, event, error: str, name: str = LEDGER_INDEXER_CHECKPOINT) -> None:
+        """
+        Parks an event the consumer ``name`` could not apply. The caller commits.
+        """
+        if db.session.get(LedgerDeadLetter, (name, event.tx_id)) is None:
+            db.session.add(LedgerDeadLetter(
+                consumer=name,
+                tx_id=event.tx_id,
+                block_number=event.block_number,
+                function=event.function,
+                args=list(event.args or []),
+                error=error
+            ))
+
+    def reset(self, name: str = LEDGER_INDEXER_CHECKPOINT) -> None:
+        """
+        Empties the mirror so it can be rebuilt from the genesis block.
+        """
+        try:
+            BatchTransfer.query.delete()
+            BatchOwnership.query.delete()
+            LedgerBatch.query.delete()
+            LedgerCheckpoint.query.filter_by(name=name).delete()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    # --------------------------------------------------------
+    # Reads
+    # --------------------------------------------------------
+    def find_batches(self, filters: dict, cursor: Optional[str], limit: int) -> Tuple[List[LedgerBatch], Optional[str]]:
+        query = LedgerBatch.query
+
+        if filters.get('owner_org_id'):
+            query = query.join(BatchOwnership).filter(BatchOwnership.org_id == filters['owner_org_id'])
+        if filters.get('product_name'):
+            query = query.filter(LedgerBatch.product_name == filters['product_name'])
+        if filters.get('status'):
+            query = query.filter(LedgerBatch.status == filters['status'])
+        if filters.get('expiry_from'):
+            query = query.filter(LedgerBatch.expiry_date >= filters['expiry_from'])
+        if filters.get('expiry_to'):
+            query = query.filter(LedgerBatch.expiry_date <= filters['expiry_to'])
+
+        return keyset_paginate(query, [LedgerBatch.batch_id], cursor, limit)
+
+    def find_transfers(self, filters: dict, cursor: Optional[str], limit: int) -> Tuple[List[BatchTransfer], Optional[str]]:
+        query = BatchTransfer.query
+
+        if filters.get('batch_id'):
+            query = query.filter(BatchTransfer.batch_id == filters['batch_id'])
+        if filters.get('org_id'):
+            query = query.filter(db.or_(
+                BatchTransfer.from_org_id == filters['org_id'],
+                BatchTransfer.to_org_id == filters['org_id']
+            ))
+
+        return keyset_paginate(
+            query, [BatchTransfer.transferred_at, BatchTransfer.tx_id], cursor, limit, descending=True
+        )
+
+    def find_transfer_history(self) -> list:
+        """
+        Every mirrored transfer with its batch's size and creation time, as
+        the rows the transfer graph and the fraud model are built from.
+        """
+        return self._transfer_history_query().all()
+
+    def iter_transfer_history(self, chunk_size: int = 50000) -> Iterator[list]:
+        """
+        Streams the rows of find_transfer_history batch by batch, in chunks
+        of about ``chunk_size`` rows that never split a batch's history.
+        """
+        query = self._transfer_history_query().order_by(
+            BatchTransfer.batch_id, BatchTransfer.transferred_at, BatchTransfer.block_number
+        ).yield_per(chunk_size)
+
+        chunk = []
+        for row in query:
+            if len(chunk) >= chunk_size and row.batch_id != chunk[-1].batch_id:
+                yield chunk
+                chunk = []
+            chunk.append(row)
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _transfer_history_query():
+        return db.session.query(
+            BatchTransfer.batch_id,
+            BatchTransfer.from_org_id,
+            BatchTransfer.to_org_id,
+            BatchTransfer.quantity,
+            BatchTransfer.transferred_at,
+            BatchTransfer.block_number,
+            LedgerBatch.total_quantity,
+            LedgerBatch.created_at,
+        ).join(LedgerBatch, LedgerBatch.batch_id == BatchTransfer.batch_id)
+
+    def find_batch_route(self, batch_id: str) -> List[BatchTransfer]:
+        return BatchTransfer.query.filter_by(batch_id=batch_id).order_by(
+            BatchTransfer.transferred_at, BatchTransfer.block_number
+        ).all()
@@ -1,19 +1,92 @@
 import json
-from typing import Any, Dict, List
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+from config.cache_config import get_cache
+from src.fabric.write_scheduler import get_write_scheduler, is_conflict
+
+BATCH_WRITE_FUNCTIONS = ("createBatch", "transferBatch", "markBatchDelivered")
+
+# Invalidation counters, striped by batch id. A ledger read only fills the
+# cache if no invalidation of its key landed while it was in flight, so a
+# read that started before a write cannot re-cache the pre-write state.
+_GENERATION_STRIPES = 1024
+_generations = [0] * _GENERATION_STRIPES
+_generations_lock = threading.Lock()
+
+
+def _stripe(batch_id: str) -> int:
+    return hash(batch_id) % _GENERATION_STRIPES
+
+
+def batch_generation(batch_id: str) -> int:
+    return _generations[_stripe(batch_id)]
+
+
+def invalidate_batch(cache, batch_id: str) -> None:
+    with _generations_lock:
+        _generations[_stripe(batch_id)] += 1
+    cache.delete(batch_id)
+
+
+def cache_batch_if_current(cache, batch_id: str, batch: Any, generation: int) -> None:
+    with _generations_lock:
+        if _generations[_stripe(batch_id)] == generation:
+            cache.set(batch_id, batch)
+
+
+def get_batch_cache():
+    return get_cache("batch")
+
+
+def get_history_cache():
+    # History is append-only, so entries never go stale; they only get extended
+    return get_cache("history", default_max_size=5000, default_ttl=0)
+
+
+def invalidate_batches_on_ledger_event(event):
+    """
+    Ledger event subscriber: drops cached state for every key a committed
+    batch transaction wrote, whichever client submitted it.
+    """
+    if event.function not in BATCH_WRITE_FUNCTIONS:
+        return
+
+    cache = get_batch_cache()
+    for key in event.keys or event.args[:1]:
+        invalidate_batch(cache, key)
 
 
 class BlockchainRepository:
-    def __init__(self, fabric_client):
+    def __init__(self, fabric_client, batch_cache=None, history_cache=None, write_scheduler=None):
         self.client = fabric_client
+        self.write_scheduler = write_scheduler if write_scheduler is not None else get_write_scheduler()
+        self.batch_cache = batch_cache if batch_cache is not None else get_batch_cache()
+        self.history_cache = history_cache if history_cache is not None else get_history_cache()
 
-    def _submit(self, function_name: str, args: List[str]):
-        return self.client.submit(function_name, args)
+    def _submit(self, function_name: str, args: List[str], wait_for_commit: bool = True):
+        # args[0] is always the batch_id for batch writes: same-batch writes
+        # are queued behind each other, conflicts retried on commit
+        try:
+            if wait_for_commit:
+                return self.write_scheduler.run(
+                    function_name, args[0], lambda: self.client.submit(function_name, args)
+                )
+            # Returns {"tx_id", "result"} as soon as the orderer accepts it;
+            # its commit outcome (conflicts included) comes from block events
+            return self.write_scheduler.run(
+                function_name, args[0], lambda: self.client.broadcast(function_name, args), retry=False
+            )
+        finally:
+            invalidate_batch(self.batch_cache, args[0])
 
     def _evaluate(self, function_name: str, args: List[str]):
         return self.client.evaluate(function_name, args)
 
-    def create_batch(self, dto: Dict[str, Any]):
-        args = [
+    @staticmethod
+    def _create_batch_args(dto: Dict[str, Any]) -> List[str]:
+        return [
             dto["batch_id"],
             dto["product_name"],
             dto["manufacture_date"],
@@ -23,9 +96,53 @@ class BlockchainRepository:
             str(dto["unit_price"]),
             dto["owner_org_id"],
         ]
-        return self._submit("createBatch", args)
 
-    def transfer_batch(self, dto: Dict[str, Any]):
+    def create_batch(self, dto: Dict[str, Any], wait_for_commit: bool = True):
+        return self._submit("createBatch", self._create_batch_args(dto), wait_for_commit)
+
+    def create_batches(self, dtos: List[Dict[str, Any]], max_in_flight: int = 32) -> List[Tuple[bool, Any]]:
+        """
+        Submits many createBatch transactions with at most ``max_in_flight``
+        endorse-order-commit cycles outstanding at once.
+
+        Returns one ``(success, result_or_error)`` pair per dto, in order.
+        An item that cannot be submitted fails on its own; the ones already
+        in flight are still awaited, as they may commit. Items invalidated
+        by an MVCC conflict are retried through the write scheduler, like
+        single writes.
+        """
+        slots = threading.BoundedSemaphore(max_in_flight)
+        futures = []
+
+        for dto in dtos:
+            slots.acquire()
+            try:
+                future = self.client.submit_async("createBatch", self._create_batch_args(dto))
+            except Exception as e:
+                slots.release()
+                future = Future()
+                future.set_exception(e)
+            else:
+                future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+        outcomes = []
+        for dto, future in zip(dtos, futures):
+            try:
+                outcomes.append((True, future.result()))
+            except Exception as e:
+                if not is_conflict(e):
+                    outcomes.append((False, str(e)))
+                    continue
+                try:
+                    outcomes.append((True, self._submit("createBatch", self._create_batch_args(dto))))
+                except Exception as retry_error:
+                    outcomes.append((False, str(retry_error)))
+            finally:
+                invalidate_batch(self.batch_cache, dto["batch_id"])
+        return outcomes
+
+    def transfer_batch(self, dto: Dict[str, Any], wait_for_commit: bool = True):
         args = [
             dto["batch_id"],
             dto["from_org_id"],
@@ -33,13 +150,77 @@ class BlockchainRepository:
             str(dto["quantity"]),
             json.dumps(dto.get("metadata", {})),
         ]
-        return self._submit("transferBatch", args)
+        return self._submit("transferBatch", args, wait_for_commit)
 
-    def mark_batch_delivered(self, batch_id: str, delivered_to_org_id: str, quantity: int):
-        return self._submit("markBatchDelivered", [batch_id, delivered_to_org_id, str(quantity)])
+    def mark_batch_delivered(self, batch_id: str, delivered_to_org_id: str, quantity: int, wait_for_commit: bool = True):
+        return self._submit("markBatchDelivered", [batch_id, delivered_to_org_id, str(quantity)], wait_for_commit)
 
     def get_batch(self, batch_id: str):
-        return self._evaluate("getBatch", [batch_id])
+        cached = self.batch_cache.get(batch_id)
+        if cached is not None:
+            return cached
+
+        generation = batch_generation(batch_id)
+        result = self._evaluate("getBatch", [batch_id])
+        if isinstance(result, dict):
+            cache_batch_if_current(self.batch_cache, batch_id, result, generation)
+        return result
+
+    def get_batches(self, batch_ids: List[str], max_in_flight: int = 64) -> Dict[str, Tuple[bool, Any]]:
+        """
+        Reads many batches: cached ones from the batch cache, the rest with at
+        most ``max_in_flight`` concurrent getBatch queries.
+
+        Returns ``batch_id -> (success, batch_or_error)`` for every id.
+        """
+        outcomes = {}
+        missing = []
+        for batch_id in dict.fromkeys(batch_ids):
+            cached = self.batch_cache.get(batch_id)
+            if cached is not None:
+                outcomes[batch_id] = (True, cached)
+            else:
+                missing.append(batch_id)
+
+        slots = threading.BoundedSemaphore(max_in_flight)
+        futures = []
+        generations = {batch_id: batch_generation(batch_id) for batch_id in missing}
+        for batch_id in missing:
+            slots.acquire()
+            try:
+                future = self.client.evaluate_async("getBatch", [batch_id])
+            except Exception:
+                slots.release()
+                raise
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+        for batch_id, future in zip(missing, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                outcomes[batch_id] = (False, str(e))
+                continue
+            if isinstance(result, dict):
+                cache_batch_if_current(self.batch_cache, batch_id, result, generations[batch_id])
+            outcomes[batch_id] = (True, result)
+        return outcomes
+
+    def get_batch_history(self, batch_id: str) -> List[Dict[str, Any]]:
+        """
+        Returns the full history (newest first), asking the ledger only for
+        the entries committed after the last transaction already cached.
+        """
+        cached = self.history_cache.get(batch_id)
+
+        if cached is None:
+            history = self._evaluate("getBatchHistory", [batch_id])
+        else:
+            delta = self._evaluate("getBatchHistorySince", [batch_id, cached["last_tx_id"]])
+            if not delta:
+                return cached["history"]
+            history = delta + cached["history"]
 
-    def get_batch_history(self, batch_id: str):
-        return self._evaluate("getBatchHistory", [batch_id])
+        if isinstance(history, list) and history:
+            self.history_cache.set(batch_id, {"last_tx_id": history[0]["txId"], "history": history})
+        return history
@@ -0,0 +1,85 @@
+from config.database import db
+from src.models.batch_mirror_model import LedgerBatch
+from src.models.consistency_model import ConsistencyRun, ConsistencyViolation
+from src.utils.pagination import keyset_paginate
+from sqlalchemy import insert
+from datetime import datetime, timezone
+from typing import Optional, List
+import uuid
+
+
+class ConsistencyRepository:
+    # --------------------------------------------------------
+    # Runs
+    # --------------------------------------------------------
+    def create_run(self, workers: int, started_by: Optional[uuid.UUID] = None) -> ConsistencyRun:
+        run = ConsistencyRun(started_by=started_by, status='running', workers=workers, batches_checked=0, batches_failed=0, violation_count=0)
+        try:
+            db.session.add(run)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return run
+
+    def find_run(self, run_id: uuid.UUID) -> Optional[ConsistencyRun]:
+        return db.session.get(ConsistencyRun, run_id)
+
+    def find_running(self) -> Optional[ConsistencyRun]:
+        return ConsistencyRun.query.filter_by(status='running').first()
+
+    def find_runs(self, limit: int = 20) -> List[ConsistencyRun]:
+        return ConsistencyRun.query.order_by(ConsistencyRun.started_at.desc()).limit(limit).all()
+
+    def finish_run(self, run: ConsistencyRun, error: Optional[str] = None) -> ConsistencyRun:
+        run.status = 'failed' if error else 'completed'
+        run.error = error
+        run.finished_at = datetime.now(timezone.utc)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return run
+
+    # --------------------------------------------------------
+    # Scanning
+    # --------------------------------------------------------
+    def next_batch_ids(self, after: Optional[str], limit: int) -> List[str]:
+        """
+        Returns the next ``limit`` ledger batch ids (from the mirror), in order.
+        """
+        query = db.session.query(LedgerBatch.batch_id)
+        if after is not None:
+            query = query.filter(LedgerBatch.batch_id > after)
+        return [batch_id for (batch_id,) in query.order_by(LedgerBatch.batch_id).limit(limit).all()]
+
+    def add_violations(self, run: ConsistencyRun, violations: List[dict], batches_checked: int, batches_failed: int) -> None:
+        """
+        Bulk-inserts one chunk's violations and advances the run's counters
+        in the same transaction.
+        """
+        try:
+            if violations:
+                db.session.execute(
+                    insert(ConsistencyViolation),
+                    [{'id': uuid.uuid4(), 'run_id': run.id, **violation} for violation in violations]
+                )
+            run.batches_checked += batches_checked
+            run.batches_failed += batches_failed
+            run.violation_count += len(violations)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def find_violations(self, run_id: uuid.UUID, kind: Optional[str], batch_id: Optional[str],
+                        cursor: Optional[str], limit: int):
+        query = ConsistencyViolation.query.filter_by(run_id=run_id)
+        if kind:
+            query = query.filter_by(kind=kind)
+        if batch_id:
+            query = query.filter_by(batch_id=batch_id)
+        return keyset_paginate(
+            query, [ConsistencyViolation.batch_id, ConsistencyViolation.id], cursor, limit
+        )
@@ -1,89 +1,280 @@
 from config.database import db
 from src.models.inventory_model import Inventory
-from typing import Optional, List
+from src.utils.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, encode_cursor, keyset_paginate
+from sqlalchemy import Float, case, cast, func, or_, tuple_, update
+from collections import Counter
+from datetime import date, datetime
+from typing import Iterable, Optional, List, Dict, Tuple
 import uuid
 
+# pg_trgm's default pg_trgm.similarity_threshold, which the % operator uses
+SEARCH_SIMILARITY_THRESHOLD = 0.3
+LOW_STOCK_THRESHOLD = 10
+# First expiry first out; the batch id breaks ties between equal dates
+FEFO_ORDER = (Inventory.expiry_date, Inventory.batch_id)
+
+
+def _parse_date(value) -> Optional[date]:
+    # Ledger DTOs carry dates as ISO strings, validated input as dates
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _stock_status(available):
+    return case(
+        (available <= 0, 'out_of_stock'),
+        (available < LOW_STOCK_THRESHOLD, 'low_stock'),
+        else_='available'
+    )
+
 
 class InventoryRepository:
-    def create(self, data: dict) -> Inventory:
-        inventory = Inventory(
+    @staticmethod
+    def _build(data: dict) -> Inventory:
+        return Inventory(
             organization_id=data['organization_id'],
             batch_id=data['batch_id'],
             product_name=data['product_name'],
             available_quantity=data['available_quantity'],
             reserved_quantity=0,
             unit_dosage=data['unit_dosage'],
-            manufacture_date=data['manufacture_date'],
-            expiry_date=data['expiry_date'],
+            manufacture_date=_parse_date(data['manufacture_date']),
+            expiry_date=_parse_date(data['expiry_date']),
             unit_price=data['unit_price'],
             status='available'
         )
+
+    def create(self, data: dict) -> Inventory:
+        inventory = self._build(data)
         
         db.session.add(inventory)
         db.session.commit()
         return inventory
     
+    def create_many(self, items: List[dict]) -> List[Inventory]:
+        inventories = [self._build(data) for data in items]
+        
+        try:
+            db.session.add_all(inventories)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return inventories
+    
     def find_by_id(self, inventory_id: uuid.UUID) -> Optional[Inventory]:
         return Inventory.query.filter_by(id=inventory_id).first()
     
-    def find_by_batch_id(self, batch_id: str) -> Optional[Inventory]:
-        return Inventory.query.filter_by(batch_id=batch_id).first()
+    def find_by_batch_id(self, batch_id: str, organization_id: Optional[uuid.UUID] = None) -> Optional[Inventory]:
+        query = Inventory.query.filter_by(batch_id=batch_id)
+        if organization_id is not None:
+            query = query.filter_by(organization_id=organization_id)
+        return query.first()
     
-    def find_by_organization(self, organization_id: uuid.UUID) -> List[Inventory]:
-        return Inventory.query.filter_by(organization_id=organization_id).order_by(Inventory.created_at.desc()).all()
+    def find_by_organization(self, organization_id: uuid.UUID, cursor: Optional[str] = None,
+                             limit: int = DEFAULT_PAGE_LIMIT) -> Tuple[List[Inventory], Optional[str]]:
+        """A page of the organization's inventory, newest first, and the next page's cursor."""
+        return keyset_paginate(
+            Inventory.query.filter_by(organization_id=organization_id),
+            [Inventory.created_at, Inventory.id], cursor, limit, descending=True
+        )
     
-    def find_available_by_product(self, product_name: str, min_quantity: int) -> List[Inventory]:
-        return Inventory.query.filter(
-            Inventory.product_name.ilike(f'%{product_name}%'),
+    def search_available(self, term: str, min_quantity: int, cursor: Optional[str], limit: int):
+        """
+        Available inventory whose product name contains ``term`` or is
+        trigram-similar to it, most similar first. On PostgreSQL both tests
+        are served by the pg_trgm GIN index on ``product_name``; elsewhere
+        ``similarity`` is the Python stand-in registered on the connection.
+        Returns ``([(inventory, score)], next_cursor)``.
+        """
+        term = term.strip()
+        # similarity() is float4 on PostgreSQL: rank and page on its float8
+        # value, so the score handed out in the cursor compares back exactly
+        # and rows tied with the last one of a page are not skipped
+        score = cast(func.similarity(Inventory.product_name, term), Float(53))
+        columns = [score, Inventory.id]
+
+        query = db.session.query(Inventory, score).filter(
             Inventory.available_quantity >= min_quantity,
             Inventory.status == 'available'
-        ).all()
+        )
+        if term:
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            if db.session.get_bind().dialect.name == 'postgresql':
+                similar = Inventory.product_name.op('%')(term)
+            else:
+                similar = score >= SEARCH_SIMILARITY_THRESHOLD
+            query = query.filter(or_(Inventory.product_name.ilike(f'%{escaped}%', escape='\\'), similar))
+        if cursor:
+            query = query.filter(tuple_(*columns) < tuple_(*decode_cursor(cursor, columns)))
+
+        rows = query.order_by(score.desc(), Inventory.id.desc()).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        inventory, last_score = rows[-1]
+        return rows, encode_cursor([last_score, inventory.id])
+
+    def fefo_split(self, organization_id: uuid.UUID, product_name: str, unit_dosage: str, quantity: int,
+                   expires_after: date) -> List[Tuple[uuid.UUID, str, int]]:
+        """
+        Splits ``quantity`` across the organization's soonest-expiring
+        batches of a product that expire on or after ``expires_after``, in
+        one query: a running sum over the eligible rows in FEFO order gives
+        the stock ahead of each batch, so every batch gives what is left of
+        the quantity after those, up to its own stock. Returns
+        ``(inventory id, batch id, quantity)`` lines; their sum falls short
+        of ``quantity`` when there is not enough stock.
+        """
+        ahead = func.sum(Inventory.available_quantity).over(order_by=FEFO_ORDER) - Inventory.available_quantity
+        eligible = db.session.query(
+            Inventory.id, Inventory.batch_id, Inventory.available_quantity.label('available'), ahead.label('ahead')
+        ).filter(
+            Inventory.organization_id == organization_id,
+            Inventory.product_name == product_name,
+            Inventory.unit_dosage == unit_dosage,
+            Inventory.expiry_date >= expires_after,
+            Inventory.available_quantity > 0
+        ).subquery()
+
+        left = quantity - eligible.c.ahead
+        take = case((eligible.c.available < left, eligible.c.available), else_=left)
+        rows = db.session.query(eligible.c.id, eligible.c.batch_id, take).filter(
+            eligible.c.ahead < quantity
+        ).order_by(eligible.c.ahead).all()
+        return [(inventory_id, batch_id, int(quantity)) for inventory_id, batch_id, quantity in rows]
+
+    def fefo_stock(self, organization_id: uuid.UUID, products: Iterable[Tuple[str, str]], expires_after: date):
+        """
+        The organization's eligible stock of several ``(product name, unit
+        dosage)`` pairs, each in FEFO order, locked until the transaction
+        ends so a batch allocation works on quantities nobody else moves.
+        """
+        return db.session.query(
+            Inventory.id, Inventory.batch_id, Inventory.product_name, Inventory.unit_dosage, Inventory.available_quantity
+        ).filter(
+            Inventory.organization_id == organization_id,
+            tuple_(Inventory.product_name, Inventory.unit_dosage).in_(list(products)),
+            Inventory.expiry_date >= expires_after,
+            Inventory.available_quantity > 0
+        ).order_by(Inventory.product_name, Inventory.unit_dosage, *FEFO_ORDER).with_for_update(of=Inventory).all()
+
+    def latest_update(self) -> Optional[datetime]:
+        return db.session.query(func.max(Inventory.updated_at)).scalar()
+
+    def products_changed_since(self, since: datetime) -> List[str]:
+        return [name for (name,) in db.session.query(Inventory.product_name).filter(
+            Inventory.updated_at >= since
+        ).distinct().all()]
+
+    def available_by_product(self, product_names: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Available quantity per product name, of all products or of the
+        given ones (those without available stock are left out).
+        """
+        query = db.session.query(Inventory.product_name, func.sum(Inventory.available_quantity)).filter(
+            Inventory.available_quantity > 0,
+            Inventory.status == 'available'
+        )
+        if product_names is not None:
+            query = query.filter(Inventory.product_name.in_(product_names))
+        return {name: int(quantity) for name, quantity in query.group_by(Inventory.product_name).all()}
     
     def update_quantity(self, batch_id: str, quantity_change: int) -> Optional[Inventory]:
+        """
+        Adds ``quantity_change`` to the available quantity in one
+        conditional UPDATE (never below zero) and recomputes the status.
+        Returns None when the item does not exist or has too little stock.
+        """
         inventory = self.find_by_batch_id(batch_id)
         if not inventory:
             return None
-        
-        inventory.available_quantity += quantity_change
-        
-        # Update status based on quantity
-        if inventory.available_quantity == 0:
-            inventory.status = 'out_of_stock'
-        elif inventory.available_quantity < 10:  # threshold can be configurable
-            inventory.status = 'low_stock'
-        else:
-            inventory.status = 'available'
-        
-        db.session.commit()
-        return inventory
-    
-    def reserve_quantity(self, batch_id: str, quantity: int) -> Optional[Inventory]:
-        inventory = self.find_by_batch_id(batch_id)
-        if not inventory or inventory.available_quantity < quantity:
-            return None
-        
-        inventory.available_quantity -= quantity
-        inventory.reserved_quantity += quantity
-        
-        if inventory.available_quantity == 0:
-            inventory.status = 'out_of_stock'
-        elif inventory.available_quantity < 10:
-            inventory.status = 'low_stock'
-        
-        db.session.commit()
+
+        available = Inventory.available_quantity + quantity_change
+        try:
+            inventory = db.session.execute(
+                update(Inventory)
+                .where(Inventory.id == inventory.id, available >= 0)
+                .values(available_quantity=available, status=_stock_status(available))
+                .returning(Inventory)
+                .execution_options(synchronize_session='fetch')
+            ).scalar_one_or_none()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         return inventory
-    
+
+    def _move(self, organization_id: uuid.UUID, quantities: Dict[str, int], available_sign: int,
+              reserved_sign: int, commit: bool) -> Tuple[List[Inventory], List[str]]:
+        """
+        Moves quantities between an organization's available and reserved
+        stock for several batches in one conditional UPDATE: a row is only
+        touched if the column being drawn from still holds the quantity, and
+        the status is recomputed in the same statement, so concurrent calls
+        can neither oversell nor lose an update. All lines succeed or none
+        do. Returns the updated items and the batch ids that failed.
+        """
+        amount = case(
+            *[(Inventory.batch_id == batch_id, quantity) for batch_id, quantity in quantities.items()], else_=0
+        )
+        drawn = Inventory.available_quantity if available_sign < 0 else Inventory.reserved_quantity
+        available = Inventory.available_quantity
+        if available_sign:
+            available = available + amount if available_sign > 0 else available - amount
+        reserved = Inventory.reserved_quantity + amount if reserved_sign > 0 else Inventory.reserved_quantity - amount
+
+        try:
+            items = db.session.execute(
+                update(Inventory)
+                .where(
+                    Inventory.organization_id == organization_id,
+                    Inventory.batch_id.in_(list(quantities)),
+                    drawn >= amount
+                )
+                .values(available_quantity=available, reserved_quantity=reserved, status=_stock_status(available))
+                .returning(Inventory)
+                .execution_options(synchronize_session='fetch')
+            ).scalars().all()
+
+            # A batch with no row, too little stock or (unexpectedly) several rows
+            updated = Counter(item.batch_id for item in items)
+            failed = sorted(batch_id for batch_id in quantities if updated[batch_id] != 1)
+            if failed:
+                db.session.rollback()
+                return [], failed
+            if commit:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return items, []
+
+    def reserve(self, organization_id: uuid.UUID, quantities: Dict[str, int],
+                commit: bool = True) -> Tuple[List[Inventory], List[str]]:
+        """Reserves available stock of several batches at once (batch id -> quantity)."""
+        return self._move(organization_id, quantities, available_sign=-1, reserved_sign=1, commit=commit)
+
+    def unreserve(self, organization_id: uuid.UUID, quantities: Dict[str, int],
+                  commit: bool = True) -> Tuple[List[Inventory], List[str]]:
+        """Returns reserved stock to the available quantity, e.g. when a request is cancelled."""
+        return self._move(organization_id, quantities, available_sign=1, reserved_sign=-1, commit=commit)
+
     def release_reserved_quantity(self, batch_id: str, quantity: int) -> Optional[Inventory]:
         inventory = self.find_by_batch_id(batch_id)
-        if not inventory or inventory.reserved_quantity < quantity:
+        if not inventory:
             return None
-        
-        inventory.reserved_quantity -= quantity
+
         # Quantity is actually shipped, so don't add back to available
-        
-        db.session.commit()
-        return inventory
-    
+        items, _ = self._move(inventory.organization_id, {batch_id: quantity}, available_sign=0, reserved_sign=-1, commit=True)
+        return items[0] if items else None
+
     def delete(self, inventory_id: uuid.UUID) -> bool:
         inventory = self.find_by_id(inventory_id)
         if not inventory:
@@ -0,0 +1,86 @@
+from config.database import db
+from src.models.batch_mirror_model import BatchTransfer, LedgerBatch
+from src.models.lead_time_model import LeadTimeDaily
+from src.models.medication_request_model import MedicationRequest
+from sqlalchemy import func, insert, select
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+TRANSFER_COLUMNS = ['batch_id', 'from_org_id', 'to_org_id', 'quantity', 'transferred_at', 'total_quantity', 'created_at']
+REQUEST_COLUMNS = ['assigned_manufacturer_id', 'approved_at', 'delivered_at']
+ROLLUP_COLUMNS = ['source', 'scope', 'org_id', 'counterparty_org_id', 'day', 'count', 'total_hours', 'histogram']
+
+
+class LeadTimeRepository:
+    # --------------------------------------------------------
+    # Columnar extracts
+    # --------------------------------------------------------
+    def extract_transfers(self, since: Optional[datetime]) -> Tuple[list, List[str]]:
+        """
+        Transfers of every batch that moved since ``since`` (all of them
+        when None), including the earlier ones each lead time is measured
+        from. Returns plain tuples and their column names.
+        """
+        query = db.session.query(
+            BatchTransfer.batch_id,
+            BatchTransfer.from_org_id,
+            BatchTransfer.to_org_id,
+            BatchTransfer.quantity,
+            BatchTransfer.transferred_at,
+            LedgerBatch.total_quantity,
+            LedgerBatch.created_at,
+        ).join(LedgerBatch, LedgerBatch.batch_id == BatchTransfer.batch_id)
+        if since is not None:
+            moved = select(BatchTransfer.batch_id).where(BatchTransfer.transferred_at >= since).distinct()
+            query = query.filter(BatchTransfer.batch_id.in_(moved))
+        return [tuple(row) for row in query.all()], TRANSFER_COLUMNS
+
+    def extract_requests(self, since: Optional[datetime]) -> Tuple[list, List[str]]:
+        query = db.session.query(
+            MedicationRequest.assigned_manufacturer_id,
+            MedicationRequest.approved_at,
+            MedicationRequest.delivered_at,
+        ).filter(
+            MedicationRequest.approved_at.isnot(None),
+            MedicationRequest.delivered_at.isnot(None),
+            MedicationRequest.assigned_manufacturer_id.isnot(None),
+        )
+        if since is not None:
+            query = query.filter(MedicationRequest.delivered_at >= since)
+        return [tuple(row) for row in query.all()], REQUEST_COLUMNS
+
+    # --------------------------------------------------------
+    # Rollups
+    # --------------------------------------------------------
+    def latest_day(self) -> Optional[date]:
+        return db.session.query(func.max(LeadTimeDaily.day)).scalar()
+
+    def replace_days(self, since: Optional[date], rows: List[dict]) -> None:
+        """
+        Swaps the rollup rows from ``since`` on (all of them when None) for
+        freshly computed ones in one transaction, so readers never see a
+        half-refreshed day.
+        """
+        try:
+            query = LeadTimeDaily.query
+            if since is not None:
+                query = query.filter(LeadTimeDaily.day >= since)
+            query.delete(synchronize_session=False)
+            if rows:
+                db.session.execute(insert(LeadTimeDaily), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def load_rollups(self, source: str, scope: str, start: date, org_id: Optional[str] = None) -> Tuple[list, List[str]]:
+        query = db.session.query(*[getattr(LeadTimeDaily, column) for column in ROLLUP_COLUMNS]).filter(
+            LeadTimeDaily.source == source,
+            LeadTimeDaily.scope == scope,
+            LeadTimeDaily.day >= start,
+        )
+        if org_id:
+            query = query.filter(db.or_(
+                LeadTimeDaily.org_id == org_id, LeadTimeDaily.counterparty_org_id == org_id
+            ))
+        return [tuple(row) for row in query.all()], ROLLUP_COLUMNS
@@ -1,7 +1,9 @@
 from config.database import db
-from src.models.medication_request_model import MedicationRequest
+from src.models.medication_request_model import MedicationRequest, MedicationRequestAllocation
+from src.utils.pagination import DEFAULT_PAGE_LIMIT, keyset_paginate
+from sqlalchemy import insert, select, tuple_, update
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 import uuid
 
 
@@ -31,29 +33,103 @@ class MedicationRequestRepository:
     def find_by_request_number(self, request_number: str) -> Optional[MedicationRequest]:
         return MedicationRequest.query.filter_by(request_number=request_number).first()
     
-    def find_by_consumer(self, consumer_id: uuid.UUID) -> List[MedicationRequest]:
-        return MedicationRequest.query.filter_by(consumer_id=consumer_id).order_by(MedicationRequest.created_at.desc()).all()
+    # Each list is a page keyed on (created_at, id), returned with the next page's cursor
+    def find_by_consumer(self, consumer_id: uuid.UUID, cursor: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_LIMIT) -> Tuple[List[MedicationRequest], Optional[str]]:
+        return keyset_paginate(
+            MedicationRequest.query.filter_by(consumer_id=consumer_id),
+            [MedicationRequest.created_at, MedicationRequest.id], cursor, limit, descending=True
+        )
     
-    def find_pending_requests(self) -> List[MedicationRequest]:
-        return MedicationRequest.query.filter_by(status='pending').order_by(MedicationRequest.created_at.asc()).all()
+    def find_pending_requests(self, cursor: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_LIMIT) -> Tuple[List[MedicationRequest], Optional[str]]:
+        return keyset_paginate(
+            MedicationRequest.query.filter_by(status='pending'),
+            [MedicationRequest.created_at, MedicationRequest.id], cursor, limit
+        )
     
-    def find_by_manufacturer(self, manufacturer_id: uuid.UUID) -> List[MedicationRequest]:
-        return MedicationRequest.query.filter_by(assigned_manufacturer_id=manufacturer_id).order_by(MedicationRequest.created_at.desc()).all()
+    def find_by_manufacturer(self, manufacturer_id: uuid.UUID, cursor: Optional[str] = None,
+                             limit: int = DEFAULT_PAGE_LIMIT) -> Tuple[List[MedicationRequest], Optional[str]]:
+        return keyset_paginate(
+            MedicationRequest.query.filter_by(assigned_manufacturer_id=manufacturer_id),
+            [MedicationRequest.created_at, MedicationRequest.id], cursor, limit, descending=True
+        )
     
-    def approve_request(self, request_id: uuid.UUID, approver_id: uuid.UUID, batch_id: str, manufacturer_id: uuid.UUID) -> MedicationRequest:
-        medication_request = self.find_by_id(request_id)
-        if not medication_request:
-            return None
-        
-        medication_request.status = 'approved'
-        medication_request.approved_at = datetime.now(timezone.utc)
-        medication_request.approved_by = approver_id
-        medication_request.batch_id = batch_id
-        medication_request.assigned_manufacturer_id = manufacturer_id
-        medication_request.updated_at = datetime.now(timezone.utc)
-        
-        db.session.commit()
-        return medication_request
+    def find_pending_page(self, after: Optional[Tuple[datetime, uuid.UUID]], limit: int):
+        """
+        The oldest pending requests after ``after`` (a ``(created_at, id)``
+        keyset), locked for the rest of the transaction. Rows another
+        allocator holds are skipped rather than waited for.
+        """
+        query = db.session.query(
+            MedicationRequest.id,
+            MedicationRequest.consumer_id,
+            MedicationRequest.request_number,
+            MedicationRequest.product_name,
+            MedicationRequest.unit_dosage,
+            MedicationRequest.requested_quantity,
+            MedicationRequest.created_at
+        ).filter(MedicationRequest.status == 'pending')
+        if after is not None:
+            query = query.filter(tuple_(MedicationRequest.created_at, MedicationRequest.id) > tuple_(*after))
+        return query.order_by(MedicationRequest.created_at, MedicationRequest.id).limit(limit).with_for_update(
+            of=MedicationRequest, skip_locked=True
+        ).all()
+
+    def approve_allocated(self, allocations: Dict[uuid.UUID, List[Tuple[uuid.UUID, str, int]]],
+                          approver_id: uuid.UUID, manufacturer_id: uuid.UUID) -> List[uuid.UUID]:
+        """
+        Records each request's allocation lines (``(inventory id, batch id,
+        quantity)``, soonest expiring first) and approves the requests, in
+        the same transaction as the inventory reserved for them beforehand.
+        The request's ``batch_id`` is its first line. All requests must
+        still be pending: when a concurrent approval or cancellation got to
+        one first, everything is rolled back and [] is returned. With
+        nothing to approve the transaction just ends, releasing its locks.
+        """
+        if not allocations:
+            db.session.rollback()
+            return []
+
+        now = datetime.now(timezone.utc)
+        first_batch = select(MedicationRequestAllocation.batch_id).where(
+            MedicationRequestAllocation.request_id == MedicationRequest.id,
+            MedicationRequestAllocation.line_number == 0
+        ).scalar_subquery()
+        try:
+            db.session.execute(insert(MedicationRequestAllocation), [
+                {
+                    'request_id': request_id,
+                    'inventory_id': inventory_id,
+                    'batch_id': batch_id,
+                    'quantity': quantity,
+                    'line_number': line_number
+                }
+                for request_id, lines in allocations.items()
+                for line_number, (inventory_id, batch_id, quantity) in enumerate(lines)
+            ])
+            approved = db.session.execute(
+                update(MedicationRequest)
+                .where(MedicationRequest.id.in_(list(allocations)), MedicationRequest.status == 'pending')
+                .values(
+                    status='approved',
+                    approved_at=now,
+                    approved_by=approver_id,
+                    batch_id=first_batch,
+                    assigned_manufacturer_id=manufacturer_id,
+                    updated_at=now
+                )
+                .returning(MedicationRequest.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            if len(approved) != len(allocations):
+                db.session.rollback()
+                return []
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return approved
     
     def reject_request(self, request_id: uuid.UUID, rejection_reason: str) -> MedicationRequest:
         medication_request = self.find_by_id(request_id)
@@ -81,13 +157,25 @@ class MedicationRequestRepository:
         db.session.commit()
         return medication_request
     
-    def cancel_request(self, request_id: uuid.UUID) -> MedicationRequest:
-        medication_request = self.find_by_id(request_id)
-        if not medication_request:
-            return None
-        
-        medication_request.status = 'cancelled'
-        medication_request.updated_at = datetime.now(timezone.utc)
-        
-        db.session.commit()
+    def cancel_request(self, request_id: uuid.UUID, expected_status: str) -> MedicationRequest:
+        """
+        Cancels the request only if its status is still ``expected_status``,
+        together with any inventory released for it beforehand; returns
+        None (after rolling back) otherwise.
+        """
+        try:
+            medication_request = db.session.execute(
+                update(MedicationRequest)
+                .where(MedicationRequest.id == request_id, MedicationRequest.status == expected_status)
+                .values(status='cancelled', updated_at=datetime.now(timezone.utc))
+                .returning(MedicationRequest)
+                .execution_options(synchronize_session='fetch')
+            ).scalar_one_or_none()
+            if medication_request is None:
+                db.session.rollback()
+                return None
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         return medication_request
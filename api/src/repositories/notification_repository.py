@@ -1,12 +1,15 @@
 from config.database import db
 from src.models.notification_model import Notification
-from typing import Optional, List
+from src.utils.pagination import DEFAULT_PAGE_LIMIT, keyset_paginate
+from sqlalchemy import insert
+from typing import Optional, List, Tuple
 import uuid
 
 
 class NotificationRepository:
-    def create(self, data: dict) -> Notification:
-        notification = Notification(
+    @staticmethod
+    def _build(data: dict) -> Notification:
+        return Notification(
             user_id=data['user_id'],
             title=data['title'],
             message=data['message'],
@@ -15,21 +18,51 @@ class NotificationRepository:
             related_entity_id=data.get('related_entity_id'),
             is_read=False
         )
+
+    def create(self, data: dict) -> Notification:
+        notification = self._build(data)
         
         db.session.add(notification)
         db.session.commit()
         return notification
-    
+
+    def create_many(self, items: List[dict], commit: bool = True) -> None:
+        """
+        Inserts many notifications in one statement, without loading them
+        back. With ``commit=False`` they join the caller's transaction.
+        """
+        if not items:
+            return
+        try:
+            db.session.execute(insert(Notification), [
+                {
+                    'user_id': data['user_id'],
+                    'title': data['title'],
+                    'message': data['message'],
+                    'notification_type': data['notification_type'],
+                    'related_entity_type': data.get('related_entity_type'),
+                    'related_entity_id': data.get('related_entity_id'),
+                    'is_read': False
+                }
+                for data in items
+            ])
+            if commit:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
     def find_by_id(self, notification_id: uuid.UUID) -> Optional[Notification]:
         return Notification.query.filter_by(id=notification_id).first()
     
-    def find_by_user(self, user_id: uuid.UUID, unread_only: bool = False) -> List[Notification]:
+    def find_by_user(self, user_id: uuid.UUID, unread_only: bool = False, cursor: Optional[str] = None,
+                     limit: int = DEFAULT_PAGE_LIMIT) -> Tuple[List[Notification], Optional[str]]:
         query = Notification.query.filter_by(user_id=user_id)
         
         if unread_only:
             query = query.filter_by(is_read=False)
         
-        return query.order_by(Notification.created_at.desc()).all()
+        return keyset_paginate(query, [Notification.created_at, Notification.id], cursor, limit, descending=True)
     
     def mark_as_read(self, notification_id: uuid.UUID) -> Optional[Notification]:
         notification = self.find_by_id(notification_id)
@@ -1,6 +1,7 @@
 from config.database import db
 from src.models.organization_model import Organization
-from typing import Optional, List
+from src.utils.pagination import DEFAULT_PAGE_LIMIT, keyset_paginate
+from typing import Optional, List, Tuple
 import uuid
 
 
@@ -29,8 +30,11 @@ class OrganizationRepository:
     def find_by_type(self, org_type: str) -> List[Organization]:
         return Organization.query.filter_by(org_type=org_type, status='active').all()
     
-    def find_all(self) -> List[Organization]:
-        return Organization.query.filter_by(status='active').all()
+    def find_all(self, cursor: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_LIMIT) -> Tuple[List[Organization], Optional[str]]:
+        return keyset_paginate(
+            Organization.query.filter_by(status='active'), [Organization.created_at, Organization.id], cursor, limit
+        )
     
     def update(self, organization_id: uuid.UUID, data: dict) -> Optional[Organization]:
         organization = self.find_by_id(organization_id)
@@ -0,0 +1,117 @@
+from config.database import db
+from src.models.outbox_model import OutboxEntry
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Tuple
+import uuid
+
+# Statuses the dispatcher still has work for
+READY_STATUSES = ('pending', 'ledger_committed')
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class OutboxRepository:
+    def enqueue(self, operation: str, aggregate_id: str, payload: dict, created_by=None) -> Tuple[OutboxEntry, bool]:
+        """
+        Records an intent. Recording the same operation for the same
+        aggregate twice returns the existing entry instead.
+        """
+        entry = OutboxEntry(
+            operation=operation,
+            aggregate_id=aggregate_id,
+            payload=payload,
+            status='pending',
+            attempts=0,
+            created_by=created_by
+        )
+
+        try:
+            db.session.add(entry)
+            db.session.commit()
+            return entry, True
+        except IntegrityError:
+            db.session.rollback()
+            return self.find_by_aggregate(operation, aggregate_id), False
+
+    def find_by_id(self, entry_id: uuid.UUID) -> Optional[OutboxEntry]:
+        return db.session.get(OutboxEntry, entry_id)
+
+    def find_by_aggregate(self, operation: str, aggregate_id: str) -> Optional[OutboxEntry]:
+        return OutboxEntry.query.filter_by(operation=operation, aggregate_id=aggregate_id).first()
+
+    def claim(self, limit: int, lease_seconds: float) -> List[OutboxEntry]:
+        """
+        Leases up to ``limit`` due entries to the caller, oldest first.
+
+        Candidates are read with SKIP LOCKED where the database supports it,
+        and the lease itself is a conditional UPDATE, so concurrent
+        dispatchers always claim disjoint sets. A lease that is not released
+        within ``lease_seconds`` (crashed worker) makes the entry claimable
+        again.
+        """
+        now = _utcnow()
+        token = uuid.uuid4()
+        claimable = (
+            OutboxEntry.status.in_(READY_STATUSES),
+            OutboxEntry.next_attempt_at <= now,
+            db.or_(
+                OutboxEntry.locked_at.is_(None),
+                OutboxEntry.locked_at < now - timedelta(seconds=lease_seconds)
+            )
+        )
+
+        try:
+            ids = [
+                row.id for row in db.session.query(OutboxEntry.id).filter(*claimable)
+                .order_by(OutboxEntry.next_attempt_at).limit(limit)
+                .with_for_update(skip_locked=True).all()
+            ]
+            if not ids:
+                db.session.commit()
+                return []
+
+            OutboxEntry.query.filter(OutboxEntry.id.in_(ids), *claimable).update(
+                {'locked_at': now, 'locked_by': token}, synchronize_session=False
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return OutboxEntry.query.filter_by(locked_by=token).order_by(OutboxEntry.next_attempt_at).all()
+
+    def schedule_retry(self, entry: OutboxEntry, error: str, delay: float, max_attempts: int) -> None:
+        entry.attempts += 1
+        entry.last_error = error[:2000]
+        entry.locked_at = None
+        entry.locked_by = None
+        if entry.attempts >= max_attempts:
+            entry.status = 'failed'
+        else:
+            entry.next_attempt_at = _utcnow() + timedelta(seconds=delay)
+
+    def fail(self, entry: OutboxEntry, error: str) -> None:
+        entry.attempts += 1
+        entry.last_error = error[:2000]
+        entry.locked_at = None
+        entry.locked_by = None
+        entry.status = 'failed'
+
+    def count_by_status(self) -> dict:
+        rows = db.session.query(OutboxEntry.status, db.func.count(OutboxEntry.id)).group_by(OutboxEntry.status).all()
+        return {status: count for status, count in rows}
+
+    def requeue_failed(self) -> int:
+        try:
+            count = OutboxEntry.query.filter_by(status='failed').update(
+                {'status': 'pending', 'attempts': 0, 'next_attempt_at': _utcnow(), 'locked_at': None, 'locked_by': None},
+                synchronize_session=False
+            )
+            db.session.commit()
+            return count
+        except Exception:
+            db.session.rollback()
+            raise
@@ -0,0 +1,103 @@
+from config.database import db
+from src.models.batch_mirror_model import LedgerBatch
+from src.models.inventory_model import Inventory
+from src.models.organization_model import Organization
+from src.models.reconciliation_model import ReconciliationRun, ReconciliationDiscrepancy
+from src.utils.pagination import keyset_paginate
+from sqlalchemy import select, union, insert
+from datetime import datetime, timezone
+from typing import Optional, List, Tuple
+import uuid
+
+
+class ReconciliationRepository:
+    # --------------------------------------------------------
+    # Runs
+    # --------------------------------------------------------
+    def create_run(self, started_by: Optional[uuid.UUID] = None) -> ReconciliationRun:
+        run = ReconciliationRun(started_by=started_by, status='running', batches_checked=0, discrepancy_count=0)
+        try:
+            db.session.add(run)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return run
+
+    def find_run(self, run_id: uuid.UUID) -> Optional[ReconciliationRun]:
+        return db.session.get(ReconciliationRun, run_id)
+
+    def find_running(self) -> Optional[ReconciliationRun]:
+        return ReconciliationRun.query.filter_by(status='running').first()
+
+    def find_runs(self, limit: int = 20) -> List[ReconciliationRun]:
+        return ReconciliationRun.query.order_by(ReconciliationRun.started_at.desc()).limit(limit).all()
+
+    def finish_run(self, run: ReconciliationRun, error: Optional[str] = None) -> ReconciliationRun:
+        run.status = 'failed' if error else 'completed'
+        run.error = error
+        run.finished_at = datetime.now(timezone.utc)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return run
+
+    # --------------------------------------------------------
+    # Scanning
+    # --------------------------------------------------------
+    def next_batch_ids(self, after: Optional[str], limit: int) -> List[str]:
+        """
+        Returns the next ``limit`` batch ids, in order, known to inventory or
+        to the ledger mirror. Each side is an index range scan.
+        """
+        sides = []
+        for column in (Inventory.batch_id, LedgerBatch.batch_id):
+            side = select(column.label('batch_id'))
+            if after is not None:
+                side = side.where(column > after)
+            sides.append(side.order_by(column).limit(limit))
+
+        ids = union(*[side.subquery().select() for side in sides]).subquery()
+        query = select(ids.c.batch_id).order_by(ids.c.batch_id).limit(limit)
+        return list(db.session.execute(query).scalars())
+
+    def load_inventory(self, batch_ids: List[str]) -> List[Tuple[str, str, int, int]]:
+        """
+        Returns ``(batch_id, org_id, available, reserved)`` rows of the given
+        batches, keyed by the organization's business ``org_id`` like the
+        ledger ownerships are.
+        """
+        rows = db.session.execute(
+            select(Inventory.batch_id, Organization.org_id, Inventory.available_quantity, Inventory.reserved_quantity)
+            .join(Organization, Inventory.organization_id == Organization.id)
+            .where(Inventory.batch_id.in_(batch_ids))
+        )
+        return [tuple(row) for row in rows]
+
+    def add_discrepancies(self, run: ReconciliationRun, records: List[dict], batches_checked: int) -> None:
+        """
+        Bulk-inserts one chunk of discrepancies and advances the run's
+        counters in the same transaction.
+        """
+        try:
+            if records:
+                db.session.execute(
+                    insert(ReconciliationDiscrepancy),
+                    [{'id': uuid.uuid4(), 'run_id': run.id, **record} for record in records]
+                )
+            run.batches_checked += batches_checked
+            run.discrepancy_count += len(records)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def find_discrepancies(self, run_id: uuid.UUID, kind: Optional[str], cursor: Optional[str], limit: int):
+        query = ReconciliationDiscrepancy.query.filter_by(run_id=run_id)
+        if kind:
+            query = query.filter_by(kind=kind)
+        return keyset_paginate(
+            query, [ReconciliationDiscrepancy.batch_id, ReconciliationDiscrepancy.org_id], cursor, limit
+        )
@@ -0,0 +1,91 @@
+from config.database import db
+from src.analytics.sketches import CountMinSketch, HyperLogLog
+from src.models.scan_model import ScanSketch, BatchScanStats
+from datetime import datetime, timezone
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, List, Optional
+
+
+class ScanSketchRepository:
+    def load_sketch(self, name: str) -> Optional[CountMinSketch]:
+        row = db.session.get(ScanSketch, name)
+        return CountMinSketch.from_bytes(row.payload) if row is not None else None
+
+    def add_to_sketch(self, name: str, delta: CountMinSketch) -> CountMinSketch:
+        """
+        Adds one process's new counts to the shared sketch under a row lock
+        and returns the combined sketch.
+        """
+        try:
+            row = ScanSketch.query.filter_by(name=name).with_for_update().first()
+            if row is None:
+                merged = CountMinSketch(delta.width, delta.depth, delta.table.copy())
+                db.session.add(ScanSketch(name=name, payload=merged.to_bytes()))
+            else:
+                merged = CountMinSketch.from_bytes(row.payload)
+                merged.merge(delta)
+                row.payload = merged.to_bytes()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return merged
+
+    def load_batch_stats(self, batch_ids: List[str]) -> Dict[str, BatchScanStats]:
+        if not batch_ids:
+            return {}
+        rows = BatchScanStats.query.filter(BatchScanStats.batch_id.in_(batch_ids)).all()
+        return {row.batch_id: row for row in rows}
+
+    def merge_location_registers(self, sketches: Dict[str, HyperLogLog]) -> Dict[str, HyperLogLog]:
+        """
+        Max-merges each batch's registers into the stored ones and returns
+        the merged sketches (which include other processes' locations).
+        """
+        merged = {}
+        try:
+            rows = BatchScanStats.query.filter(
+                BatchScanStats.batch_id.in_(list(sketches))
+            ).with_for_update().all()
+            stored = {row.batch_id: row for row in rows}
+
+            for batch_id, sketch in sketches.items():
+                combined = HyperLogLog(sketch.precision, sketch.registers.copy())
+                row = stored.get(batch_id)
+                if row is None:
+                    row = BatchScanStats(batch_id=batch_id)
+                    db.session.add(row)
+                elif row.location_registers:
+                    combined.merge(HyperLogLog.from_bytes(row.location_registers))
+                row.location_registers = combined.to_bytes()
+                merged[batch_id] = combined
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return merged
+
+    def flag_batch(self, batch_id: str, kind: str) -> bool:
+        """
+        Records an alert of ``kind`` (volume or locations) for the batch;
+        returns False when it had already been raised, by any process.
+        """
+        column = BatchScanStats.volume_flagged_at if kind == 'volume' else BatchScanStats.locations_flagged_at
+        now = datetime.now(timezone.utc)
+        try:
+            if db.session.get(BatchScanStats, batch_id) is None:
+                db.session.add(BatchScanStats(batch_id=batch_id))
+                db.session.commit()
+        except IntegrityError:
+            # Created concurrently by another process
+            db.session.rollback()
+
+        try:
+            flagged = BatchScanStats.query.filter(
+                BatchScanStats.batch_id == batch_id, column.is_(None)
+            ).update({column: now}, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return flagged == 1
@@ -1,5 +1,7 @@
+import uuid
 from src.models.user_model import User, db
 from src.utils.constants import UserStatus
+from src.utils.pagination import DEFAULT_PAGE_LIMIT, keyset_paginate
 
 class UserRepository:
 
@@ -27,16 +29,23 @@ class UserRepository:
             db.session.rollback()
             raise
 
-    def get_all_users(self):
+    def get_all_users(self, cursor=None, limit=DEFAULT_PAGE_LIMIT):
         try: 
-            users = User.query.filter_by(status=UserStatus.ACTIVE.value).all()
-            return users
+            return keyset_paginate(
+                User.query.filter_by(status=UserStatus.ACTIVE.value), [User.created_at, User.id], cursor, limit
+            )
         except Exception:
             db.session.rollback()
             raise
         
 
     def get_user(self, user_id):
+        try:
+            # JWT identities arrive as strings; the UUID column needs a UUID on every backend
+            user_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
+        except ValueError:
+            return None
+
         try:
             user = User.query.filter_by(id=user_id, status=UserStatus.ACTIVE.value).first()
             return user
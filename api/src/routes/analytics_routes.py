@@ -0,0 +1,16 @@
+from flask import Blueprint, request
+from src.controllers.analytics_controller import AnalyticsController
+
+
+analytics_bp = Blueprint("analytics_bp", __name__)
+analytics_controller = AnalyticsController()
+
+
+@analytics_bp.route("/lead-times", methods=["GET"])
+def get_lead_times():
+    return analytics_controller.get_lead_times(request.args)
+
+
+@analytics_bp.route("/lead-times/rollup", methods=["POST"])
+def refresh_lead_time_rollups():
+    return analytics_controller.refresh_lead_time_rollups(request.args)
@@ -6,19 +6,44 @@ blockchain_bp = Blueprint("blockchain_bp", __name__)
 blockchain_controller = BlockchainController()
 
 
+def _wait_for_commit():
+    """
+    Writes block until commit unless the client opts into async mode with
+    ?mode=async or a "Prefer: respond-async" header.
+    """
+    if request.args.get("mode") == "async":
+        return False
+    return "respond-async" not in request.headers.get("Prefer", "")
+
+
 @blockchain_bp.route("/batches", methods=["POST"])
 def create_batch():
-    return blockchain_controller.create_batch(request.get_json())
+    return blockchain_controller.create_batch(request.get_json(), _wait_for_commit())
+
+
+@blockchain_bp.route("/batches", methods=["GET"])
+def list_batches():
+    return blockchain_controller.list_batches(request.args)
+
+
+@blockchain_bp.route("/batches/bulk", methods=["POST"])
+def create_batches():
+    return blockchain_controller.create_batches(request.get_data(as_text=True), request.mimetype)
+
+
+@blockchain_bp.route("/batches/verify-bulk", methods=["POST"])
+def verify_batches():
+    return blockchain_controller.verify_batches(request.get_json(silent=True))
 
 
 @blockchain_bp.route("/batches/transfer", methods=["POST"])
 def transfer_batch():
-    return blockchain_controller.transfer_batch(request.json)
+    return blockchain_controller.transfer_batch(request.json, _wait_for_commit())
 
 
 @blockchain_bp.route("/batches/delivered", methods=["POST"])
 def mark_batch_delivered():
-    return blockchain_controller.mark_batch_delivered(request.json)
+    return blockchain_controller.mark_batch_delivered(request.json, _wait_for_commit())
 
 
 @blockchain_bp.route("/batches/<string:batch_id>", methods=["GET"])
@@ -28,4 +53,120 @@ def get_batch(batch_id):
 
 @blockchain_bp.route("/batches/<string:batch_id>/history", methods=["GET"])
 def get_batch_history(batch_id):
-    return blockchain_controller.get_batch_history(batch_id)
+    since = request.args.get("since")
+    return blockchain_controller.get_batch_history(batch_id, since)
+
+
+@blockchain_bp.route("/batches/<string:batch_id>/route", methods=["GET"])
+def get_batch_route(batch_id):
+    return blockchain_controller.get_batch_route(batch_id)
+
+
+@blockchain_bp.route("/transfers", methods=["GET"])
+def list_transfers():
+    return blockchain_controller.list_transfers(request.args)
+
+
+@blockchain_bp.route("/graph/path", methods=["GET"])
+def find_graph_path():
+    return blockchain_controller.find_graph_path(request.args)
+
+
+@blockchain_bp.route("/graph/reachable/<string:org_id>", methods=["GET"])
+def find_graph_reachable(org_id):
+    return blockchain_controller.find_graph_reachable(org_id, request.args)
+
+
+@blockchain_bp.route("/graph/flows", methods=["GET"])
+def find_graph_flows():
+    return blockchain_controller.find_graph_flows(request.args)
+
+
+@blockchain_bp.route("/graph/stats", methods=["GET"])
+def get_graph_stats():
+    return blockchain_controller.get_graph_stats()
+
+
+@blockchain_bp.route("/anomalies", methods=["GET"])
+def list_anomalies():
+    return blockchain_controller.list_anomalies(request.args)
+
+
+@blockchain_bp.route("/reconciliations", methods=["POST"])
+def start_reconciliation():
+    return blockchain_controller.start_reconciliation()
+
+
+@blockchain_bp.route("/reconciliations", methods=["GET"])
+def list_reconciliations():
+    return blockchain_controller.list_reconciliations()
+
+
+@blockchain_bp.route("/reconciliations/<string:run_id>", methods=["GET"])
+def get_reconciliation(run_id):
+    return blockchain_controller.get_reconciliation(run_id)
+
+
+@blockchain_bp.route("/reconciliations/<string:run_id>/discrepancies", methods=["GET"])
+def list_discrepancies(run_id):
+    return blockchain_controller.list_discrepancies(run_id, request.args)
+
+
+@blockchain_bp.route("/consistency-runs", methods=["POST"])
+def start_consistency_check():
+    return blockchain_controller.start_consistency_check()
+
+
+@blockchain_bp.route("/consistency-runs", methods=["GET"])
+def list_consistency_runs():
+    return blockchain_controller.list_consistency_runs()
+
+
+@blockchain_bp.route("/consistency-runs/<string:run_id>", methods=["GET"])
+def get_consistency_run(run_id):
+    return blockchain_controller.get_consistency_run(run_id)
+
+
+@blockchain_bp.route("/consistency-runs/<string:run_id>/violations", methods=["GET"])
+def list_consistency_violations(run_id):
+    return blockchain_controller.list_consistency_violations(run_id, request.args)
+
+
+@blockchain_bp.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    return blockchain_controller.get_cache_stats()
+
+
+@blockchain_bp.route("/network/stats", methods=["GET"])
+def get_network_stats():
+    return blockchain_controller.get_network_stats()
+
+
+@blockchain_bp.route("/writes/stats", methods=["GET"])
+def get_write_stats():
+    return blockchain_controller.get_write_stats()
+
+
+@blockchain_bp.route("/scans/stats", methods=["GET"])
+def get_scan_stats():
+    return blockchain_controller.get_scan_stats()
+
+
+@blockchain_bp.route("/outbox/stats", methods=["GET"])
+def get_outbox_stats():
+    return blockchain_controller.get_outbox_stats()
+
+
+@blockchain_bp.route("/outbox/<string:entry_id>", methods=["GET"])
+def get_outbox_entry(entry_id):
+    return blockchain_controller.get_outbox_entry(entry_id)
+
+
+@blockchain_bp.route("/transactions/<string:tx_id>", methods=["GET"])
+def get_transaction_status(tx_id):
+    return blockchain_controller.get_transaction_status(tx_id)
+
+
+@blockchain_bp.route("/transactions/status", methods=["POST"])
+def get_transaction_statuses():
+    return blockchain_controller.get_transaction_statuses(request.get_json())
@@ -0,0 +1,17 @@
+from flask import Blueprint, request
+from src.controllers.fraud_controller import FraudController
+
+
+fraud_bp = Blueprint("fraud_bp", __name__)
+fraud_controller = FraudController()
+
+
+@fraud_bp.route("/score", methods=["POST"])
+def score_transfers():
+    data = request.get_json(silent=True)
+    return fraud_controller.score_transfers(data)
+
+
+@fraud_bp.route("/model", methods=["GET"])
+def get_model():
+    return fraud_controller.get_model()
@@ -13,21 +13,29 @@ def create_inventory_item():
 
 @inventory_bp.route("/inventory", methods=["GET"])
 def get_my_inventory():
-    return inventory_controller.get_my_inventory()
+    return inventory_controller.get_my_inventory(request.args)
 
 
 @inventory_bp.route("/inventory/organization/<string:organization_id>", methods=["GET"])
 def get_inventory_by_organization(organization_id):
-    return inventory_controller.get_inventory_by_organization(organization_id)
+    return inventory_controller.get_inventory_by_organization(organization_id, request.args)
 
 
 @inventory_bp.route("/inventory/search", methods=["GET"])
 def search_available_inventory():
-    product_name = request.args.get('product_name', '')
-    min_quantity = request.args.get('min_quantity', 1)
-    return inventory_controller.search_available_inventory(product_name, min_quantity)
+    return inventory_controller.search_available_inventory(request.args)
+
+
+@inventory_bp.route("/inventory/autocomplete", methods=["GET"])
+def autocomplete_products():
+    return inventory_controller.autocomplete_products(request.args)
 
 
 @inventory_bp.route("/inventory/<string:batch_id>/quantity", methods=["PATCH"])
 def update_inventory_quantity(batch_id):
     return inventory_controller.update_inventory_quantity(batch_id, request.get_json())
+
+
+@inventory_bp.route("/inventory/reservations", methods=["POST"])
+def reserve_inventory():
+    return inventory_controller.reserve_inventory(request.get_json())
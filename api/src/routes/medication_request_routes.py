@@ -13,7 +13,12 @@ def create_request():
 
 @medication_request_bp.route("/medication-requests", methods=["GET"])
 def get_my_requests():
-    return medication_request_controller.get_my_requests()
+    return medication_request_controller.get_my_requests(request.args)
+
+
+@medication_request_bp.route("/medication-requests/allocate", methods=["POST"])
+def allocate_pending_requests():
+    return medication_request_controller.allocate_pending_requests(request.get_json())
 
 
 @medication_request_bp.route("/medication-requests/<string:request_id>", methods=["GET"])
@@ -8,8 +8,7 @@ notification_controller = NotificationController()
 
 @notification_bp.route("/notifications", methods=["GET"])
 def get_my_notifications():
-    unread_only = request.args.get('unread_only', 'false').lower() == 'true'
-    return notification_controller.get_my_notifications(unread_only)
+    return notification_controller.get_my_notifications(request.args)
 
 
 @notification_bp.route("/notifications/<string:notification_id>/read", methods=["POST"])
@@ -7,9 +7,7 @@ user_controller = UserController()
 
 @user_bp.route('/', methods=['GET'])
 def get_all_users():
-    source = request.args.get('source', False)
-
-    return user_controller.get_all_users(source)
+    return user_controller.get_all_users(request.args)
     
 @user_bp.route('/', methods=['POST'])
 def create_user():
@@ -0,0 +1,16 @@
+from flask import Blueprint
+from src.controllers.verification_controller import VerificationController
+
+
+verification_bp = Blueprint("verification_bp", __name__)
+verification_controller = VerificationController()
+
+
+@verification_bp.route("/public-key", methods=["GET"])
+def get_public_key():
+    return verification_controller.get_public_key()
+
+
+@verification_bp.route("/<string:batch_id>", methods=["GET"])
+def verify_batch(batch_id):
+    return verification_controller.verify_batch(batch_id)
@@ -0,0 +1,279 @@
+import math
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from config.database import db
+from src.analytics.anomaly import RobustZScoreDetector
+from src.fabric.event_listener import LedgerEventListener
+from src.models.user_model import User
+from src.repositories.anomaly_repository import AnomalyRepository
+from src.repositories.batch_mirror_repository import BatchMirrorRepository
+from src.repositories.notification_repository import NotificationRepository
+from src.utils.constants import UserRole, UserStatus
+from src.utils.timestamps import hours_between
+
+ANOMALY_DETECTOR_CHECKPOINT = 'anomaly_detector'
+FEATURE_NAMES = ("log_quantity", "batch_share", "log_hours_since_previous_step")
+# Smallest spread that counts: ~10% in quantity, 2% of the batch, ~6 minutes of a short hold
+FEATURE_MIN_SCALE = (0.1, 0.02, 0.1)
+
+
+def extract_features(event) -> Optional[Tuple[dict, list, list]]:
+    """
+    Turns a committed transferBatch/markBatchDelivered event into
+    ``(details, window_keys, features)``, or None for other events.
+
+    Features: the quantity moved (log scale), its share of the batch, and
+    the hours since the batch's previous custody step (log scale), i.e.
+    how long the sender held it or how long it took to be delivered.
+    """
+    if not event.valid or event.function not in ("transferBatch", "markBatchDelivered") or len(event.args) < 3:
+        return None
+
+    batch_id = event.args[0]
+    batch = event.values.get(batch_id)
+    if not isinstance(batch, dict):
+        return None
+    transfers = batch.get("transfers") or []
+    now = event.timestamp or batch.get("updatedAt")
+
+    if event.function == "transferBatch":
+        org_id, counterparty, quantity = event.args[1], event.args[2], int(event.args[3])
+        previous = transfers[-2]["timestamp"] if len(transfers) >= 2 else batch.get("createdAt")
+        keys = [("transferBatch", "org", org_id), ("transferBatch", "route", org_id, counterparty)]
+    else:
+        org_id, counterparty, quantity = event.args[1], None, int(event.args[2])
+        received = next((t for t in reversed(transfers) if t.get("toOrgId") == org_id), None)
+        previous = received["timestamp"] if received else batch.get("createdAt")
+        keys = [("markBatchDelivered", "org", org_id)]
+
+    total = batch.get("totalQuantity") or 0
+    features = [
+        math.log1p(quantity),
+        quantity / total if total else 0.0,
+        math.log1p(hours_between(previous, now)),
+    ]
+    details = {
+        "tx_id": event.tx_id,
+        "block_number": event.block_number,
+        "function": event.function,
+        "batch_id": batch_id,
+        "org_id": org_id,
+        "counterparty_org_id": counterparty,
+        "quantity": quantity,
+    }
+    return details, keys, features
+
+
+class TransferAnomalyDetector:
+    """
+    Scores committed transfer and delivery events as they arrive and
+    records the outliers.
+
+    Like the ledger indexer it owns a block listener and applies events on a
+    worker thread. Rolling per-organization and per-route windows live in
+    memory only, so on start the listener rewinds ``warmup_blocks`` before
+    the checkpoint: events up to the checkpoint just rebuild the windows,
+    later ones are scored. Flagged events go to transfer_anomaly and every
+    active admin gets a Notification.
+
+    At most ``max_queue`` events wait for the worker; beyond that events
+    are dropped (and counted) rather than stall the shared event loop. A
+    group whose results still fail to record after ``max_attempts`` is
+    recorded one flagged event at a time, and an event that fails on its
+    own is parked in the dead-letter table.
+    """
+
+    def __init__(self, app, window: int = 256, min_samples: int = 30, threshold: float = 4.0,
+                 warmup_blocks: int = 10000, batch_size: int = 500, retry_delay: float = 5.0,
+                 max_attempts: int = 5, max_queue: int = 100000) -> None:
+        self.app = app
+        self.warmup_blocks = warmup_blocks
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.model = RobustZScoreDetector(
+            FEATURE_NAMES, window=window, min_samples=min_samples, threshold=threshold, min_scale=FEATURE_MIN_SCALE
+        )
+
+        self.repository = AnomalyRepository()
+        self.checkpoint_repository = BatchMirrorRepository()
+        self.notification_repository = NotificationRepository()
+        self.listener = LedgerEventListener()
+        self.listener.subscribe(self._enqueue)
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._score_after = -1
+        self.counters = {"events": 0, "scored": 0, "flagged": 0, "dropped": 0, "parked": 0}
+
+    def _enqueue(self, event) -> None:
+        # Runs on the Fabric event loop: hand off without touching the
+        # database, and never block it
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.counters["dropped"] += 1
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def start(self, fabric_client) -> None:
+        with self.app.app_context():
+            checkpoint = self.checkpoint_repository.get_checkpoint(ANOMALY_DETECTOR_CHECKPOINT)
+
+        if checkpoint is None:
+            start_block = 0
+        else:
+            self._score_after = checkpoint
+            start_block = max(checkpoint + 1 - self.warmup_blocks, 0)
+
+        self._stopped.clear()
+        self._worker = threading.Thread(target=self._run, name="anomaly-detector", daemon=True)
+        self._worker.start()
+        self.listener.start(fabric_client, start_block=start_block)
+
+    def stop(self) -> None:
+        self.listener.stop()
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    # --------------------------------------------------------
+    # Worker
+    # --------------------------------------------------------
+    def _drain(self) -> List:
+        try:
+            events = [self._queue.get(timeout=1.0)]
+        except queue.Empty:
+            return []
+        while len(events) < self.batch_size:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while not self._stopped.is_set():
+                events = self._drain()
+                if not events:
+                    continue
+
+                flagged = self.score(events)
+                checkpoint = max(e.block_number for e in events) - 1
+                if not self._record_with_retries(flagged, checkpoint):
+                    self._record_or_park(flagged, events, checkpoint)
+
+    def _record_with_retries(self, flagged: List[dict], checkpoint: int) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.record(flagged, checkpoint)
+                return True
+            except Exception as e:
+                db.session.rollback()
+                print(
+                    f"Warning: Anomaly detector failed to record block {checkpoint + 1} "
+                    f"(attempt {attempt} of {self.max_attempts}): {str(e)}"
+                )
+            if self._stopped.is_set():
+                return True
+            if attempt < self.max_attempts:
+                time.sleep(self.retry_delay)
+        return False
+
+    def _record_or_park(self, flagged: List[dict], events: List, checkpoint: int) -> None:
+        events_by_tx = {event.tx_id: event for event in events}
+        for anomaly in flagged:
+            try:
+                self.record([anomaly], -1)
+                continue
+            except Exception as e:
+                db.session.rollback()
+                error = str(e)
+
+            try:
+                self.checkpoint_repository.record_dead_letter(
+                    events_by_tx[anomaly["tx_id"]], error, ANOMALY_DETECTOR_CHECKPOINT
+                )
+                db.session.commit()
+                self.counters["parked"] += 1
+                print(f"Warning: Anomaly detector skipped tx {anomaly['tx_id']}: {error}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"Warning: Anomaly detector dropped tx {anomaly['tx_id']}: {str(e)}")
+
+        try:
+            self.record([], checkpoint)
+        except Exception as e:
+            # Only the checkpoint is lost: the next group moves it past these blocks
+            db.session.rollback()
+            print(f"Warning: Anomaly detector could not checkpoint block {checkpoint}: {str(e)}")
+
+    def score(self, events: List) -> List[dict]:
+        """
+        Runs a group of events through the model; returns the flagged ones.
+        """
+        flagged = []
+        for event in events:
+            extracted = extract_features(event)
+            if extracted is None:
+                continue
+            details, keys, features = extracted
+            self.counters["events"] += 1
+
+            if event.block_number <= self._score_after:
+                self.model.update(keys, features)
+                continue
+
+            score, reasons = self.model.observe(keys, features)
+            self.counters["scored"] += 1
+            if score > self.model.threshold:
+                flagged.append({
+                    **details,
+                    "score": round(score, 3),
+                    "features": dict(zip(FEATURE_NAMES, (round(f, 4) for f in features))),
+                    "reasons": reasons,
+                })
+        return flagged
+
+    def record(self, flagged: List[dict], checkpoint: int) -> None:
+        """
+        Stores the flagged events, notifies admins and advances the
+        checkpoint in one transaction.
+        """
+        added = self.repository.add_new(flagged) if flagged else []
+
+        if added:
+            db.session.flush()  # assigns the ids the notifications point at
+            admins = User.query.filter_by(role=UserRole.ADMIN.value, status=UserStatus.ACTIVE.value).all()
+            notifications = []
+            for anomaly in added:
+                # The same feature usually stands out in the org and the route window
+                strongest = {}
+                for reason in sorted(anomaly.reasons, key=lambda r: r['z']):
+                    strongest[reason['feature']] = reason
+                reasons = ", ".join(f"{r['feature']} = {r['value']} (mediana {r['median']})" for r in strongest.values())
+                notifications.extend({
+                    'user_id': admin.id,
+                    'title': 'Anomalia na Distribuição Detectada',
+                    'message': f'Movimentação do lote {anomaly.batch_id} por {anomaly.org_id} '
+                               f'({anomaly.quantity} unidades) fora do padrão: {reasons}.',
+                    'notification_type': 'distribution_anomaly',
+                    'related_entity_type': 'transfer_anomaly',
+                    'related_entity_id': str(anomaly.id)
+                } for admin in admins)
+            self.notification_repository.create_many(notifications, commit=False)
+
+        if checkpoint >= 0:
+            self.checkpoint_repository.set_checkpoint(checkpoint, ANOMALY_DETECTOR_CHECKPOINT)
+        db.session.commit()
+        self.counters["flagged"] += len(added)
+
+    def stats(self) -> dict:
+        return {**self.counters, "tracked_windows": self.model.tracked_keys, "queued": self._queue.qsize()}
@@ -0,0 +1,32 @@
+from werkzeug.exceptions import BadRequest
+from src.models.anomaly_model import transfer_anomalies_output
+from src.repositories.anomaly_repository import AnomalyRepository
+from src.services.auth_service import AuthService
+from src.utils.constants import UserRole
+from src.utils.pagination import parse_limit
+
+
+class AnomalyService:
+    def __init__(self):
+        self.repository = AnomalyRepository()
+        self.auth_service = AuthService()
+
+    def list_anomalies(self, args):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view distribution anomalies")
+
+        try:
+            min_score = float(args['min_score']) if args.get('min_score') else None
+        except ValueError:
+            raise BadRequest("min_score must be a number")
+
+        filters = {
+            'batch_id': args.get('batch_id'),
+            'org_id': args.get('org_id'),
+            'min_score': min_score,
+        }
+        anomalies, next_cursor = self.repository.find(filters, args.get('cursor'), parse_limit(args.get('limit')))
+        return transfer_anomalies_output.dump(anomalies), next_cursor
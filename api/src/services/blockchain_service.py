@@ -1,15 +1,37 @@
-from werkzeug.exceptions import NotFound, BadRequest
+import os
+import uuid
+from flask import current_app
+from werkzeug.exceptions import NotFound, BadRequest, Conflict
+from config.cache_config import get_all_cache_stats
+from config.scan_monitor_config import get_scan_monitor
+from src.fabric.transaction_tracker import get_transaction_tracker
+from src.fabric.write_scheduler import WriteConflictError
 from src.repositories.blockchain_repository import BlockchainRepository
+from src.models.outbox_model import outbox_entry_output
 from src.repositories.inventory_repository import InventoryRepository
+from src.repositories.organization_repository import OrganizationRepository
+from src.repositories.outbox_repository import OutboxRepository
 from src.services.auth_service import AuthService
+from src.services.outbox_dispatcher_service import inventory_data
+from src.services.scan_monitor_service import SCAN_SOURCE_GATE
 from src.utils.constants import UserRole
 
+BULK_SUBMIT_CONCURRENCY = int(os.getenv("BULK_SUBMIT_CONCURRENCY", "32"))
+BULK_QUERY_CONCURRENCY = int(os.getenv("BULK_QUERY_CONCURRENCY", "64"))
+TX_STATUS_MAX_LOOKUP = 1000
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+
 
 class BlockchainService:
     def __init__(self, fabric_client):
+        self.fabric_client = fabric_client
         self.repository = BlockchainRepository(fabric_client)
         self.inventory_repository = InventoryRepository()
+        self.organization_repository = OrganizationRepository()
+        self.outbox_repository = OutboxRepository()
         self.auth_service = AuthService()
+        self.transaction_tracker = get_transaction_tracker()
+        self.outbox_enabled = OUTBOX_ENABLED
 
     def _get_current_user(self):
         user = self.auth_service.return_user_from_token()
@@ -17,7 +39,57 @@ class BlockchainService:
             raise BadRequest("Authentication required")
         return user
 
-    def create_batch(self, data):
+    def _ledger_org_id(self, user):
+        """
+        The caller's organization as the ledger names it (its business
+        ``org_id``, not the Organization primary key), or None.
+        """
+        if not user.organization_id:
+            return None
+        organization = self.organization_repository.find_by_id(user.organization_id)
+        return organization.org_id if organization else None
+
+    @staticmethod
+    def _inventory_data(user, data):
+        return inventory_data(user.organization_id, data)
+
+    @staticmethod
+    def _follow_commits():
+        """
+        Makes sure the block listener that resolves the status of async
+        submits is running. Called before broadcasting, so the block the
+        transaction commits in cannot pass before the listener follows.
+        """
+        from config.fabric_config import start_ledger_events
+
+        start_ledger_events()
+
+    def _accepted(self, function, batch_id, broadcast, on_valid=None):
+        """
+        Records a transaction submitted without waiting for its commit.
+        ``on_valid`` runs once the transaction commits as VALID.
+        """
+        record = self.transaction_tracker.track(broadcast["tx_id"], function, batch_id, on_valid)
+        return {**record, "result": broadcast["result"]}
+
+    def _create_inventory(self, organization_id, data):
+        try:
+            self.inventory_repository.create(inventory_data(organization_id, data))
+        except Exception as e:
+            # Log error but don't fail the batch creation
+            print(f"Warning: Could not add to inventory: {str(e)}")
+
+    def _create_inventory_on_commit(self, user, data):
+        app = current_app._get_current_object()
+        organization_id = user.organization_id
+
+        def create():
+            with app.app_context():
+                self._create_inventory(organization_id, data)
+
+        return create
+
+    def create_batch(self, data, wait_for_commit=True):
         user = self._get_current_user()
         if user.role not in [UserRole.ADMIN.value, UserRole.MANUFACTURER.value]:
             raise BadRequest("You are not allowed to create batches")
@@ -25,30 +97,98 @@ class BlockchainService:
         if not data:
             raise BadRequest("Invalid payload")
 
+        if self.outbox_enabled:
+            return self._record_create_batch(user, data)
+
+        if not wait_for_commit:
+            self._follow_commits()
+
         # Create batch on blockchain
-        blockchain_result = self.repository.create_batch(data)
+        try:
+            blockchain_result = self.repository.create_batch(data, wait_for_commit)
+        except WriteConflictError as e:
+            raise Conflict(str(e))
         
-        # Also add to inventory if organization_id is provided
-        if user.organization_id and "unit_price" in data:
-            try:
-                inventory_data = {
-                    'organization_id': user.organization_id,
-                    'batch_id': data['batch_id'],
-                    'product_name': data['product_name'],
-                    'available_quantity': data['total_quantity'],
-                    'unit_dosage': data['unit_dosage'],
-                    'manufacture_date': data['manufacture_date'],
-                    'expiry_date': data['expiry_date'],
-                    'unit_price': data['unit_price']
-                }
-                self.inventory_repository.create(inventory_data)
-            except Exception as e:
-                # Log error but don't fail the batch creation
-                print(f"Warning: Could not add to inventory: {str(e)}")
+        # Also add to inventory if organization_id is provided (in async mode
+        # only once the transaction commits VALID, so a rejected one leaves no stock)
+        add_to_inventory = user.organization_id and "unit_price" in data
+        if not wait_for_commit:
+            on_valid = self._create_inventory_on_commit(user, data) if add_to_inventory else None
+            return self._accepted("createBatch", data["batch_id"], blockchain_result, on_valid)
+
+        if add_to_inventory:
+            self._create_inventory(user.organization_id, data)
         
         return blockchain_result
 
-    def transfer_batch(self, data):
+    def _enqueue_create_batch(self, user, data):
+        """
+        Records the ledger write and the inventory insert as one outbox
+        intent; the dispatcher carries both out in the background.
+        """
+        payload = {
+            **data,
+            'organization_id': str(user.organization_id) if user.organization_id and "unit_price" in data else None,
+        }
+        entry, created = self.outbox_repository.enqueue("createBatch", data["batch_id"], payload, user.id)
+        if not created and entry.payload != payload:
+            raise BadRequest(f"Batch {data['batch_id']} was already submitted with different data")
+        return outbox_entry_output.dump(entry)
+
+    def _record_create_batch(self, user, data):
+        from config.fabric_config import notify_outbox_dispatcher
+
+        result = self._enqueue_create_batch(user, data)
+        notify_outbox_dispatcher()
+        return result
+
+    def _record_create_batches(self, user, items):
+        from config.fabric_config import notify_outbox_dispatcher
+
+        outcomes = []
+        for data in items:
+            try:
+                outcomes.append((True, self._enqueue_create_batch(user, data)))
+            except BadRequest as e:
+                outcomes.append((False, e.description))
+
+        notify_outbox_dispatcher()
+        return outcomes
+
+    def create_batches(self, items):
+        """
+        Creates many batches with pipelined chaincode submission and adds the
+        ones the ledger accepted to inventory in a single transaction. With
+        the outbox enabled every item is recorded as an outbox intent
+        instead, like a single create.
+        Returns one (success, result_or_error) pair per item.
+        """
+        user = self._get_current_user()
+        if user.role not in [UserRole.ADMIN.value, UserRole.MANUFACTURER.value]:
+            raise BadRequest("You are not allowed to create batches")
+
+        if not items:
+            raise BadRequest("Invalid payload")
+
+        if self.outbox_enabled:
+            return self._record_create_batches(user, items)
+
+        outcomes = self.repository.create_batches(items, BULK_SUBMIT_CONCURRENCY)
+
+        if user.organization_id:
+            created = [data for data, (success, _) in zip(items, outcomes) if success]
+            if created:
+                try:
+                    self.inventory_repository.create_many(
+                        [self._inventory_data(user, data) for data in created]
+                    )
+                except Exception as e:
+                    # Log error but don't fail the batch creation
+                    print(f"Warning: Could not add batches to inventory: {str(e)}")
+
+        return outcomes
+
+    def transfer_batch(self, data, wait_for_commit=True):
         user = self._get_current_user()
         if user.role not in [
             UserRole.ADMIN.value,
@@ -61,9 +201,18 @@ class BlockchainService:
         if not data:
             raise BadRequest("Invalid payload")
 
-        return self.repository.transfer_batch(data)
+        if not wait_for_commit:
+            self._follow_commits()
+
+        try:
+            result = self.repository.transfer_batch(data, wait_for_commit)
+        except WriteConflictError as e:
+            raise Conflict(str(e))
+        if not wait_for_commit:
+            return self._accepted("transferBatch", data["batch_id"], result)
+        return result
 
-    def mark_batch_delivered(self, data):
+    def mark_batch_delivered(self, data, wait_for_commit=True):
         user = self._get_current_user()
         if user.role not in [UserRole.ADMIN.value, UserRole.PHARMACIST.value]:
             raise BadRequest("You are not allowed to mark delivery")
@@ -71,9 +220,38 @@ class BlockchainService:
         if "batch_id" not in data or "delivered_to_org_id" not in data or "quantity" not in data:
             raise BadRequest("batch_id, delivered_to_org_id and quantity are required")
 
-        return self.repository.mark_batch_delivered(
-            data["batch_id"], data["delivered_to_org_id"], data["quantity"]
-        )
+        if not wait_for_commit:
+            self._follow_commits()
+
+        try:
+            result = self.repository.mark_batch_delivered(
+                data["batch_id"], data["delivered_to_org_id"], data["quantity"], wait_for_commit
+            )
+        except WriteConflictError as e:
+            raise Conflict(str(e))
+        if not wait_for_commit:
+            return self._accepted("markBatchDelivered", data["batch_id"], result)
+        return result
+
+    def get_transaction_status(self, tx_id: str):
+        user = self._get_current_user()
+        record = self.transaction_tracker.get(tx_id)
+        if record is None:
+            raise NotFound("Transaction not found")
+        return record
+
+    def get_transaction_statuses(self, tx_ids):
+        user = self._get_current_user()
+        if not isinstance(tx_ids, list) or not tx_ids:
+            raise BadRequest("tx_ids must be a non-empty list")
+        if len(tx_ids) > TX_STATUS_MAX_LOOKUP:
+            raise BadRequest(f"At most {TX_STATUS_MAX_LOOKUP} transactions can be looked up at once")
+
+        statuses = self.transaction_tracker.get_many(tx_ids)
+        return [
+            statuses[tx_id] or {"tx_id": tx_id, "status": "UNKNOWN"}
+            for tx_id in tx_ids
+        ]
 
     def get_batch(self, batch_id: str):
         # You can decide: allow all authenticated users
@@ -83,6 +261,99 @@ class BlockchainService:
             raise NotFound("Batch not found")
         return result
 
-    def get_batch_history(self, batch_id: str):
+    def verify_batches(self, batch_ids):
+        """
+        Checks scanned tags against the ledger in one pass. Each distinct
+        batch id is looked up once; returns one result per distinct id, in
+        the order first scanned. Every scan of an authentic batch is counted
+        by the scan monitor as a gate scan of the caller's organization,
+        apart from consumer scans.
+        """
+        user = self._get_current_user()
+        org_id = self._ledger_org_id(user)
+
+        outcomes = self.repository.get_batches(batch_ids, BULK_QUERY_CONCURRENCY)
+
+        scan_monitor = get_scan_monitor()
+        if scan_monitor is not None:
+            location = org_id or str(user.id)
+            for batch_id in batch_ids:
+                success, value = outcomes[batch_id]
+                if success and isinstance(value, dict):
+                    scan_monitor.record(batch_id, location, value.get("totalQuantity"), SCAN_SOURCE_GATE)
+
+        results = []
+        for batch_id, (success, value) in outcomes.items():
+            if not success or not isinstance(value, dict):
+                not_found = not success and "does not exist" in value
+                results.append({
+                    "batch_id": batch_id,
+                    "authentic": False if not_found else None,
+                    "error": "Batch not found" if not_found else "Could not reach the ledger",
+                })
+                continue
+
+            owners = value.get("ownerships") or []
+            results.append({
+                "batch_id": batch_id,
+                "authentic": True,
+                "product_name": value.get("productName"),
+                "expiry_date": value.get("expiryDate"),
+                "status": value.get("status"),
+                "owners": owners,
+                "held_by_caller": org_id is not None and any(o.get("orgId") == org_id for o in owners),
+            })
+        return results
+
+    def get_batch_history(self, batch_id: str, since: str = None):
+        user = self._get_current_user()
+        history = self.repository.get_batch_history(batch_id)
+        if not since:
+            return history
+
+        # History is newest first: everything before the cursor is newer than it
+        for index, entry in enumerate(history):
+            if entry.get("txId") == since:
+                return history[:index]
+        raise BadRequest("Unknown history cursor")
+
+    def get_cache_stats(self):
+        user = self._get_current_user()
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view cache statistics")
+        return get_all_cache_stats()
+
+    def get_network_stats(self):
+        user = self._get_current_user()
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view network statistics")
+        return self.fabric_client.stats()
+
+    def get_write_stats(self):
+        user = self._get_current_user()
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view write statistics")
+        return self.repository.write_scheduler.stats()
+
+    def get_scan_stats(self):
+        user = self._get_current_user()
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view scan statistics")
+        scan_monitor = get_scan_monitor()
+        return scan_monitor.stats() if scan_monitor is not None else {"enabled": False}
+
+    def get_outbox_entry(self, entry_id: str):
+        user = self._get_current_user()
+        try:
+            entry = self.outbox_repository.find_by_id(uuid.UUID(entry_id))
+        except ValueError:
+            raise BadRequest("Invalid outbox id")
+        if entry is None:
+            raise NotFound("Outbox entry not found")
+        return outbox_entry_output.dump(entry)
+
+    def get_outbox_stats(self):
         user = self._get_current_user()
-        return self.repository.get_batch_history(batch_id)
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view outbox statistics")
+        return self.outbox_repository.count_by_status()
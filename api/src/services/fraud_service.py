@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+from werkzeug.exceptions import BadRequest, NotFound
+from config.fraud_config import get_model_registry
+from src.analytics.fraud import FRAUD_FEATURES, transfer_features, transfer_frame
+from src.services.auth_service import AuthService
+from src.utils.constants import UserRole
+
+FRAUD_SCORE_MAX_RECORDS = int(os.getenv("FRAUD_SCORE_MAX_RECORDS", "10000"))
+
+
+class FraudService:
+    def __init__(self):
+        self.registry = get_model_registry()
+        self.auth_service = AuthService()
+
+    def _get_current_user(self):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        return user
+
+    def _current_model(self):
+        model = self.registry.current()
+        if model is None:
+            raise NotFound("No fraud model has been published")
+        if tuple(model.features) != FRAUD_FEATURES:
+            raise BadRequest(f"Model {model.version} expects unsupported features {list(model.features)}")
+        return model
+
+    def score_transfers(self, records):
+        """
+        Scores many transfer records with one model call: features are
+        computed column-wise for the whole batch. Records missing a quantity
+        get a null score. Returns one result per record, in order.
+        """
+        user = self._get_current_user()
+
+        if not isinstance(records, list) or not records:
+            raise BadRequest("transfers must be a non-empty list")
+        if len(records) > FRAUD_SCORE_MAX_RECORDS:
+            raise BadRequest(f"At most {FRAUD_SCORE_MAX_RECORDS} transfers can be scored at once")
+        if not all(isinstance(record, dict) for record in records):
+            raise BadRequest("Each transfer must be an object")
+
+        # Pinned for the whole request, even if a new version is swapped in meanwhile
+        model = self._current_model()
+
+        features = transfer_features(transfer_frame(records))
+        valid = ~np.isnan(features).any(axis=1)
+        scores = np.full(len(records), np.nan)
+        if valid.any():
+            scores[valid] = model.score(features[valid])
+
+        results = []
+        for record, score in zip(records, scores.tolist()):
+            scored = score == score
+            results.append({
+                "tx_id": record.get("tx_id"),
+                "batch_id": record.get("batch_id"),
+                "score": round(score, 6) if scored else None,
+                "flagged": score >= model.threshold if scored else None,
+            })
+        return {"model_version": model.version, "threshold": model.threshold, "results": results}
+
+    def get_model(self):
+        user = self._get_current_user()
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view the fraud model")
+        return self.registry.stats()
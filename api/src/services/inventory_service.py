@@ -1,8 +1,65 @@
+import os
+import threading
+import time
+from datetime import timedelta
+
 from werkzeug.exceptions import NotFound, BadRequest, Forbidden
 from src.repositories.inventory_repository import InventoryRepository
 from src.repositories.organization_repository import OrganizationRepository
 from src.services.auth_service import AuthService
 from src.utils.constants import UserRole
+from src.utils.pagination import parse_limit
+from src.utils.text_search import PrefixIndex
+
+PRODUCT_INDEX_REFRESH_INTERVAL = float(os.getenv("PRODUCT_INDEX_REFRESH_INTERVAL", "5"))
+PRODUCT_INDEX_REBUILD_INTERVAL = float(os.getenv("PRODUCT_INDEX_REBUILD_INTERVAL", "3600"))
+# Rows are re-read from a little before the watermark: a transaction that
+# commits late can carry an updated_at older than rows already seen
+PRODUCT_INDEX_OVERLAP = timedelta(seconds=60)
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+_product_index = PrefixIndex()
+_watermark = None
+_refreshed_at = 0.0
+_rebuilt_at = 0.0
+_refresh_lock = threading.Lock()
+
+
+def get_product_index() -> PrefixIndex:
+    """
+    Returns the process-wide product name index for autocomplete. Every
+    PRODUCT_INDEX_REFRESH_INTERVAL seconds the products of inventory rows
+    updated since the last refresh have their available quantity
+    re-aggregated; every PRODUCT_INDEX_REBUILD_INTERVAL seconds the index is
+    rebuilt, which also drops products whose rows were deleted. Needs an
+    app context.
+    """
+    global _watermark, _refreshed_at, _rebuilt_at
+
+    now = time.monotonic()
+    if now - _refreshed_at < PRODUCT_INDEX_REFRESH_INTERVAL:
+        return _product_index
+
+    # Other requests keep using the index while one refreshes it
+    if not _refresh_lock.acquire(blocking=_rebuilt_at == 0.0):
+        return _product_index
+    try:
+        repository = InventoryRepository()
+        # Read before aggregating, so nothing updated in between is skipped
+        watermark = repository.latest_update()
+        if _watermark is None or now - _rebuilt_at >= PRODUCT_INDEX_REBUILD_INTERVAL:
+            _product_index.replace(repository.available_by_product())
+            _rebuilt_at = now
+        else:
+            names = repository.products_changed_since(_watermark - PRODUCT_INDEX_OVERLAP)
+            if names:
+                available = repository.available_by_product(names)
+                _product_index.update({name: available.get(name, 0) for name in names})
+        _watermark = watermark
+        _refreshed_at = now
+        return _product_index
+    finally:
+        _refresh_lock.release()
 
 
 class InventoryService:
@@ -34,32 +91,49 @@ class InventoryService:
         
         return self.repository.create(data)
     
-    def get_my_inventory(self):
+    def get_my_inventory(self, args):
         user = self._get_current_user()
         
         if user.role == UserRole.ADMIN.value:
             # Admin can see all inventory items - for now return empty, could be enhanced
-            return []
+            return [], None
         
         if not user.organization_id:
             raise BadRequest("User not associated with an organization")
         
-        return self.repository.find_by_organization(user.organization_id)
+        return self.repository.find_by_organization(
+            user.organization_id, args.get('cursor'), parse_limit(args.get('limit'))
+        )
     
-    def get_inventory_by_organization(self, organization_id):
+    def get_inventory_by_organization(self, organization_id, args):
         user = self._get_current_user()
         
         # Only admin or users from the same organization can view
         if user.role != UserRole.ADMIN.value and user.organization_id != organization_id:
             raise Forbidden("You don't have permission to view this inventory")
         
-        return self.repository.find_by_organization(organization_id)
+        return self.repository.find_by_organization(organization_id, args.get('cursor'), parse_limit(args.get('limit')))
     
-    def search_available_inventory(self, product_name, min_quantity):
-        user = self._get_current_user()
-        
+    def search_available_inventory(self, args):
+        self._get_current_user()
+
         # All authenticated users can search
-        return self.repository.find_available_by_product(product_name, min_quantity)
+        try:
+            min_quantity = int(args.get('min_quantity', 1))
+        except ValueError:
+            raise BadRequest("min_quantity must be an integer")
+        return self.repository.search_available(
+            args.get('product_name', ''), min_quantity, args.get('cursor'), parse_limit(args.get('limit'))
+        )
+
+    def autocomplete_products(self, args):
+        self._get_current_user()
+
+        limit = parse_limit(args.get('limit'), default=10, maximum=AUTOCOMPLETE_MAX_LIMIT)
+        return [
+            {'product_name': name, 'available_quantity': quantity}
+            for name, quantity in get_product_index().complete(args.get('prefix', ''), limit)
+        ]
     
     def update_inventory_quantity(self, batch_id, quantity_change):
         user = self._get_current_user()
@@ -75,4 +149,41 @@ class InventoryService:
         if user.role != UserRole.ADMIN.value and user.organization_id != inventory.organization_id:
             raise Forbidden("You can only update inventory from your own organization")
         
-        return self.repository.update_quantity(batch_id, quantity_change)
+        inventory = self.repository.update_quantity(batch_id, quantity_change)
+        if inventory is None:
+            raise BadRequest("Insufficient quantity in inventory")
+        return inventory
+
+    def reserve_inventory(self, data):
+        """
+        Reserves stock of several batches of one organization in a single
+        statement; either every line is reserved or none is.
+        """
+        user = self._get_current_user()
+
+        if user.role not in [UserRole.ADMIN.value, UserRole.MANUFACTURER.value]:
+            raise BadRequest("Only manufacturers or admins can reserve inventory")
+
+        organization_id = data.get('organization_id') or user.organization_id
+        if not organization_id:
+            raise BadRequest("organization_id is required")
+        if user.role != UserRole.ADMIN.value and user.organization_id != organization_id:
+            raise Forbidden("You can only reserve inventory from your own organization")
+
+        quantities = {}
+        for line in data['lines']:
+            quantities[line['batch_id']] = quantities.get(line['batch_id'], 0) + line['quantity']
+
+        reserved, failed = self.repository.reserve(organization_id, quantities)
+        if failed:
+            raise BadRequest(f"Insufficient quantity in inventory for batches: {', '.join(failed)}")
+        return reserved
+
+
+def _reset_after_fork():
+    global _refresh_lock
+    _refresh_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
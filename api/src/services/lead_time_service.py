@@ -0,0 +1,132 @@
+import os
+from datetime import date, datetime, time, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+from werkzeug.exceptions import BadRequest
+from src.analytics.lead_time import daily_rollup, request_lead_times, summarize, transfer_lead_times
+from src.repositories.lead_time_repository import LeadTimeRepository
+from src.services.auth_service import AuthService
+from src.utils.constants import UserRole
+from src.utils.pagination import parse_limit
+
+# Days before the latest rollup that are recomputed, for late-arriving data
+LEAD_TIME_LOOKBACK_DAYS = int(os.getenv("LEAD_TIME_LOOKBACK_DAYS", "2"))
+LEAD_TIME_MAX_WINDOW_DAYS = 365
+SCOPES = {'transfer': ('route', 'org'), 'request': ('org',)}
+
+
+def refresh_lead_time_rollups(full: bool = False) -> dict:
+    """
+    Recomputes the daily lead-time rollups from the latest rolled-up day
+    (at most today, minus LEAD_TIME_LOOKBACK_DAYS) on, or from scratch
+    when ``full``.
+    Only the transfers of batches that moved in that window and the
+    requests delivered in it are extracted.
+    """
+    repository = LeadTimeRepository()
+    latest = repository.latest_day()
+    if full or latest is None:
+        since = None
+    else:
+        # Clamped to today: a clock-skewed timestamp must not move the window forward
+        since = min(latest, datetime.now(timezone.utc).date()) - timedelta(days=LEAD_TIME_LOOKBACK_DAYS)
+    since_time = datetime.combine(since, time.min) if since is not None else None
+
+    lead_times = pd.concat([
+        transfer_lead_times(*repository.extract_transfers(since_time)),
+        request_lead_times(*repository.extract_requests(since_time)),
+    ], ignore_index=True)
+    if since is not None:
+        # Earlier transfers were only extracted to measure from
+        lead_times = lead_times[lead_times["day"] >= since]
+
+    rollup = daily_rollup(lead_times)
+    rows = [
+        {
+            'source': row.source,
+            'scope': row.scope,
+            'org_id': row.org_id,
+            'counterparty_org_id': row.counterparty_org_id,
+            'day': row.day,
+            'count': int(row.count),
+            'total_hours': float(row.total_hours),
+            'histogram': row.histogram.astype('<i4').tobytes(),
+        }
+        for row in rollup.itertuples(index=False)
+    ]
+    repository.replace_days(since, rows)
+    return {
+        'since': since.isoformat() if since else None,
+        'lead_times': len(lead_times),
+        'rollup_rows': len(rows),
+    }
+
+
+class LeadTimeService:
+    """
+    Lead-time statistics for the dashboard, merged from the daily rollups
+    rather than recomputed over the whole history.
+    """
+
+    def __init__(self):
+        self.repository = LeadTimeRepository()
+        self.auth_service = AuthService()
+
+    def _require_admin(self):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can view lead-time analytics")
+        return user
+
+    def get_lead_times(self, args):
+        self._require_admin()
+
+        source = args.get('source', 'transfer')
+        if source not in SCOPES:
+            raise BadRequest(f"source must be one of {', '.join(SCOPES)}")
+        scope = args.get('scope', SCOPES[source][0])
+        if scope not in SCOPES[source]:
+            raise BadRequest(f"scope must be one of {', '.join(SCOPES[source])} for {source}")
+        try:
+            days = int(args.get('days', 30))
+        except ValueError:
+            raise BadRequest("days must be an integer")
+        if not 1 <= days <= LEAD_TIME_MAX_WINDOW_DAYS:
+            raise BadRequest(f"days must be between 1 and {LEAD_TIME_MAX_WINDOW_DAYS}")
+        limit = parse_limit(args.get('limit'))
+
+        start = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        rows, columns = self.repository.load_rollups(source, scope, start, args.get('org_id'))
+        rollup = pd.DataFrame.from_records(rows, columns=columns)
+        rollup["histogram"] = [np.frombuffer(histogram, dtype='<i4') for histogram in rollup["histogram"]]
+
+        summary = summarize(rollup).sort_values("p95_hours", ascending=False, kind="stable").head(limit)
+        items = []
+        for row in summary.itertuples(index=False):
+            item = {
+                'org_id': row.org_id,
+                'count': int(row.count),
+                'mean_hours': round(float(row.mean_hours), 2),
+                'median_hours': round(float(row.median_hours), 2),
+                'p95_hours': round(float(row.p95_hours), 2),
+                'trend_hours_per_day': round(float(row.trend_hours_per_day), 3),
+            }
+            if scope == 'route':
+                item['to_org_id'] = row.counterparty_org_id
+            items.append(item)
+
+        latest = self.repository.latest_day()
+        return {
+            'source': source,
+            'scope': scope,
+            'from': start.isoformat(),
+            'rolled_up_through': latest.isoformat() if latest else None,
+            'items': items,
+        }
+
+    def refresh_rollups(self, args):
+        self._require_admin()
+        return refresh_lead_time_rollups(full=args.get('full', 'false').lower() == 'true')
@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from config.database import db
+from src.fabric.event_listener import LedgerEventListener
+from src.repositories.batch_mirror_repository import BatchMirrorRepository
+from src.repositories.blockchain_repository import BATCH_WRITE_FUNCTIONS
+
+
+class LedgerIndexer:
+    """
+    Mirrors committed batch transactions into the off-chain batch tables.
+
+    The indexer owns its own block listener, started from the block after
+    the stored checkpoint, and applies events on a worker thread inside an
+    app context. Events are written in small transactions together with the
+    checkpoint, so a restart resumes exactly where the mirror left off.
+
+    A run that still fails after ``max_attempts`` is applied one event at a
+    time; an event that fails on its own is parked in the dead-letter table
+    and the checkpoint moves past it.
+    """
+
+    def __init__(self, app, batch_size: int = 500, retry_delay: float = 5.0, max_attempts: int = 5) -> None:
+        self.app = app
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.repository = BatchMirrorRepository()
+        self.listener = LedgerEventListener()
+        self.listener.subscribe(self._enqueue)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _enqueue(self, event) -> None:
+        # Runs on the Fabric event loop: hand off without touching the database
+        self._queue.put(event)
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def start(self, fabric_client, from_genesis: bool = False) -> None:
+        with self.app.app_context():
+            if from_genesis:
+                self.repository.reset()
+                start_block = 0
+            else:
+                checkpoint = self.repository.get_checkpoint()
+                start_block = checkpoint + 1 if checkpoint is not None else 0
+
+        self._stopped.clear()
+        self._worker = threading.Thread(target=self._run, name="ledger-indexer", daemon=True)
+        self._worker.start()
+        self.listener.start(fabric_client, start_block=start_block)
+
+    def stop(self) -> None:
+        self.listener.stop()
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    # --------------------------------------------------------
+    # Worker
+    # --------------------------------------------------------
+    def _drain(self) -> List:
+        try:
+            events = [self._queue.get(timeout=1.0)]
+        except queue.Empty:
+            return []
+        while len(events) < self.batch_size:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while not self._stopped.is_set():
+                events = self._drain()
+                if events and not self._apply_with_retries(events):
+                    for event in events:
+                        if self._stopped.is_set():
+                            break
+                        self._apply_or_park(event)
+
+    def _apply_with_retries(self, events: List) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.apply(events)
+                return True
+            except Exception as e:
+                db.session.rollback()
+                print(
+                    f"Warning: Ledger indexer failed to apply block {events[0].block_number} "
+                    f"(attempt {attempt} of {self.max_attempts}): {str(e)}"
+                )
+            if self._stopped.is_set():
+                return True
+            if attempt < self.max_attempts:
+                time.sleep(self.retry_delay)
+        return False
+
+    def _apply_or_park(self, event) -> None:
+        try:
+            self.apply([event])
+            return
+        except Exception as e:
+            db.session.rollback()
+            error = str(e)
+
+        # Parking only needs a trivial insert; if even that fails the database
+        # itself is down, so keep trying rather than skip the event
+        while not self._stopped.is_set():
+            try:
+                self.repository.record_dead_letter(event, error)
+                self.repository.set_checkpoint(event.block_number - 1)
+                db.session.commit()
+                print(f"Warning: Ledger indexer skipped tx {event.tx_id} in block {event.block_number}: {error}")
+                return
+            except Exception as e:
+                db.session.rollback()
+                print(f"Warning: Ledger indexer could not park tx {event.tx_id}: {str(e)}")
+                time.sleep(self.retry_delay)
+
+    def apply(self, events: List) -> None:
+        """
+        Applies a run of events and advances the checkpoint in one transaction.
+        """
+        for event in events:
+            if event.valid and event.function in BATCH_WRITE_FUNCTIONS:
+                self.repository.apply_event(event)
+
+        # The newest block may still have events on their way; checkpoint the
+        # one before it; re-applying a block is idempotent
+        self.repository.set_checkpoint(max(e.block_number for e in events) - 1)
+        db.session.commit()
@@ -0,0 +1,59 @@
+from datetime import date
+from werkzeug.exceptions import BadRequest
+from src.models.batch_mirror_model import ledger_batches_output, batch_transfers_output
+from src.repositories.batch_mirror_repository import BatchMirrorRepository
+from src.services.auth_service import AuthService
+from src.utils.pagination import parse_limit
+
+
+class LedgerMirrorService:
+    """
+    Read side of the ledger indexer: list queries served from PostgreSQL,
+    without a round trip to the Fabric network.
+    """
+
+    def __init__(self):
+        self.repository = BatchMirrorRepository()
+        self.auth_service = AuthService()
+
+    def _get_current_user(self):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        return user
+
+    @staticmethod
+    def _parse_date(value, name):
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise BadRequest(f"{name} must be a date in YYYY-MM-DD format")
+
+    def list_batches(self, args):
+        self._get_current_user()
+
+        filters = {
+            'owner_org_id': args.get('owner_org_id'),
+            'product_name': args.get('product_name'),
+            'status': args.get('status'),
+            'expiry_from': self._parse_date(args.get('expiry_from'), 'expiry_from'),
+            'expiry_to': self._parse_date(args.get('expiry_to'), 'expiry_to'),
+        }
+        batches, next_cursor = self.repository.find_batches(
+            filters, args.get('cursor'), parse_limit(args.get('limit'))
+        )
+        return ledger_batches_output.dump(batches), next_cursor
+
+    def list_transfers(self, args):
+        self._get_current_user()
+
+        filters = {
+            'batch_id': args.get('batch_id'),
+            'org_id': args.get('org_id'),
+        }
+        transfers, next_cursor = self.repository.find_transfers(
+            filters, args.get('cursor'), parse_limit(args.get('limit'))
+        )
+        return batch_transfers_output.dump(transfers), next_cursor
@@ -1,10 +1,62 @@
-from werkzeug.exceptions import NotFound, BadRequest, Forbidden
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from werkzeug.exceptions import NotFound, BadRequest, Forbidden, Conflict
 from src.repositories.medication_request_repository import MedicationRequestRepository
 from src.repositories.inventory_repository import InventoryRepository
 from src.repositories.notification_repository import NotificationRepository
 from src.repositories.organization_repository import OrganizationRepository
 from src.services.auth_service import AuthService
 from src.utils.constants import UserRole
+from src.utils.pagination import parse_limit
+
+# Batches closer to expiry than this are not allocated
+FEFO_MIN_SHELF_LIFE_DAYS = int(os.getenv("FEFO_MIN_SHELF_LIFE_DAYS", "30"))
+FEFO_CHUNK_SIZE = int(os.getenv("FEFO_CHUNK_SIZE", "2000"))
+# Allocations retried after losing a race for the same stock or requests
+FEFO_MAX_ATTEMPTS = 3
+
+
+def fefo_expires_after():
+    return datetime.now(timezone.utc).date() + timedelta(days=FEFO_MIN_SHELF_LIFE_DAYS)
+
+
+def fefo_allocate(requests, stock):
+    """
+    Allocates requests, oldest first, against stock rows in FEFO order per
+    ``(product_name, unit_dosage)`` (as returned by
+    ``InventoryRepository.fefo_stock``). A request gets all of its quantity
+    or nothing: one the remaining stock cannot cover is skipped, without
+    holding up smaller ones behind it. Returns request id ->
+    ``[(inventory id, batch id, quantity)]``.
+    """
+    batches = defaultdict(list)
+    for row in stock:
+        batches[(row.product_name, row.unit_dosage)].append([row.id, row.batch_id, row.available_quantity])
+    left = {key: sum(batch[2] for batch in rows) for key, rows in batches.items()}
+    position = defaultdict(int)
+
+    allocations = {}
+    for request in requests:
+        key = (request.product_name, request.unit_dosage)
+        quantity = request.requested_quantity
+        if left.get(key, 0) < quantity:
+            continue
+        left[key] -= quantity
+
+        rows, lines = batches[key], []
+        while quantity:
+            batch = rows[position[key]]
+            take = min(batch[2], quantity)
+            lines.append((batch[0], batch[1], take))
+            batch[2] -= take
+            quantity -= take
+            if not batch[2]:
+                position[key] += 1
+        allocations[request.id] = lines
+    return allocations
 
 
 class MedicationRequestService:
@@ -47,17 +99,18 @@ class MedicationRequestService:
         
         return medication_request
     
-    def get_my_requests(self):
+    def get_my_requests(self, args):
         user = self._get_current_user()
+        cursor, limit = args.get('cursor'), parse_limit(args.get('limit'))
         
         if user.role == UserRole.CONSUMER.value:
-            return self.repository.find_by_consumer(user.id)
+            return self.repository.find_by_consumer(user.id, cursor, limit)
         elif user.role == UserRole.MANUFACTURER.value:
             if not user.organization_id:
                 raise BadRequest("User not associated with an organization")
-            return self.repository.find_by_manufacturer(user.organization_id)
+            return self.repository.find_by_manufacturer(user.organization_id, cursor, limit)
         elif user.role == UserRole.ADMIN.value:
-            return self.repository.find_pending_requests()
+            return self.repository.find_pending_requests(cursor, limit)
         else:
             raise Forbidden("You don't have permission to view requests")
     
@@ -87,24 +140,50 @@ class MedicationRequestService:
         if medication_request.status != 'pending':
             raise BadRequest(f"Request is already {medication_request.status}")
         
-        # Check inventory availability
-        inventory = self.inventory_repository.find_by_batch_id(data['batch_id'])
-        if not inventory:
-            raise NotFound("Batch not found in inventory")
-        
-        if inventory.available_quantity < medication_request.requested_quantity:
+        # A hand-picked batch, or the soonest-expiring batches of the
+        # manufacturer's stock (FEFO). Either way only the assigned
+        # manufacturer's stock is allocated.
+        quantity = medication_request.requested_quantity
+        organization_id = data['assigned_manufacturer_id']
+        if user.role == UserRole.MANUFACTURER.value and user.organization_id != organization_id:
+            raise Forbidden("You can only allocate your own organization's stock")
+
+        if data.get('batch_id'):
+            inventory = self.inventory_repository.find_by_batch_id(data['batch_id'], organization_id)
+            if not inventory:
+                if self.inventory_repository.find_by_batch_id(data['batch_id']):
+                    raise Forbidden("Batch is not held by the assigned manufacturer")
+                raise NotFound("Batch not found in inventory")
+            attempts = 1
+            split = lambda: [(inventory.id, data['batch_id'], quantity)]
+        else:
+            attempts = FEFO_MAX_ATTEMPTS
+            split = lambda: self.inventory_repository.fefo_split(
+                organization_id, medication_request.product_name, medication_request.unit_dosage,
+                quantity, fefo_expires_after()
+            )
+
+        # Reserve the quantity and approve in one transaction: the reservation
+        # is a conditional UPDATE, so concurrent approvals cannot oversell.
+        # A FEFO split that lost a race for its batches is recomputed.
+        for _ in range(attempts):
+            lines = split()
+            if sum(line[2] for line in lines) < quantity:
+                raise BadRequest("Insufficient quantity in inventory")
+            _, failed = self.inventory_repository.reserve(
+                organization_id, {batch_id: taken for _, batch_id, taken in lines}, commit=False
+            )
+            if not failed:
+                break
+        else:
             raise BadRequest("Insufficient quantity in inventory")
-        
-        # Reserve the quantity
-        self.inventory_repository.reserve_quantity(data['batch_id'], medication_request.requested_quantity)
-        
+
         # Approve the request
-        approved_request = self.repository.approve_request(
-            request_id,
-            user.id,
-            data['batch_id'],
-            data['assigned_manufacturer_id']
-        )
+        if not self.repository.approve_allocated(
+            {medication_request.id: lines}, user.id, data['assigned_manufacturer_id']
+        ):
+            raise BadRequest("Request is no longer pending")
+        approved_request = self.repository.find_by_id(medication_request.id)
         
         # Notify consumer
         self.notification_repository.create({
@@ -118,6 +197,82 @@ class MedicationRequestService:
         
         return approved_request
     
+    def allocate_pending_requests(self, data):
+        """
+        Approves pending requests, oldest first, with FEFO allocations from
+        one manufacturer's stock, FEFO_CHUNK_SIZE at a time: per chunk the
+        requests and the stock they draw from are locked and read in one
+        query each, allocated in memory, and reserved and approved in a few
+        set-based statements. Requests the stock cannot cover stay pending.
+        """
+        user = self._get_current_user()
+
+        if user.role not in [UserRole.ADMIN.value, UserRole.MANUFACTURER.value]:
+            raise BadRequest("Only manufacturers or admins can allocate requests")
+        organization_id = data['assigned_manufacturer_id']
+        if user.role == UserRole.MANUFACTURER.value and user.organization_id != organization_id:
+            raise Forbidden("You can only allocate your own organization's stock")
+
+        limit = data.get('limit')
+        started = time.perf_counter()
+        allocated = skipped = 0
+        after = None
+        while limit is None or allocated + skipped < limit:
+            size = FEFO_CHUNK_SIZE if limit is None else min(FEFO_CHUNK_SIZE, limit - allocated - skipped)
+            pending, approved = self._allocate_chunk(organization_id, user.id, after, size)
+            if not pending:
+                break
+            after = (pending[-1].created_at, pending[-1].id)
+            allocated += len(approved)
+            skipped += len(pending) - len(approved)
+
+        elapsed = time.perf_counter() - started
+        return {
+            'allocated': allocated,
+            'skipped': skipped,
+            'elapsed_seconds': round(elapsed, 3),
+            'requests_per_second': round((allocated + skipped) / elapsed) if elapsed else None
+        }
+
+    def _allocate_chunk(self, organization_id, approver_id, after, size):
+        expires_after = fefo_expires_after()
+        for _ in range(FEFO_MAX_ATTEMPTS):
+            pending = self.repository.find_pending_page(after, size)
+            if not pending:
+                return pending, []
+
+            stock = self.inventory_repository.fefo_stock(
+                organization_id, {(request.product_name, request.unit_dosage) for request in pending}, expires_after
+            )
+            allocations = fefo_allocate(pending, stock)
+            if allocations:
+                totals = Counter()
+                for lines in allocations.values():
+                    for _, batch_id, quantity in lines:
+                        totals[batch_id] += quantity
+                _, failed = self.inventory_repository.reserve(organization_id, dict(totals), commit=False)
+                if failed:
+                    continue
+
+            approved = self.repository.approve_allocated(allocations, approver_id, organization_id)
+            if len(approved) == len(allocations):
+                self._notify_approved([request for request in pending if request.id in allocations])
+                return pending, approved
+        raise Conflict("Pending requests kept changing during allocation, try again")
+
+    def _notify_approved(self, requests):
+        self.notification_repository.create_many([
+            {
+                'user_id': request.consumer_id,
+                'title': 'Solicitação Aprovada',
+                'message': f'Sua solicitação #{request.request_number} foi aprovada e será processada em breve.',
+                'notification_type': 'request_approved',
+                'related_entity_type': 'medication_request',
+                'related_entity_id': str(request.id)
+            }
+            for request in requests
+        ])
+
     def reject_request(self, request_id, data):
         user = self._get_current_user()
         
@@ -160,10 +315,20 @@ class MedicationRequestService:
             raise BadRequest(f"Cannot cancel request with status {medication_request.status}")
         
         # If approved, release reserved quantity
-        if medication_request.status == 'approved' and medication_request.batch_id:
-            inventory = self.inventory_repository.find_by_batch_id(medication_request.batch_id)
-            if inventory:
-                inventory.reserved_quantity -= medication_request.requested_quantity
-                inventory.available_quantity += medication_request.requested_quantity
+        if medication_request.status == 'approved':
+            released = defaultdict(Counter)
+            if medication_request.allocations:
+                for allocation in medication_request.allocations:
+                    released[allocation.inventory.organization_id][allocation.batch_id] += allocation.quantity
+            elif medication_request.batch_id:
+                # Approved before allocations were recorded
+                inventory = self.inventory_repository.find_by_batch_id(medication_request.batch_id)
+                if inventory:
+                    released[inventory.organization_id][medication_request.batch_id] += medication_request.requested_quantity
+            for organization_id, quantities in released.items():
+                self.inventory_repository.unreserve(organization_id, dict(quantities), commit=False)
         
-        return self.repository.cancel_request(request_id)
+        cancelled_request = self.repository.cancel_request(request_id, medication_request.status)
+        if cancelled_request is None:
+            raise BadRequest("Request changed while cancelling, try again")
+        return cancelled_request
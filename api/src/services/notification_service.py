@@ -1,6 +1,7 @@
 from werkzeug.exceptions import NotFound, BadRequest, Forbidden
 from src.repositories.notification_repository import NotificationRepository
 from src.services.auth_service import AuthService
+from src.utils.pagination import parse_limit
 
 
 class NotificationService:
@@ -14,9 +15,10 @@ class NotificationService:
             raise BadRequest("Authentication required")
         return user
 
-    def get_my_notifications(self, unread_only=False):
+    def get_my_notifications(self, args):
         user = self._get_current_user()
-        return self.repository.find_by_user(user.id, unread_only)
+        unread_only = args.get('unread_only', 'false').lower() == 'true'
+        return self.repository.find_by_user(user.id, unread_only, args.get('cursor'), parse_limit(args.get('limit')))
     
     def mark_notification_as_read(self, notification_id):
         user = self._get_current_user()
@@ -0,0 +1,226 @@
+import random
+import threading
+import uuid
+from typing import List, Optional
+
+from config.database import db
+from src.fabric.write_scheduler import is_conflict
+from src.models.inventory_model import Inventory
+from src.repositories.blockchain_repository import BlockchainRepository
+from src.repositories.inventory_repository import InventoryRepository
+from src.repositories.outbox_repository import OutboxRepository
+
+
+# Chaincode rejections of createBatch that every retry of the same payload
+# would hit again
+PERMANENT_ERRORS = (
+    "already exists",
+    "must be a positive",
+    "must have a batchId property",
+    "function that does not exist",
+    "Expected a different number of arguments",
+)
+
+
+def is_permanent(error) -> bool:
+    message = str(error)
+    return any(marker in message for marker in PERMANENT_ERRORS)
+
+
+def inventory_data(organization_id, data: dict) -> dict:
+    return {
+        'organization_id': organization_id,
+        'batch_id': data['batch_id'],
+        'product_name': data['product_name'],
+        'available_quantity': data['total_quantity'],
+        'unit_dosage': data['unit_dosage'],
+        'manufacture_date': data['manufacture_date'],
+        'expiry_date': data['expiry_date'],
+        'unit_price': data['unit_price']
+    }
+
+
+class OutboxDispatcher:
+    """
+    Carries out createBatch intents recorded in the outbox.
+
+    Each of ``workers`` threads leases up to ``batch_size`` due entries,
+    submits their chaincode transactions pipelined (``max_in_flight`` at a
+    time), then inserts the inventory rows and marks the entries done in one
+    database transaction. Both steps are idempotent: a batch that already
+    exists on the ledger with the same contents counts as committed, and an
+    inventory row is only inserted if the organization does not have one for
+    the batch yet. Transient failures are retried with exponential backoff
+    up to ``max_attempts`` times; chaincode rejections that would repeat on
+    every attempt (validation errors, a different batch under the same id)
+    fail the entry at once.
+    """
+
+    def __init__(
+        self,
+        app,
+        fabric_client,
+        workers: int = 2,
+        batch_size: int = 50,
+        max_in_flight: int = 32,
+        max_attempts: int = 10,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300.0,
+    ) -> None:
+        self.app = app
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+
+        self.repository = OutboxRepository()
+        self.blockchain_repository = BlockchainRepository(fabric_client)
+
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._processed_lock = threading.Lock()
+        self.processed = 0
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def start(self) -> None:
+        self._stopped.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbox-dispatcher-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def notify(self) -> None:
+        """
+        Wakes idle workers right away instead of at the next poll.
+        """
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while not self._stopped.is_set():
+                try:
+                    handled = self.dispatch_once()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Warning: Outbox dispatch failed: {str(e)}")
+                    handled = 0
+                finally:
+                    db.session.remove()
+
+                if not handled:
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+
+    # --------------------------------------------------------
+    # Dispatching
+    # --------------------------------------------------------
+    def _backoff(self, attempts: int) -> float:
+        return random.uniform(0.5, 1.0) * min(300.0, 2 ** attempts)
+
+    def _verify_existing(self, payload: dict) -> Optional[str]:
+        """
+        A createBatch rejected with "already exists" is treated as committed
+        when the ledger holds this very batch (an earlier attempt committed
+        but the worker died before recording it). Returns an error otherwise.
+        """
+        batch = self.blockchain_repository.get_batch(payload['batch_id'])
+        if (
+            isinstance(batch, dict)
+            and batch.get('productName') == payload['product_name']
+            and batch.get('totalQuantity') == payload['total_quantity']
+            and batch.get('createdAt')
+        ):
+            return None
+        return f"Batch {payload['batch_id']} already exists on the ledger with different contents"
+
+    def dispatch_once(self) -> int:
+        """
+        Leases and processes one group of due entries; returns how many.
+        """
+        entries = self.repository.claim(self.batch_size, self.lease_seconds)
+        if not entries:
+            return 0
+
+        # Step 1: ledger, pipelined for every entry that has not committed yet
+        pending = [e for e in entries if e.status == 'pending']
+        if pending:
+            outcomes = self.blockchain_repository.create_batches(
+                [e.payload for e in pending], self.max_in_flight
+            )
+            for entry, (success, value) in zip(pending, outcomes):
+                if success:
+                    entry.status = 'ledger_committed'
+                    entry.result = value
+                    continue
+
+                error = str(value)
+                if 'already exists' in error:
+                    try:
+                        error = self._verify_existing(entry.payload)
+                    except Exception as e:
+                        error = f"Could not read back existing batch: {str(e)}"
+                    if error is None:
+                        entry.status = 'ledger_committed'
+                        continue
+
+                if is_permanent(error):
+                    self.repository.fail(entry, error)
+                    continue
+
+                # Conflicts clear up quickly; anything else backs off exponentially
+                delay = random.uniform(0, 1) if is_conflict(error) else self._backoff(entry.attempts)
+                self.repository.schedule_retry(entry, error, delay, self.max_attempts)
+            db.session.commit()
+
+        # Step 2: inventory rows and completion in one transaction
+        committed = [e for e in entries if e.status == 'ledger_committed']
+        if committed:
+            try:
+                self._complete(committed)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                for entry in committed:
+                    self.repository.schedule_retry(
+                        entry, f"Inventory insert failed: {str(e)}", self._backoff(entry.attempts), self.max_attempts
+                    )
+                db.session.commit()
+
+        with self._processed_lock:
+            self.processed += len(entries)
+        return len(entries)
+
+    def _complete(self, entries) -> None:
+        wanted = {}
+        for entry in entries:
+            organization_id = entry.payload.get('organization_id')
+            if organization_id:
+                wanted[(uuid.UUID(organization_id), entry.payload['batch_id'])] = entry.payload
+
+        if wanted:
+            existing = set(
+                db.session.query(Inventory.organization_id, Inventory.batch_id).filter(
+                    Inventory.batch_id.in_([batch_id for _, batch_id in wanted])
+                ).all()
+            )
+            for (organization_id, batch_id), payload in wanted.items():
+                if (organization_id, batch_id) not in existing:
+                    db.session.add(InventoryRepository._build(inventory_data(organization_id, payload)))
+
+        for entry in entries:
+            entry.status = 'done'
+            entry.locked_at = None
+            entry.locked_by = None
+            entry.last_error = None
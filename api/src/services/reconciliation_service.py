@@ -0,0 +1,176 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from flask import current_app
+from werkzeug.exceptions import NotFound, BadRequest, Conflict
+
+from config.database import db
+from src.analytics.reconciliation import diff_quantities, inventory_frame, ledger_frame, to_records
+from src.models.reconciliation_model import (
+    reconciliation_run_output, reconciliation_runs_output, reconciliation_discrepancies_output
+)
+from src.repositories.reconciliation_repository import ReconciliationRepository
+from src.services.auth_service import AuthService
+from src.utils.constants import UserRole
+from src.utils.pagination import parse_limit
+
+RECONCILIATION_CHUNK_SIZE = int(os.getenv("RECONCILIATION_CHUNK_SIZE", "5000"))
+RECONCILIATION_MAX_IN_FLIGHT = int(os.getenv("RECONCILIATION_MAX_IN_FLIGHT", "64"))
+# A run still "running" after this long belonged to a process that died
+RECONCILIATION_STALE_AFTER = timedelta(hours=6)
+
+
+class Reconciler:
+    """
+    Compares the ledger ownership of every batch with the inventory rows
+    (available plus reserved) of each organization holding it.
+
+    Batch ids are walked in order in chunks of ``chunk_size``: each chunk's
+    ledger state is read with at most ``max_in_flight`` concurrent getBatch
+    queries, its inventory rows with one query, and the two are diffed with
+    pandas before the discrepancies are written. Memory stays bounded by the
+    chunk size whatever the number of batches.
+    """
+
+    def __init__(self, fabric_client, chunk_size: int = RECONCILIATION_CHUNK_SIZE,
+                 max_in_flight: int = RECONCILIATION_MAX_IN_FLIGHT) -> None:
+        self.fabric_client = fabric_client
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.repository = ReconciliationRepository()
+
+    def _fetch_ledger(self, batch_ids: List[str]) -> Tuple[List[tuple], List[str], List[str]]:
+        """
+        Returns the ``(batch_id, org_id, quantity)`` ownerships of the given
+        batches, plus the ids missing from the ledger and the ids that could
+        not be read.
+        """
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        futures = []
+
+        for batch_id in batch_ids:
+            slots.acquire()
+            try:
+                # Straight to the peers: the batch cache may lag behind the ledger
+                future = self.fabric_client.evaluate_async("getBatch", [batch_id])
+            except Exception:
+                slots.release()
+                raise
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+        ownerships, missing, failed = [], [], []
+        for batch_id, future in zip(batch_ids, futures):
+            try:
+                batch = future.result()
+            except Exception as e:
+                (missing if "does not exist" in str(e) else failed).append(batch_id)
+                continue
+
+            if not isinstance(batch, dict):
+                failed.append(batch_id)
+                continue
+            for ownership in batch.get("ownerships") or []:
+                ownerships.append((batch_id, ownership["orgId"], int(ownership["quantity"])))
+
+        return ownerships, missing, failed
+
+    def run(self, run):
+        """
+        Reconciles every batch into ``run``, committing chunk by chunk so the
+        counters show progress. Returns the finished run.
+        """
+        after = None
+        try:
+            while True:
+                batch_ids = self.repository.next_batch_ids(after, self.chunk_size)
+                if not batch_ids:
+                    break
+
+                ownerships, missing, failed = self._fetch_ledger(batch_ids)
+                inventory = self.repository.load_inventory(batch_ids)
+                discrepancies = diff_quantities(ledger_frame(ownerships), inventory_frame(inventory), missing, failed)
+
+                self.repository.add_discrepancies(run, to_records(discrepancies), len(batch_ids))
+                after = batch_ids[-1]
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: Reconciliation run {run.id} failed: {str(e)}")
+            return self.repository.finish_run(run, str(e))
+
+        return self.repository.finish_run(run)
+
+
+class ReconciliationService:
+    def __init__(self):
+        self.repository = ReconciliationRepository()
+        self.auth_service = AuthService()
+
+    def _get_admin(self):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can reconcile the ledger and inventory")
+        return user
+
+    def _find_run(self, run_id: str):
+        try:
+            run = self.repository.find_run(uuid.UUID(run_id))
+        except ValueError:
+            raise BadRequest("Invalid reconciliation run id")
+        if run is None:
+            raise NotFound("Reconciliation run not found")
+        return run
+
+    @staticmethod
+    def _reconcile_in_background(app, fabric_client, run_id):
+        with app.app_context():
+            try:
+                repository = ReconciliationRepository()
+                Reconciler(fabric_client).run(repository.find_run(run_id))
+            finally:
+                db.session.remove()
+
+    def start_reconciliation(self):
+        """
+        Starts a reconciliation run in a background thread; one at a time.
+        """
+        from config.fabric_config import get_fabric_client
+
+        user = self._get_admin()
+
+        running = self.repository.find_running()
+        if running is not None:
+            started_at = running.started_at.replace(tzinfo=timezone.utc) if running.started_at.tzinfo is None else running.started_at
+            if datetime.now(timezone.utc) - started_at < RECONCILIATION_STALE_AFTER:
+                raise Conflict(f"Reconciliation run {running.id} is still running")
+            self.repository.finish_run(running, "Abandoned")
+
+        run = self.repository.create_run(user.id)
+        threading.Thread(
+            target=self._reconcile_in_background,
+            args=(current_app._get_current_object(), get_fabric_client(), run.id),
+            name=f"reconciliation-{run.id}",
+            daemon=True,
+        ).start()
+        return reconciliation_run_output.dump(run)
+
+    def list_runs(self):
+        self._get_admin()
+        return reconciliation_runs_output.dump(self.repository.find_runs())
+
+    def get_run(self, run_id: str):
+        self._get_admin()
+        return reconciliation_run_output.dump(self._find_run(run_id))
+
+    def list_discrepancies(self, run_id: str, args):
+        self._get_admin()
+        run = self._find_run(run_id)
+        discrepancies, next_cursor = self.repository.find_discrepancies(
+            run.id, args.get('kind'), args.get('cursor'), parse_limit(args.get('limit'))
+        )
+        return reconciliation_discrepancies_output.dump(discrepancies), next_cursor
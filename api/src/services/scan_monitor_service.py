@@ -0,0 +1,312 @@
+import ipaddress
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+import numpy as np
+
+from config.database import db
+from src.analytics.sketches import CountMinSketch, HyperLogLog, hash64
+from src.models.user_model import User
+from src.repositories.notification_repository import NotificationRepository
+from src.repositories.scan_sketch_repository import ScanSketchRepository
+from src.utils.constants import UserRole, UserStatus
+
+BATCH_SCANS_SKETCH = 'batch_scans'
+GATE_SCANS_SKETCH = 'gate_scans'
+
+SCAN_SOURCE_CONSUMER = 'consumer'
+SCAN_SOURCE_GATE = 'gate'
+
+
+def coarse_scan_location(remote_addr: Optional[str], region: Optional[str] = None) -> str:
+    """
+    Location of a public scan, from nothing the client controls: the region
+    set by the edge in front of the API when there is one, else the network
+    (IPv4 /16, IPv6 /32) of the address the connection came from.
+    """
+    if region:
+        return f"region:{region.strip().upper()}"
+    try:
+        address = ipaddress.ip_address(remote_addr or "")
+    except ValueError:
+        return "unknown"
+    prefix = 16 if address.version == 4 else 32
+    return f"net:{ipaddress.ip_network(f'{address}/{prefix}', strict=False)}"
+
+
+class ScanMonitor:
+    """
+    Spots counterfeit suspects in the stream of verification scans.
+
+    Scans are queued by request threads and applied in batches by a worker:
+    a count-min sketch estimates how often each batch was scanned, and a
+    HyperLogLog per batch how many distinct places scanned it. A batch is
+    flagged once when its scans exceed ``volume_factor`` times its ledger
+    total_quantity, and once when it was seen at more than
+    ``max_locations`` places; admins are notified of both. Only consumer
+    scans count towards either: gate scans by supply chain members are
+    tallied in a sketch of their own.
+
+    Every ``flush_interval`` seconds the new counts are added to the shared
+    sketches in the database and the merged state read back, so all API
+    processes converge on the same estimates.
+    """
+
+    def __init__(
+        self,
+        app,
+        flush_interval: float = 30.0,
+        volume_factor: float = 1.0,
+        max_locations: int = 10,
+        max_tracked: int = 100000,
+        max_queue: int = 500000,
+        sketch_width: int = 2 ** 18,
+        gate_sketch_width: int = 2 ** 16,
+    ) -> None:
+        self.app = app
+        self.flush_interval = flush_interval
+        self.volume_factor = volume_factor
+        self.max_locations = max_locations
+        self.max_tracked = max_tracked
+        self.max_queue = max_queue
+
+        self.repository = ScanSketchRepository()
+        self.notification_repository = NotificationRepository()
+
+        # Shared counts as of the last flush, plus this process's counts since
+        self._base = CountMinSketch(width=sketch_width)
+        self._delta = CountMinSketch(width=sketch_width)
+        self._gate_base = CountMinSketch(width=gate_sketch_width)
+        self._gate_delta = CountMinSketch(width=gate_sketch_width)
+        self._locations: "OrderedDict[str, HyperLogLog]" = OrderedDict()
+        self._dirty = set()
+        self._flagged = set()
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.counters = {"recorded": 0, "applied": 0, "gate_applied": 0, "dropped": 0, "alerts": 0, "flushes": 0}
+
+    # --------------------------------------------------------
+    # Ingestion (request threads)
+    # --------------------------------------------------------
+    def record(self, batch_id: str, location: Optional[str], total_quantity: Optional[int],
+               source: str = SCAN_SOURCE_CONSUMER) -> None:
+        if len(self._queue) >= self.max_queue:
+            self.counters["dropped"] += 1
+            return
+        self._queue.append((batch_id, location or "unknown", total_quantity, source))
+        self.counters["recorded"] += 1
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def start(self) -> None:
+        with self.app.app_context():
+            base = self.repository.load_sketch(BATCH_SCANS_SKETCH)
+            if base is not None and base.table.shape == self._base.table.shape:
+                self._base = base
+            gate_base = self.repository.load_sketch(GATE_SCANS_SKETCH)
+            if gate_base is not None and gate_base.table.shape == self._gate_base.table.shape:
+                self._gate_base = gate_base
+        self._thread = threading.Thread(target=self._run, name="scan-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        with self.app.app_context():
+            while True:
+                stopping = self._stopped.is_set()
+                try:
+                    self.apply_pending()
+                    if stopping or time.monotonic() - last_flush >= self.flush_interval:
+                        self.flush()
+                        last_flush = time.monotonic()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Warning: Scan monitor failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+                if stopping:
+                    return
+                self._wakeup.wait(0.05)
+
+    # --------------------------------------------------------
+    # Applying scans (worker thread)
+    # --------------------------------------------------------
+    def _location_sketch(self, batch_id: str) -> HyperLogLog:
+        sketch = self._locations.get(batch_id)
+        if sketch is not None:
+            self._locations.move_to_end(batch_id)
+            return sketch
+
+        sketch = HyperLogLog()
+        self._locations[batch_id] = sketch
+        # Bound memory: forget the least recently scanned batches that have
+        # nothing left to flush (their registers are in the database)
+        while len(self._locations) > self.max_tracked:
+            oldest = next((b for b in self._locations if b not in self._dirty), None)
+            if oldest is None:
+                break
+            del self._locations[oldest]
+        return sketch
+
+    def apply_pending(self, limit: int = 50000) -> int:
+        scans, gate_scans = [], []
+        while self._queue and len(scans) + len(gate_scans) < limit:
+            batch_id, location, total_quantity, source = self._queue.popleft()
+            if source == SCAN_SOURCE_GATE:
+                gate_scans.append(batch_id)
+            else:
+                scans.append((batch_id, location, total_quantity))
+
+        if gate_scans:
+            gate_hashes = np.fromiter((hash64(batch_id) for batch_id in gate_scans), dtype=np.uint64, count=len(gate_scans))
+            with self._lock:
+                self._gate_delta.add_many(gate_hashes)
+            self.counters["gate_applied"] += len(gate_scans)
+        if not scans:
+            return len(gate_scans)
+
+        batch_hashes = np.fromiter((hash64(batch_id) for batch_id, _, _ in scans), dtype=np.uint64, count=len(scans))
+
+        with self._lock:
+            self._delta.add_many(batch_hashes)
+
+            # Load the stored location registers and alert state of batches
+            # this process has not seen yet
+            unseen = list({b for b, _, _ in scans if b not in self._locations})
+            for batch_id, stats in self.repository.load_batch_stats(unseen).items():
+                sketch = self._location_sketch(batch_id)
+                if stats.location_registers:
+                    sketch.merge(HyperLogLog.from_bytes(stats.location_registers))
+                if stats.volume_flagged_at:
+                    self._flagged.add((batch_id, 'volume'))
+                if stats.locations_flagged_at:
+                    self._flagged.add((batch_id, 'locations'))
+
+            latest = {}
+            for (batch_id, location, total_quantity), batch_hash in zip(scans, batch_hashes):
+                if self._location_sketch(batch_id).add(hash64(location)):
+                    self._dirty.add(batch_id)
+                latest[batch_id] = (int(batch_hash), total_quantity)
+
+            suspects = []
+            for batch_id, (batch_hash, total_quantity) in latest.items():
+                if total_quantity and (batch_id, 'volume') not in self._flagged:
+                    scanned = self._base.estimate(batch_hash) + self._delta.estimate(batch_hash)
+                    if scanned > total_quantity * self.volume_factor:
+                        suspects.append((batch_id, 'volume', scanned, total_quantity))
+                if (batch_id, 'locations') not in self._flagged:
+                    places = self._locations[batch_id].count()
+                    if places > self.max_locations:
+                        suspects.append((batch_id, 'locations', places, self.max_locations))
+
+        for suspect in suspects:
+            self._alert(*suspect)
+
+        self.counters["applied"] += len(scans)
+        return len(scans) + len(gate_scans)
+
+    def scan_count(self, batch_id: str, source: str = SCAN_SOURCE_CONSUMER) -> int:
+        """
+        Estimated scans of the batch from ``source``, across every process
+        as of the last flush plus this one's since.
+        """
+        batch_hash = hash64(batch_id)
+        with self._lock:
+            if source == SCAN_SOURCE_GATE:
+                return self._gate_base.estimate(batch_hash) + self._gate_delta.estimate(batch_hash)
+            return self._base.estimate(batch_hash) + self._delta.estimate(batch_hash)
+
+    def _alert(self, batch_id: str, kind: str, observed: int, limit: int) -> None:
+        self._flagged.add((batch_id, kind))
+        if not self.repository.flag_batch(batch_id, kind):
+            return
+
+        if kind == 'volume':
+            message = (f'Lote {batch_id} foi escaneado cerca de {observed} vezes, '
+                       f'acima da quantidade total de {limit} unidades registrada no ledger.')
+        else:
+            message = f'Lote {batch_id} foi escaneado em cerca de {observed} locais distintos (limite: {limit}).'
+
+        admins = User.query.filter_by(role=UserRole.ADMIN.value, status=UserStatus.ACTIVE.value).all()
+        for admin in admins:
+            self.notification_repository.create({
+                'user_id': admin.id,
+                'title': 'Possível Falsificação Detectada',
+                'message': message,
+                'notification_type': 'counterfeit_suspected',
+                'related_entity_type': 'batch',
+                'related_entity_id': batch_id
+            })
+        self.counters["alerts"] += 1
+
+    # --------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------
+    def _flush_sketch(self, name: str, pending: CountMinSketch) -> Optional[CountMinSketch]:
+        """
+        Adds ``pending`` to the shared sketch ``name`` and returns the merged
+        sketch, or None when there was nothing to add. On failure the counts
+        go back in, to be retried at the next flush.
+        """
+        with self._lock:
+            delta = CountMinSketch(pending.width, pending.depth, pending.table.copy())
+            pending.clear()
+        if not delta.table.any():
+            return None
+
+        try:
+            return self.repository.add_to_sketch(name, delta)
+        except Exception:
+            with self._lock:
+                pending.merge(delta)
+            raise
+
+    def flush(self) -> None:
+        base = self._flush_sketch(BATCH_SCANS_SKETCH, self._delta)
+        if base is not None:
+            self._base = base
+        gate_base = self._flush_sketch(GATE_SCANS_SKETCH, self._gate_delta)
+        if gate_base is not None:
+            self._gate_base = gate_base
+
+        with self._lock:
+            dirty = {batch_id: self._locations[batch_id] for batch_id in self._dirty if batch_id in self._locations}
+            self._dirty = set()
+
+        if dirty:
+            try:
+                merged = self.repository.merge_location_registers(dirty)
+            except Exception:
+                with self._lock:
+                    self._dirty.update(dirty)
+                raise
+            with self._lock:
+                for batch_id, sketch in merged.items():
+                    if batch_id in self._locations:
+                        self._locations[batch_id].merge(sketch)
+
+        self.counters["flushes"] += 1
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "queued": len(self._queue),
+            "tracked_batches": len(self._locations),
+            "volume_factor": self.volume_factor,
+            "max_locations": self.max_locations,
+        }
@@ -0,0 +1,240 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from flask import current_app
+from werkzeug.exceptions import BadRequest, NotFound
+from src.analytics.fraud import transfer_frame, with_previous_steps
+from src.analytics.transfer_graph import TransferGraph, WEIGHTS
+from src.models.batch_mirror_model import batch_transfers_output
+from src.repositories.batch_mirror_repository import BatchMirrorRepository
+from src.services.auth_service import AuthService
+from src.utils.constants import UserRole
+from src.utils.timestamps import hours_between
+
+TRANSFER_GRAPH_REBUILD_INTERVAL = float(os.getenv("TRANSFER_GRAPH_REBUILD_INTERVAL", "3600"))
+TRANSFER_GRAPH_BUILD_CHUNK_SIZE = int(os.getenv("TRANSFER_GRAPH_BUILD_CHUNK_SIZE", "50000"))
+TRANSFER_GRAPH_MAX_FLOWS = 100
+
+_graph: Optional[TransferGraph] = None
+_through_block = -1
+_built_at = 0.0
+_build_lock = threading.Lock()
+# Guards swapping the graph against the event subscriber applying to it
+_apply_lock = threading.Lock()
+# Transfers seen on the event stream, replayed into a rebuilt graph when
+# they are newer than what the mirror held at build time
+_recent = deque(maxlen=100000)
+
+
+def build_transfer_graph(chunks):
+    """
+    Aggregates mirrored transfers into a graph: one edge per
+    (from, to) organization pair with its transfer count, volume and summed
+    lead time. ``chunks`` yields lists of rows, each holding whole batch
+    histories, so only one chunk is in memory at a time. Returns
+    ``(graph, last_block)``.
+    """
+    graph = TransferGraph()
+    last_block = -1
+    for rows in chunks:
+        if not rows:
+            continue
+        frame = with_previous_steps(transfer_frame(rows, columns=list(rows[0]._fields)))
+        frame["lead_hours"] = (
+            (frame["transferred_at"] - frame["previous_step_at"]).dt.total_seconds().fillna(0).clip(lower=0) / 3600
+        )
+        edges = frame.groupby(["from_org_id", "to_org_id"], sort=False, as_index=False).agg(
+            transfers=("quantity", "size"), volume=("quantity", "sum"), lead_hours=("lead_hours", "sum")
+        )
+        graph.add_edges(
+            edges["from_org_id"], edges["to_org_id"],
+            edges["transfers"].to_numpy(), edges["volume"].to_numpy(), edges["lead_hours"].to_numpy(),
+        )
+        last_block = max(last_block, int(frame["block_number"].max()))
+    return graph, last_block
+
+
+def _is_fresh() -> bool:
+    return _graph is not None and time.monotonic() - _built_at < TRANSFER_GRAPH_REBUILD_INTERVAL
+
+
+def _rebuild() -> None:
+    global _graph, _through_block, _built_at
+
+    graph, through_block = build_transfer_graph(
+        BatchMirrorRepository().iter_transfer_history(TRANSFER_GRAPH_BUILD_CHUNK_SIZE)
+    )
+    with _apply_lock:
+        for block_number, transfer in list(_recent):
+            if block_number > through_block:
+                graph.add_transfer(*transfer)
+        _graph, _through_block, _built_at = graph, through_block, time.monotonic()
+
+
+def _rebuild_in_background(app) -> None:
+    try:
+        with app.app_context():
+            _rebuild()
+    except Exception as e:
+        print(f"Warning: Could not rebuild the transfer graph: {str(e)}")
+    finally:
+        _build_lock.release()
+
+
+def get_transfer_graph() -> TransferGraph:
+    """
+    Returns the process-wide transfer graph, building it from the ledger
+    mirror on first use. Every TRANSFER_GRAPH_REBUILD_INTERVAL seconds it
+    is rebuilt on a background thread while requests keep using the
+    current one. Needs an app context.
+    """
+    if _is_fresh():
+        return _graph
+
+    if _graph is None:
+        with _build_lock:
+            if _graph is None:
+                _rebuild()
+        return _graph
+
+    # At most one rebuild at a time; it releases the lock when done
+    if _build_lock.acquire(blocking=False):
+        if _is_fresh():
+            _build_lock.release()
+            return _graph
+        try:
+            threading.Thread(
+                target=_rebuild_in_background, args=(current_app._get_current_object(),),
+                name="transfer-graph-rebuild", daemon=True,
+            ).start()
+        except Exception:
+            _build_lock.release()
+            raise
+    return _graph
+
+
+def update_transfer_graph_on_ledger_event(event):
+    """
+    Ledger event subscriber: adds a committed transfer to the graph right
+    away, so queries see it before the next rebuild.
+    """
+    if not event.valid or event.function != "transferBatch" or not event.args:
+        return
+    batch = event.values.get(event.args[0])
+    if not isinstance(batch, dict) or not batch.get("lastTransfer"):
+        return
+
+    last = batch["lastTransfer"]
+    transfers = batch.get("transfers") or []
+    previous = transfers[-2].get("timestamp") if len(transfers) >= 2 else batch.get("createdAt")
+    transfer = (
+        last["fromOrgId"], last["toOrgId"], int(last["quantity"]),
+        hours_between(previous, last.get("timestamp") or event.timestamp),
+    )
+
+    with _apply_lock:
+        _recent.append((event.block_number, transfer))
+        if _graph is not None and event.block_number > _through_block:
+            _graph.add_transfer(*transfer)
+
+
+class TransferGraphService:
+    """
+    Path, reachability and flow queries over the organization transfer
+    graph, plus the custody route of a single batch from the mirror.
+    """
+
+    def __init__(self):
+        self.repository = BatchMirrorRepository()
+        self.auth_service = AuthService()
+
+    def _get_current_user(self):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        return user
+
+    def _require_admin(self):
+        user = self._get_current_user()
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can query the transfer graph")
+        return user
+
+    def find_path(self, args):
+        self._require_admin()
+
+        from_org_id, to_org_id = args.get('from'), args.get('to')
+        if not from_org_id or not to_org_id:
+            raise BadRequest("from and to are required")
+        weight = args.get('weight', 'hops')
+        if weight not in WEIGHTS:
+            raise BadRequest(f"weight must be one of {', '.join(WEIGHTS)}")
+
+        path = get_transfer_graph().shortest_path(from_org_id, to_org_id, weight)
+        if path is None:
+            raise NotFound(f"No transfer route from {from_org_id} to {to_org_id}")
+        return path
+
+    def find_reachable(self, org_id, args):
+        self._require_admin()
+
+        direction = args.get('direction', 'downstream')
+        if direction not in ('downstream', 'upstream'):
+            raise BadRequest("direction must be downstream or upstream")
+        try:
+            max_hops = int(args['max_hops']) if args.get('max_hops') else None
+        except ValueError:
+            raise BadRequest("max_hops must be an integer")
+
+        reachable = get_transfer_graph().reachable(org_id, direction == 'downstream', max_hops)
+        if reachable is None:
+            raise NotFound("Organization has no transfers")
+        return reachable
+
+    def find_top_flows(self, args):
+        self._require_admin()
+
+        direction = args.get('direction', 'both')
+        if direction not in ('in', 'out', 'both'):
+            raise BadRequest("direction must be in, out or both")
+        try:
+            limit = min(int(args.get('limit', 10)), TRANSFER_GRAPH_MAX_FLOWS)
+        except ValueError:
+            raise BadRequest("limit must be an integer")
+        if limit < 1:
+            raise BadRequest("limit must be positive")
+
+        return get_transfer_graph().top_flows(limit, args.get('org_id'), direction)
+
+    def get_graph_stats(self):
+        self._require_admin()
+        return {**get_transfer_graph().stats(), "through_block": _through_block}
+
+    def get_batch_route(self, batch_id):
+        """
+        The organizations a batch passed through, in custody order.
+        """
+        self._get_current_user()
+
+        transfers = self.repository.find_batch_route(batch_id)
+        if not transfers:
+            raise NotFound("Batch has no recorded transfers")
+
+        route = [transfers[0].from_org_id]
+        for transfer in transfers:
+            if transfer.to_org_id not in route:
+                route.append(transfer.to_org_id)
+        return {"batch_id": batch_id, "organizations": route, "transfers": batch_transfers_output.dump(transfers)}
+
+
+def _reset_after_fork():
+    global _build_lock, _apply_lock
+    _build_lock = threading.Lock()
+    _apply_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
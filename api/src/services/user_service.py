@@ -4,6 +4,7 @@ from src.models.user_model import User, user_input_create, user_input_update, us
 from src.utils.constants import UserRole, UserStatus, RequestSource
 from werkzeug.exceptions import NotFound
 from src.services.auth_service import AuthService
+from src.utils.pagination import parse_limit
 
 
 class UserService:
@@ -11,15 +12,15 @@ class UserService:
         self.user_repository = UserRepository()
         self.auth_service = AuthService()
 
-    def get_all_users(self,source=None):    
-        users = self.user_repository.get_all_users()
+    def get_all_users(self, args):
+        users, next_cursor = self.user_repository.get_all_users(args.get('cursor'), parse_limit(args.get('limit')))
 
         user = self.auth_service.return_user_from_token(optional=True)
 
-        if user is not None and source == RequestSource.DASHBOARD.value and user.role == UserRole.ADMIN.value:           
-            return users_output_admin.dump(users)
+        if user is not None and args.get('source') == RequestSource.DASHBOARD.value and user.role == UserRole.ADMIN.value:           
+            return users_output_admin.dump(users), next_cursor
             
-        return users_output.dump(users)
+        return users_output.dump(users), next_cursor
 
     def create_user(self, data):
         user_data = user_input_create.load(data)
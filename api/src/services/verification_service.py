@@ -0,0 +1,174 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config.cache_config import get_cache
+from src.repositories.blockchain_repository import BATCH_WRITE_FUNCTIONS, BlockchainRepository
+from src.utils.signing import SIGNATURE_ALGORITHM, canonical_json, get_provenance_signer
+
+VERIFY_MAX_AGE = int(os.getenv("VERIFY_MAX_AGE", "60"))
+VERIFY_SHARED_MAX_AGE = int(os.getenv("VERIFY_SHARED_MAX_AGE", "300"))
+VERIFY_NOT_FOUND_MAX_AGE = int(os.getenv("VERIFY_NOT_FOUND_MAX_AGE", "30"))
+
+# Concurrent misses for the same batch wait for one ledger round trip
+_build_locks = [threading.Lock() for _ in range(64)]
+_refresher: Optional[ThreadPoolExecutor] = None
+_refresher_lock = threading.Lock()
+
+
+def get_verification_cache():
+    # Snapshots are refreshed on ledger events; the TTL only bounds staleness
+    # when the event listener is not running
+    return get_cache("verification", default_max_size=50000, default_ttl=300)
+
+
+def _describe(previous: Optional[dict], value: dict) -> dict:
+    """
+    Reduces one history entry to the custody event it records.
+    """
+    if previous is None:
+        owner = (value.get("ownerships") or [{}])[0].get("orgId")
+        return {"event": "created", "org_id": owner, "quantity": value.get("totalQuantity")}
+
+    last_transfer = value.get("lastTransfer")
+    if last_transfer and last_transfer != previous.get("lastTransfer"):
+        return {
+            "event": "transferred",
+            "from_org_id": last_transfer.get("fromOrgId"),
+            "to_org_id": last_transfer.get("toOrgId"),
+            "quantity": last_transfer.get("quantity"),
+        }
+    return {"event": "delivered" if value.get("status") == "DELIVERED" else "updated", "status": value.get("status")}
+
+
+def build_provenance_summary(batch: dict, history: list) -> dict:
+    """
+    Compact, consumer-facing view of a batch and its chain of custody
+    (oldest event first). Contains nothing time-dependent besides ledger
+    data, so it only changes when the batch does.
+    """
+    custody = []
+    previous = None
+    for entry in reversed(history or []):
+        value = entry.get("value")
+        if not isinstance(value, dict):
+            continue
+        custody.append({"tx_id": entry.get("txId"), "timestamp": entry.get("timestamp"), **_describe(previous, value)})
+        previous = value
+
+    return {
+        "batch_id": batch.get("batchId"),
+        "product_name": batch.get("productName"),
+        "unit_dosage": batch.get("unitDosage"),
+        "manufacture_date": batch.get("manufactureDate"),
+        "expiry_date": batch.get("expiryDate"),
+        "total_quantity": batch.get("totalQuantity"),
+        "status": batch.get("status"),
+        "current_holders": sorted(o.get("orgId") for o in batch.get("ownerships") or []),
+        "custody": custody,
+        "last_tx_id": custody[-1]["tx_id"] if custody else None,
+    }
+
+
+class VerificationService:
+    """
+    Unauthenticated provenance checks for scanned packages.
+
+    Each batch's signed summary is built once and kept as a snapshot in the
+    verification cache together with its ETag; ledger events rebuild the
+    snapshots of hot batches in the background, so a scan spike is served
+    from memory (and from HTTP caches in front of the API) instead of peers.
+    """
+
+    def __init__(self, fabric_client):
+        self.repository = BlockchainRepository(fabric_client)
+        self.cache = get_verification_cache()
+        self.signer = get_provenance_signer()
+
+    def build_snapshot(self, batch_id: str) -> dict:
+        try:
+            batch = self.repository.get_batch(batch_id)
+        except Exception as e:
+            if "does not exist" not in str(e):
+                raise
+            batch = None
+
+        if not isinstance(batch, dict):
+            snapshot = {"found": False, "etag": None, "data": None}
+        else:
+            summary = build_provenance_summary(batch, self.repository.get_batch_history(batch_id))
+            data = {
+                "summary": summary,
+                "signature": self.signer.sign(summary),
+                "algorithm": SIGNATURE_ALGORITHM,
+                "key_id": self.signer.key_id,
+            }
+            # Strong validator: the signature is deterministic, so the
+            # summary plus the key identify the response body exactly
+            etag = hashlib.sha256(canonical_json(summary) + self.signer.key_id.encode("ascii")).hexdigest()[:32]
+            snapshot = {"found": True, "etag": etag, "data": data}
+
+        self.cache.set(batch_id, snapshot)
+        return snapshot
+
+    def get_snapshot(self, batch_id: str) -> dict:
+        snapshot = self.cache.get(batch_id)
+        if snapshot is not None:
+            return snapshot
+
+        with _build_locks[hash(batch_id) % len(_build_locks)]:
+            snapshot = self.cache.get(batch_id)
+            if snapshot is None:
+                snapshot = self.build_snapshot(batch_id)
+        return snapshot
+
+    def get_public_key(self) -> dict:
+        return {
+            "algorithm": SIGNATURE_ALGORITHM,
+            "key_id": self.signer.key_id,
+            "public_key": self.signer.public_key_pem,
+        }
+
+
+def _refresh_snapshot(batch_id: str) -> None:
+    from config.fabric_config import get_fabric_client
+
+    try:
+        VerificationService(get_fabric_client()).build_snapshot(batch_id)
+    except Exception as e:
+        get_verification_cache().delete(batch_id)
+        print(f"Warning: Could not refresh verification snapshot for {batch_id}: {str(e)}")
+
+
+def refresh_verification_on_ledger_event(event):
+    """
+    Ledger event subscriber: rebuilds the snapshot of every cached batch a
+    committed transaction wrote. Runs on the event loop thread, so the
+    ledger queries are handed to a small worker pool.
+    """
+    global _refresher
+
+    if event.function not in BATCH_WRITE_FUNCTIONS:
+        return
+
+    cache = get_verification_cache()
+    for key in event.keys or event.args[:1]:
+        if cache.get(key) is None:
+            continue
+        with _refresher_lock:
+            if _refresher is None:
+                _refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="verification-refresh")
+        _refresher.submit(_refresh_snapshot, key)
+
+
+def _reset_after_fork() -> None:
+    global _build_locks, _refresher, _refresher_lock
+    _build_locks = [threading.Lock() for _ in range(64)]
+    _refresher = None
+    _refresher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,222 @@
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+from typing import List, Tuple
+
+from flask import current_app
+from werkzeug.exceptions import NotFound, BadRequest, Conflict
+
+from config.database import db
+from src.analytics.volume_consistency import check_history
+from src.models.consistency_model import (
+    consistency_run_output, consistency_runs_output, consistency_violations_output
+)
+from src.repositories.consistency_repository import ConsistencyRepository
+from src.services.auth_service import AuthService
+from src.utils.constants import UserRole
+from src.utils.pagination import parse_limit
+
+CONSISTENCY_WORKERS = int(os.getenv("CONSISTENCY_WORKERS", "4"))
+CONSISTENCY_CHUNK_SIZE = int(os.getenv("CONSISTENCY_CHUNK_SIZE", "2000"))
+CONSISTENCY_MAX_IN_FLIGHT = int(os.getenv("CONSISTENCY_MAX_IN_FLIGHT", "32"))
+# A run still "running" after this long belonged to a process that died
+CONSISTENCY_STALE_AFTER = timedelta(hours=12)
+
+
+def check_batches(fabric_client, batch_ids: List[str], max_in_flight: int) -> Tuple[List[dict], int]:
+    """
+    Checks the histories of the given batches, read with at most
+    ``max_in_flight`` concurrent getBatchHistory queries. Returns their
+    violations and the number of batches whose history could not be read.
+    """
+    slots = threading.BoundedSemaphore(max_in_flight)
+    futures = []
+
+    for batch_id in batch_ids:
+        slots.acquire()
+        try:
+            future = fabric_client.evaluate_async("getBatchHistory", [batch_id])
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+
+    violations, failed = [], 0
+    for batch_id, future in zip(batch_ids, futures):
+        try:
+            history = future.result()
+        except Exception:
+            failed += 1
+            continue
+        if not isinstance(history, list):
+            failed += 1
+            continue
+        # Histories are checked one at a time and dropped, only balances are kept
+        violations.extend(check_history(batch_id, history))
+
+    return violations, failed
+
+
+def _check_chunk(batch_ids: List[str], max_in_flight: int) -> Tuple[List[dict], int]:
+    """Worker process entry point: each worker owns its own client pool."""
+    from config.fabric_config import get_fabric_client
+
+    return check_batches(get_fabric_client(), batch_ids, max_in_flight)
+
+
+class VolumeChecker:
+    """
+    Checks volume conservation over the history of every ledger batch.
+
+    Batch ids are walked in order from the ledger mirror in chunks of
+    ``chunk_size``; each chunk is a shard handed to one of ``workers``
+    processes, which reads its histories and replays them through running
+    per-batch balances (see ``src.analytics.volume_consistency``). At most
+    two chunks per worker are outstanding, so memory stays bounded whatever
+    the size of the ledger, and violations are written chunk by chunk in
+    batch id order as the results come back.
+
+    Workers are spawned rather than forked so they inherit neither the
+    parent's database connections nor its gateway channels. With a single
+    worker (or the in-memory fake ledger, which is not shared across
+    processes) chunks are checked in-process with ``fabric_client``.
+    """
+
+    def __init__(self, fabric_client, workers: int = CONSISTENCY_WORKERS, chunk_size: int = CONSISTENCY_CHUNK_SIZE,
+                 max_in_flight: int = CONSISTENCY_MAX_IN_FLIGHT) -> None:
+        if workers > 1 and os.getenv("FABRIC_BACKEND", "sdk") == "fake":
+            print("Warning: The fake ledger lives in this process, checking volumes with a single worker")
+            workers = 1
+        self.fabric_client = fabric_client
+        self.workers = max(workers, 1)
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.repository = ConsistencyRepository()
+
+    def _chunks(self):
+        after = None
+        while True:
+            batch_ids = self.repository.next_batch_ids(after, self.chunk_size)
+            if not batch_ids:
+                return
+            yield batch_ids
+            after = batch_ids[-1]
+
+    def _check_in_process(self, run) -> None:
+        for batch_ids in self._chunks():
+            violations, failed = check_batches(self.fabric_client, batch_ids, self.max_in_flight)
+            self.repository.add_violations(run, violations, len(batch_ids), failed)
+
+    def _check_in_workers(self, run) -> None:
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn")) as pool:
+            pending = deque()
+            chunks = self._chunks()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < 2 * self.workers:
+                    batch_ids = next(chunks, None)
+                    if batch_ids is None:
+                        exhausted = True
+                        break
+                    pending.append((len(batch_ids), pool.submit(_check_chunk, batch_ids, self.max_in_flight)))
+                if not pending:
+                    break
+
+                checked, future = pending.popleft()
+                violations, failed = future.result()
+                self.repository.add_violations(run, violations, checked, failed)
+
+    def run(self, run):
+        """
+        Checks every batch into ``run``, committing chunk by chunk so the
+        counters show progress. Returns the finished run.
+        """
+        try:
+            if self.workers == 1:
+                self._check_in_process(run)
+            else:
+                self._check_in_workers(run)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Warning: Volume consistency run {run.id} failed: {str(e)}")
+            return self.repository.finish_run(run, str(e))
+
+        return self.repository.finish_run(run)
+
+
+class VolumeConsistencyService:
+    def __init__(self):
+        self.repository = ConsistencyRepository()
+        self.auth_service = AuthService()
+
+    def _get_admin(self):
+        user = self.auth_service.return_user_from_token()
+        if user is None:
+            raise BadRequest("Authentication required")
+        if user.role != UserRole.ADMIN.value:
+            raise BadRequest("Only admins can check ledger volumes")
+        return user
+
+    def _find_run(self, run_id: str):
+        try:
+            run = self.repository.find_run(uuid.UUID(run_id))
+        except ValueError:
+            raise BadRequest("Invalid consistency run id")
+        if run is None:
+            raise NotFound("Consistency run not found")
+        return run
+
+    @staticmethod
+    def _check_in_background(app, fabric_client, run_id):
+        with app.app_context():
+            try:
+                repository = ConsistencyRepository()
+                run = repository.find_run(run_id)
+                VolumeChecker(fabric_client, workers=run.workers).run(run)
+            finally:
+                db.session.remove()
+
+    def start_check(self):
+        """
+        Starts a volume consistency run in a background thread; one at a time.
+        """
+        from config.fabric_config import get_fabric_client
+
+        user = self._get_admin()
+
+        running = self.repository.find_running()
+        if running is not None:
+            started_at = running.started_at.replace(tzinfo=timezone.utc) if running.started_at.tzinfo is None else running.started_at
+            if datetime.now(timezone.utc) - started_at < CONSISTENCY_STALE_AFTER:
+                raise Conflict(f"Consistency run {running.id} is still running")
+            self.repository.finish_run(running, "Abandoned")
+
+        run = self.repository.create_run(CONSISTENCY_WORKERS, user.id)
+        threading.Thread(
+            target=self._check_in_background,
+            args=(current_app._get_current_object(), get_fabric_client(), run.id),
+            name=f"volume-consistency-{run.id}",
+            daemon=True,
+        ).start()
+        return consistency_run_output.dump(run)
+
+    def list_runs(self):
+        self._get_admin()
+        return consistency_runs_output.dump(self.repository.find_runs())
+
+    def get_run(self, run_id: str):
+        self._get_admin()
+        return consistency_run_output.dump(self._find_run(run_id))
+
+    def list_violations(self, run_id: str, args):
+        self._get_admin()
+        run = self._find_run(run_id)
+        violations, next_cursor = self.repository.find_violations(
+            run.id, args.get('kind'), args.get('batch_id'), args.get('cursor'), parse_limit(args.get('limit'))
+        )
+        return consistency_violations_output.dump(violations), next_cursor
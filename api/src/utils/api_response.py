@@ -2,12 +2,15 @@ from flask import jsonify
 
 class ApiResponse:
     @staticmethod
-    def response(success, message, data=None, status_code=200):
+    def response(success, message, data=None, status_code=200, next_cursor=None):
         response = {
             'success': success,
             'message': message,
             'data': data
         }
+
+        if next_cursor is not None:
+            response['next_cursor'] = next_cursor
             
         return jsonify(response), status_code
         
\ No newline at end of file
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with an optional per-entry TTL.
+    """
+
+    backend = "memory"
+
+    def __init__(self, name: str, max_size: int = 10000, ttl: Optional[float] = None) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl or None
+        self._entries: "OrderedDict[str, tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "backend": self.backend,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                **self._stats.as_dict(),
+            }
+
+
+class RedisCache:
+    """
+    Redis-backed cache sharing entries across workers and hosts.
+
+    Values are stored as JSON under ``<name>:<key>``. Hit/miss counters are
+    per process; evictions are the server-wide ``evicted_keys`` counter since
+    Redis applies its own maxmemory policy.
+    """
+
+    backend = "redis"
+
+    def __init__(self, name: str, redis_url: str, ttl: Optional[float] = None) -> None:
+        import redis
+
+        self.name = name
+        self.ttl = int(ttl) if ttl else None
+        self._redis = redis.Redis.from_url(redis_url)
+        self._stats = CacheStats()
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._redis.get(self._key(key))
+        if raw is None:
+            self._stats.misses += 1
+            return None
+
+        self._stats.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self._redis.set(self._key(key), json.dumps(value), ex=self.ttl)
+
+    def delete(self, key: str) -> None:
+        if self._redis.delete(self._key(key)):
+            self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(match=f"{self.name}:*"):
+            self._redis.delete(key)
+
+    def stats(self) -> dict:
+        stats = self._stats.as_dict()
+        try:
+            stats["evictions"] = self._redis.info("stats").get("evicted_keys", 0)
+        except Exception:
+            pass
+
+        return {
+            "name": self.name,
+            "backend": self.backend,
+            "ttl": self.ttl,
+            **stats,
+        }
@@ -0,0 +1,85 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import tuple_
+from werkzeug.exceptions import BadRequest
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _from_json(value, column):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor shape mismatch")
+        return [_from_json(v, c) for v, c in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise BadRequest("Invalid pagination cursor")
+
+
+def parse_limit(limit, default: int = DEFAULT_PAGE_LIMIT, maximum: int = MAX_PAGE_LIMIT) -> int:
+    if limit in (None, ""):
+        return default
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise BadRequest("limit must be an integer")
+    if limit < 1:
+        raise BadRequest("limit must be positive")
+    return min(limit, maximum)
+
+
+def keyset_paginate(query, columns, cursor=None, limit=DEFAULT_PAGE_LIMIT, descending=False):
+    """
+    Applies keyset (seek) pagination over ``columns`` to ``query``.
+
+    ``columns`` must form a unique, indexed sort key (e.g. a timestamp plus
+    the primary key), so every page is an index range scan whose cost does
+    not depend on how deep into the result set it starts. Returns the page
+    items and the opaque cursor of the next page (None on the last page).
+    """
+    key = tuple_(*columns)
+    if cursor:
+        values = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < values if descending else key > values)
+
+    order = [c.desc() for c in columns] if descending else list(columns)
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, c.key) for c in columns])
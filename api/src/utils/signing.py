@@ -0,0 +1,77 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+SIGNATURE_ALGORITHM = "Ed25519"
+
+
+def canonical_json(value) -> bytes:
+    """
+    Serializes ``value`` deterministically (sorted keys, no whitespace), so
+    the bytes that are signed can be rebuilt by any verifier.
+    """
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ProvenanceSigner:
+    """
+    Signs provenance summaries with an Ed25519 key. Signatures are
+    deterministic, so the same summary always gets the same signature.
+    """
+
+    def __init__(self, private_key: Ed25519PrivateKey) -> None:
+        self._private_key = private_key
+        public_raw = private_key.public_key().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        self.key_id = hashlib.sha256(public_raw).hexdigest()[:16]
+        self.public_key_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode("ascii")
+
+    def sign(self, value) -> str:
+        return base64.b64encode(self._private_key.sign(canonical_json(value))).decode("ascii")
+
+
+_signer: Optional[ProvenanceSigner] = None
+_signer_lock = threading.Lock()
+
+
+def get_provenance_signer() -> ProvenanceSigner:
+    """
+    Returns the signer for public verification responses, loading the PEM
+    private key at VERIFY_SIGNING_KEY_PATH. Without one, a key is generated
+    per process: fine for development, but signatures then change on restart
+    and differ between workers.
+    """
+    global _signer
+
+    with _signer_lock:
+        if _signer is None:
+            key_path = os.getenv("VERIFY_SIGNING_KEY_PATH")
+            if key_path:
+                with open(key_path, "rb") as key_file:
+                    private_key = serialization.load_pem_private_key(key_file.read(), password=None)
+                if not isinstance(private_key, Ed25519PrivateKey):
+                    raise RuntimeError("VERIFY_SIGNING_KEY_PATH must hold an Ed25519 private key.")
+            else:
+                print("Warning: VERIFY_SIGNING_KEY_PATH is not set, signing verifications with a temporary key")
+                private_key = Ed25519PrivateKey.generate()
+            _signer = ProvenanceSigner(private_key)
+        return _signer
+
+
+def _reset_after_fork() -> None:
+    # The key itself is kept: forked workers sign with the parent's key
+    global _signer_lock
+    _signer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
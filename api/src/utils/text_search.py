@@ -0,0 +1,99 @@
+import bisect
+import heapq
+import re
+import threading
+from typing import Dict, List, Set, Tuple
+
+# pg_trgm splits text into words of alphanumeric characters
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    The trigrams pg_trgm extracts from ``text``: lower-cased words, each
+    padded with two spaces in front and one behind.
+    """
+    grams = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    pg_trgm's ``similarity``: shared trigrams over distinct trigrams of
+    both strings. Registered on SQLite connections so searches run
+    unchanged where the extension does not exist.
+    """
+    left, right = trigrams(a), trigrams(b)
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+class PrefixIndex:
+    """
+    Autocomplete over names, each weighted (e.g. by available quantity).
+
+    Every name is keyed by its lower-cased text from the start of each of
+    its words, so "amo" and "500" both complete "Amoxicillin 500mg". Keys
+    live in one sorted list: a completion is a bisect to the first key with
+    the prefix plus a walk over the matching range, and a name is added or
+    removed with a bisect per word.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, str]] = []
+        self._weights: Dict[str, int] = {}
+
+    @staticmethod
+    def _name_keys(name: str) -> List[Tuple[str, str]]:
+        lowered = name.lower()
+        return [(lowered[match.start():], name) for match in _WORD.finditer(lowered)]
+
+    def _remove(self, name: str) -> None:
+        for key in self._name_keys(name):
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+        del self._weights[name]
+
+    def replace(self, weights: Dict[str, int]) -> None:
+        """Rebuilds the index from scratch."""
+        keys = sorted(key for name, weight in weights.items() if weight > 0 for key in self._name_keys(name))
+        with self._lock:
+            self._keys = keys
+            self._weights = {name: weight for name, weight in weights.items() if weight > 0}
+
+    def update(self, weights: Dict[str, int]) -> None:
+        """Sets the weight of the given names; a zero weight removes a name."""
+        with self._lock:
+            for name, weight in weights.items():
+                if weight <= 0:
+                    if name in self._weights:
+                        self._remove(name)
+                    continue
+                if name not in self._weights:
+                    for key in self._name_keys(name):
+                        bisect.insort(self._keys, key)
+                self._weights[name] = weight
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """The ``limit`` heaviest names with a word starting with ``prefix``."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        with self._lock:
+            matches = set()
+            position = bisect.bisect_left(self._keys, (prefix, ""))
+            while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+                matches.add(self._keys[position][1])
+                position += 1
+            return heapq.nsmallest(
+                limit, ((name, self._weights[name]) for name in matches), key=lambda item: (-item[1], item[0])
+            )
+
+    def __len__(self) -> int:
+        return len(self._weights)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """
+    Parses a ledger ISO-8601 timestamp (``Z`` suffix allowed); None when
+    missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def hours_between(start, end) -> float:
+    """
+    Hours from ``start`` to ``end`` (ledger timestamps), 0 when either is
+    unknown or ``end`` comes first.
+    """
+    start, end = parse_timestamp(start), parse_timestamp(end)
+    if start is None or end is None:
+        return 0.0
+    return max((end - start).total_seconds(), 0.0) / 3600
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from flask import Flask
+
+from config.database import db
+from src.fabric.event_listener import TX_VALIDATION_VALID, LedgerEvent
+from src.models.anomaly_model import TransferAnomaly
+from src.models.batch_mirror_model import LedgerDeadLetter
+from src.models.notification_model import Notification
+from src.models.user_model import User
+from src.services.anomaly_detector_service import ANOMALY_DETECTOR_CHECKPOINT, TransferAnomalyDetector
+from src.utils.constants import UserRole, UserStatus
+
+
+def _event(block_number, tx_id):
+    return LedgerEvent(block_number, tx_id, TX_VALIDATION_VALID, 'transferBatch', ['BATCH-AN-1', 'M1', 'D1', '5'], [])
+
+
+def _flagged(event):
+    return {
+        'tx_id': event.tx_id, 'block_number': event.block_number, 'function': event.function,
+        'batch_id': 'BATCH-AN-1', 'org_id': 'M1', 'counterparty_org_id': 'D1', 'quantity': 5, 'score': 9.0,
+        'features': {}, 'reasons': [{'feature': 'log_quantity', 'value': 1.8, 'median': 0.5, 'z': 9.0}],
+    }
+
+
+def test_unrecordable_anomaly_is_parked_and_the_detector_moves_on(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'anomalies.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(
+            name="Admin", email="admin@example.com", phone="0", hashed_password="-",
+            role=UserRole.ADMIN.value, status=UserStatus.ACTIVE.value
+        ))
+        db.session.commit()
+
+    detector = TransferAnomalyDetector(app, retry_delay=0, max_attempts=2)
+    detector.score = lambda events: [_flagged(event) for event in events]
+    add_new = detector.repository.add_new
+
+    def add_new_failing_on_poison(anomalies):
+        if any(anomaly['tx_id'] == 'tx-poison' for anomaly in anomalies):
+            raise ValueError("cannot store this one")
+        return add_new(anomalies)
+
+    detector.repository.add_new = add_new_failing_on_poison
+    worker = threading.Thread(target=detector._run, daemon=True)
+    worker.start()
+    try:
+        for event in [_event(3, 'tx-good'), _event(4, 'tx-poison'), _event(5, 'tx-later')]:
+            detector._enqueue(event)
+
+        deadline = time.monotonic() + 10
+        with app.app_context():
+            while time.monotonic() < deadline and detector.checkpoint_repository.get_checkpoint(ANOMALY_DETECTOR_CHECKPOINT) != 4:
+                db.session.remove()
+                time.sleep(0.05)
+
+            assert detector.checkpoint_repository.get_checkpoint(ANOMALY_DETECTOR_CHECKPOINT) == 4
+            assert sorted(a.tx_id for a in TransferAnomaly.query.all()) == ['tx-good', 'tx-later']
+            assert Notification.query.filter_by(notification_type='distribution_anomaly').count() == 2
+            (parked,) = LedgerDeadLetter.query.all()
+            assert (parked.consumer, parked.tx_id) == (ANOMALY_DETECTOR_CHECKPOINT, 'tx-poison')
+    finally:
+        detector._stopped.set()
+        worker.join()
+
+
+def test_queue_is_bounded_without_blocking_the_event_loop():
+    detector = TransferAnomalyDetector(Flask(__name__), max_queue=2)
+    for block_number in range(5):
+        detector._enqueue(_event(block_number, f'tx-{block_number}'))
+    assert (detector.stats()["queued"], detector.counters["dropped"]) == (2, 3)
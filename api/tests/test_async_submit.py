@@ -0,0 +1,76 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+from flask import Flask
+
+import config.fabric_config as fabric_config
+import src.fabric.event_listener as event_listener
+import src.fabric.transaction_tracker as transaction_tracker
+from config.database import db
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.fabric.transaction_tracker import TX_STATUS_PENDING, TX_STATUS_VALID, TransactionTracker
+from src.models.inventory_model import Inventory
+from src.services.blockchain_service import BlockchainService
+from src.utils.cache import LRUCache
+from src.utils.constants import UserRole
+
+
+class _SlowToConnectClient(FakeFabricClient):
+    async def listen_blocks(self, on_block, start_block=None):
+        # The event stream takes a while to open
+        await asyncio.sleep(0.2)
+        await super().listen_blocks(on_block, start_block=start_block)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_first_async_submit_in_a_process_is_seen_committing(tmp_path, monkeypatch):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'async.db'}"
+    db.init_app(app)
+
+    client = _SlowToConnectClient(FakeLedger())
+    tracker = TransactionTracker(LRUCache("test-tx"))
+    monkeypatch.setattr(fabric_config, "get_fabric_client", lambda: client)
+    monkeypatch.setattr(event_listener, "_listener", None)
+    monkeypatch.setattr(transaction_tracker, "_tracker", tracker)
+
+    organization_id = uuid.uuid4()
+    try:
+        with app.app_context():
+            db.create_all()
+            service = BlockchainService(client)
+            service.auth_service.return_user_from_token = lambda: SimpleNamespace(
+                id=uuid.uuid4(), role=UserRole.MANUFACTURER.value, organization_id=organization_id
+            )
+
+            record = service.create_batch({
+                "batch_id": "BATCH-ASYNC-1",
+                "product_name": "Test Drug",
+                "manufacture_date": "2025-01-01",
+                "expiry_date": "2027-01-01",
+                "total_quantity": 100,
+                "unit_dosage": "100mg",
+                "unit_price": 2.5,
+                "owner_org_id": "MANUFACTURER_1",
+            }, wait_for_commit=False)
+            assert record["status"] == TX_STATUS_PENDING
+
+            assert _wait_for(lambda: tracker.get(record["tx_id"])["status"] == TX_STATUS_VALID)
+
+            def inventory_added():
+                db.session.expire_all()
+                return Inventory.query.filter_by(organization_id=organization_id, batch_id="BATCH-ASYNC-1").count() == 1
+
+            assert _wait_for(inventory_added)
+    finally:
+        event_listener.get_ledger_event_listener().stop()
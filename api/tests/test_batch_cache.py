@@ -0,0 +1,93 @@
+from src.fabric.event_listener import parse_block
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.fabric.write_scheduler import WriteScheduler
+from src.repositories.blockchain_repository import (
+    BlockchainRepository,
+    get_batch_cache,
+    invalidate_batches_on_ledger_event,
+)
+from src.utils.cache import LRUCache
+
+
+def _repository(ledger, batch_cache=None):
+    return BlockchainRepository(
+        FakeFabricClient(ledger),
+        batch_cache=batch_cache if batch_cache is not None else LRUCache("test-batch"),
+        history_cache=LRUCache("test-history"),
+        write_scheduler=WriteScheduler(max_retries=0),
+    )
+
+
+def _create(repository, batch_id):
+    repository.create_batch({
+        "batch_id": batch_id,
+        "product_name": "Test Drug",
+        "manufacture_date": "2025-01-01",
+        "expiry_date": "2027-01-01",
+        "total_quantity": 100,
+        "unit_dosage": "100mg",
+        "unit_price": 2.5,
+        "owner_org_id": "manufacturer-1",
+    })
+
+
+def _transfer(batch_id, quantity):
+    return [batch_id, "manufacturer-1", "distributor-1", str(quantity), "{}"]
+
+
+def test_writes_invalidate_the_cached_batch():
+    ledger = FakeLedger()
+    repository = _repository(ledger)
+    _create(repository, "BATCH-CACHE-1")
+    assert repository.get_batch("BATCH-CACHE-1")["ownerships"] == [{"orgId": "manufacturer-1", "quantity": 100}]
+
+    # A write from another process is not seen until something invalidates
+    FakeFabricClient(ledger).submit("transferBatch", _transfer("BATCH-CACHE-1", 10))
+    assert repository.get_batch("BATCH-CACHE-1")["ownerships"] == [{"orgId": "manufacturer-1", "quantity": 100}]
+
+    repository.transfer_batch({
+        "batch_id": "BATCH-CACHE-1", "from_org_id": "manufacturer-1", "to_org_id": "distributor-1", "quantity": 5,
+    })
+    assert repository.get_batch("BATCH-CACHE-1")["ownerships"] == [
+        {"orgId": "manufacturer-1", "quantity": 85},
+        {"orgId": "distributor-1", "quantity": 15},
+    ]
+
+
+def test_ledger_events_invalidate_batches_written_elsewhere():
+    ledger = FakeLedger()
+    repository = _repository(ledger, batch_cache=get_batch_cache())
+    _create(repository, "BATCH-CACHE-2")
+    _create(repository, "BATCH-CACHE-3")
+    repository.get_batch("BATCH-CACHE-2")
+    repository.get_batch("BATCH-CACHE-3")
+
+    FakeFabricClient(ledger).submit("transferBatch", _transfer("BATCH-CACHE-2", 10))
+    for event in parse_block(ledger.blocks[-1], ledger.chaincode_name):
+        invalidate_batches_on_ledger_event(event)
+
+    assert {"orgId": "distributor-1", "quantity": 10} in repository.get_batch("BATCH-CACHE-2")["ownerships"]
+    assert repository.batch_cache.get("BATCH-CACHE-3") is not None
+
+
+def test_read_racing_a_write_does_not_recache_stale_state():
+    ledger = FakeLedger()
+    repository = _repository(ledger)
+    _create(repository, "BATCH-CACHE-4")
+    transfer = {"batch_id": "BATCH-CACHE-4", "from_org_id": "manufacturer-1", "to_org_id": "distributor-1", "quantity": 5}
+
+    # The read takes its snapshot, then the transfer commits (and
+    # invalidates) before the read's result reaches the cache
+    evaluate = repository.client.evaluate
+
+    def evaluate_then_write(function, args):
+        result = evaluate(function, args)
+        repository.client.evaluate = evaluate
+        repository.transfer_batch(transfer)
+        return result
+
+    repository.client.evaluate = evaluate_then_write
+    stale = repository.get_batch("BATCH-CACHE-4")
+    assert {"orgId": "distributor-1", "quantity": 5} not in stale["ownerships"]
+
+    assert {"orgId": "distributor-1", "quantity": 5} in repository.get_batch("BATCH-CACHE-4")["ownerships"]
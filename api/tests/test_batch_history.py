@@ -0,0 +1,83 @@
+import uuid
+from types import SimpleNamespace
+
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.fabric.write_scheduler import WriteScheduler
+from src.repositories.blockchain_repository import BlockchainRepository
+from src.routes.blockchain_routes import blockchain_controller
+from src.services.blockchain_service import BlockchainService
+from src.utils.cache import LRUCache
+from src.utils.constants import UserRole
+
+
+class _RecordingClient(FakeFabricClient):
+    def __init__(self, ledger):
+        super().__init__(ledger)
+        self.queries = []
+
+    def evaluate(self, function, args):
+        self.queries.append((function, list(args)))
+        return super().evaluate(function, args)
+
+
+def _ledger_with_transfers(batch_id, transfers):
+    ledger = FakeLedger()
+    client = FakeFabricClient(ledger)
+    client.submit("createBatch", [batch_id, "Test Drug", "2025-01-01", "2027-01-01", "100", "100mg", "2.5", "manufacturer-1"])
+    for _ in range(transfers):
+        client.submit("transferBatch", [batch_id, "manufacturer-1", "distributor-1", "1", "{}"])
+    return ledger
+
+
+def test_cached_history_is_extended_with_the_delta_only():
+    ledger = _ledger_with_transfers("BATCH-HIST-1", 1)
+    client = _RecordingClient(ledger)
+    repository = BlockchainRepository(
+        client,
+        batch_cache=LRUCache("test-batch"),
+        history_cache=LRUCache("test-history", ttl=0),
+        write_scheduler=WriteScheduler(max_retries=0),
+    )
+
+    history = repository.get_batch_history("BATCH-HIST-1")
+    assert len(history) == 2
+    newest = history[0]["txId"]
+
+    FakeFabricClient(ledger).submit("transferBatch", ["BATCH-HIST-1", "manufacturer-1", "distributor-1", "1", "{}"])
+    refreshed = repository.get_batch_history("BATCH-HIST-1")
+    assert len(refreshed) == 3
+    assert refreshed[1:] == history
+    assert [e["txId"] for e in refreshed] == [e["txId"] for e in ledger.history["BATCH-HIST-1"]]
+
+    # Nothing new: the cache answers after an empty delta
+    assert repository.get_batch_history("BATCH-HIST-1") == refreshed
+    assert client.queries == [
+        ("getBatchHistory", ["BATCH-HIST-1"]),
+        ("getBatchHistorySince", ["BATCH-HIST-1", newest]),
+        ("getBatchHistorySince", ["BATCH-HIST-1", refreshed[0]["txId"]]),
+    ]
+
+
+def test_history_route_slices_at_the_since_cursor(client, monkeypatch):
+    ledger = _ledger_with_transfers("BATCH-HIST-2", 3)
+    service = BlockchainService(FakeFabricClient(ledger))
+    service.repository.history_cache = LRUCache("test-history", ttl=0)
+    service.auth_service.return_user_from_token = lambda: SimpleNamespace(
+        id=uuid.uuid4(), role=UserRole.DISTRIBUTOR.value, organization_id=None
+    )
+    monkeypatch.setattr(blockchain_controller, "fabric_client", service.fabric_client)
+    monkeypatch.setattr(blockchain_controller, "blockchain_service", service)
+
+    history = client.get("/blockchain/batches/BATCH-HIST-2/history").get_json()["data"]
+    assert len(history) == 4
+
+    response = client.get(f"/blockchain/batches/BATCH-HIST-2/history?since={history[2]['txId']}")
+    assert response.status_code == 200
+    assert response.get_json()["data"] == history[:2]
+
+    response = client.get(f"/blockchain/batches/BATCH-HIST-2/history?since={history[0]['txId']}")
+    assert response.get_json()["data"] == []
+
+    response = client.get("/blockchain/batches/BATCH-HIST-2/history?since=not-a-tx")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Unknown history cursor"
@@ -0,0 +1,44 @@
+import uuid
+from types import SimpleNamespace
+
+from flask import Flask
+
+from config.database import db
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.models.organization_model import Organization
+from src.services.blockchain_service import BlockchainService
+from src.utils.constants import UserRole
+
+
+def _organization(org_id, org_type):
+    return Organization(
+        org_id=org_id, name=org_id, org_type=org_type,
+        contact_email=f"{org_id.lower()}@example.com", contact_phone="0", status="active"
+    )
+
+
+def test_held_by_caller_matches_the_callers_business_org_id(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'verification.db'}"
+    db.init_app(app)
+
+    client = FakeFabricClient(FakeLedger())
+    client.submit("createBatch", ["BATCH-VER-1", "Test Drug", "2025-01-01", "2027-01-01", "100", "100mg", "2.5", "MANUFACTURER_1"])
+    client.submit("createBatch", ["BATCH-VER-2", "Test Drug", "2025-01-01", "2027-01-01", "100", "100mg", "2.5", "MANUFACTURER_2"])
+
+    with app.app_context():
+        db.create_all()
+        manufacturer = _organization("MANUFACTURER_1", "manufacturer")
+        db.session.add(manufacturer)
+        db.session.commit()
+
+        service = BlockchainService(client)
+        service.auth_service.return_user_from_token = lambda: SimpleNamespace(
+            id=uuid.uuid4(), role=UserRole.MANUFACTURER.value, organization_id=manufacturer.id
+        )
+
+        results = service.verify_batches(["BATCH-VER-1", "BATCH-VER-2", "BATCH-VER-1"])
+        assert [(r["batch_id"], r["authentic"], r["held_by_caller"]) for r in results] == [
+            ("BATCH-VER-1", True, True),
+            ("BATCH-VER-2", True, False),
+        ]
@@ -0,0 +1,150 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from werkzeug.exceptions import BadRequest
+
+from config.database import db
+from src.controllers.blockchain_controller import _parse_bulk_body
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.fabric.write_scheduler import WriteScheduler
+from src.models.outbox_model import OutboxEntry
+from src.repositories.blockchain_repository import BlockchainRepository
+from src.routes.blockchain_routes import blockchain_controller
+from src.services.blockchain_service import BlockchainService
+from src.utils.cache import LRUCache
+from src.utils.constants import UserRole
+
+
+def _batch(batch_id, **overrides):
+    return {
+        "batch_id": batch_id,
+        "product_name": "Test Drug",
+        "manufacture_date": "2025-01-01",
+        "expiry_date": "2027-01-01",
+        "total_quantity": 100,
+        "unit_dosage": "100mg",
+        "unit_price": 2.5,
+        "owner_org_id": "manufacturer-1",
+        **overrides,
+    }
+
+
+def _service(client, organization_id=None):
+    service = BlockchainService(client)
+    service.auth_service.return_user_from_token = lambda: SimpleNamespace(
+        id=uuid.uuid4(), role=UserRole.MANUFACTURER.value, organization_id=organization_id
+    )
+    return service
+
+
+def test_bulk_body_accepts_arrays_wrapped_arrays_and_ndjson():
+    items = [_batch("BATCH-BULK-1"), _batch("BATCH-BULK-2")]
+    assert _parse_bulk_body(json.dumps(items), "application/json") == items
+    assert _parse_bulk_body(json.dumps({"batches": items}), "application/json") == items
+    ndjson = "\n".join(json.dumps(item) for item in items) + "\n\n"
+    assert _parse_bulk_body(ndjson, "application/x-ndjson") == items
+
+    with pytest.raises(BadRequest):
+        _parse_bulk_body('{"batch_id": "BATCH-BULK-1"}\nnot json', "application/x-ndjson")
+
+
+def test_bulk_route_reports_a_result_per_item(client, monkeypatch):
+    ledger = FakeLedger()
+    FakeFabricClient(ledger).submit("createBatch", BlockchainRepository._create_batch_args(_batch("BATCH-BULK-3")))
+    service = _service(FakeFabricClient(ledger))
+    monkeypatch.setattr(blockchain_controller, "fabric_client", service.fabric_client)
+    monkeypatch.setattr(blockchain_controller, "blockchain_service", service)
+
+    items = [
+        _batch("BATCH-BULK-4"),
+        _batch("BATCH-BULK-5", total_quantity=0),
+        _batch("BATCH-BULK-4"),
+        _batch("BATCH-BULK-3"),
+        _batch("BATCH-BULK-6"),
+    ]
+    response = client.post(
+        "/blockchain/batches/bulk",
+        data="\n".join(json.dumps(item) for item in items),
+        content_type="application/x-ndjson",
+    )
+
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body["message"] == "2 of 5 batches created"
+    results = body["data"]
+    assert [(r["index"], r["batch_id"], r["success"]) for r in results] == [
+        (0, "BATCH-BULK-4", True),
+        (1, "BATCH-BULK-5", False),
+        (2, "BATCH-BULK-4", False),
+        (3, "BATCH-BULK-3", False),
+        (4, "BATCH-BULK-6", True),
+    ]
+    assert "total_quantity" in results[1]["error"]
+    assert results[2]["error"] == "Duplicate batch_id in request"
+    assert "already exists" in results[3]["error"]
+    assert ledger.counters["endorsed"] == 3
+
+    response = client.post(
+        "/blockchain/batches/bulk", json={"batches": [_batch("BATCH-BULK-7")]}
+    )
+    assert response.status_code == 201
+    assert response.get_json()["success"] is True
+
+
+def test_a_failed_submit_does_not_orphan_batches_in_flight():
+    ledger = FakeLedger(commit_latency=0.01)
+    client = FakeFabricClient(ledger)
+    submit_async = client.submit_async
+
+    def flaky_submit_async(function, args):
+        if args[0] == "BATCH-BULK-9":
+            raise ConnectionError("peer unavailable")
+        return submit_async(function, args)
+
+    client.submit_async = flaky_submit_async
+    repository = BlockchainRepository(
+        client,
+        batch_cache=LRUCache("test-batch"),
+        history_cache=LRUCache("test-history"),
+        write_scheduler=WriteScheduler(max_retries=0),
+    )
+
+    outcomes = repository.create_batches([_batch(f"BATCH-BULK-{n}") for n in (8, 9, 10)])
+    assert [success for success, _ in outcomes] == [True, False, True]
+    assert outcomes[1][1] == "peer unavailable"
+    assert {"BATCH-BULK-8", "BATCH-BULK-10"} <= set(ledger.state)
+
+
+def test_bulk_creation_records_outbox_intents_when_enabled(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'outbox.db'}"
+    db.init_app(app)
+    ledger = FakeLedger()
+
+    with app.app_context():
+        db.create_all()
+        organization_id = uuid.uuid4()
+        service = _service(FakeFabricClient(ledger), organization_id)
+        service.outbox_enabled = True
+        service.create_batch(_batch("BATCH-BULK-11"))
+
+        outcomes = service.create_batches([
+            _batch("BATCH-BULK-11"),
+            _batch("BATCH-BULK-11", total_quantity=5),
+            _batch("BATCH-BULK-12"),
+        ])
+
+        assert [success for success, _ in outcomes] == [True, False, True]
+        assert "already submitted with different data" in outcomes[1][1]
+        assert outcomes[2][1]["status"] == "pending"
+        entries = OutboxEntry.query.order_by(OutboxEntry.aggregate_id).all()
+        assert [(e.aggregate_id, e.payload["organization_id"]) for e in entries] == [
+            ("BATCH-BULK-11", str(organization_id)),
+            ("BATCH-BULK-12", str(organization_id)),
+        ]
+
+    # Nothing reaches the ledger from the request thread
+    assert ledger.height == 1
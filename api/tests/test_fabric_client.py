@@ -0,0 +1,158 @@
+import asyncio
+import sys
+import time
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.fabric.fabric_client import FabricClient
+from src.fabric.peer_selector import PeerSelector
+
+PROFILE = Path(__file__).resolve().parents[1] / "network" / "connection-org1.yaml"
+
+
+class _Channel:
+    def __init__(self):
+        self.proposals = []
+
+    def send_tx_proposal(self, tx_context, peers):
+        self.proposals.append((tx_context, peers))
+
+        async def endorse():
+            return SimpleNamespace(response=SimpleNamespace(status=200, message="", payload=b'{"batchId": "BATCH-SDK-1"}'))
+
+        return [endorse() for _ in peers], "proposal", "header"
+
+
+class _Sdk:
+    """
+    Stands in for hfc.fabric.Client: users come from the profile's
+    organizations, while the wallet identity lands in ``_users`` as a
+    plain dict.
+    """
+
+    profile_users = {}
+    query_latency = {}
+
+    def __init__(self, net_profile):
+        self._users = {}
+        self.orderers = {"orderer.example.com": object()}
+        self.state_store = object()
+        self.channel = _Channel()
+
+    def get_channel(self, name):
+        return self.channel
+
+    def get_user(self, org_name, name):
+        return self.profile_users.get((org_name, name))
+
+    def get_peer(self, name):
+        return name
+
+    async def chaincode_query(self, requestor, channel_name, peers, chaincode_name, fcn, args):
+        await asyncio.sleep(self.query_latency[peers[0]])
+        return f'{{"peer": "{peers[0]}"}}'
+
+
+@pytest.fixture
+def sdk_modules(monkeypatch):
+    contexts = []
+    created = []
+
+    def module(name, **attributes):
+        stub = types.ModuleType(name)
+        stub.__dict__.update(attributes)
+        monkeypatch.setitem(sys.modules, name, stub)
+
+    async def send_transaction(orderers, request, context):
+        yield SimpleNamespace(status=200, info="")
+
+    def create_tx_context(requestor, crypto, request):
+        contexts.append((requestor, crypto))
+        return SimpleNamespace(tx_id=f"tx-{len(contexts)}")
+
+    def create_user(**kwargs):
+        created.append(kwargs)
+        return SimpleNamespace(name=kwargs["name"], cryptoSuite="wallet-crypto")
+
+    for name in ("hfc", "hfc.fabric.transaction", "hfc.util"):
+        module(name)
+    module("hfc.fabric", Client=_Sdk)
+    module("hfc.fabric.transaction.tx_context", create_tx_context=create_tx_context)
+    module(
+        "hfc.fabric.transaction.tx_proposal_request",
+        CC_INVOKE="invoke", CC_TYPE_NODE="node", TXProposalRequest=dict, create_tx_prop_req=lambda **kwargs: kwargs,
+    )
+    module("hfc.util.utils", build_tx_req=lambda responses: responses, send_transaction=send_transaction)
+    module("hfc.fabric.user", create_user=create_user)
+    return SimpleNamespace(contexts=contexts, created=created)
+
+
+def _client(profile_users, **options):
+    _Sdk.profile_users = profile_users
+    return FabricClient(
+        ccp_path=str(PROFILE),
+        wallet_path="/wallet",
+        user_id="Admin",
+        msp_id="Org1MSP",
+        channel_name="mychannel",
+        chaincode_name="medicinecc",
+        contract_name="MedicineContract",
+        identity={"cert": "cert", "private_key": "key", "mspid": "Org1MSP"},
+        **options,
+    )
+
+
+def test_broadcast_signs_as_the_profile_user(sdk_modules):
+    user = SimpleNamespace(name="Admin", cryptoSuite="profile-crypto")
+    client = _client({("Org1", "Admin"): user})
+
+    assert client.broadcast("createBatch", ["BATCH-SDK-1"]) == {"tx_id": "tx-1", "result": {"batchId": "BATCH-SDK-1"}}
+    assert sdk_modules.contexts == [(user, "profile-crypto"), (user, "profile-crypto")]
+    assert sdk_modules.created == []
+
+
+def test_broadcast_falls_back_to_the_wallet_identity(sdk_modules):
+    client = _client({})
+
+    client.broadcast("createBatch", ["BATCH-SDK-1"])
+    client.broadcast("createBatch", ["BATCH-SDK-2"])
+
+    assert sdk_modules.created == [{
+        "name": "Admin",
+        "org": "Org1",
+        "state_store": client.client.state_store,
+        "msp_id": "Org1MSP",
+        "key_path": "/wallet/Admin.key",
+        "cert_path": "/wallet/Admin.crt",
+    }]
+    assert {crypto for _, crypto in sdk_modules.contexts} == {"wallet-crypto"}
+
+
+def test_a_slow_query_is_hedged_to_a_second_peer(sdk_modules):
+    selector = PeerSelector(["peer0", "peer1"], hedge_min_delay=0.02, min_samples=1)
+    selector.end("peer1", selector.begin("peer1"))
+    # peer0 now looks idle and untested, so it is picked first
+    selector._stats["peer1"].latency_ewma = 1.0
+    _Sdk.query_latency = {"peer0": 1.0, "peer1": 0.0}
+    client = _client({("Org1", "Admin"): SimpleNamespace(cryptoSuite="crypto")}, query_selector=selector)
+
+    started = time.monotonic()
+    assert client.evaluate("getBatch", ["BATCH-SDK-1"]) == {"peer": "peer1"}
+    assert time.monotonic() - started < 0.5
+
+    stats = selector.stats()["peers"]
+    assert (stats["peer0"]["requests"], stats["peer0"]["outstanding"], stats["peer0"]["errors"]) == (1, 0, 0)
+    assert (stats["peer1"]["hedged"], stats["peer1"]["outstanding"]) == (1, 0)
+
+
+def test_a_fast_query_is_not_hedged(sdk_modules):
+    selector = PeerSelector(["peer0", "peer1"], hedge_min_delay=0.2, min_samples=1)
+    selector.end("peer1", selector.begin("peer1"))
+    _Sdk.query_latency = {"peer0": 0.0, "peer1": 0.0}
+    client = _client({("Org1", "Admin"): SimpleNamespace(cryptoSuite="crypto")}, query_selector=selector)
+
+    client.evaluate("getBatch", ["BATCH-SDK-1"])
+    assert sum(peer["hedged"] for peer in selector.stats()["peers"].values()) == 0
@@ -0,0 +1,44 @@
+import pytest
+
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+
+
+def _create_args(batch_id, quantity="100"):
+    return [batch_id, "Test Drug", "2025-01-01", "2027-01-01", quantity, "100mg", "2.5", "manufacturer-1"]
+
+
+def test_fake_client_enforces_chaincode_rules():
+    client = FakeFabricClient(FakeLedger())
+
+    batch = client.submit("createBatch", _create_args("BATCH-FAKE-1"))
+    assert batch["status"] == "CREATED"
+
+    with pytest.raises(RuntimeError, match="already exists"):
+        client.submit("createBatch", _create_args("BATCH-FAKE-1"))
+
+    batch = client.submit("transferBatch", ["BATCH-FAKE-1", "manufacturer-1", "distributor-1", "40", "{}"])
+    assert batch["ownerships"] == [
+        {"orgId": "manufacturer-1", "quantity": 60},
+        {"orgId": "distributor-1", "quantity": 40},
+    ]
+
+    with pytest.raises(RuntimeError, match="Insufficient quantity"):
+        client.submit("transferBatch", ["BATCH-FAKE-1", "distributor-1", "pharmacy-1", "41", "{}"])
+
+    assert len(client.evaluate("getBatchHistory", ["BATCH-FAKE-1"])) == 2
+
+
+def test_fake_client_invalidates_concurrent_writes_to_the_same_batch():
+    ledger = FakeLedger(commit_latency=0.01)
+    client = FakeFabricClient(ledger)
+    client.submit("createBatch", _create_args("BATCH-FAKE-2"))
+
+    futures = [
+        client.submit_async("transferBatch", ["BATCH-FAKE-2", "manufacturer-1", "distributor-1", "1", "{}"])
+        for _ in range(5)
+    ]
+    errors = [f.exception() for f in futures]
+
+    assert sum(e is None for e in errors) == 1
+    assert all("MVCC_READ_CONFLICT" in str(e) for e in errors if e is not None)
+    assert ledger.counters["mvcc_conflicts"] == 4
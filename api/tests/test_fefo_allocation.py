@@ -0,0 +1,139 @@
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from werkzeug.exceptions import Forbidden
+
+from config.database import db
+from src.models.inventory_model import Inventory
+from src.models.medication_request_model import MedicationRequest
+from src.services.medication_request_service import MedicationRequestService
+from src.utils.constants import UserRole
+
+ORGANIZATION_ID = uuid.uuid4()
+TODAY = date.today()
+
+
+@pytest.fixture
+def database(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'fefo.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            # Expires too soon to be allocated
+            _inventory('B-SOON', 100, 5),
+            _inventory('B-LATE', 100, 400),
+            _inventory('B-FIRST', 30, 60),
+            _inventory('B-SECOND', 50, 90),
+            # Another organization's stock is never drawn from
+            _inventory('B-OTHER', 100, 40, organization_id=uuid.uuid4()),
+        ])
+        db.session.commit()
+    return app
+
+
+def _inventory(batch_id, available, expires_in_days, organization_id=ORGANIZATION_ID):
+    return Inventory(
+        organization_id=organization_id, batch_id=batch_id, product_name='Amoxicillin 500mg',
+        available_quantity=available, reserved_quantity=0, unit_dosage='500mg',
+        manufacture_date=TODAY - timedelta(days=365), expiry_date=TODAY + timedelta(days=expires_in_days),
+        unit_price=1, status='available'
+    )
+
+
+def _requests(*quantities):
+    requests = [
+        MedicationRequest(
+            request_number=f'REQ-{index}', consumer_id=uuid.uuid4(), product_name='Amoxicillin 500mg',
+            requested_quantity=quantity, unit_dosage='500mg', prescription_required=False, status='pending',
+            created_at=datetime(2026, 1, 1) + timedelta(seconds=index)
+        )
+        for index, quantity in enumerate(quantities)
+    ]
+    db.session.add_all(requests)
+    db.session.commit()
+    return [request.id for request in requests]
+
+
+def _service(role=UserRole.ADMIN.value, organization_id=None):
+    service = MedicationRequestService()
+    service.auth_service.return_user_from_token = lambda: SimpleNamespace(
+        id=uuid.uuid4(), role=role, organization_id=organization_id
+    )
+    return service
+
+
+def _available():
+    return {item.batch_id: (item.available_quantity, item.reserved_quantity) for item in Inventory.query.all()}
+
+
+def test_approval_without_batch_splits_soonest_expiring_first(database):
+    with database.app_context():
+        (request_id,) = _requests(45)
+        service = _service()
+
+        approved = service.approve_request(request_id, {'assigned_manufacturer_id': ORGANIZATION_ID})
+        assert approved.status == 'approved'
+        assert approved.batch_id == 'B-FIRST'
+        assert [(line.batch_id, line.quantity) for line in approved.allocations] == [('B-FIRST', 30), ('B-SECOND', 15)]
+        assert _available() == {
+            'B-SOON': (100, 0), 'B-LATE': (100, 0), 'B-FIRST': (0, 30), 'B-SECOND': (35, 15), 'B-OTHER': (100, 0),
+        }
+
+        # Cancelling returns every line to its batch
+        service.cancel_request(request_id)
+        assert _available()['B-FIRST'] == (30, 0)
+        assert _available()['B-SECOND'] == (50, 0)
+
+
+def test_manufacturer_cannot_approve_from_another_organizations_stock(database):
+    with database.app_context():
+        (request_id,) = _requests(10)
+        service = _service(UserRole.MANUFACTURER.value, organization_id=uuid.uuid4())
+
+        with pytest.raises(Forbidden):
+            service.approve_request(request_id, {'assigned_manufacturer_id': ORGANIZATION_ID})
+        assert db.session.get(MedicationRequest, request_id).status == 'pending'
+        assert _available()['B-FIRST'] == (30, 0)
+
+        own = _service(UserRole.MANUFACTURER.value, organization_id=ORGANIZATION_ID)
+        assert own.approve_request(request_id, {'assigned_manufacturer_id': ORGANIZATION_ID}).status == 'approved'
+
+
+def test_hand_picked_batch_must_be_held_by_the_assigned_manufacturer(database):
+    with database.app_context():
+        (request_id,) = _requests(10)
+        service = _service(UserRole.MANUFACTURER.value, organization_id=ORGANIZATION_ID)
+
+        with pytest.raises(Forbidden):
+            service.approve_request(request_id, {'assigned_manufacturer_id': ORGANIZATION_ID, 'batch_id': 'B-OTHER'})
+        assert db.session.get(MedicationRequest, request_id).status == 'pending'
+        assert _available()['B-OTHER'] == (100, 0)
+
+        approved = service.approve_request(request_id, {'assigned_manufacturer_id': ORGANIZATION_ID, 'batch_id': 'B-LATE'})
+        assert (approved.status, approved.batch_id) == ('approved', 'B-LATE')
+        assert _available()['B-LATE'] == (90, 10)
+
+
+def test_batch_allocation_is_first_in_first_served(database):
+    with database.app_context():
+        # Eligible stock is 30 + 50 + 100 = 180: the 150 unit request only
+        # fits after the first one, and the last one no longer does
+        ids = _requests(20, 150, 400, 5, 6)
+
+        result = _service().allocate_pending_requests({'assigned_manufacturer_id': ORGANIZATION_ID})
+        assert (result['allocated'], result['skipped']) == (3, 2)
+
+        statuses = {request.id: request.status for request in MedicationRequest.query.all()}
+        assert [statuses[request_id] for request_id in ids] == ['approved', 'approved', 'pending', 'approved', 'pending']
+        assert _available() == {
+            'B-SOON': (100, 0), 'B-LATE': (5, 95), 'B-FIRST': (0, 30), 'B-SECOND': (0, 50), 'B-OTHER': (100, 0),
+        }
+        large = db.session.get(MedicationRequest, ids[1])
+        assert [(line.batch_id, line.quantity) for line in large.allocations] == [
+            ('B-FIRST', 10), ('B-SECOND', 50), ('B-LATE', 90),
+        ]
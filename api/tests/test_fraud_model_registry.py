@@ -0,0 +1,53 @@
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from src.analytics.fraud import FRAUD_FEATURES, transfer_features, transfer_frame
+from src.analytics.model_registry import ModelRegistry
+
+
+def _transfers(quantities):
+    return [
+        {
+            "batch_id": f"BATCH-FRAUD-{index}",
+            "quantity": quantity,
+            "total_quantity": 1000,
+            "transferred_at": "2025-03-02T12:00:00Z",
+            "previous_step_at": "2025-03-01T12:00:00Z",
+        }
+        for index, quantity in enumerate(quantities)
+    ]
+
+
+def _model(seed):
+    rng = np.random.default_rng(seed)
+    features = transfer_features(transfer_frame(_transfers(rng.integers(15, 25, size=500).tolist())))
+    return IsolationForest(n_estimators=20, contamination=0.01, random_state=seed).fit(features)
+
+
+def test_features_are_extracted_for_the_whole_batch():
+    records = _transfers([20, 500]) + [{"batch_id": "BATCH-FRAUD-X", "quantity": None}]
+    features = transfer_features(transfer_frame(records))
+
+    assert features.shape == (3, len(FRAUD_FEATURES))
+    np.testing.assert_allclose(features[1], [np.log1p(500), 0.5, np.log1p(24)])
+    assert np.isnan(features[2, 0])
+
+
+def test_published_versions_are_memory_mapped_and_hot_reloaded(tmp_path):
+    registry = ModelRegistry(str(tmp_path), reload_interval=0)
+    assert registry.current() is None
+
+    first = _model(1)
+    registry.publish(first, FRAUD_FEATURES, threshold=-first.offset_, version="v1")
+    model = registry.current()
+    assert model.version == "v1"
+    assert isinstance(model.estimator.estimators_features_[0], np.memmap)
+
+    scores = model.score(transfer_features(transfer_frame(_transfers([20, 500]))))
+    assert scores[0] < model.threshold <= scores[1]
+
+    second = _model(2)
+    registry.publish(second, FRAUD_FEATURES, threshold=-second.offset_, version="v2")
+    assert registry.current().version == "v2"
+    # A model already handed out keeps working after the swap
+    assert model.score(transfer_features(transfer_frame(_transfers([20])))).shape == (1,)
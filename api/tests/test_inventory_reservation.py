@@ -0,0 +1,95 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from config.database import db
+from src.models.inventory_model import Inventory
+from src.models.medication_request_model import MedicationRequest
+from src.repositories.inventory_repository import InventoryRepository
+from src.services.medication_request_service import MedicationRequestService
+from src.utils.constants import UserRole
+
+
+@pytest.fixture
+def database(tmp_path):
+    # A file database: threads need to share it, unlike sqlite:// in memory
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'reservations.db'}"
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 60}}
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _inventory(organization_id, batch_id, available):
+    return Inventory(
+        organization_id=organization_id, batch_id=batch_id, product_name='Amoxicillin 500mg',
+        available_quantity=available, reserved_quantity=0, unit_dosage='500mg',
+        manufacture_date=date(2026, 1, 1), expiry_date=date(2027, 1, 1), unit_price=1, status='available'
+    )
+
+
+def test_parallel_approvals_never_oversell(database):
+    stock, approvals = 100, 300
+    organization_id = uuid.uuid4()
+    admin = SimpleNamespace(id=uuid.uuid4(), role=UserRole.ADMIN.value, organization_id=None)
+
+    with database.app_context():
+        db.session.add(_inventory(organization_id, 'BATCH-1', stock))
+        requests = [
+            MedicationRequest(
+                request_number=f'REQ-{index}', consumer_id=uuid.uuid4(), product_name='Amoxicillin 500mg',
+                requested_quantity=1, unit_dosage='500mg', prescription_required=False, status='pending'
+            )
+            for index in range(approvals)
+        ]
+        db.session.add_all(requests)
+        db.session.commit()
+        request_ids = [request.id for request in requests]
+
+    def approve(request_id):
+        with database.app_context():
+            service = MedicationRequestService()
+            service.auth_service.return_user_from_token = lambda: admin
+            try:
+                service.approve_request(request_id, {'batch_id': 'BATCH-1', 'assigned_manufacturer_id': organization_id})
+                return 'approved'
+            except Exception as e:
+                return str(e)
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        outcomes = list(pool.map(approve, request_ids))
+
+    assert outcomes.count('approved') == stock
+    assert set(outcomes) == {'approved', '400 Bad Request: Insufficient quantity in inventory'}
+    with database.app_context():
+        inventory = Inventory.query.filter_by(batch_id='BATCH-1').one()
+        assert (inventory.available_quantity, inventory.reserved_quantity) == (0, stock)
+        assert inventory.status == 'out_of_stock'
+        assert MedicationRequest.query.filter_by(status='approved').count() == stock
+
+
+def test_multi_line_reservation_is_all_or_nothing(database):
+    organization_id = uuid.uuid4()
+    with database.app_context():
+        db.session.add_all([_inventory(organization_id, 'BATCH-1', 50), _inventory(organization_id, 'BATCH-2', 20)])
+        db.session.commit()
+        repository = InventoryRepository()
+
+        reserved, failed = repository.reserve(organization_id, {'BATCH-1': 45, 'BATCH-2': 21})
+        assert (reserved, failed) == ([], ['BATCH-2'])
+        assert Inventory.query.filter_by(batch_id='BATCH-1').one().available_quantity == 50
+
+        reserved, failed = repository.reserve(organization_id, {'BATCH-1': 45, 'BATCH-2': 20})
+        assert failed == []
+        assert sorted((item.batch_id, item.available_quantity, item.reserved_quantity, item.status) for item in reserved) == [
+            ('BATCH-1', 5, 45, 'low_stock'),
+            ('BATCH-2', 0, 20, 'out_of_stock'),
+        ]
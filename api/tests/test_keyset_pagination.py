@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from config.database import db
+from src.models.notification_model import Notification
+from src.repositories.notification_repository import NotificationRepository
+from src.utils.pagination import encode_cursor
+
+ROWS = 1_000_000
+USER_ID = uuid.UUID('f0000000-0000-4000-8000-000000000001')
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path_factory.mktemp('pagination') / 'notifications.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        # Generated in SQL: a million ORM inserts would dominate the run.
+        # Values are written the way SQLAlchemy stores them on SQLite; ids
+        # start with a letter so the column's numeric affinity leaves them be.
+        db.session.execute(text("""
+            WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < :rows - 1)
+            INSERT INTO notification (id, user_id, title, message, notification_type, is_read, created_at)
+            SELECT printf('f%031x', i), :user_id, 'Title', 'Message', 'request_created', i % 2,
+                   datetime('2026-01-01', '+' || (i / 3) || ' seconds') || '.000000'
+            FROM n
+        """), {'rows': ROWS, 'user_id': USER_ID.hex})
+        db.session.commit()
+    return app
+
+
+def _vm_steps(query):
+    """Runs ``query`` and counts the SQLite virtual machine steps it took, a deterministic measure of its cost."""
+    connection = db.session.connection().connection.driver_connection
+    steps = [0]
+
+    def count():
+        steps[0] += 1
+
+    connection.set_progress_handler(count, 100)
+    try:
+        result = query()
+    finally:
+        connection.set_progress_handler(None, 0)
+    return result, steps[0]
+
+
+def _cursor_at(offset):
+    created_at, notification_id = db.session.query(Notification.created_at, Notification.id).order_by(
+        Notification.created_at.desc(), Notification.id.desc()
+    ).offset(offset).limit(1).one()
+    return encode_cursor([created_at, notification_id])
+
+
+@pytest.mark.parametrize("unread_only", [False, True])
+def test_deep_page_costs_the_same_as_page_one(database, unread_only):
+    repository = NotificationRepository()
+    with database.app_context():
+        (first, _), first_steps = _vm_steps(lambda: repository.find_by_user(USER_ID, unread_only, None, 50))
+        deep_cursor = _cursor_at(ROWS - 200)
+        (deep, _), deep_steps = _vm_steps(lambda: repository.find_by_user(USER_ID, unread_only, deep_cursor, 50))
+
+        assert len(first) == len(deep) == 50
+        # An OFFSET of this depth would walk ~a million index entries
+        assert deep_steps <= 2 * first_steps + 50
+
+
+def test_pages_cover_every_row_once(database):
+    repository = NotificationRepository()
+    with database.app_context():
+        cursor, seen = _cursor_at(ROWS - 1001), []
+        while True:
+            page, cursor = repository.find_by_user(USER_ID, False, cursor, 300)
+            seen.extend(notification.id for notification in page)
+            if cursor is None:
+                break
+        # Timestamps repeat (three rows per second), so this also checks the id tie-break
+        assert len(seen) == len(set(seen)) == 1000
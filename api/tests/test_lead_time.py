@@ -0,0 +1,47 @@
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.lead_time import daily_rollup, request_lead_times, summarize
+
+
+def test_rollups_merge_into_accurate_quantiles_and_trend():
+    rng = np.random.default_rng(3)
+    days = pd.date_range("2026-03-01", periods=20).date
+    frames = []
+    for index, day in enumerate(days):
+        # One route gets slower every day, the other stays put
+        for org_id, base in (("distributor-1", 10 + index), ("distributor-2", 10)):
+            hours = rng.lognormal(np.log(base), 0.3, 500)
+            frames.append(pd.DataFrame({
+                "source": "transfer", "scope": "org", "org_id": org_id, "counterparty_org_id": "",
+                "day": day, "hours": hours,
+            }))
+    lead_times = pd.concat(frames, ignore_index=True)
+
+    summary = summarize(daily_rollup(lead_times)).set_index("org_id")
+
+    for org_id, group in lead_times.groupby("org_id"):
+        row = summary.loc[org_id]
+        assert row["count"] == len(group)
+        assert abs(row["median_hours"] / group["hours"].median() - 1) < 0.07
+        assert abs(row["p95_hours"] / group["hours"].quantile(0.95) - 1) < 0.07
+    assert 0.8 < summary.loc["distributor-1", "trend_hours_per_day"] < 1.3
+    assert abs(summary.loc["distributor-2", "trend_hours_per_day"]) < 0.1
+
+
+def test_request_lead_times_run_from_approval_to_delivery():
+    manufacturer = uuid.uuid4()
+    approved = datetime(2026, 3, 1, 8)
+    rows = [
+        (manufacturer, approved, approved + timedelta(hours=30)),
+        (manufacturer, approved, approved + timedelta(hours=50)),
+    ]
+
+    lead_times = request_lead_times(rows, ["assigned_manufacturer_id", "approved_at", "delivered_at"])
+
+    assert list(lead_times["hours"]) == [30.0, 50.0]
+    assert set(lead_times["org_id"]) == {str(manufacturer)}
+    assert [str(day) for day in lead_times["day"]] == ["2026-03-02", "2026-03-03"]
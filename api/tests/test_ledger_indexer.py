@@ -0,0 +1,48 @@
+import threading
+import time
+
+from flask import Flask
+
+from config.database import db
+from src.fabric.event_listener import TX_VALIDATION_VALID, LedgerEvent
+from src.models.batch_mirror_model import LedgerBatch, LedgerDeadLetter
+from src.services.ledger_indexer_service import LedgerIndexer
+
+
+def _event(block_number, tx_id, batch_id, total_quantity):
+    batch = {
+        'batchId': batch_id, 'productName': 'Test Drug', 'totalQuantity': total_quantity,
+        'unitDosage': '100mg', 'status': 'CREATED', 'ownerships': [{'orgId': 'MANUFACTURER_1', 'quantity': 10}],
+    }
+    return LedgerEvent(block_number, tx_id, TX_VALIDATION_VALID, 'createBatch', [batch_id], [batch_id], values={batch_id: batch})
+
+
+def test_poison_event_is_parked_and_indexing_moves_on(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'indexer.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+
+    indexer = LedgerIndexer(app, retry_delay=0, max_attempts=2)
+    worker = threading.Thread(target=indexer._run, daemon=True)
+    worker.start()
+    try:
+        # The middle event can never be applied: its quantity is not a number
+        for event in [_event(3, 'tx-1', 'BATCH-IDX-1', 10), _event(4, 'tx-2', 'BATCH-IDX-2', 'ten'),
+                      _event(5, 'tx-3', 'BATCH-IDX-3', 10)]:
+            indexer._queue.put(event)
+
+        deadline = time.monotonic() + 10
+        with app.app_context():
+            while time.monotonic() < deadline and indexer.repository.get_checkpoint() != 4:
+                db.session.remove()
+                time.sleep(0.05)
+
+            assert indexer.repository.get_checkpoint() == 4
+            assert sorted(batch.batch_id for batch in LedgerBatch.query.all()) == ['BATCH-IDX-1', 'BATCH-IDX-3']
+            (parked,) = LedgerDeadLetter.query.all()
+            assert (parked.consumer, parked.tx_id, parked.block_number) == ('ledger_indexer', 'tx-2', 4)
+    finally:
+        indexer._stopped.set()
+        worker.join()
@@ -0,0 +1,146 @@
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+
+import config.fabric_config as fabric_config
+import outbox_replay
+from config.database import db
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.models.inventory_model import Inventory
+from src.models.outbox_model import OutboxEntry
+from src.repositories.blockchain_repository import BlockchainRepository
+from src.repositories.outbox_repository import OutboxRepository
+from src.services.outbox_dispatcher_service import OutboxDispatcher
+
+ORGANIZATION_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'outbox.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _payload(batch_id, **overrides):
+    return {
+        "batch_id": batch_id,
+        "product_name": "Test Drug",
+        "manufacture_date": "2025-01-01",
+        "expiry_date": "2027-01-01",
+        "total_quantity": 100,
+        "unit_dosage": "100mg",
+        "unit_price": 2.5,
+        "owner_org_id": "MANUFACTURER_1",
+        "organization_id": str(ORGANIZATION_ID),
+        **overrides,
+    }
+
+
+def _enqueue(*payloads):
+    return [OutboxRepository().enqueue("createBatch", p["batch_id"], p)[0].id for p in payloads]
+
+
+def _entry(entry_id):
+    db.session.expire_all()
+    return db.session.get(OutboxEntry, entry_id)
+
+
+def test_claims_are_disjoint_until_the_lease_expires(app):
+    _enqueue(*[_payload(f"BATCH-OUTBOX-{n}") for n in range(3)])
+    repository = OutboxRepository()
+
+    first = {e.id for e in repository.claim(2, lease_seconds=60)}
+    second = {e.id for e in repository.claim(2, lease_seconds=60)}
+    assert (len(first), len(second)) == (2, 1)
+    assert not first & second
+    assert repository.claim(2, lease_seconds=60) == []
+
+    # A worker that died holding its lease does not block the entries forever
+    time.sleep(0.01)
+    assert len(repository.claim(10, lease_seconds=0.001)) == 3
+
+
+def test_dispatch_commits_to_the_ledger_and_adds_inventory_once(app):
+    ledger = FakeLedger()
+    # An earlier attempt committed BATCH-OUTBOX-4 but died before recording it
+    FakeFabricClient(ledger).submit("createBatch", BlockchainRepository._create_batch_args(_payload("BATCH-OUTBOX-4")))
+    ids = _enqueue(_payload("BATCH-OUTBOX-3"), _payload("BATCH-OUTBOX-4"))
+    dispatcher = OutboxDispatcher(app, FakeFabricClient(ledger))
+
+    assert dispatcher.dispatch_once() == 2
+    assert [_entry(i).status for i in ids] == ["done", "done"]
+    assert _entry(ids[0]).result["batchId"] == "BATCH-OUTBOX-3"
+    assert Inventory.query.filter_by(organization_id=ORGANIZATION_ID).count() == 2
+
+    # Replaying a completed entry inserts nothing twice
+    OutboxEntry.query.filter(OutboxEntry.id == ids[1]).update({"status": "ledger_committed"})
+    db.session.commit()
+    assert dispatcher.dispatch_once() == 1
+    assert Inventory.query.filter_by(organization_id=ORGANIZATION_ID).count() == 2
+
+
+def test_transient_failures_back_off_until_attempts_run_out(app):
+    client = FakeFabricClient(FakeLedger())
+
+    def unavailable(function, args):
+        raise ConnectionError("failed to connect to all addresses")
+
+    client.submit_async = unavailable
+    [entry_id] = _enqueue(_payload("BATCH-OUTBOX-5"))
+    dispatcher = OutboxDispatcher(app, client, max_attempts=2)
+
+    assert dispatcher.dispatch_once() == 1
+    entry = _entry(entry_id)
+    assert (entry.status, entry.attempts) == ("pending", 1)
+    assert entry.last_error == "failed to connect to all addresses"
+    assert entry.next_attempt_at > _utcnow() + timedelta(seconds=0.5)
+    # Not due yet
+    assert dispatcher.dispatch_once() == 0
+
+    OutboxEntry.query.update({"next_attempt_at": _utcnow()})
+    db.session.commit()
+    assert dispatcher.dispatch_once() == 1
+    assert (_entry(entry_id).status, _entry(entry_id).attempts) == ("failed", 2)
+
+
+def test_chaincode_rejections_fail_at_once(app):
+    ledger = FakeLedger()
+    FakeFabricClient(ledger).submit(
+        "createBatch", BlockchainRepository._create_batch_args(_payload("BATCH-OUTBOX-6", product_name="Other Drug"))
+    )
+    ids = _enqueue(_payload("BATCH-OUTBOX-6"), _payload("BATCH-OUTBOX-7", total_quantity=0))
+    dispatcher = OutboxDispatcher(app, FakeFabricClient(ledger), max_attempts=10)
+
+    assert dispatcher.dispatch_once() == 2
+    entries = [_entry(i) for i in ids]
+    assert [(e.status, e.attempts) for e in entries] == [("failed", 1), ("failed", 1)]
+    assert "already exists on the ledger with different contents" in entries[0].last_error
+    assert "totalQuantity must be a positive integer" in entries[1].last_error
+    assert Inventory.query.count() == 0
+
+
+def test_replay_drains_the_backlog_and_requeues_failed_entries(app, monkeypatch):
+    ledger = FakeLedger()
+    ids = _enqueue(_payload("BATCH-OUTBOX-8"), _payload("BATCH-OUTBOX-9"))
+    OutboxEntry.query.filter(OutboxEntry.id == ids[1]).update({"status": "failed", "attempts": 10})
+    db.session.commit()
+
+    monkeypatch.setattr(outbox_replay, "create_app", lambda: app)
+    monkeypatch.setattr(fabric_config, "get_fabric_client", lambda: FakeFabricClient(ledger))
+    monkeypatch.setattr(sys, "argv", ["outbox_replay.py", "--workers", "2", "--requeue-failed"])
+
+    assert outbox_replay.main() == 0
+    assert [_entry(i).status for i in ids] == ["done", "done"]
+    assert {"BATCH-OUTBOX-8", "BATCH-OUTBOX-9"} <= set(ledger.state)
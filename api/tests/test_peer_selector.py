@@ -0,0 +1,39 @@
+import time
+
+from src.fabric.peer_selector import PeerSelector
+
+
+def test_pick_prefers_the_fewest_in_flight_then_the_fastest():
+    selector = PeerSelector(["peer0", "peer1", "peer2"])
+    for peer, latency in (("peer0", 0.03), ("peer1", 0.01), ("peer2", 0.02)):
+        selector._stats[peer].latency_ewma = latency
+
+    assert selector.pick() == "peer1"
+    busy = selector.begin("peer1")
+    assert selector.pick() == "peer2"
+    assert selector.pick(exclude={"peer2"}) == "peer0"
+    selector.end("peer1", busy)
+
+    assert selector.pick_per_group({"Org1": ["peer0", "peer1"], "Org2": ["peer2"]}) == ["peer1", "peer2"]
+
+
+def test_failing_peers_are_ejected_for_a_while():
+    selector = PeerSelector(["peer0", "peer1"], eject_after=3, eject_seconds=0.05)
+    # peer1 is busy, so a healthy peer0 would always be preferred
+    selector.begin("peer1")
+
+    # Errors that do not follow each other keep the peer in rotation
+    for error in (True, True, False, True, True):
+        selector.end("peer0", selector.begin("peer0"), error=error)
+    assert selector.pick() == "peer0"
+
+    selector.end("peer0", selector.begin("peer0"), error=True)
+    assert selector.stats()["peers"]["peer0"]["ejected"] is True
+    assert {selector.pick() for _ in range(10)} == {"peer1"}
+    # With every other candidate excluded an ejected peer still answers
+    assert selector.pick(exclude={"peer1"}) == "peer0"
+
+    time.sleep(0.06)
+    stats = selector.stats()["peers"]["peer0"]
+    assert (stats["ejected"], stats["ejections"]) == (False, 1)
+    assert selector.pick() == "peer0"
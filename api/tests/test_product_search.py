@@ -0,0 +1,57 @@
+import uuid
+from datetime import date
+
+from flask import Flask
+
+from config.database import db
+from src.models.inventory_model import Inventory
+from src.repositories.inventory_repository import InventoryRepository
+from src.utils.text_search import PrefixIndex, similarity
+
+
+def test_similarity_matches_pg_trgm():
+    # Values from the pg_trgm documentation and psql
+    assert round(similarity("word", "two words"), 6) == 0.363636
+    assert similarity("Amoxicillin", "amoxicillin") == 1.0
+    assert similarity("", "amoxicillin") == 0.0
+
+
+def test_prefix_index_completes_any_word_and_follows_updates():
+    index = PrefixIndex()
+    index.replace({"Amoxicillin 500mg": 40, "Amlodipine 5mg": 90, "Paracetamol 500mg": 70, "Ibuprofen": 0})
+
+    assert index.complete("am") == [("Amlodipine 5mg", 90), ("Amoxicillin 500mg", 40)]
+    assert index.complete("500", limit=1) == [("Paracetamol 500mg", 70)]
+    assert index.complete("ibu") == []
+
+    index.update({"Amlodipine 5mg": 0, "Amphotericin B": 10, "Amoxicillin 500mg": 55})
+
+    assert index.complete("AM ") == [("Amoxicillin 500mg", 55), ("Amphotericin B", 10)]
+    assert index.complete("b") == [("Amphotericin B", 10)]
+    assert len(index) == 3
+
+
+def test_search_pages_through_tied_scores_without_skipping(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'search.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        # Every row scores the same, so only the id orders them
+        db.session.add_all([
+            Inventory(
+                organization_id=uuid.uuid4(), batch_id=f"B-TIE-{index}", product_name="Amoxicillin 500mg",
+                available_quantity=10, reserved_quantity=0, unit_dosage="500mg", manufacture_date=date(2025, 1, 1),
+                expiry_date=date(2027, 1, 1), unit_price=1, status="available"
+            )
+            for index in range(25)
+        ])
+        db.session.commit()
+
+        repository, cursor, seen = InventoryRepository(), None, []
+        while True:
+            rows, cursor = repository.search_available("amoxicilin", 1, cursor, 10)
+            seen.extend(inventory.batch_id for inventory, _ in rows)
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 25
@@ -0,0 +1,72 @@
+from datetime import date
+
+from flask import Flask
+
+from config.database import db
+from src.analytics.reconciliation import diff_quantities, inventory_frame, ledger_frame, to_records
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.models.inventory_model import Inventory
+from src.models.organization_model import Organization
+from src.repositories.reconciliation_repository import ReconciliationRepository
+from src.services.reconciliation_service import Reconciler
+
+
+def test_discrepancies_are_classified():
+    ledger = ledger_frame([
+        ("BATCH-1", "org-a", 10),
+        ("BATCH-1", "org-b", 5),
+        ("BATCH-2", "org-a", 7),
+    ])
+    inventory = inventory_frame([
+        ("BATCH-1", "org-a", 8, 2),   # matches once reserved stock is counted
+        ("BATCH-1", "org-b", 3, 0),
+        ("BATCH-2", "org-c", 1, 0),
+        ("BATCH-3", "org-a", 4, 0),
+    ])
+
+    records = to_records(diff_quantities(ledger, inventory, missing_batches=["BATCH-3"]))
+
+    assert sorted((r["batch_id"], r["org_id"], r["kind"], r["difference"]) for r in records) == [
+        ("BATCH-1", "org-b", "quantity_mismatch", -2),
+        ("BATCH-2", "org-a", "missing_in_inventory", -7),
+        ("BATCH-2", "org-c", "not_owned_on_ledger", 1),
+        ("BATCH-3", "org-a", "missing_on_ledger", 4),
+    ]
+    assert next(r for r in records if r["kind"] == "missing_in_inventory")["inventory_quantity"] is None
+
+
+def test_inventory_is_matched_to_ledger_owners_by_business_org_id(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'reconciliation.db'}"
+    db.init_app(app)
+
+    client = FakeFabricClient(FakeLedger())
+    for batch_id in ("BATCH-REC-1", "BATCH-REC-2"):
+        client.submit("createBatch", [batch_id, "Test Drug", "2025-01-01", "2027-01-01", "100", "100mg", "2.5", "MANUFACTURER_1"])
+
+    with app.app_context():
+        db.create_all()
+        organization = Organization(
+            org_id="MANUFACTURER_1", name="Manufacturer", org_type="manufacturer",
+            contact_email="m1@example.com", contact_phone="0", status="active"
+        )
+        db.session.add(organization)
+        db.session.flush()
+        db.session.add_all([
+            Inventory(
+                organization_id=organization.id, batch_id=batch_id, product_name="Test Drug",
+                available_quantity=available, reserved_quantity=reserved, unit_dosage="100mg",
+                manufacture_date=date(2025, 1, 1), expiry_date=date(2027, 1, 1), unit_price=2.5, status="available"
+            )
+            for batch_id, available, reserved in [("BATCH-REC-1", 90, 10), ("BATCH-REC-2", 60, 0)]
+        ])
+        db.session.commit()
+
+        repository = ReconciliationRepository()
+        run = Reconciler(client).run(repository.create_run())
+
+        assert run.status == "completed"
+        (discrepancy,), _ = repository.find_discrepancies(run.id, None, None, 10)
+        assert (discrepancy.batch_id, discrepancy.org_id, discrepancy.kind, discrepancy.difference) == (
+            "BATCH-REC-2", "MANUFACTURER_1", "quantity_mismatch", -40
+        )
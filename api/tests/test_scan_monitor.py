@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+from flask import Flask
+
+from config.database import db
+from src.analytics.sketches import CountMinSketch, HyperLogLog, hash64
+from src.models.notification_model import Notification
+from src.models.user_model import User
+from src.services.scan_monitor_service import SCAN_SOURCE_GATE, ScanMonitor, coarse_scan_location
+from src.utils.constants import UserRole, UserStatus
+
+
+def test_count_min_sketch_never_undercounts_and_merges():
+    rng = random.Random(3)
+    keys = [f"BATCH-{index}" for index in range(2000)]
+    counts = {key: rng.randrange(1, 20) for key in keys}
+
+    first, second = CountMinSketch(width=1024), CountMinSketch(width=1024)
+    stream = [key for key, count in counts.items() for _ in range(count)]
+    rng.shuffle(stream)
+    half = len(stream) // 2
+    for key in stream[:half]:
+        first.add(hash64(key))
+    second.add_many(np.array([hash64(key) for key in stream[half:]], dtype=np.uint64))
+
+    first.merge(CountMinSketch.from_bytes(second.to_bytes()))
+    estimates = {key: first.estimate(hash64(key)) for key in keys}
+    assert all(estimates[key] >= counts[key] for key in keys)
+    # epsilon = e / width: overcounts beyond epsilon * total are rare
+    bound = np.e / 1024 * len(stream)
+    assert sum(estimates[key] - counts[key] > bound for key in keys) <= len(keys) * 0.05
+
+
+def test_hyperloglog_estimates_distinct_counts_and_merges_idempotently():
+    first, second = HyperLogLog(precision=10), HyperLogLog(precision=10)
+    for index in range(5000):
+        first.add(hash64(f"place-{index}"))
+    for index in range(2500, 8000):
+        second.add(hash64(f"place-{index}"))
+
+    first.merge(second)
+    first.merge(HyperLogLog.from_bytes(second.to_bytes()))
+    # Standard error 1.04 / sqrt(1024) is about 3%
+    assert abs(first.count() - 8000) / 8000 < 0.1
+
+    few = HyperLogLog()
+    for place in ["a", "b", "c", "a"]:
+        few.add(hash64(place))
+    assert few.count() == 3
+
+
+def test_public_scan_location_ignores_client_supplied_values():
+    assert coarse_scan_location("203.0.113.7") == coarse_scan_location("203.0.200.1") == "net:203.0.0.0/16"
+    assert coarse_scan_location("2001:db8:1::1") == "net:2001:db8::/32"
+    assert coarse_scan_location("203.0.113.7", "br ") == "region:BR"
+    assert coarse_scan_location(None) == "unknown"
+
+
+def test_apply_pending_alerts_on_consumer_scans_only(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'scans.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(
+            name="Admin", email="admin@example.com", phone="0", hashed_password="-",
+            role=UserRole.ADMIN.value, status=UserStatus.ACTIVE.value
+        ))
+        db.session.commit()
+
+        monitor = ScanMonitor(app, max_locations=3, sketch_width=1024, gate_sketch_width=1024)
+        # Gate scans never count towards the consumer alerts
+        for index in range(50):
+            monitor.record("BATCH-GATE", f"ORG-{index}", 10, SCAN_SOURCE_GATE)
+        # Ten units scanned eleven times from one network
+        for _ in range(11):
+            monitor.record("BATCH-VOLUME", coarse_scan_location("198.51.100.9"), 10)
+        # Few scans from many networks
+        for index in range(5):
+            monitor.record("BATCH-PLACES", coarse_scan_location(f"10.{index}.0.1"), 1000)
+
+        assert monitor.apply_pending() == 66
+        assert monitor.scan_count("BATCH-GATE", SCAN_SOURCE_GATE) == 50
+        assert monitor.scan_count("BATCH-GATE") == 0
+        assert monitor.scan_count("BATCH-VOLUME") == 11
+
+        alerts = sorted(n.related_entity_id for n in Notification.query.filter_by(notification_type='counterfeit_suspected'))
+        assert alerts == ["BATCH-PLACES", "BATCH-VOLUME"]
+
+        # Alerts are raised once per batch and kind
+        monitor.record("BATCH-VOLUME", coarse_scan_location("198.51.100.9"), 10)
+        monitor.apply_pending()
+        monitor.flush()
+        assert Notification.query.filter_by(notification_type='counterfeit_suspected').count() == 2
+        assert monitor.counters["gate_applied"] == 50
@@ -0,0 +1,50 @@
+import threading
+from types import SimpleNamespace
+
+from src.fabric.transaction_tracker import TX_STATUS_INVALID, TX_STATUS_VALID, TransactionTracker
+from src.utils.cache import LRUCache
+
+
+def _event(tx_id, function="createBatch", valid=True):
+    return SimpleNamespace(
+        tx_id=tx_id, function=function, args=["BATCH-TX-1"], valid=valid,
+        validation_name="VALID" if valid else "MVCC_READ_CONFLICT", block_number=7, timestamp="2026-01-01T00:00:00Z",
+    )
+
+
+def test_on_valid_runs_only_for_a_valid_commit():
+    tracker = TransactionTracker(LRUCache("test-tx"))
+    created = []
+    done = threading.Event()
+
+    def on_valid(tx_id):
+        def callback():
+            created.append((tx_id, threading.current_thread().name))
+            done.set()
+        return callback
+
+    tracker.track("tx-valid", "createBatch", "BATCH-TX-1", on_valid("tx-valid"))
+    tracker.track("tx-invalid", "createBatch", "BATCH-TX-1", on_valid("tx-invalid"))
+    assert created == []
+
+    tracker.on_ledger_event(_event("tx-invalid", valid=False))
+    tracker.on_ledger_event(_event("tx-valid"))
+    tracker.on_ledger_event(_event("tx-valid"))
+    assert done.wait(5)
+    tracker._callbacks.shutdown(wait=True)
+    # Off the thread that delivered the event
+    assert [tx_id for tx_id, _ in created] == ["tx-valid"]
+    assert created[0][1].startswith("tx-on-valid")
+    assert tracker.get("tx-invalid")["status"] == TX_STATUS_INVALID
+
+    # The commit event can beat the submitting request to the tracker
+    tracker.on_ledger_event(_event("tx-early"))
+    record = tracker.track("tx-early", "createBatch", "BATCH-TX-1", lambda: created.append(("tx-early", None)))
+    assert record["status"] == TX_STATUS_VALID
+    assert created[-1] == ("tx-early", None)
+
+
+def test_non_batch_functions_are_not_tracked():
+    tracker = TransactionTracker(LRUCache("test-tx"))
+    tracker.on_ledger_event(_event("tx-other", function="recordScan"))
+    assert tracker.get("tx-other") is None
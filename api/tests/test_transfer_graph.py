@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from config.database import db
+from src.analytics.transfer_graph import TransferGraph
+from src.models.batch_mirror_model import BatchTransfer, LedgerBatch
+from src.repositories.batch_mirror_repository import BatchMirrorRepository
+from src.services.transfer_graph_service import build_transfer_graph
+
+
+def _graph():
+    graph = TransferGraph(capacity=2)
+    graph.add_transfer("manufacturer-1", "distributor-1", 100, 48.0)
+    graph.add_transfer("manufacturer-1", "distributor-2", 40, 2.0)
+    graph.add_transfer("distributor-1", "pharmacy-1", 30, 24.0)
+    graph.add_transfer("distributor-2", "distributor-3", 20, 2.0)
+    graph.add_transfer("distributor-3", "pharmacy-1", 20, 2.0)
+    return graph
+
+
+def test_shortest_path_by_hops_and_by_lead_time():
+    graph = _graph()
+
+    by_hops = graph.shortest_path("manufacturer-1", "pharmacy-1")
+    assert by_hops["path"] == ["manufacturer-1", "distributor-1", "pharmacy-1"]
+    assert (by_hops["hops"], by_hops["lead_time_hours"]) == (2, 72.0)
+
+    by_lead_time = graph.shortest_path("manufacturer-1", "pharmacy-1", weight="lead_time")
+    assert by_lead_time["path"] == ["manufacturer-1", "distributor-2", "distributor-3", "pharmacy-1"]
+    assert by_lead_time["lead_time_hours"] == 6.0
+
+    assert graph.shortest_path("pharmacy-1", "manufacturer-1") is None
+
+
+def test_incremental_updates_reach_queries():
+    graph = _graph()
+    graph.shortest_path("manufacturer-1", "pharmacy-1")
+
+    # New edge after the adjacency was built, then more volume on a known one
+    graph.add_transfer("pharmacy-1", "pharmacy-2", 5, 1.0)
+    graph.add_transfer("distributor-3", "pharmacy-1", 200, 4.0)
+
+    assert graph.reachable("pharmacy-2", downstream=False, max_hops=2) == [
+        {"org_id": "pharmacy-1", "hops": 1},
+        {"org_id": "distributor-1", "hops": 2},
+        {"org_id": "distributor-3", "hops": 2},
+    ]
+    top = graph.top_flows(limit=1, org_id="pharmacy-1", direction="in")
+    assert top == [{
+        "from_org_id": "distributor-3", "to_org_id": "pharmacy-1",
+        "transfers": 2, "volume": 220, "avg_lead_time_hours": 3.0,
+    }]
+    assert graph.stats()["edges"] == 6
+
+
+def test_graph_built_from_streamed_chunks_matches_a_single_pass(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'transfers.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        start = datetime(2026, 1, 1)
+        block = 0
+        for index in range(20):
+            batch_id = f"BATCH-G-{index:02d}"
+            db.session.add(LedgerBatch(
+                batch_id=batch_id, product_name="Drug", total_quantity=100, unit_dosage="100mg", status="IN_TRANSIT",
+                created_at=start, last_tx_id=f"tx-{batch_id}", last_block=0
+            ))
+            route = ["manufacturer-1", f"distributor-{index % 3}", f"pharmacy-{index % 4}"]
+            for step, (sender, receiver) in enumerate(zip(route, route[1:])):
+                block += 1
+                db.session.add(BatchTransfer(
+                    tx_id=f"tx-{batch_id}-{step}", batch_id=batch_id, from_org_id=sender, to_org_id=receiver,
+                    quantity=10 + index, transferred_at=start + timedelta(hours=6 * (step + 1) + index),
+                    block_number=block
+                ))
+        db.session.commit()
+
+        repository = BatchMirrorRepository()
+        chunks = list(repository.iter_transfer_history(chunk_size=5))
+        # Chunks close on batch boundaries only
+        assert all(len(chunk) == 6 for chunk in chunks[:-1])
+        assert len({row.batch_id for chunk in chunks for row in chunk}) == 20
+
+        streamed, streamed_block = build_transfer_graph(chunks)
+        whole, whole_block = build_transfer_graph([repository.find_transfer_history()])
+        assert streamed_block == whole_block == 40
+        assert streamed.stats() == whole.stats()
+        assert streamed.top_flows(20) == whole.top_flows(20)
+        assert streamed.shortest_path("manufacturer-1", "pharmacy-1", weight="lead_time") == \
+            whole.shortest_path("manufacturer-1", "pharmacy-1", weight="lead_time")
@@ -0,0 +1,113 @@
+import base64
+import time
+
+import pytest
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+import config.fabric_config as fabric_config
+from src.fabric.event_listener import parse_block
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.repositories.blockchain_repository import (
+    get_batch_cache,
+    get_history_cache,
+    invalidate_batches_on_ledger_event,
+)
+from src.routes.verification_routes import verification_controller
+from src.services.verification_service import (
+    VerificationService,
+    get_verification_cache,
+    refresh_verification_on_ledger_event,
+)
+from src.utils.signing import canonical_json
+
+CACHEABLE = "public, max-age=60, s-maxage=300, stale-if-error=86400"
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    ledger = FakeLedger()
+    client = FakeFabricClient(ledger)
+    client.submit("createBatch", ["BATCH-VERIFY-1", "Test Drug", "2025-01-01", "2027-01-01", "100", "100mg", "2.5", "MANUFACTURER_1"])
+    client.submit("transferBatch", ["BATCH-VERIFY-1", "MANUFACTURER_1", "DISTRIBUTOR_1", "40", "{}"])
+
+    # Every test builds its own ledger under the same batch id
+    for cache in (get_verification_cache(), get_batch_cache(), get_history_cache()):
+        cache.clear()
+    monkeypatch.setattr(fabric_config, "get_fabric_client", lambda: client)
+    monkeypatch.setattr(verification_controller, "verification_service", VerificationService(client))
+    return ledger
+
+
+def test_verify_serves_a_signed_summary_with_a_strong_etag(client, ledger):
+    response = client.get("/verify/BATCH-VERIFY-1")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == CACHEABLE
+    etag, weak = response.get_etag()
+    assert etag and not weak
+
+    data = response.get_json()["data"]
+    summary = data["summary"]
+    assert summary["current_holders"] == ["DISTRIBUTOR_1", "MANUFACTURER_1"]
+    assert [event["event"] for event in summary["custody"]] == ["created", "transferred"]
+
+    key = client.get("/verify/public-key")
+    assert key.headers["Cache-Control"] == "public, max-age=3600, s-maxage=3600, stale-if-error=86400"
+    key = key.get_json()["data"]
+    assert (data["algorithm"], data["key_id"]) == (key["algorithm"], key["key_id"])
+    # Raises InvalidSignature if the summary was not what got signed
+    load_pem_public_key(key["public_key"].encode("ascii")).verify(
+        base64.b64decode(data["signature"]), canonical_json(summary)
+    )
+
+
+def test_matching_if_none_match_is_answered_with_304(client, ledger):
+    etag, _ = client.get("/verify/BATCH-VERIFY-1").get_etag()
+
+    response = client.get("/verify/BATCH-VERIFY-1", headers={"If-None-Match": f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.get_etag() == (etag, False)
+    assert response.headers["Cache-Control"] == CACHEABLE
+
+    response = client.get("/verify/BATCH-VERIFY-1", headers={"If-None-Match": '"something-else"'})
+    assert response.status_code == 200
+
+
+def test_unknown_batches_are_cached_briefly(client, ledger):
+    response = client.get("/verify/BATCH-VERIFY-404")
+    assert response.status_code == 404
+    assert response.headers["Cache-Control"] == "public, max-age=30, s-maxage=30, stale-if-error=86400"
+
+
+def test_ledger_events_refresh_the_snapshot(client, ledger):
+    etag, _ = client.get("/verify/BATCH-VERIFY-1").get_etag()
+
+    FakeFabricClient(ledger).submit("transferBatch", ["BATCH-VERIFY-1", "MANUFACTURER_1", "DISTRIBUTOR_2", "10", "{}"])
+    for event in parse_block(ledger.blocks[-1], ledger.chaincode_name):
+        invalidate_batches_on_ledger_event(event)
+        refresh_verification_on_ledger_event(event)
+
+    deadline = time.monotonic() + 5
+    while get_verification_cache().get("BATCH-VERIFY-1")["etag"] == etag and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    response = client.get("/verify/BATCH-VERIFY-1", headers={"If-None-Match": f'"{etag}"'})
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+    assert "DISTRIBUTOR_2" in response.get_json()["data"]["summary"]["current_holders"]
+
+
+def test_errors_are_never_cached(client, ledger, monkeypatch):
+    def unavailable(*args):
+        raise ConnectionError("peers unreachable")
+
+    service = verification_controller.verification_service
+    monkeypatch.setattr(service, "get_snapshot", unavailable)
+    monkeypatch.setattr(service, "get_public_key", unavailable)
+
+    for path in ("/verify/BATCH-VERIFY-2", "/verify/public-key"):
+        response = client.get(path)
+        assert response.status_code == 500
+        assert response.get_json()["success"] is False
+        assert response.headers["Cache-Control"] == "no-store"
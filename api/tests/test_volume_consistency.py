@@ -0,0 +1,56 @@
+from src.analytics.volume_consistency import (
+    CONSERVATION, TRANSFER_EXCEEDS_BALANCE, UNEXPLAINED_CHANGE, check_history
+)
+
+
+def _version(tx_id, ownerships, transfers, total=100):
+    return {
+        "txId": tx_id,
+        "timestamp": f"2026-03-01T00:00:0{tx_id[-1]}Z",
+        "isDelete": False,
+        "value": {
+            "totalQuantity": total,
+            "ownerships": [{"orgId": org_id, "quantity": quantity} for org_id, quantity in ownerships.items()],
+            "transfers": [
+                {"fromOrgId": sender, "toOrgId": receiver, "quantity": quantity}
+                for sender, receiver, quantity in transfers
+            ],
+        },
+    }
+
+
+def test_consistent_history_has_no_violations():
+    first = [("maker", "dist", 60)]
+    second = first + [("dist", "pharmacy", 20)]
+    history = [
+        _version("tx1", {"maker": 100}, []),
+        _version("tx2", {"maker": 40, "dist": 60}, first),
+        _version("tx3", {"maker": 40, "dist": 40, "pharmacy": 20}, second),
+        # Delivery: one holder's share leaves without a transfer
+        _version("tx4", {"maker": 40, "dist": 40, "pharmacy": 5}, second),
+    ]
+
+    # getBatchHistory returns the newest version first
+    assert check_history("B-1", list(reversed(history))) == []
+
+
+def test_overdrawn_transfer_is_reported_once_with_the_offending_transaction():
+    first = [("maker", "dist", 60)]
+    second = first + [("dist", "pharmacy", 90)]
+    third = second + [("pharmacy", "clinic", 10)]
+    history = [
+        _version("tx1", {"maker": 100}, []),
+        _version("tx2", {"maker": 40, "dist": 60}, first),
+        # The distributor ships more than it holds, the ledger records it anyway
+        _version("tx3", {"maker": 40, "dist": 0, "pharmacy": 90}, second),
+        _version("tx4", {"maker": 40, "pharmacy": 80, "clinic": 10}, third),
+    ]
+
+    violations = check_history("B-2", list(reversed(history)))
+
+    kinds = [(violation["kind"], violation["tx_id"]) for violation in violations]
+    assert kinds == [(TRANSFER_EXCEEDS_BALANCE, "tx3"), (UNEXPLAINED_CHANGE, "tx3"), (CONSERVATION, "tx3")]
+    overdraft = violations[0]
+    assert (overdraft["org_id"], overdraft["counterparty_org_id"]) == ("dist", "pharmacy")
+    assert (overdraft["quantity"], overdraft["expected"]) == (90, 60)
+    assert violations[2]["actual"] == 130
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.fabric.fake_fabric_client import FakeFabricClient, FakeLedger
+from src.fabric.write_scheduler import WriteConflictError, WriteScheduler
+from src.repositories.blockchain_repository import BlockchainRepository
+from src.utils.cache import LRUCache
+
+
+def _repository(ledger, scheduler):
+    return BlockchainRepository(
+        FakeFabricClient(ledger),
+        batch_cache=LRUCache("test-batch"),
+        history_cache=LRUCache("test-history"),
+        write_scheduler=scheduler,
+    )
+
+
+def test_same_batch_transfers_are_serialized():
+    ledger = FakeLedger(commit_latency=0.005)
+    repository = _repository(ledger, WriteScheduler(max_retries=0))
+    repository.create_batch({
+        "batch_id": "BATCH-SCHED-1",
+        "product_name": "Test Drug",
+        "manufacture_date": "2025-01-01",
+        "expiry_date": "2027-01-01",
+        "total_quantity": 100,
+        "unit_dosage": "100mg",
+        "unit_price": 2.5,
+        "owner_org_id": "manufacturer-1",
+    })
+
+    transfer = {"batch_id": "BATCH-SCHED-1", "from_org_id": "manufacturer-1", "to_org_id": "distributor-1", "quantity": 1}
+    with ThreadPoolExecutor(max_workers=8) as workers:
+        list(workers.map(lambda _: repository.transfer_batch(transfer), range(16)))
+
+    batch = repository.get_batch("BATCH-SCHED-1")
+    assert {"orgId": "distributor-1", "quantity": 16} in batch["ownerships"]
+    assert ledger.counters["mvcc_conflicts"] == 0
+
+
+def test_conflicts_are_retried_then_reported():
+    scheduler = WriteScheduler(max_retries=2, base_delay=0)
+    attempts = []
+
+    def always_conflicts():
+        attempts.append(1)
+        raise RuntimeError("Transaction abc failed to commit: MVCC_READ_CONFLICT")
+
+    with pytest.raises(WriteConflictError):
+        scheduler.run("transferBatch", "BATCH-SCHED-2", always_conflicts)
+
+    assert len(attempts) == 3
+    stats = scheduler.stats()["functions"]["transferBatch"]
+    assert (stats["conflicts"], stats["retries"], stats["exhausted"]) == (3, 2, 1)
+
@@ -276,6 +276,24 @@ class MedicineContract extends Contract {
    * This is very useful for traceability and audits.
    */
   async getBatchHistory(ctx, batchId) {
+    const history = await this._readHistory(ctx, batchId, null);
+    return JSON.stringify(history);
+  }
+
+  /**
+   * Get only the history entries committed after transaction sinceTxId.
+   * Fabric 2.x returns key history newest first, so the scan stops as soon as
+   * it reaches the cursor instead of walking the whole history.
+   */
+  async getBatchHistorySince(ctx, batchId, sinceTxId) {
+    if (!sinceTxId) {
+      throw new Error('sinceTxId is required');
+    }
+    const history = await this._readHistory(ctx, batchId, sinceTxId);
+    return JSON.stringify(history);
+  }
+
+  async _readHistory(ctx, batchId, sinceTxId) {
     const exists = await this.batchExists(ctx, batchId);
     if (!exists) {
       throw new Error(`Batch ${batchId} does not exist`);
@@ -283,6 +301,7 @@ class MedicineContract extends Contract {
 
     const iterator = await ctx.stub.getHistoryForKey(batchId);
     const history = [];
+    let cursorFound = false;
 
     // Loop through all historical states
     while (true) {
@@ -290,6 +309,13 @@ class MedicineContract extends Contract {
 
       if (res.value && res.value.value) {
         const txId = res.value.txId;
+
+        if (sinceTxId && txId === sinceTxId) {
+          cursorFound = true;
+          await iterator.close();
+          break;
+        }
+
         const timestamp = res.value.timestamp;
         let value = res.value.value.toString('utf8');
 
@@ -316,7 +342,11 @@ class MedicineContract extends Contract {
       }
     }
 
-    return JSON.stringify(history);
+    if (sinceTxId && !cursorFound) {
+      throw new Error(`Transaction ${sinceTxId} is not part of the history of batch ${batchId}`);
+    }
+
+    return history;
   }
 }
 